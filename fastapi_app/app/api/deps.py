@@ -6,9 +6,9 @@ API 엔드포인트에서 사용되는 의존성 모듈
     - get_llm: LangChain LLM 의존성
     - get_recommender: 추천 서비스 의존성
     - get_place_store: 장소 벡터 저장소 의존성
+    - get_cache: 계층형 캐시 의존성 (프로세스 내 LRU → Redis)
     # TODO: 아래 의존성들은 추후 구현 예정
     # - get_logger: 로깅 의존성
-    # - get_cache: 캐시 의존성
 """
 
 import logging
@@ -17,6 +17,7 @@ from fastapi import Depends, HTTPException
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from app.core.config import settings
+from app.cache.cache import Cache, get_cache as get_shared_cache
 from app.services.recommend.service import RecommenderService
 from app.services.recommend.keyword_extractor import KeywordExtractor
 from app.services.llm_factory import LLMFactory
@@ -28,12 +29,31 @@ from app.services.recommend.engine import RecommendationEngine
 from app.logging.di import get_logger_dep
 from monitoring.metrics import metrics as recommend_metrics  # 추천 API 메트릭 싱글턴 인스턴스 임포트
 from app.services.moment.generator import GeneratorService
-from app.data_pipeline.pipeline import UploaderPipeline
+from app.data_pipeline.pipeline import UploaderPipeline, get_pipeline_runner
+from app.data_pipeline.runner import StagedPipelineRunner
 # TODO: 추후 구현 예정
 # import logging
 # from typing import Generator
 # from app.logging.config import setup_logger
-# from app.cache.redis import get_redis_client
+
+# 캐시 의존성
+def get_cache() -> Cache:
+    """
+    캐시 의존성
+
+    Returns:
+        Cache: 공용 계층형 캐시 인스턴스
+
+    Raises:
+        HTTPException: 캐시 초기화 실패 시
+    """
+    try:
+        return get_shared_cache()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"캐시 초기화 실패: {str(e)}"
+        )
 
 # LLM 의존성
 def get_llm() -> ChatGoogleGenerativeAI:
@@ -55,11 +75,13 @@ def get_llm() -> ChatGoogleGenerativeAI:
         )
     
 def get_keyword_extractor(
-    llm: ChatGoogleGenerativeAI = Depends(get_llm)
+    llm: ChatGoogleGenerativeAI = Depends(get_llm),
+    cache: Cache = Depends(get_cache)
 ) -> KeywordExtractor:
     try:
         return KeywordExtractor(
-            llm=llm
+            llm=llm,
+            cache=cache
         )
     except Exception as e:
         logger.error(f"키워드 추출기 초기화 실패: {str(e)}")
@@ -110,6 +132,7 @@ def get_recommender(
     keyword_extractor: KeywordExtractor = Depends(get_keyword_extractor),
     embedding_model: EmbeddingModel = Depends(get_embedding_model),
     recommendation_engine: RecommendationEngine = Depends(get_recommendation_engine),
+    cache: Cache = Depends(get_cache),
     logger: logging.Logger = Depends(get_logger_dep)
 ) -> RecommenderService:
     """
@@ -129,7 +152,8 @@ def get_recommender(
         return RecommenderService(
             keyword_extractor=keyword_extractor,
             embedding_model=embedding_model,
-            recommendation_engine=recommendation_engine
+            recommendation_engine=recommendation_engine,
+            cache=cache
         )
     except Exception as e:
         logger.error(f"추천 서비스 초기화 실패: {str(e)}")
@@ -146,6 +170,7 @@ def get_recommend_metrics():
 # 게시글 생성 서비스 의존성
 def get_moment_generator(
     llm: ChatGoogleGenerativeAI = Depends(get_llm),
+    cache: Cache = Depends(get_cache),
     logger: logging.Logger = Depends(get_logger_dep)
 ) -> GeneratorService:
     """
@@ -162,7 +187,8 @@ def get_moment_generator(
     """
     try:
         return GeneratorService(
-            llm=llm
+            llm=llm,
+            cache=cache
         )
     except Exception as e:
         logger.error(f"게시글 생성 서비스 초기화 실패: {str(e)}")
@@ -187,6 +213,26 @@ def get_data_uploader(
             detail=f"데이터 업로더 초기화 실패: {str(e)}"
         )
     
+# 데이터 수집 파이프라인 의존성
+def get_data_pipeline_runner(
+    embedding_model: EmbeddingModel = Depends(get_embedding_model),
+    logger: logging.Logger = Depends(get_logger_dep)
+) -> StagedPipelineRunner:
+    """
+    일괄 업로드에 사용하는 공유 단계별 파이프라인 의존성
+
+    Returns:
+        StagedPipelineRunner: 상시 실행 중인 파이프라인 실행기
+    """
+    try:
+        return get_pipeline_runner(embedding_model)
+    except Exception as e:
+        logger.error(f"데이터 파이프라인 초기화 실패: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"데이터 파이프라인 초기화 실패: {str(e)}"
+        )
+
 # TODO: 추후 구현 예정
 # # 로깅 의존성
 # def get_logger_dep() -> logging.Logger:
@@ -194,22 +240,3 @@ def get_data_uploader(
 #     FastAPI 의존성 주입용 로거 반환 함수
 #     """
 #     return get_logger()
-
-# # 캐시 의존성
-# def get_cache():
-#     """
-#     캐시 의존성
-#     
-#     Returns:
-#         Redis: Redis 클라이언트 인스턴스
-#         
-#     Raises:
-#         HTTPException: 캐시 연결 실패 시
-#     """
-#     try:
-#         return get_redis_client()
-#     except Exception as e:
-#         raise HTTPException(
-#             status_code=500,
-#             detail=f"캐시 연결 실패: {str(e)}"
-#         )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, BackgroundTasks, Header
 
 from app.core.config import settings
-from app.api.deps import get_data_uploader
-from app.schemas.data_schema import UploadRequest
-from app.data_pipeline.pipeline import UploaderPipeline
+from app.api.deps import get_data_uploader, get_data_pipeline_runner
+from app.schemas.data_schema import UploadRequest, BatchUploadRequest
+from app.data_pipeline.pipeline import UploaderPipeline, current_pipeline_runner
+from app.data_pipeline.runner import StagedPipelineRunner
 
 router = APIRouter()
 
@@ -30,4 +31,50 @@ async def upload_data(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/upload/batch",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="장소 데이터 일괄 추가",
+    description="장소 id 목록을 단계별 수집 파이프라인에 등록합니다"
+)
+async def upload_batch(
+    background_tasks: BackgroundTasks,
+    req: BatchUploadRequest = Body(..., description="업로드할 장소 id 목록"),
+    runner: StagedPipelineRunner = Depends(get_data_pipeline_runner)
+) -> dict:
+    if req.upload_secret_key != settings.UPLOAD_SECRET_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid secret key"
+        )
+
+    # 큐가 가득 차면 submit이 대기하므로 응답 이후 백그라운드에서 등록
+    def _submit_all():
+        for place_id in req.place_ids:
+            runner.submit(place_id)
+
+    background_tasks.add_task(_submit_all)
+    return {"message": "Upload queued", "count": len(req.place_ids)}
+
+
+@router.get(
+    "/pipeline/stats",
+    status_code=status.HTTP_200_OK,
+    summary="수집 파이프라인 상태",
+    description="단계별 처리량과 큐 대기 수를 반환합니다 (파이프라인이 실행 중이 아니면 빈 값)"
+)
+async def pipeline_stats(
+    upload_secret_key: str = Header(..., alias="X-Upload-Secret-Key", description="업로드 요청을 위한 인증 키")
+) -> dict:
+    if upload_secret_key != settings.UPLOAD_SECRET_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid secret key"
+        )
+
+    # 상태 조회가 임베딩 모델 로드와 워커 기동을 일으키지 않도록, 실행 중인 파이프라인만 조회
+    runner = current_pipeline_runner()
+    return runner.stats() if runner is not None else {}
@@ -8,7 +8,11 @@ FastAPI를 사용하여 HTTP 요청을 처리하고 추천 서비스와 연동
     - recommend: 추천 요청을 처리하는 엔드포인트 함수
 """
 
+from datetime import datetime
+from typing import Literal, Optional
+from zoneinfo import ZoneInfo
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from app.core.config import settings
 from app.services.recommend.service import RecommenderService
 from app.schemas.recommend_schema import RecommendResponse
 from app.api.deps import get_recommender, get_recommend_metrics  # 추천 API 메트릭 의존성 함수 임포트
@@ -24,6 +28,12 @@ router = APIRouter()
 )
 async def get_recommendation(
     text: str = Query(..., description="추천을 위한 키워드나 문장"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="검색 기준 위도"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="검색 기준 경도"),
+    radius: Optional[float] = Query(None, gt=0, description="검색 반경 (m, 기본값 GEO_DEFAULT_RADIUS_M)"),
+    open_at: Optional[datetime] = Query(None, description="이 시각에 영업 중인 장소만 (ISO 8601, 시간대 없으면 PLACE_TIMEZONE)"),
+    open_now: bool = Query(False, description="현재 영업 중인 장소만"),
+    mode: Literal["keyword", "dense"] = Query("keyword", description="keyword: LLM 키워드 추출, dense: 문장 임베딩 (LLM 없음)"),
     recommender: RecommenderService = Depends(get_recommender),
     metrics = Depends(get_recommend_metrics)  # 메트릭 객체를 의존성 주입으로 받음
 ) -> RecommendResponse:
@@ -32,11 +42,17 @@ async def get_recommendation(
     
     이 엔드포인트는 다음과 같은 단계로 동작합니다:
     1. 사용자의 추천 요청을 받음
-    2. RecommenderService를 사용하여 추천 생성
+    2. RecommenderService를 사용하여 추천 생성 (lat/lon이 주어지면 반경 내 장소만, open_at/open_now면 영업 중인 장소만)
     3. 추천 결과를 응답 형식에 맞게 변환하여 반환
     
     Args:
         text (str): 사용자의 추천 요청 키워드
+        lat (float): 검색 기준 위도 (lon과 함께 지정)
+        lon (float): 검색 기준 경도 (lat과 함께 지정)
+        radius (float): 검색 반경 (m)
+        open_at (datetime): 이 시각에 영업 중인 장소만 추천
+        open_now (bool): 현재 영업 중인 장소만 추천 (open_at이 없을 때)
+        mode (str): 추천 방식 (keyword: LLM 키워드 추출, 실패 시 dense로 대체 / dense: 문장 임베딩)
         recommender (RecommenderService): 의존성으로 주입된 추천 서비스
         metrics (RecommendMetrics): 의존성으로 주입된 추천 메트릭스
         
@@ -44,11 +60,28 @@ async def get_recommendation(
         RecommendResponse: 추천 결과 데이터
         
     Raises:
-        HTTPException: 추천 생성 과정에서 오류가 발생한 경우
+        HTTPException: 위치 조건이 잘못되었거나 추천 생성 과정에서 오류가 발생한 경우
     """
+    location = None
+    if (lat is None) != (lon is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat과 lon은 함께 지정해야 합니다."
+        )
+    if lat is not None:
+        radius = float(radius or settings.GEO_DEFAULT_RADIUS_M)
+        if radius > float(settings.GEO_MAX_RADIUS_M):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"radius는 {settings.GEO_MAX_RADIUS_M}m 이하여야 합니다."
+            )
+        location = (lat, lon, radius)
+    if open_at is None and open_now:
+        open_at = datetime.now(ZoneInfo(settings.PLACE_TIMEZONE))
+
     try:
         recommender.metrics = metrics  # 엔드포인트에서 RecommenderService에 메트릭 객체 주입
-        return await recommender.get_recommendation(user_input=text)
+        return await recommender.get_recommendation(user_input=text, location=location, open_at=open_at, mode=mode)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
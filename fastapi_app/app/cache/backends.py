@@ -0,0 +1,102 @@
+"""
+캐시 저장소(백엔드) 모듈
+
+이 모듈은 캐시 계층이 구현하는 공통 인터페이스와 프로세스 내 LRU 저장소를 제공합니다.
+값은 직렬화된 bytes로 저장하며, 직렬화와 네임스페이스별 TTL은 Cache(app.cache.cache)가 담당합니다.
+
+MemoryCache는 캐시의 1차 계층으로 쓰이며, Redis 없이 Cache를 구성할 때(테스트, 로컬 실행)의 대체 저장소로도 사용합니다.
+
+주요 구성요소:
+    - CacheBackend: 캐시 저장소 인터페이스
+    - MemoryCache: 항목 수 제한과 항목별 만료 시간이 있는 프로세스 내 LRU 저장소
+"""
+
+import time
+import threading
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """
+    캐시 저장소 인터페이스
+
+    모든 메서드는 비동기이며, 저장소 오류는 호출한 쪽(Cache)에서 캐시 미스로 처리합니다.
+    """
+
+    name = "backend"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """키의 값을 반환합니다. (없거나 만료되었으면 None)"""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """키에 값을 ttl초 동안 저장합니다."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """키를 삭제합니다."""
+
+    async def clear(self) -> None:
+        """모든 항목을 삭제합니다. (지원하지 않는 저장소는 무시)"""
+
+    async def close(self) -> None:
+        """연결 등 자원을 해제합니다."""
+
+
+class MemoryCache(CacheBackend):
+    """
+    프로세스 내 LRU 캐시 저장소
+
+    max_items를 넘으면 가장 오래 사용하지 않은 항목부터 제거하고,
+    항목별 만료 시각이 지나면 조회 시 제거합니다. 여러 스레드에서 사용할 수 있습니다.
+
+    Attributes:
+        max_items (int): 최대 항목 수
+        max_ttl (Optional[float]): 항목 TTL 상한 (초, None이면 제한 없음)
+    """
+
+    name = "memory"
+
+    def __init__(self, max_items: int = 1024, max_ttl: Optional[float] = None):
+        self.max_items = max(1, int(max_items))
+        self.max_ttl = float(max_ttl) if max_ttl else None
+        self._items: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if self.max_ttl is not None:
+            ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,210 @@
+"""
+계층형 캐시 모듈
+
+이 모듈은 프로세스 내 LRU(MemoryCache)를 Redis(RedisCache) 앞에 둔 계층형 캐시를 제공합니다.
+조회는 위 계층부터 확인하고, 아래 계층에서 찾으면 위 계층을 채웁니다. 저장은 모든 계층에 합니다.
+값은 Pydantic 모델(RecommendResponse, GenerateResponse 등)이면 모델 JSON으로,
+그 밖의 값은 JSON으로 직렬화하며, TTL은 네임스페이스별 설정(CACHE_TTLS)을 따릅니다.
+
+캐시 저장소 오류는 경고만 남기고 캐시 미스로 처리하므로, 캐시 장애가 요청 실패로 이어지지 않습니다.
+REDIS_URL이 없으면 프로세스 내 LRU만 사용하며, 테스트에서는 Cache([MemoryCache()])로 Redis 없이 구성합니다.
+
+주요 구성요소:
+    - parse_cache_ttls: "recommend=300,extract=86400" 형식 → 네임스페이스별 TTL
+    - Cache: 계층형 캐시 (직렬화, 네임스페이스별 TTL)
+    - get_cache: 공용 Cache 반환 (MemoryCache → RedisCache)
+"""
+
+import json
+import hashlib
+import threading
+
+from pydantic import BaseModel
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+
+from app.core.config import settings
+from app.cache.backends import CacheBackend, MemoryCache
+from monitoring.metrics import cache_metrics
+
+NAMESPACES = ("recommend", "extract", "moment")
+DEFAULT_TTL = 300.0
+
+
+def parse_cache_ttls(raw: Optional[str]) -> Dict[str, float]:
+    """
+    "recommend=300,extract=86400,moment=3600" 형식의 설정을 네임스페이스별 TTL(초)로 변환합니다.
+
+    지정하지 않은 네임스페이스는 DEFAULT_TTL을 사용합니다.
+    """
+    ttls = {namespace: DEFAULT_TTL for namespace in NAMESPACES}
+    if not raw:
+        return ttls
+
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        namespace, ttl = (s.strip() for s in item.split("=", 1))
+        try:
+            ttls[namespace] = float(ttl)
+        except ValueError:
+            raise ValueError(f"잘못된 캐시 TTL 설정: {item}")
+    return ttls
+
+
+class Cache:
+    """
+    계층형 캐시
+
+    Attributes:
+        tiers (List[CacheBackend]): 조회 순서대로 정렬된 캐시 저장소 (비어 있으면 캐시 사용 안 함)
+        ttls (Dict[str, float]): 네임스페이스별 TTL (초)
+        prefix (str): 키 접두사
+    """
+
+    def __init__(
+        self,
+        tiers: List[CacheBackend],
+        ttls: Optional[Dict[str, float]] = None,
+        prefix: Optional[str] = None,
+        logger=None
+    ):
+        if logger is None:
+            from app.logging.config import get_logger
+            logger = get_logger()
+        self.logger = logger
+        self.tiers = list(tiers)
+        self.ttls = ttls if ttls is not None else parse_cache_ttls(settings.CACHE_TTLS)
+        self.prefix = prefix if prefix is not None else settings.CACHE_PREFIX
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        요청 인자들로 캐시 키를 만듭니다. (JSON으로 정규화한 뒤 SHA-1)
+        """
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def ttl_of(self, namespace: str) -> float:
+        return float(self.ttls.get(namespace, DEFAULT_TTL))
+
+    def _full_key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return value.model_dump_json().encode("utf-8")
+        return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+    @staticmethod
+    def _decode(raw: bytes, model: Optional[Type[BaseModel]]) -> Any:
+        if model is not None:
+            return model.model_validate_json(raw)
+        return json.loads(raw)
+
+    async def get(self, namespace: str, key: str, model: Optional[Type[BaseModel]] = None) -> Any:
+        """
+        캐시된 값을 반환합니다. (없으면 None)
+
+        Args:
+            namespace (str): 네임스페이스 (예: "recommend")
+            key (str): 캐시 키 (Cache.key로 생성)
+            model (Type[BaseModel]): 값을 복원할 Pydantic 모델 (없으면 JSON 값)
+        """
+        if not self.tiers:
+            return None
+        full_key = self._full_key(namespace, key)
+        for i, tier in enumerate(self.tiers):
+            try:
+                raw = await tier.get(full_key)
+            except Exception as e:
+                self.logger.warning(f"캐시 조회 실패 ({tier.name}, {namespace}): {str(e)}")
+                continue
+            if raw is None:
+                continue
+            try:
+                value = self._decode(raw, model)
+            except Exception as e:
+                # 형식이 바뀐 이전 값 등은 지우고 미스로 처리
+                self.logger.warning(f"캐시 값 복원 실패 ({tier.name}, {namespace}): {str(e)}")
+                await self.delete(namespace, key)
+                return None
+            # 아래 계층에서 찾았으면 위 계층을 채움
+            for upper in self.tiers[:i]:
+                await self._set_tier(upper, full_key, raw, self.ttl_of(namespace), namespace)
+            cache_metrics.requests.labels(namespace=namespace, result=tier.name).inc()
+            return value
+        cache_metrics.requests.labels(namespace=namespace, result="miss").inc()
+        return None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """값을 모든 계층에 저장합니다. (ttl이 없으면 네임스페이스 TTL)"""
+        if not self.tiers or value is None:
+            return
+        raw = self._encode(value)
+        ttl = float(ttl) if ttl is not None else self.ttl_of(namespace)
+        full_key = self._full_key(namespace, key)
+        for tier in self.tiers:
+            await self._set_tier(tier, full_key, raw, ttl, namespace)
+
+    async def _set_tier(self, tier: CacheBackend, full_key: str, raw: bytes, ttl: float, namespace: str) -> None:
+        try:
+            await tier.set(full_key, raw, ttl)
+        except Exception as e:
+            self.logger.warning(f"캐시 저장 실패 ({tier.name}, {namespace}): {str(e)}")
+
+    async def delete(self, namespace: str, key: str) -> None:
+        full_key = self._full_key(namespace, key)
+        for tier in self.tiers:
+            try:
+                await tier.delete(full_key)
+            except Exception as e:
+                self.logger.warning(f"캐시 삭제 실패 ({tier.name}, {namespace}): {str(e)}")
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        model: Optional[Type[BaseModel]] = None
+    ) -> Any:
+        """
+        캐시된 값이 있으면 반환하고, 없으면 factory()의 결과를 저장한 뒤 반환합니다.
+        """
+        value = await self.get(namespace, key, model)
+        if value is not None:
+            return value
+        value = await factory()
+        await self.set(namespace, key, value)
+        return value
+
+    async def close(self) -> None:
+        for tier in self.tiers:
+            await tier.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Cache:
+    """
+    공용 Cache를 반환합니다.
+
+    CACHE_ENABLED가 꺼져 있으면 계층 없는 Cache(항상 미스)를, REDIS_URL이 없으면 프로세스 내 LRU만 사용합니다.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                tiers: List[CacheBackend] = []
+                if settings.CACHE_ENABLED:
+                    tiers.append(MemoryCache(
+                        max_items=int(settings.CACHE_MEMORY_MAX_ITEMS),
+                        max_ttl=float(settings.CACHE_MEMORY_TTL)
+                    ))
+                    if settings.REDIS_URL:
+                        from app.cache.redis import RedisCache
+                        tiers.append(RedisCache())
+                _cache = Cache(tiers)
+    return _cache
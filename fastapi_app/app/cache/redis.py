@@ -2,30 +2,110 @@
 Redis 캐시 모듈
 
 이 모듈은 Redis를 사용한 캐시 기능을 제공합니다.
-Redis 클라이언트를 관리하고 의존성을 제공합니다.
+redis.asyncio 클라이언트는 프로세스 공용 연결 풀(REDIS_POOL_SIZE)을 사용하며,
+명령은 REDIS_TIMEOUT 안에 끝나지 않으면 실패로 처리합니다.
+Redis 오류가 나면 REDIS_RETRY_INTERVAL 동안 Redis 계층을 건너뛰어 요청이 Redis 장애를 기다리지 않게 합니다.
 
 주요 구성요소:
-    - get_redis_client: Redis 클라이언트 의존성
+    - get_redis_pool: 공용 비동기 연결 풀
+    - get_redis_client: 공용 연결 풀을 쓰는 Redis 클라이언트
+    - RedisCache: Redis 캐시 저장소 (캐시 2차 계층)
 """
 
-from redis import Redis
-from fastapi import Depends, HTTPException
+import time
+import threading
+
+from typing import Optional
+
 from app.core.config import settings
+from app.cache.backends import CacheBackend
+
+_pool = None
+_pool_lock = threading.Lock()
 
-def get_redis_client() -> Redis:
+
+def get_redis_pool():
+    """
+    공용 redis.asyncio 연결 풀을 반환합니다. (처음 호출할 때 생성)
     """
-    Redis 클라이언트 의존성
-    
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from redis.asyncio import ConnectionPool
+                _pool = ConnectionPool.from_url(
+                    settings.REDIS_URL,
+                    max_connections=int(settings.REDIS_POOL_SIZE),
+                    socket_timeout=float(settings.REDIS_TIMEOUT),
+                    socket_connect_timeout=float(settings.REDIS_TIMEOUT)
+                )
+    return _pool
+
+
+def get_redis_client():
+    """
+    공용 연결 풀을 쓰는 Redis 클라이언트
+
     Returns:
-        Redis: Redis 클라이언트 인스턴스
-        
-    Raises:
-        HTTPException: Redis 연결 실패 시
+        redis.asyncio.Redis: Redis 클라이언트 인스턴스
+    """
+    from redis.asyncio import Redis
+    return Redis(connection_pool=get_redis_pool())
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis 캐시 저장소
+
+    Attributes:
+        client (redis.asyncio.Redis): Redis 클라이언트
+        retry_interval (float): 오류 후 Redis 계층을 건너뛰는 시간 (초)
     """
-    try:
-        return Redis.from_url(settings.REDIS_URL)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Redis 연결 실패: {str(e)}"
+
+    name = "redis"
+
+    def __init__(self, client=None, retry_interval: Optional[float] = None):
+        self.client = client if client is not None else get_redis_client()
+        self.retry_interval = float(
+            retry_interval if retry_interval is not None else settings.REDIS_RETRY_INTERVAL
         )
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self) -> None:
+        self._down_until = time.monotonic() + self.retry_interval
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self.available:
+            return None
+        try:
+            return await self.client.get(key)
+        except Exception:
+            self._failed()
+            raise
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if not self.available or ttl <= 0:
+            return
+        try:
+            await self.client.set(key, value, px=max(1, int(ttl * 1000)))
+        except Exception:
+            self._failed()
+            raise
+
+    async def delete(self, key: str) -> None:
+        if not self.available:
+            return
+        try:
+            await self.client.delete(key)
+        except Exception:
+            self._failed()
+            raise
+
+    async def close(self) -> None:
+        # redis 5.0.1부터 aclose (이전 버전은 close)
+        close = getattr(self.client, "aclose", None) or self.client.close
+        await close()
@@ -28,9 +28,9 @@ class Settings(BaseSettings):
         VECTOR_STORE_PATH (str): 벡터 저장소 경로
         EMBEDDING_MODEL_NAME (str): 임베딩 모델 이름
         VECTOR_STORE_COLLECTION_NAME (str): 벡터 저장소 컬렉션 이름
+        REDIS_URL (str): Redis 연결 URL (캐시 2차 계층)
         
     TODO: 추후 구현 예정
-        REDIS_URL (str): Redis 연결 URL
         LOG_LEVEL (str): 로깅 레벨
     """
     
@@ -38,11 +38,60 @@ class Settings(BaseSettings):
     MODEL_NAME: str = os.getenv("MODEL_NAME", "gemini-2.0-flash-lite")
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY")
     TEMPERATURE: float = os.getenv("TEMPERATURE", 0.7)
+    KEYWORD_EXTRACT_TIMEOUT: float = os.getenv("KEYWORD_EXTRACT_TIMEOUT", 3.0)  # 초과하거나 실패하면 dense 모드로 추천 (0이면 제한 없음)
+
+    # dense 모드(LLM 없이 질의 문장 임베딩으로 추천) 설정
+    DENSE_TOP_K: int = os.getenv("DENSE_TOP_K", 20)  # 키워드 카테고리 컬렉션별 검색 결과 수
+    DENSE_MIN_SCORE: float = os.getenv("DENSE_MIN_SCORE", 0.3)  # 이 유사도 미만의 키워드는 점수에 넣지 않음
+    DENSE_MAX_RESULTS: int = os.getenv("DENSE_MAX_RESULTS", 30)  # 반환할 최대 장소 수
+
+    # 장소 키워드 추출(후처리) LLM 설정
+    LLM_METADATA_TOKEN_BUDGET: int = os.getenv("LLM_METADATA_TOKEN_BUDGET", 1500)
+    LLM_REVIEW_MAX_CHARS: int = os.getenv("LLM_REVIEW_MAX_CHARS", 200)
+    LLM_BATCH_SIZE: int = os.getenv("LLM_BATCH_SIZE", 1)  # 2 이상이면 파이프라인에서 일괄 추출
+    LLM_BATCH_CONCURRENCY: int = os.getenv("LLM_BATCH_CONCURRENCY", 4)
     
     # 벡터 저장소 설정
     VECTOR_STORE_PATH: str = os.getenv("VECTOR_STORE_PATH", "data/vector_store")
     EMBEDDING_MODEL_NAME: str = os.getenv("EMBEDDING_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
     VECTOR_STORE_COLLECTION_NAME: str = os.getenv("VECTOR_STORE_COLLECTION_NAME", "documents")
+    VECTOR_STORE_KEEP_VERSIONS: int = os.getenv("VECTOR_STORE_KEEP_VERSIONS", 2)  # 롤백용 이전 버전 포함
+    VECTOR_STORE_REFRESH_INTERVAL: float = os.getenv("VECTOR_STORE_REFRESH_INTERVAL", 1.0)
+    VECTOR_STORE_RETIRE_GRACE: float = os.getenv("VECTOR_STORE_RETIRE_GRACE", 60.0)  # 내려온 버전을 정리하지 않는 최소 시간(초)
+    VECTOR_WRITER_FLUSH_MS: float = os.getenv("VECTOR_WRITER_FLUSH_MS", 200)  # 그룹 커밋 대기 시간
+    VECTOR_WRITER_MAX_ITEMS: int = os.getenv("VECTOR_WRITER_MAX_ITEMS", 2000)  # 그룹 커밋 최대 항목 수
+    VECTOR_WRITER_MIN_INTERVAL: float = os.getenv("VECTOR_WRITER_MIN_INTERVAL", 2.0)  # 커밋 간 최소 간격(초), 커밋마다 저장소 전체를 복사하므로 묶어서 반영
+    SNAPSHOT_STORE_URI: Optional[str] = os.getenv("SNAPSHOT_STORE_URI")  # s3://bucket/prefix 또는 file:///path
+    SNAPSHOT_ROLE: str = os.getenv("SNAPSHOT_ROLE", "")  # publisher(수집 노드) | subscriber(API 레플리카)
+    SNAPSHOT_POLL_INTERVAL: float = os.getenv("SNAPSHOT_POLL_INTERVAL", 2.0)
+    RETRIEVAL_BACKEND: str = os.getenv("RETRIEVAL_BACKEND", "chroma")  # chroma | compact (메모리 매핑 인덱스) | sharded (지역 샤드)
+    COMPACT_INDEX_EXPORT: bool = os.getenv("COMPACT_INDEX_EXPORT", False)  # 버전 게시 시 압축 인덱스 함께 생성 (RETRIEVAL_BACKEND=compact이면 항상 생성)
+    COMPACT_INDEX_DTYPE: str = os.getenv("COMPACT_INDEX_DTYPE", "float32")  # float32 | float16 | int8 (컬렉션별: food_product=int8,float16)
+    COMPACT_INDEX_RERANK: int = os.getenv("COMPACT_INDEX_RERANK", 4)  # 양자화 시 float32 재정렬 후보 배수 (0이면 재정렬 안 함)
+    COMPACT_TWO_STAGE: bool = os.getenv("COMPACT_TWO_STAGE", True)  # 장소 중심 벡터로 후보 장소를 고른 뒤 항목 재계산
+    COMPACT_TWO_STAGE_CANDIDATES: int = os.getenv("COMPACT_TWO_STAGE_CANDIDATES", 4)  # 후보 장소 수 = n_results * 배수
+    NEIGHBOR_TABLE_K: int = os.getenv("NEIGHBOR_TABLE_K", 50)  # 키워드별 미리 계산할 이웃 수 (0이면 사용 안 함)
+    GEO_CELL_DEG: float = os.getenv("GEO_CELL_DEG", 0.01)  # 좌표 격자 칸 크기 (약 1.1km)
+    GEO_DEFAULT_RADIUS_M: float = os.getenv("GEO_DEFAULT_RADIUS_M", 1000)  # lat/lon만 주어졌을 때 반경
+    GEO_MAX_RADIUS_M: float = os.getenv("GEO_MAX_RADIUS_M", 20000)
+    PLACE_FILTER_MAX_IDS: int = os.getenv("PLACE_FILTER_MAX_IDS", 2000)  # 위치/영업시간 조건 장소가 이보다 많으면 벡터 검색 필터 대신 결과에서 거름
+    PLACE_TIMEZONE: str = os.getenv("PLACE_TIMEZONE", "Asia/Seoul")  # 영업시간 조회 기준 시간대
+    ADAPTIVE_TOP_K: bool = os.getenv("ADAPTIVE_TOP_K", True)  # 거리만 먼저 조회하고 임계값을 넘을 수 있는 결과만 메타데이터 조회
+    LEXICAL_INDEX: bool = os.getenv("LEXICAL_INDEX", True)  # 키워드 문자 n-gram 역색인 생성/검색
+    LEXICAL_WEIGHT: float = os.getenv("LEXICAL_WEIGHT", 1.0)  # 어휘 점수 가중치 (장소별 max(벡터 점수, 어휘 점수 * 가중치))
+    LEXICAL_MIN_SCORE: float = os.getenv("LEXICAL_MIN_SCORE", 0.5)  # 이 점수 미만의 어휘 일치는 사용 안 함
+    LEXICAL_SKIP_DENSE: bool = os.getenv("LEXICAL_SKIP_DENSE", True)  # 어휘 검색이 정확히 일치하거나 확실하면 키워드 임베딩/벡터 검색 생략
+    LEXICAL_SKIP_DENSE_SCORE: float = os.getenv("LEXICAL_SKIP_DENSE_SCORE", 0.9)  # 정확히 일치하지 않아도 어휘 최고 점수가 이 이상이면 벡터 검색 생략
+    SHARD_ROOT: str = os.getenv("SHARD_ROOT", "data/shards")  # 지역 샤드 저장소 경로 (shard_map.npz, shard-0, ...)
+    SHARD_COUNT: int = os.getenv("SHARD_COUNT", 3)  # 분할할 샤드 수
+    SHARD_URLS: str = os.getenv("SHARD_URLS", "")  # 샤드 서버 주소 (쉼표 구분, 샤드 번호 순) / 비우면 SHARD_ROOT 샤드를 프로세스 내에서 열기
+    SHARD_BACKEND: str = os.getenv("SHARD_BACKEND", "chroma")  # 샤드별 저장소: chroma | compact
+    SHARD_TIMEOUT: float = os.getenv("SHARD_TIMEOUT", 0.5)  # 샤드 응답 기한 (초, 넘기면 해당 샤드 결과 없이 병합)
+    SHARD_REGION_DEG: float = os.getenv("SHARD_REGION_DEG", 0.05)  # 도로명주소가 없을 때 지역 격자 칸 크기 (약 5.5km)
+    SHARD_ROUTE_WRITES: bool = os.getenv("SHARD_ROUTE_WRITES", True)  # 분할된 SHARD_ROOT가 있으면 벡터 저장소 커밋을 소유 샤드에도 반영
+    SHARD_MAX_PENDING: int = os.getenv("SHARD_MAX_PENDING", 4)  # 샤드별로 아직 끝나지 않은 호출 상한 (넘으면 그 샤드는 결과 없이 병합)
+    KEYWORD_DEDUP_THRESHOLD: float = os.getenv("KEYWORD_DEDUP_THRESHOLD", 0.95)  # 1 이상이면 문자열 정규화만 사용
+    INGEST_STATE_PATH: str = os.getenv("INGEST_STATE_PATH", "app/data/ingest_state.sqlite3")
 
     # ONNX 임베딩 모델 설정
     ONNX_MODEL_PATH: str = os.getenv("ONNX_MODEL_PATH", "app/model/snunlp_KR-SBERT-V40K-klueNLI-augSTS_quant.onnx")
@@ -50,24 +99,65 @@ class Settings(BaseSettings):
 
     # 카카오 API 설정
     KAKAO_API_KEY: str = os.getenv("KAKAO_API_KEY")
+    GEOCODE_CACHE_PATH: str = os.getenv("GEOCODE_CACHE_PATH", "app/data/geocode_cache.sqlite3")
+    GEOCODE_CACHE_TTL: float = os.getenv("GEOCODE_CACHE_TTL", 60 * 60 * 24 * 90)
+    GEOCODE_NEGATIVE_TTL: float = os.getenv("GEOCODE_NEGATIVE_TTL", 60 * 60 * 24)
+
+    # 크롤러 설정
+    KAKAO_PLACE_URL: str = os.getenv("KAKAO_PLACE_URL", "https://place.map.kakao.com")
+    CRAWL_SECTION_MODES: str = os.getenv("CRAWL_SECTION_MODES", "main=http,menu=http,reviews=browser")
+    HTTP_POOL_SIZE: int = os.getenv("HTTP_POOL_SIZE", 10)
+    HTTP_TIMEOUT: float = os.getenv("HTTP_TIMEOUT", 5.0)
+    CRAWL_WORKERS: int = os.getenv("CRAWL_WORKERS", 4)
+    CRAWL_FRONTIER_SIZE: int = os.getenv("CRAWL_FRONTIER_SIZE", 100)
+    CRAWL_MAX_RETRIES: int = os.getenv("CRAWL_MAX_RETRIES", 3)
+    CRAWL_RETRY_BACKOFF: float = os.getenv("CRAWL_RETRY_BACKOFF", 1.0)
+    CRAWL_HOST_CONCURRENCY: int = os.getenv("CRAWL_HOST_CONCURRENCY", 2)
+    CRAWL_HOST_MIN_INTERVAL: float = os.getenv("CRAWL_HOST_MIN_INTERVAL", 0.5)
+    CRAWL_BROWSER_POOL_SIZE: int = os.getenv("CRAWL_BROWSER_POOL_SIZE", 2)
+
+    # 수집 파이프라인 단계별 동시 실행 설정
+    PIPELINE_QUEUE_SIZE: int = os.getenv("PIPELINE_QUEUE_SIZE", 16)
+    PIPELINE_CRAWL_WORKERS: int = os.getenv("PIPELINE_CRAWL_WORKERS", 4)
+    PIPELINE_LLM_WORKERS: int = os.getenv("PIPELINE_LLM_WORKERS", 2)
+    PIPELINE_INDEX_WORKERS: int = os.getenv("PIPELINE_INDEX_WORKERS", 4)  # 쓰기는 VectorStoreWriter가 묶어서 반영
+    PIPELINE_EXPORT_WORKERS: int = os.getenv("PIPELINE_EXPORT_WORKERS", 4)
 
     # S3 권한 설정
     S3_ACCESS_KEY: str = os.getenv("S3_ACCESS_KEY")
     S3_SECRET_KEY: str = os.getenv("S3_SECRET_KEY")
     S3_DEFAULT_REGION: str = os.getenv("S3_DEFAULT_REGION")
+    S3_ENDPOINT_URL: Optional[str] = os.getenv("S3_ENDPOINT_URL")
+    S3_MAX_POOL_CONNECTIONS: int = os.getenv("S3_MAX_POOL_CONNECTIONS", 10)
     
     # 장소 이미지 저장 경로 설정
     TEMP_IMAGE_PATH: str = os.getenv("TEMP_IMAGE_PATH", "app/data/temp_image")
+    IMAGE_TRANSFER_MODE: str = os.getenv("IMAGE_TRANSFER_MODE", "stream")  # stream | file
+    IMAGE_MAX_SIZE: int = os.getenv("IMAGE_MAX_SIZE", 0)  # 0이면 리사이즈하지 않음
+    IMAGE_JPEG_QUALITY: int = os.getenv("IMAGE_JPEG_QUALITY", 85)
     S3_IMAGE_PATH: str = os.getenv("S3_IMAGE_PATH", "s3-dolpin-image-dev/place")
     S3_METADATA_PATH: str = os.getenv("S3_METADATA_PATH", "ai-metadata-temp-bucket")
+    S3_EXPORT_FORMAT: str = os.getenv("S3_EXPORT_FORMAT", "csv")  # csv | parquet
+    S3_EXPORT_PREFIX: str = os.getenv("S3_EXPORT_PREFIX", "batches")
+    S3_EXPORT_BATCH_SIZE: int = os.getenv("S3_EXPORT_BATCH_SIZE", 200)
+    S3_EXPORT_FLUSH_INTERVAL: float = os.getenv("S3_EXPORT_FLUSH_INTERVAL", 60.0)  # 버퍼의 가장 오래된 장소가 이 시간(초)을 넘기면 batch_size 미만이어도 업로드 (0이면 사용 안 함)
 
     # 장소 데이터 API 요청 시크릿 키 설정
     UPLOAD_SECRET_KEY: str = os.getenv("UPLOAD_SECRET_KEY")
 
-    # TODO: 추후 구현 예정
-    # # Redis 설정
-    # REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
-    
+    # 캐시 설정 (프로세스 내 LRU → Redis)
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", True)
+    CACHE_PREFIX: str = os.getenv("CACHE_PREFIX", "dolpin")  # Redis 키 접두사
+    CACHE_TTLS: str = os.getenv("CACHE_TTLS", "recommend=300,extract=86400,moment=3600")  # 네임스페이스별 TTL (초)
+    CACHE_MEMORY_MAX_ITEMS: int = os.getenv("CACHE_MEMORY_MAX_ITEMS", 2048)  # 프로세스 내 LRU 최대 항목 수
+    CACHE_MEMORY_TTL: float = os.getenv("CACHE_MEMORY_TTL", 60)  # 프로세스 내 LRU 항목 최대 TTL (레플리카 간 차이 제한)
+
+    # Redis 설정
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")  # 예: redis://localhost:6379/0 (비우면 프로세스 내 LRU만 사용)
+    REDIS_POOL_SIZE: int = os.getenv("REDIS_POOL_SIZE", 20)  # 연결 풀 최대 연결 수
+    REDIS_TIMEOUT: float = os.getenv("REDIS_TIMEOUT", 0.2)  # 연결/명령 제한 시간 (초)
+    REDIS_RETRY_INTERVAL: float = os.getenv("REDIS_RETRY_INTERVAL", 5.0)  # Redis 오류 후 이 시간 동안 Redis 계층 생략
+
     # # 로깅 설정
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
@@ -8,4 +8,6 @@ CATEGORY_MAP = {
     "시간": "time"
 }
 
-REVERSE_CATEGORY_MAP = {v: k for k, v in CATEGORY_MAP.items()} 
\ No newline at end of file
+REVERSE_CATEGORY_MAP = {v: k for k, v in CATEGORY_MAP.items()} 
+# 장소 카테고리 (키워드 추출/후처리 프롬프트에서 선택 가능한 값)
+PLACE_CATEGORIES = ["음식점", "카페", "편의점", "영화관"]
@@ -11,6 +11,8 @@ import pandas as pd
 from app.core.config import settings
 from app.core.constants import CATEGORY_MAP
 from app.api.deps import get_embedding_model
+from app.data.snapshots import get_snapshot_manager
+from app.data_pipeline.keyword_normalizer import collapse_keywords
 
 def is_valid_embedding(vec, expected_dim=768):
     if not isinstance(vec, list):
@@ -55,7 +57,6 @@ def make_chroma_db():
 
     # ✅ Chroma 저장 경로 생성
     os.makedirs(chroma_path, exist_ok=True)
-    client = chromadb.PersistentClient(path=chroma_path)
 
     # ✅ 데이터 로드
     df_place_ids = pd.read_csv(csv_path)
@@ -63,64 +64,94 @@ def make_chroma_db():
         place_keyword_data = [json.loads(line) for line in f]
 
     print(f"총 {len(place_keyword_data)}개의 장소 키워드 데이터 로드됨.")
+    raw_count, collapsed_count = 0, 0
 
-    for entry in place_keyword_data:
-        place_name = entry["place_name"]
-        keywords_by_category = entry["keywords"]
+    # ✅ 새 버전에 적재 후 게시 (검색 중인 버전은 변경하지 않음)
+    with get_snapshot_manager().transaction() as client:
+        for entry in place_keyword_data:
+            place_name = entry["place_name"]
+            keywords_by_category = entry["keywords"]
 
-        row = df_place_ids[df_place_ids["name"] == place_name]
-        if row.empty:
-            print(f"❗ place_id 누락 - '{place_name}'")
-            continue
-        
-        place_id = int(row["id"].values[0])
-
-        for kor_category, keyword_list in keywords_by_category.items():
-            if not keyword_list:
-                continue
-
-            collection_name = CATEGORY_MAP.get(kor_category)
-            if not collection_name:
+            row = df_place_ids[df_place_ids["name"] == place_name]
+            if row.empty:
+                print(f"❗ place_id 누락 - '{place_name}'")
                 continue
+        
+            place_id = int(row["id"].values[0])
+            place_category = str(row["place_category"].values[0])
 
-            try:
-                collection = client.get_collection(name=collection_name)
-            except:
-                collection_size = len(keyword_list)
-                metadata = get_hnsw_metadata_by_size(collection_size)
+            for kor_category, keyword_list in keywords_by_category.items():
+                if not keyword_list:
+                    continue
 
-                collection = client.create_collection(
-                    name=collection_name,
-                    metadata=metadata
-                )
+                collection_name = CATEGORY_MAP.get(kor_category)
+                if not collection_name:
+                    continue
 
-            for keyword in keyword_list:
                 try:
-                    vec = embedding_model.encode(keyword)
+                    collection = client.get_collection(name=collection_name)
+                except:
+                    collection_size = len(keyword_list)
+                    metadata = get_hnsw_metadata_by_size(collection_size)
+
+                    collection = client.create_collection(
+                        name=collection_name,
+                        metadata=metadata
+                    )
 
+                try:
+                    vecs = embedding_model.encode([str(k) for k in keyword_list])
+                except Exception as e:
+                    print(f"❌ 임베딩 실패 ({place_name}, {kor_category}): {e}")
+                    continue
+
+                valid = [
+                    (keyword, vec) for keyword, vec in zip(keyword_list, vecs)
+                    if is_valid_embedding(vec, expected_dim=embedding_dim)
+                ]
+                for keyword, vec in zip(keyword_list, vecs):
                     if not is_valid_embedding(vec, expected_dim=embedding_dim):
                         print(f"❌ 유효하지 않은 임베딩: {keyword}")
-                        continue
-
-                    doc_id = f"{collection_name}_{place_id}_{keyword}"
-                    metadata = {
-                        "place_id": place_id,
-                        "keyword": keyword,
-                        "category": kor_category
-                    }
-
-                    # 중복 방지
-                    existing = collection.get(ids=[doc_id])
-                    if existing["ids"]:
-                        print(f"⚠️ 중복된 ID 감지됨: {doc_id}")
-                        continue
-
-                    collection.add(
-                        ids=[doc_id],
-                        documents=[keyword],
-                        metadatas=[metadata],
-                        embeddings=[vec]
-                    )
+                if not valid:
+                    continue
 
-                except Exception as e:
-                    print(f"❌ 오류 발생 ({keyword}): {e}")
\ No newline at end of file
+                # 같은 장소·카테고리 안의 중복 표기를 대표 키워드 하나로 병합
+                groups = collapse_keywords(
+                    [k for k, _ in valid], [v for _, v in valid], settings.KEYWORD_DEDUP_THRESHOLD
+                )
+                raw_count += len(valid)
+                collapsed_count += len(groups)
+
+                for group in groups:
+                    keyword = group.canonical
+                    try:
+                        doc_id = f"{collection_name}_{place_id}_{keyword}"
+                        metadata = {
+                            "place_id": place_id,
+                            "keyword": keyword,
+                            "category": kor_category,
+                            "variants": group.variants_str,
+                            "place_category": place_category
+                        }
+
+                        # 중복 방지
+                        existing = collection.get(ids=[doc_id])
+                        if existing["ids"]:
+                            print(f"⚠️ 중복된 ID 감지됨: {doc_id}")
+                            continue
+
+                        collection.add(
+                            ids=[doc_id],
+                            documents=[keyword],
+                            metadatas=[metadata],
+                            embeddings=[[float(x) for x in group.vector]]
+                        )
+
+                    except Exception as e:
+                        print(f"❌ 오류 발생 ({keyword}): {e}")
+
+    if raw_count:
+        print(
+            f"키워드 중복 병합: {raw_count} → {collapsed_count}개 "
+            f"({(1 - collapsed_count / raw_count) * 100:.1f}% 감소)"
+        )
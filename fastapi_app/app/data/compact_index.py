@@ -0,0 +1,666 @@
+"""
+메모리 매핑 압축 인덱스 모듈
+
+이 모듈은 벡터 저장소의 컬렉션을 np.memmap으로 바로 열 수 있는 압축 형식으로 내보내고 불러옵니다.
+파일을 메모리 매핑으로 열기 때문에 서버 시작이 거의 즉시 끝나고,
+같은 파일을 여는 여러 워커 프로세스가 OS 페이지 캐시를 공유합니다.
+
+벡터는 컬렉션별로 float32, float16, int8(차원별 scale/offset 스칼라 양자화) 중 하나로 저장합니다.
+양자화된 컬렉션은 양자화 영역에서 내적으로 후보를 고른 뒤,
+float32 사본이 있으면 상위 후보만 float32로 다시 계산해 순위를 보정합니다.
+
+디렉토리 구조 ({버전 경로}/compact):
+    meta.json                     차원, 컬렉션별 dtype/항목 수
+    {collection}.vectors.npy      (N, D) 정규화된 벡터 (float32 또는 float16)
+    {collection}.codes.npy        (N, D) uint8 양자화 코드 (int8 모드)
+    {collection}.scale.npy        (D,) float32 차원별 scale (int8 모드)
+    {collection}.offset.npy       (D,) float32 차원별 offset (int8 모드)
+    {collection}.vectors_f32.npy  (N, D) float32 재정렬용 사본 (양자화 + COMPACT_INDEX_RERANK > 0)
+    {collection}.place_ids.npy    (N,) int64 place_id
+    {collection}.offsets.npy      (N + 1,) int64 키워드 blob 오프셋
+    {collection}.keywords.bin     UTF-8 키워드 blob
+    {collection}.groups.npy       (P + 1,) int64 장소별 행 구간 오프셋
+    {collection}.centroids.npy    (P, D) float32 장소별 키워드 벡터 중심 (정규화)
+
+각 컬렉션의 행은 (장소 카테고리, place_id) 순으로 정렬되어 있으며, meta.json의 partitions에
+장소 카테고리별 [start, end) 구간이 기록됩니다. (해당 구간만 검색 가능)
+한 장소의 키워드는 연속된 행이므로, 2단계 검색(COMPACT_TWO_STAGE)은 장소 중심 벡터로
+후보 장소를 먼저 고른 뒤 후보 장소의 키워드만 정확히 계산하여 장소별 최고 키워드를 반환합니다.
+
+주요 구성요소:
+    - parse_dtypes: 컬렉션별 저장 형식 설정 파싱
+    - export_compact_index: ChromaDB 클라이언트 → 압축 인덱스 내보내기
+    - CompactCollection: 컬렉션 하나의 메모리 매핑 인덱스 (코사인 검색 + 재정렬)
+    - load_compact_index: 압축 인덱스 불러오기
+    - build_hook: 버전 게시 직전 압축 인덱스 생성 (SnapshotManager 빌드 훅)
+    - recall_report: 저장 형식별 메모리/지연 시간/recall@k 비교
+    - two_stage_report: 2단계 검색의 장소 recall@k / 지연 시간 비교
+
+사용법:
+    python -m app.data.compact_index export [--dtype food_product=int8,float16]
+    python -m app.data.compact_index recall [--k 50] [--queries 200]
+    python -m app.data.compact_index two-stage [--k 50] [--queries 200]
+"""
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id
+
+COMPACT_DIR = "compact"
+META_FILE = "meta.json"
+PAGE_SIZE = 1000
+DTYPES = ("float32", "float16", "int8")
+QUANTIZED = ("float16", "int8")
+SEARCH_CHUNK = 8192  # 양자화 벡터를 float32로 변환해 계산할 때 한 번에 처리할 행 수
+
+
+def parse_dtypes(raw: Optional[str] = None) -> Dict[str, str]:
+    """
+    저장 형식 설정을 컬렉션별 dtype으로 변환합니다.
+
+    "int8" 처럼 하나만 주면 모든 컬렉션에 적용하고,
+    "food_product=int8,time=float16,float32" 처럼 주면 이름이 없는 항목이 기본값이 됩니다.
+
+    Raises:
+        ValueError: 지원하지 않는 dtype인 경우
+    """
+    raw = raw or settings.COMPACT_INDEX_DTYPE
+    default, out = "float32", {}
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        name, _, dtype = part.rpartition("=")
+        if dtype not in DTYPES:
+            raise ValueError(f"지원하지 않는 dtype입니다: {dtype}")
+        if name:
+            out[name.strip()] = dtype
+        else:
+            default = dtype
+    return {name: out.get(name, default) for name in CATEGORY_MAP.values()}
+
+
+def quantize_int8(matrix: np.ndarray) -> tuple:
+    """
+    차원별 최소/최대 범위를 256단계로 나누어 uint8 코드로 양자화합니다.
+
+    x ≈ offset + scale * code
+
+    Returns:
+        tuple: (codes, scale, offset)
+    """
+    if len(matrix) == 0:
+        dim = matrix.shape[1]
+        return np.zeros((0, dim), dtype=np.uint8), np.ones(dim, dtype=np.float32), np.zeros(dim, dtype=np.float32)
+    offset = matrix.min(axis=0).astype(np.float32)
+    scale = ((matrix.max(axis=0) - offset) / 255.0).astype(np.float32)
+    scale[scale == 0] = 1.0
+    codes = np.clip(np.rint((matrix - offset) / scale), 0, 255).astype(np.uint8)
+    return codes, scale, offset
+
+
+def _read_collection(collection) -> tuple:
+    ids, keywords, place_ids, place_categories, vectors = [], [], [], [], []
+    offset = skipped = 0
+    while True:
+        page = collection.get(
+            limit=PAGE_SIZE, offset=offset, include=["metadatas", "documents", "embeddings"]
+        )
+        if not page["ids"]:
+            break
+        for doc_id, document, meta, vec in zip(page["ids"], page["documents"], page["metadatas"], page["embeddings"]):
+            meta = meta or {}
+            place_id = entry_place_id(meta, doc_id)
+            if place_id is None:
+                skipped += 1
+                continue
+            ids.append(doc_id)
+            keywords.append(str(meta.get("keyword") or document or ""))
+            place_ids.append(place_id)
+            place_categories.append(str(meta.get("place_category") or ""))
+            vectors.append(vec)
+        offset += len(page["ids"])
+    if skipped:
+        print(f"⚠️ place_id를 읽을 수 없는 항목 {skipped}개를 압축 인덱스에서 제외했습니다. ({collection.name})")
+    return ids, keywords, place_ids, place_categories, vectors
+
+
+def _write_atomic(path: str, write) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _place_groups(place_ids: np.ndarray, matrix: np.ndarray) -> tuple:
+    """
+    place_id 순으로 정렬된 행을 장소별로 묶어 행 구간 오프셋과 중심 벡터를 계산합니다.
+
+    Returns:
+        tuple: ((P + 1,) int64 오프셋, (P, D) float32 정규화된 중심 벡터)
+    """
+    if not len(place_ids):
+        return np.zeros(1, dtype=np.int64), np.zeros((0, matrix.shape[1]), dtype=np.float32)
+    starts = np.flatnonzero(np.r_[True, place_ids[1:] != place_ids[:-1]])
+    groups = np.r_[starts, len(place_ids)].astype(np.int64)
+    sums = np.add.reduceat(matrix, starts, axis=0)
+    norms = np.linalg.norm(sums, axis=1, keepdims=True)
+    return groups, (sums / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+
+def export_compact_index(
+    client,
+    out_dir: str,
+    dtype: Optional[str] = None,
+    rerank: Optional[int] = None
+) -> dict:
+    """
+    ChromaDB 컬렉션들을 압축 인덱스로 내보냅니다.
+
+    벡터는 단위 길이로 정규화해서 저장하므로 검색 시 내적이 곧 코사인 유사도입니다.
+
+    Args:
+        client (chromadb.PersistentClient): 내보낼 저장소 클라이언트
+        out_dir (str): 출력 디렉토리
+        dtype (str): 저장 형식 설정 (parse_dtypes 참고)
+        rerank (int): 0보다 크면 양자화 컬렉션에 재정렬용 float32 사본을 함께 저장
+
+    Returns:
+        dict: meta.json 내용
+    """
+    dtypes = parse_dtypes(dtype)
+    rerank = settings.COMPACT_INDEX_RERANK if rerank is None else rerank
+    os.makedirs(out_dir, exist_ok=True)
+
+    meta = {
+        "dim": None,
+        "created_at": time.time(),
+        "collections": {},
+        "dtypes": {},
+        "partitions": {},
+        "rerank": bool(rerank),
+    }
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        _, keywords, place_ids, place_categories, vectors = _read_collection(collection)
+
+        # 같은 장소 카테고리, 같은 장소의 항목이 연속되도록 정렬하여 파티션을 [start, end) 구간으로 기록
+        order = sorted(range(len(keywords)), key=lambda i: (place_categories[i], place_ids[i]))
+        keywords = [keywords[i] for i in order]
+        place_ids = [place_ids[i] for i in order]
+        place_categories = [place_categories[i] for i in order]
+        vectors = [vectors[i] for i in order]
+        partitions = {}
+        for i, place_category in enumerate(place_categories):
+            if place_category:
+                partitions.setdefault(place_category, [i, i])[1] = i + 1
+
+        if vectors:
+            matrix = np.asarray(vectors, dtype=np.float32)
+        else:
+            matrix = np.zeros((0, meta["dim"] or 0), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        groups, centroids = _place_groups(np.asarray(place_ids, dtype=np.int64), matrix)
+        blob = [k.encode("utf-8") for k in keywords]
+        offsets = np.zeros(len(blob) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in blob])
+
+        base = os.path.join(out_dir, name)
+        kind = dtypes[name]
+        if kind == "int8":
+            codes, scale, offset = quantize_int8(matrix)
+            _write_atomic(f"{base}.codes.npy", lambda f: np.save(f, codes))
+            _write_atomic(f"{base}.scale.npy", lambda f: np.save(f, scale))
+            _write_atomic(f"{base}.offset.npy", lambda f: np.save(f, offset))
+        else:
+            _write_atomic(f"{base}.vectors.npy", lambda f: np.save(f, matrix.astype(kind)))
+        if kind in QUANTIZED and rerank:
+            _write_atomic(f"{base}.vectors_f32.npy", lambda f: np.save(f, matrix.astype(np.float32)))
+        _write_atomic(f"{base}.place_ids.npy", lambda f: np.save(f, np.asarray(place_ids, dtype=np.int64)))
+        _write_atomic(f"{base}.offsets.npy", lambda f: np.save(f, offsets))
+        _write_atomic(f"{base}.keywords.bin", lambda f: f.write(b"".join(blob)))
+        _write_atomic(f"{base}.groups.npy", lambda f: np.save(f, groups))
+        _write_atomic(f"{base}.centroids.npy", lambda f: np.save(f, centroids))
+
+        meta["collections"][name] = len(keywords)
+        meta["dtypes"][name] = kind
+        meta["partitions"][name] = partitions
+        if len(keywords):
+            meta["dim"] = int(matrix.shape[1])
+
+    # meta.json을 마지막에 써서, meta가 있으면 모든 파일이 완성된 상태임을 보장
+    _write_atomic(
+        os.path.join(out_dir, META_FILE),
+        lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    )
+    return meta
+
+
+class CompactCollection:
+    """
+    컬렉션 하나의 메모리 매핑 인덱스
+
+    Attributes:
+        name (str): 컬렉션 이름
+        dtype (str): 저장 형식 (float32 | float16 | int8)
+        vectors (np.memmap): (N, D) 정규화된 벡터 (int8 모드에서는 None)
+        codes (np.memmap): (N, D) uint8 양자화 코드 (int8 모드)
+        rerank_vectors (np.memmap): (N, D) float32 재정렬용 사본 (없으면 None)
+        place_ids (np.memmap): (N,) place_id
+        partitions (Dict[str, Tuple[int, int]]): 장소 카테고리별 [start, end) 행 구간
+        groups (np.ndarray): (P + 1,) 장소별 행 구간 오프셋 (2단계 검색, 없으면 None)
+        centroids (np.memmap): (P, D) 장소별 중심 벡터 (2단계 검색, 없으면 None)
+        two_stage (bool): 2단계 검색 사용 여부
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        dtype: str = "float32",
+        rerank: Optional[int] = None,
+        partitions: Optional[dict] = None,
+        two_stage: Optional[bool] = None
+    ):
+        base = os.path.join(directory, name)
+        self.name = name
+        self.dtype = dtype
+        self.partitions = {k: (int(v[0]), int(v[1])) for k, v in (partitions or {}).items()}
+        self.rerank = settings.COMPACT_INDEX_RERANK if rerank is None else int(rerank)
+        self.vectors = self.codes = self.scale = self.offset = None
+        if dtype == "int8":
+            self.codes = np.load(f"{base}.codes.npy", mmap_mode="r")
+            self.scale = np.load(f"{base}.scale.npy")
+            self.offset = np.load(f"{base}.offset.npy")
+        else:
+            self.vectors = np.load(f"{base}.vectors.npy", mmap_mode="r")
+        self.rerank_vectors = (
+            np.load(f"{base}.vectors_f32.npy", mmap_mode="r")
+            if dtype in QUANTIZED and os.path.exists(f"{base}.vectors_f32.npy") else None
+        )
+        self.place_ids = np.load(f"{base}.place_ids.npy", mmap_mode="r")
+        self.offsets = np.load(f"{base}.offsets.npy", mmap_mode="r")
+        self._blob = (
+            np.memmap(f"{base}.keywords.bin", dtype=np.uint8, mode="r")
+            if os.path.getsize(f"{base}.keywords.bin") else np.zeros(0, dtype=np.uint8)
+        )
+        # 장소 묶음 정보가 없는 이전 형식이면 1단계 검색만 사용
+        self.groups = self.centroids = None
+        if os.path.exists(f"{base}.centroids.npy"):
+            self.groups = np.load(f"{base}.groups.npy")
+            self.centroids = np.load(f"{base}.centroids.npy", mmap_mode="r")
+        self.two_stage = settings.COMPACT_TWO_STAGE if two_stage is None else bool(two_stage)
+        self.two_stage = self.two_stage and self.centroids is not None
+
+    @property
+    def nbytes(self) -> int:
+        """검색에 사용하는 벡터 데이터 크기 (재정렬용 사본 제외)"""
+        return int((self.codes if self.dtype == "int8" else self.vectors).nbytes)
+
+    def __len__(self) -> int:
+        return int(self.place_ids.shape[0])
+
+    def keyword(self, idx: int) -> str:
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def scores(
+        self,
+        query: np.ndarray,
+        start: int = 0,
+        end: Optional[int] = None,
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        [start, end) 구간 (rows가 주어지면 해당 행) 항목과의 (근사) 코사인 유사도를 계산합니다.
+
+        float16은 BLAS 연산이 없으므로 청크 단위로 float32로 올려 계산하고,
+        int8 모드는 x ≈ offset + scale * code 이므로
+        x·q = offset·q + code·(scale * q) 로 코드를 복원하지 않고 계산합니다.
+        """
+        if self.dtype == "int8":
+            matrix, weights, bias = self.codes, (self.scale * query).astype(np.float32), np.float32(self.offset @ query)
+        else:
+            matrix, weights, bias = self.vectors, query, np.float32(0)
+        if rows is not None:
+            return np.asarray(matrix[rows], dtype=np.float32) @ weights + bias
+
+        end = len(self) if end is None else end
+        if self.dtype == "float32":
+            return self.vectors[start:end] @ query
+        out = np.empty(end - start, dtype=np.float32)
+        for i in range(start, end, SEARCH_CHUNK):
+            chunk = np.asarray(matrix[i:min(i + SEARCH_CHUNK, end)], dtype=np.float32)
+            out[i - start:i - start + len(chunk)] = chunk @ weights + bias
+        return out
+
+    def to_results(self, indices: np.ndarray, similarities: np.ndarray) -> Dict[str, list]:
+        """
+        검색 결과를 ChromaDB query 결과와 같은 형태로 변환합니다. (distance = 1 - 코사인 유사도)
+        """
+        metadatas, documents = [], []
+        for idx in indices:
+            keyword = self.keyword(int(idx))
+            metadatas.append({"place_id": int(self.place_ids[idx]), "keyword": keyword})
+            documents.append(keyword)
+        return {
+            "ids": [[f"{self.name}_{m['place_id']}_{m['keyword']}" for m in metadatas]],
+            "documents": [documents],
+            "metadatas": [metadatas],
+            "distances": [[float(1.0 - s) for s in similarities]],
+        }
+
+    def search(
+        self,
+        query_vec: List[float],
+        n_results: int = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None
+    ) -> Optional[Dict[str, list]]:
+        """
+        코사인 유사도 상위 n_results개 항목을 반환합니다.
+
+        place_category가 파티션에 있으면 해당 구간만 검색하고,
+        place_ids가 주어지면 해당 장소의 항목만, exclude_ids가 주어지면 해당 장소를 뺀 항목만 검색합니다.
+        2단계 검색을 사용하면 항목 대신 장소별 최고 항목을 상위 n_results개 장소만큼 반환합니다.
+        """
+        ranked = self.rank(query_vec, n_results, place_category, place_ids, exclude_ids)
+        return self.to_results(*ranked) if ranked is not None else None
+
+    def rank(
+        self,
+        query_vec: List[float],
+        n_results: int = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        search와 같은 검색을 수행하되, 키워드를 읽지 않고 (행 번호, 코사인 유사도)를 유사도 내림차순으로 반환합니다.
+        """
+        start, end = self.partitions.get(place_category, (0, len(self)))
+        if end <= start:
+            return None
+        if self.two_stage:
+            return self.rank_places(query_vec, n_results, start, end, place_ids, exclude_ids)
+        rows = None
+        if place_ids is not None or exclude_ids:
+            mask = np.ones(end - start, dtype=bool)
+            if place_ids is not None:
+                mask &= np.isin(self.place_ids[start:end], np.fromiter(place_ids, dtype=np.int64))
+            if exclude_ids:
+                mask &= ~np.isin(self.place_ids[start:end], np.fromiter(exclude_ids, dtype=np.int64))
+            rows = np.flatnonzero(mask) + start
+            if not len(rows):
+                return None
+        query = np.asarray(query_vec, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        sims = np.asarray(self.scores(query, start, end, rows=rows), dtype=np.float32)
+        positions = rows if rows is not None else np.arange(start, end)
+        k = min(int(n_results), len(sims))
+
+        # 양자화 컬렉션: 상위 k * rerank개 후보만 float32로 다시 계산
+        if self.rerank_vectors is not None and self.rerank > 0:
+            n_candidates = min(len(sims), k * self.rerank)
+            candidates = positions[np.sort(np.argpartition(-sims, n_candidates - 1)[:n_candidates])]
+            exact = self.rerank_vectors[candidates] @ query
+            order = np.argsort(-exact)[:k]
+            return candidates[order], exact[order]
+
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return positions[top], sims[top]
+
+    def _exact_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """rows 항목의 코사인 유사도 (재정렬용 float32 사본이 있으면 정확한 값)"""
+        if self.rerank_vectors is not None:
+            return np.asarray(self.rerank_vectors[rows], dtype=np.float32) @ query
+        return np.asarray(self.scores(query, rows=rows), dtype=np.float32)
+
+    def search_places(
+        self,
+        query_vec: List[float],
+        n_results: int = 50,
+        start: int = 0,
+        end: Optional[int] = None,
+        place_ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None,
+        candidates: Optional[int] = None
+    ) -> Optional[Dict[str, list]]:
+        """
+        2단계 검색: 장소 중심 벡터로 후보 장소를 고른 뒤, 후보 장소의 항목만 정확히 계산합니다.
+
+        1단계: [start, end) 구간 장소들의 중심 벡터와 유사도를 계산해 상위 n_results * 배수개 장소 선택
+        2단계: 후보 장소의 모든 항목 유사도를 계산해 장소별 최고 항목으로 장소 순위를 정함
+
+        한 장소의 키워드가 많아도 결과가 그 장소의 항목으로 채워지지 않고,
+        계산량은 (장소 수 + 후보 장소의 항목 수)에 비례합니다.
+
+        Returns:
+            Optional[Dict[str, list]]: 장소별 최고 항목 (ChromaDB query 결과 형태)
+        """
+        ranked = self.rank_places(query_vec, n_results, start, end, place_ids, exclude_ids, candidates)
+        return self.to_results(*ranked) if ranked is not None else None
+
+    def rank_places(
+        self,
+        query_vec: List[float],
+        n_results: int = 50,
+        start: int = 0,
+        end: Optional[int] = None,
+        place_ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None,
+        candidates: Optional[int] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """search_places의 (장소별 최고 항목 행 번호, 코사인 유사도)를 유사도 내림차순으로 반환합니다."""
+        end = len(self) if end is None else end
+        g0, g1 = int(np.searchsorted(self.groups, start)), int(np.searchsorted(self.groups, end))
+        if g1 <= g0:
+            return None
+        query = np.asarray(query_vec, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        # 1단계: 장소 중심 벡터
+        coarse = np.asarray(self.centroids[g0:g1], dtype=np.float32) @ query
+        if place_ids is not None or exclude_ids:
+            group_places = self.place_ids[self.groups[g0:g1]]
+            if place_ids is not None:
+                coarse[~np.isin(group_places, np.fromiter(place_ids, dtype=np.int64))] = -np.inf
+            if exclude_ids:
+                coarse[np.isin(group_places, np.fromiter(exclude_ids, dtype=np.int64))] = -np.inf
+        allowed = int(np.isfinite(coarse).sum())
+        if not allowed:
+            return None
+        factor = settings.COMPACT_TWO_STAGE_CANDIDATES if candidates is None else candidates
+        n_candidates = min(allowed, max(int(n_results) * int(factor), int(n_results)))
+        chosen = np.argpartition(-coarse, n_candidates - 1)[:n_candidates] + g0
+
+        # 2단계: 후보 장소의 항목 정확히 계산
+        firsts, lengths = self.groups[chosen], self.groups[chosen + 1] - self.groups[chosen]
+        seg_starts = np.r_[0, np.cumsum(lengths)[:-1]]
+        rows = np.repeat(firsts - seg_starts, lengths) + np.arange(int(lengths.sum()))
+        sims = self._exact_scores(query, rows)
+
+        best = np.maximum.reduceat(sims, seg_starts)
+        owner = np.repeat(np.arange(len(chosen)), lengths)
+        hit = np.flatnonzero(sims == best[owner])
+        _, first_hit = np.unique(owner[hit], return_index=True)
+        best_rows = rows[hit[first_hit]]
+
+        top = np.argsort(-best, kind="stable")[:int(n_results)]
+        return best_rows[top], best[top]
+
+
+def load_compact_index(directory: str) -> Dict[str, CompactCollection]:
+    """
+    압축 인덱스를 메모리 매핑으로 엽니다.
+
+    Raises:
+        FileNotFoundError: meta.json이 없는 경우 (내보내기 미완료)
+    """
+    with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    dtypes = meta.get("dtypes", {})
+    partitions = meta.get("partitions", {})
+    return {
+        name: CompactCollection(
+            directory, name, dtypes.get(name, meta.get("dtype", "float32")), partitions=partitions.get(name)
+        )
+        for name in meta["collections"]
+    }
+
+
+def compact_dir_of(store_path: str) -> str:
+    return os.path.join(store_path, COMPACT_DIR)
+
+
+def build_hook(client, path: str) -> None:
+    """벡터 저장소 버전 게시 직전에 압축 인덱스를 함께 생성합니다. (SnapshotManager 빌드 훅)"""
+    export_compact_index(client, compact_dir_of(path))
+
+
+def recall_report(client, k: int = 50, n_queries: int = 200, seed: int = 0) -> dict:
+    """
+    저장 형식별 벡터 메모리, 검색 지연 시간, recall@k를 float32 정확 검색과 비교합니다.
+
+    질의는 컬렉션에 저장된 벡터 중 무작위로 골라 사용합니다.
+
+    Returns:
+        dict: 컬렉션 이름별 {모드: {bytes, p50_ms, recall}}
+    """
+    import tempfile
+
+    modes = [("float32", 0), ("float16", 0), ("float16", 4), ("int8", 0), ("int8", 4)]
+    rng = np.random.default_rng(seed)
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        indexes = {}
+        for dtype, rerank in modes:
+            directory = os.path.join(tmp, f"{dtype}-{rerank}")
+            meta = export_compact_index(client, directory, dtype=dtype, rerank=rerank)
+            indexes[(dtype, rerank)] = {
+                name: CompactCollection(directory, name, dtype, rerank=rerank, two_stage=False)
+                for name in meta["collections"]
+            }
+
+        for name, exact in indexes[("float32", 0)].items():
+            if len(exact) == 0:
+                continue
+            queries = exact.vectors[rng.integers(0, len(exact), size=min(n_queries, len(exact)))]
+            truth = [set(exact.search(q, k)["ids"][0]) for q in queries]
+
+            report[name] = {}
+            for (dtype, rerank), collections in indexes.items():
+                collection = collections[name]
+                timings, hits = [], 0
+                for q, expected in zip(queries, truth):
+                    start = time.perf_counter()
+                    found = collection.search(q, k)["ids"][0]
+                    timings.append((time.perf_counter() - start) * 1000)
+                    hits += len(expected.intersection(found))
+                report[name][f"{dtype}+rerank{rerank}" if rerank else dtype] = {
+                    "bytes": collection.nbytes,
+                    "p50_ms": float(np.percentile(timings, 50)),
+                    "recall": hits / sum(len(t) for t in truth),
+                }
+    return report
+
+
+def two_stage_report(client, k: int = 50, n_queries: int = 200, factors=(2, 4, 8), seed: int = 0) -> dict:
+    """
+    2단계 검색의 장소 단위 recall@k와 지연 시간을 전체 항목 정확 검색과 비교합니다.
+
+    기준은 모든 항목을 계산한 뒤 장소별 최고 항목으로 정한 상위 k개 장소입니다.
+    질의는 컬렉션에 저장된 벡터 중 무작위로 골라 사용합니다.
+
+    Returns:
+        dict: 컬렉션 이름별 {모드: {p50_ms, recall}}
+    """
+    import tempfile
+
+    rng = np.random.default_rng(seed)
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        meta = export_compact_index(client, tmp, dtype="float32", rerank=0)
+        for name in meta["collections"]:
+            collection = CompactCollection(tmp, name, "float32", rerank=0, two_stage=False)
+            if len(collection) == 0:
+                continue
+            queries = collection.vectors[rng.integers(0, len(collection), size=min(n_queries, len(collection)))]
+            starts = collection.groups[:-1]
+
+            timings, truth = [], []
+            for q in queries:
+                begin = time.perf_counter()
+                best = np.maximum.reduceat(collection.scores(q), starts)
+                top = np.argsort(-best)[:k]
+                timings.append((time.perf_counter() - begin) * 1000)
+                truth.append(set(collection.place_ids[starts[top]].tolist()))
+            report[name] = {
+                "places": int(len(starts)),
+                "entries": len(collection),
+                "exact": {"p50_ms": float(np.percentile(timings, 50)), "recall": 1.0},
+            }
+
+            for factor in factors:
+                timings, hits = [], 0
+                for q, expected in zip(queries, truth):
+                    begin = time.perf_counter()
+                    found = collection.search_places(q, k, candidates=factor)
+                    timings.append((time.perf_counter() - begin) * 1000)
+                    hits += len(expected.intersection(m["place_id"] for m in found["metadatas"][0]))
+                report[name][f"two-stage x{factor}"] = {
+                    "p50_ms": float(np.percentile(timings, 50)),
+                    "recall": hits / sum(len(t) for t in truth),
+                }
+    return report
+
+
+def main(argv=None) -> None:
+    import chromadb
+    from app.data.snapshots import SnapshotManager
+
+    parser = argparse.ArgumentParser(description="압축 인덱스 내보내기 / 양자화 recall 비교")
+    parser.add_argument("command", choices=["export", "recall", "two-stage"])
+    parser.add_argument("--path", default=settings.VECTOR_STORE_PATH)
+    parser.add_argument("--dtype", default=settings.COMPACT_INDEX_DTYPE, help="예: int8 또는 food_product=int8,float16")
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    path = SnapshotManager(args.path).current_path()
+    client = chromadb.PersistentClient(path=path)
+    if args.command == "export":
+        meta = export_compact_index(client, compact_dir_of(path), dtype=args.dtype)
+        print(json.dumps(meta, ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "two-stage":
+        for name, modes in two_stage_report(client, k=args.k, n_queries=args.queries).items():
+            print(f"- {name} (장소 {modes.pop('places')}개, 항목 {modes.pop('entries')}개)")
+            for mode, r in modes.items():
+                print(f"    {mode:<16} p50 {r['p50_ms']:.3f}ms  place recall@{args.k} {r['recall']:.4f}")
+        return
+
+    for name, modes in recall_report(client, k=args.k, n_queries=args.queries).items():
+        print(f"- {name}")
+        for mode, r in modes.items():
+            print(
+                f"    {mode:<18} {r['bytes'] / 1024:>10.1f}KB  "
+                f"p50 {r['p50_ms']:.3f}ms  recall@{args.k} {r['recall']:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+벡터 저장소 버전 배포 모듈
+
+이 모듈은 수집 노드에서 게시한 벡터 저장소 버전을 여러 API 레플리카에 배포합니다.
+수집 노드(publisher)는 게시된 버전 디렉토리를 압축 파일과 체크섬 manifest로 공유 저장소에 올리고,
+레플리카(subscriber)는 주기적으로 최신 버전을 확인하여 내려받고, 검증한 뒤 로컬 버전으로 게시합니다.
+레플리카는 재임베딩이나 재색인 없이 받은 버전을 그대로 사용하며,
+PlaceStore가 다음 요청부터 새 버전으로 교체합니다.
+
+공유 저장소 구조:
+    {prefix}/LATEST                       최신 배포 id
+    {prefix}/{snapshot_id}/manifest.json  파일 크기/sha256, 컬렉션별 항목 수
+    {prefix}/{snapshot_id}/index.tar.gz   버전 디렉토리 압축본 (SQLite는 backup API로 복사한 사본)
+
+주요 구성요소:
+    - LocalSnapshotStore / S3SnapshotStore: 공유 저장소 (로컬 디렉토리는 테스트/단일 서버용)
+    - get_snapshot_store: SNAPSHOT_STORE_URI에 맞는 저장소 반환
+    - SnapshotPublisher: 게시된 버전 업로드 (대기 중인 배포는 최신 버전 하나로 합침)
+    - SnapshotSubscriber: 최신 버전 폴링, 다운로드, 검증, 로컬 게시
+
+사용법:
+    python -m app.data.distribution publish
+    python -m app.data.distribution pull
+"""
+
+import os
+import json
+import time
+import shutil
+import tarfile
+import hashlib
+import argparse
+import tempfile
+import threading
+
+from typing import Optional
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.data.snapshots import SnapshotManager, get_snapshot_manager, release_client, _copy_store
+
+LATEST_KEY = "LATEST"
+MANIFEST_NAME = "manifest.json"
+ARCHIVE_NAME = "index.tar.gz"
+APPLIED_FILE = "REMOTE_VERSION"
+CHUNK_SIZE = 1024 * 1024
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LocalSnapshotStore:
+    """로컬(또는 공유 마운트) 디렉토리 저장소"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put_file(self, key: str, path: str) -> None:
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.tmp"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+
+    def put_bytes(self, key: str, body: bytes) -> None:
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, target)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get_file(self, key: str, path: str) -> None:
+        shutil.copyfile(self._path(key), path)
+
+    def delete_prefix(self, prefix: str) -> None:
+        shutil.rmtree(self._path(prefix), ignore_errors=True)
+
+    def list_prefixes(self) -> list:
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        )
+
+
+class S3SnapshotStore:
+    """S3 저장소 (공용 S3 클라이언트 사용)"""
+
+    def __init__(self, bucket: str, prefix: str = "", s3_client=None):
+        from app.services.s3_client_factory import S3ClientFactory
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.s3 = s3_client or S3ClientFactory.get_instance()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, key: str, path: str) -> None:
+        self.s3.upload_file(Filename=path, Bucket=self.bucket, Key=self._key(key))
+
+    def put_bytes(self, key: str, body: bytes) -> None:
+        self.s3.put_object(Bucket=self.bucket, Key=self._key(key), Body=body)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        try:
+            return self.s3.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+        except self.s3.exceptions.NoSuchKey:
+            return None
+
+    def get_file(self, key: str, path: str) -> None:
+        self.s3.download_file(Bucket=self.bucket, Key=self._key(key), Filename=path)
+
+    def delete_prefix(self, prefix: str) -> None:
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix) + "/"):
+            objects = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            if objects:
+                self.s3.delete_objects(Bucket=self.bucket, Delete={"Objects": objects})
+
+    def list_prefixes(self) -> list:
+        base = self._key("")
+        names = []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=base, Delimiter="/"):
+            for common in page.get("CommonPrefixes", []):
+                names.append(common["Prefix"][len(base):].strip("/"))
+        return sorted(names)
+
+
+def get_snapshot_store(uri: Optional[str] = None):
+    """
+    SNAPSHOT_STORE_URI(s3://bucket/prefix 또는 file:///path, 경로만 주면 로컬 디렉토리)에 맞는 저장소를 반환합니다.
+    """
+    uri = uri or settings.SNAPSHOT_STORE_URI
+    if not uri:
+        raise ValueError("SNAPSHOT_STORE_URI가 설정되지 않았습니다.")
+    parsed = urlparse(uri)
+    if parsed.scheme == "s3":
+        return S3SnapshotStore(parsed.netloc, parsed.path)
+    if parsed.scheme in ("", "file"):
+        return LocalSnapshotStore(parsed.path if parsed.scheme else uri)
+    raise ValueError(f"지원하지 않는 SNAPSHOT_STORE_URI입니다: {uri}")
+
+
+def _collection_counts(path: str) -> dict:
+    """path 저장소의 컬렉션별 항목 수 (열었던 클라이언트는 해제)"""
+    import chromadb
+    from app.core.constants import CATEGORY_MAP
+
+    try:
+        client = chromadb.PersistentClient(path=path)
+        counts = {}
+        for name in CATEGORY_MAP.values():
+            try:
+                counts[name] = client.get_collection(name=name).count()
+            except Exception:
+                counts[name] = 0
+        return counts
+    finally:
+        release_client(path)
+
+
+def _snapshot_order(snapshot_id: str) -> tuple:
+    """배포 id("{시각}-v{번호}")의 정렬 키"""
+    stamp, _, version = snapshot_id.partition("-")
+    number = version[1:]
+    return stamp, int(number) if number.isdigit() else -1
+
+
+class SnapshotPublisher:
+    """
+    게시된 로컬 버전을 공유 저장소에 배포합니다.
+
+    압축 파일과 manifest를 먼저 올리고 마지막에 LATEST를 교체하므로,
+    레플리카는 업로드가 끝난 버전만 보게 됩니다.
+    커밋마다 배포를 요청해도 아직 시작하지 않은 배포는 하나로 합쳐지고,
+    실행 시점의 현재 버전만 올립니다. (이미 올린 버전이면 건너뜀)
+    """
+
+    def __init__(self, store=None, manager: Optional[SnapshotManager] = None, keep: Optional[int] = None):
+        self.store = store or get_snapshot_store()
+        self.manager = manager or get_snapshot_manager()
+        self.keep = max(2, int(keep or settings.VECTOR_STORE_KEEP_VERSIONS))
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-publish")
+        self._lock = threading.Lock()
+        self._queued = None
+        self._last_version: Optional[str] = None
+
+    def publish(self) -> Optional[str]:
+        """
+        현재 버전을 배포합니다.
+
+        버전을 임대한 채로 SQLite는 backup API로, 나머지 파일은 그대로 임시 디렉토리에 복사한 뒤 압축합니다.
+
+        Returns:
+            Optional[str]: 배포 id (현재 버전이 없거나 이미 정리된 경우 None)
+        """
+        version = self.manager.current()
+        if version is None:
+            print("⚠️ 게시된 벡터 저장소 버전이 없어 배포를 건너뜁니다.")
+            return None
+
+        snapshot_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{version}"
+        start = time.perf_counter()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            staging = os.path.join(tmp, "store")
+            try:
+                with self.manager.leased(version) as path:
+                    _copy_store(path, staging, keep_derived=True)
+            except FileNotFoundError:
+                print(f"⚠️ 이미 정리된 버전이라 배포를 건너뜁니다: {version}")
+                return None
+
+            archive = os.path.join(tmp, ARCHIVE_NAME)
+            with tarfile.open(archive, "w:gz") as tar:
+                tar.add(staging, arcname=".")
+
+            manifest = {
+                "snapshot_id": snapshot_id,
+                "source_version": version,
+                "created_at": time.time(),
+                "archive": {"bytes": os.path.getsize(archive), "sha256": _sha256(archive)},
+                "collections": _collection_counts(staging),
+            }
+            self.store.put_file(f"{snapshot_id}/{ARCHIVE_NAME}", archive)
+            self.store.put_bytes(
+                f"{snapshot_id}/{MANIFEST_NAME}",
+                json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+            )
+            self.store.put_bytes(LATEST_KEY, snapshot_id.encode("utf-8"))
+
+        self._last_version = version
+        self.prune(snapshot_id)
+
+        print(
+            f"[INFO] 벡터 저장소 배포: {snapshot_id} "
+            f"({manifest['archive']['bytes'] / 1024 / 1024:.1f}MB, {time.perf_counter() - start:.2f}s)"
+        )
+        return snapshot_id
+
+    def prune(self, latest: Optional[str] = None) -> list:
+        """
+        공유 저장소의 배포본 중 최근 keep개를 남기고 지웁니다. (다른 프로세스가 올린 배포본 포함)
+
+        Returns:
+            list: 삭제한 배포 id 목록
+        """
+        if latest is None:
+            raw = self.store.get_bytes(LATEST_KEY)
+            latest = raw.decode("utf-8").strip() if raw else None
+        snapshots = sorted(self.store.list_prefixes(), key=_snapshot_order)
+        removed = []
+        for old in snapshots[:-self.keep]:
+            if old == latest:
+                continue
+            self.store.delete_prefix(old)
+            removed.append(old)
+        return removed
+
+    def _publish_queued(self) -> Optional[str]:
+        with self._lock:
+            self._queued = None
+        if self.manager.current() == self._last_version:
+            return None
+        return self.publish()
+
+    def publish_async(self, *_):
+        """
+        작성기 스레드를 막지 않도록 배포를 백그라운드에서 수행합니다.
+
+        아직 시작하지 않은 배포가 있으면 새로 쌓지 않고 그 작업을 반환합니다.
+        """
+        def _report(future):
+            if future.exception() is not None:
+                print(f"❌ 벡터 저장소 배포 실패: {future.exception()}")
+
+        with self._lock:
+            if self._queued is not None:
+                return self._queued
+            future = self._executor.submit(self._publish_queued)
+            self._queued = future
+        future.add_done_callback(_report)
+        return future
+
+
+def _safe_extract(tar: tarfile.TarFile, target: str) -> None:
+    root = os.path.realpath(target)
+    for member in tar.getmembers():
+        dest = os.path.realpath(os.path.join(target, member.name))
+        if not (dest == root or dest.startswith(root + os.sep)) or member.issym() or member.islnk():
+            raise ValueError(f"허용되지 않는 압축 항목입니다: {member.name}")
+    if hasattr(tarfile, "data_filter"):
+        tar.extractall(target, filter="data")
+    else:
+        tar.extractall(target)
+
+
+class SnapshotSubscriber:
+    """
+    공유 저장소의 최신 배포 버전을 주기적으로 확인하여 로컬 버전으로 게시합니다.
+    """
+
+    def __init__(self, store=None, manager: Optional[SnapshotManager] = None, interval: Optional[float] = None):
+        self.store = store or get_snapshot_store()
+        self.manager = manager or get_snapshot_manager()
+        self.interval = float(interval or settings.SNAPSHOT_POLL_INTERVAL)
+        self._applied_path = os.path.join(self.manager.root, APPLIED_FILE)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def applied(self) -> Optional[str]:
+        try:
+            with open(self._applied_path, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _mark_applied(self, snapshot_id: str) -> None:
+        tmp = f"{self._applied_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(snapshot_id)
+        os.replace(tmp, self._applied_path)
+
+    def poll(self) -> Optional[str]:
+        """
+        새 배포 버전이 있으면 내려받아 적용합니다.
+
+        Returns:
+            Optional[str]: 적용한 배포 id (변경 없으면 None)
+
+        압축을 푼 저장소의 컬렉션별 항목 수가 manifest와 다르면 게시하지 않고 버립니다.
+
+        Raises:
+            ValueError: manifest가 없거나 체크섬 또는 컬렉션 항목 수가 일치하지 않는 경우
+        """
+        latest = self.store.get_bytes(LATEST_KEY)
+        if not latest:
+            return None
+        snapshot_id = latest.decode("utf-8").strip()
+        if snapshot_id == self.applied:
+            return None
+
+        raw = self.store.get_bytes(f"{snapshot_id}/{MANIFEST_NAME}")
+        if raw is None:
+            raise ValueError(f"manifest 없음: {snapshot_id}")
+        manifest = json.loads(raw)
+        start = time.perf_counter()
+
+        with tempfile.TemporaryDirectory(dir=self.manager.versions_dir) as tmp:
+            archive = os.path.join(tmp, ARCHIVE_NAME)
+            self.store.get_file(f"{snapshot_id}/{ARCHIVE_NAME}", archive)
+            expected = manifest["archive"]
+            if os.path.getsize(archive) != expected["bytes"] or _sha256(archive) != expected["sha256"]:
+                raise ValueError(f"체크섬 불일치: {snapshot_id}")
+
+            with self.manager.locked():
+                version, building = self.manager.begin(copy_current=False)
+                try:
+                    with tarfile.open(archive, "r:gz") as tar:
+                        _safe_extract(tar, building)
+                    expected_counts = manifest.get("collections")
+                    if expected_counts is not None:
+                        counts = _collection_counts(building)
+                        if counts != expected_counts:
+                            raise ValueError(f"컬렉션 항목 수 불일치: {snapshot_id} ({counts} != {expected_counts})")
+                except BaseException:
+                    self.manager.discard(building)
+                    raise
+                self.manager.publish(version, building)
+
+        self._mark_applied(snapshot_id)
+        print(f"[INFO] 배포 버전 적용: {snapshot_id} → {version} ({time.perf_counter() - start:.2f}s)")
+        return snapshot_id
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"❌ 배포 버전 적용 실패: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> "SnapshotSubscriber":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="snapshot-subscriber", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+_publisher = None
+_subscriber = None
+_lock = threading.Lock()
+
+
+def get_snapshot_publisher() -> Optional[SnapshotPublisher]:
+    """
+    SNAPSHOT_ROLE이 publisher이면 공용 배포기를 반환합니다. (그 외에는 None)
+    """
+    global _publisher
+    if settings.SNAPSHOT_ROLE != "publisher" or not settings.SNAPSHOT_STORE_URI:
+        return None
+    if _publisher is None:
+        with _lock:
+            if _publisher is None:
+                _publisher = SnapshotPublisher()
+    return _publisher
+
+
+def start_snapshot_subscriber() -> Optional[SnapshotSubscriber]:
+    """
+    SNAPSHOT_ROLE이 subscriber이면 백그라운드 폴링을 시작합니다. (그 외에는 None)
+    """
+    global _subscriber
+    if settings.SNAPSHOT_ROLE != "subscriber" or not settings.SNAPSHOT_STORE_URI:
+        return None
+    with _lock:
+        if _subscriber is None:
+            _subscriber = SnapshotSubscriber().start()
+    return _subscriber
+
+
+def stop_snapshot_subscriber() -> None:
+    global _subscriber
+    with _lock:
+        subscriber, _subscriber = _subscriber, None
+    if subscriber is not None:
+        subscriber.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="벡터 저장소 버전 배포")
+    parser.add_argument("command", choices=["publish", "pull"])
+    parser.add_argument("--uri", default=settings.SNAPSHOT_STORE_URI)
+    args = parser.parse_args(argv)
+
+    store = get_snapshot_store(args.uri)
+    if args.command == "publish":
+        print(SnapshotPublisher(store).publish())
+    else:
+        print(SnapshotSubscriber(store).poll() or "변경 없음")
+
+
+if __name__ == "__main__":
+    main()
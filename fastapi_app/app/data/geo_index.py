@@ -0,0 +1,189 @@
+"""
+장소 좌표 격자 인덱스 모듈
+
+이 모듈은 장소 좌표(위도/경도)를 균일 격자로 나눈 프로세스 내 공간 인덱스를 제공합니다.
+반경 검색은 반경을 덮는 격자 칸의 장소만 모은 뒤 하버사인 거리로 정확히 거르므로,
+추천 점수 계산 전에 후보 장소를 반경 내 장소로 제한할 수 있습니다.
+
+좌표는 수집 시 키워드 메타데이터(lat, lon)로 저장되며,
+버전 게시 직전에 버전 경로의 geo.npz로 내보내 검색 쪽에서 바로 불러옵니다.
+좌표가 하나도 없는 인덱스(좌표 수집 이전에 색인된 저장소)는 반경 조건 없이 검색하도록 None을 반환하며,
+좌표는 `python -m app.data.maintenance coords`로 S3 장소 테이블에서 채울 수 있습니다.
+
+주요 구성요소:
+    - parse_location: "SRID=4326;POINT(lon lat)" → (lat, lon)
+    - GeoGridIndex: 균일 격자 반경 검색 인덱스
+    - export_geo_index: ChromaDB 메타데이터 → geo.npz 내보내기
+    - load_geo_index: 버전 경로의 좌표 인덱스 불러오기 (없으면 None)
+    - build_hook: 버전 게시 직전 좌표 인덱스 생성 (SnapshotManager 빌드 훅)
+"""
+
+import os
+import re
+import math
+import numpy as np
+
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id
+
+GEO_FILE = "geo.npz"
+PAGE_SIZE = 1000
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = 111320.0
+
+_POINT_RE = re.compile(r"POINT\s*\(\s*([-\d.eE+]+)\s+([-\d.eE+]+)\s*\)")
+
+
+def parse_location(location) -> Optional[Tuple[float, float]]:
+    """
+    크롤러의 location 문자열("SRID=4326;POINT(lon lat)")을 (lat, lon)으로 변환합니다.
+
+    Returns:
+        Optional[Tuple[float, float]]: (위도, 경도) (형식이 맞지 않으면 None)
+    """
+    if not isinstance(location, str):
+        return None
+    match = _POINT_RE.search(location)
+    if not match:
+        return None
+    lon, lat = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def haversine_m(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """(lat, lon)에서 각 좌표까지의 거리(m)"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GeoGridIndex:
+    """
+    균일 격자 공간 인덱스
+
+    Attributes:
+        cell_deg (float): 격자 한 칸의 크기 (도)
+        place_ids (np.ndarray): (N,) place_id
+        lats (np.ndarray): (N,) 위도
+        lons (np.ndarray): (N,) 경도
+    """
+
+    def __init__(self, place_ids, lats, lons, cell_deg: Optional[float] = None):
+        self.cell_deg = float(cell_deg or settings.GEO_CELL_DEG)
+        self.place_ids = np.asarray(place_ids, dtype=np.int64)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+
+        rows = np.floor(self.lats / self.cell_deg).astype(np.int64)
+        cols = np.floor(self.lons / self.cell_deg).astype(np.int64)
+        cells: Dict[Tuple[int, int], list] = {}
+        for idx, key in enumerate(zip(rows.tolist(), cols.tolist())):
+            cells.setdefault(key, []).append(idx)
+        self._cells = {key: np.asarray(idx, dtype=np.int64) for key, idx in cells.items()}
+
+    def __len__(self) -> int:
+        return int(self.place_ids.shape[0])
+
+    def _candidate_rows(self, lat: float, lon: float, radius_m: float) -> np.ndarray:
+        lat_span = radius_m / METERS_PER_DEGREE
+        lon_span = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        r0, r1 = math.floor((lat - lat_span) / self.cell_deg), math.floor((lat + lat_span) / self.cell_deg)
+        c0, c1 = math.floor((lon - lon_span) / self.cell_deg), math.floor((lon + lon_span) / self.cell_deg)
+
+        # 덮는 칸 수가 채워진 칸 수보다 많으면 채워진 칸만 확인
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > len(self._cells):
+            found = [
+                idx for (r, c), idx in self._cells.items()
+                if r0 <= r <= r1 and c0 <= c <= c1
+            ]
+        else:
+            found = [
+                self._cells[(r, c)]
+                for r in range(r0, r1 + 1)
+                for c in range(c0, c1 + 1)
+                if (r, c) in self._cells
+            ]
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def within(self, lat: float, lon: float, radius_m: float) -> Optional[Set[int]]:
+        """
+        (lat, lon)에서 radius_m 이내인 장소 id 집합을 반환합니다.
+
+        Returns:
+            Optional[Set[int]]: 장소 id 집합 (좌표가 하나도 없는 인덱스면 None = 제한 없음)
+        """
+        if not len(self):
+            return None
+        rows = self._candidate_rows(lat, lon, radius_m)
+        if not len(rows):
+            return set()
+        distances = haversine_m(lat, lon, self.lats[rows], self.lons[rows])
+        return set(self.place_ids[rows[distances <= radius_m]].tolist())
+
+
+def _read_coordinates(client) -> Dict[int, Tuple[float, float]]:
+    coords = {}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        offset = 0
+        while True:
+            page = collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas"])
+            if not page["ids"]:
+                break
+            for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                meta = meta or {}
+                place_id = entry_place_id(meta, doc_id)
+                if "lat" in meta and "lon" in meta and place_id is not None:
+                    coords[place_id] = (float(meta["lat"]), float(meta["lon"]))
+            offset += len(page["ids"])
+    return coords
+
+
+def export_geo_index(client, store_path: str) -> int:
+    """
+    키워드 메타데이터의 장소 좌표를 버전 경로의 geo.npz로 내보냅니다.
+
+    Returns:
+        int: 좌표가 있는 장소 수
+    """
+    coords = _read_coordinates(client)
+    place_ids = np.fromiter(coords.keys(), dtype=np.int64, count=len(coords))
+    latlon = np.asarray(list(coords.values()), dtype=np.float64).reshape(-1, 2)
+
+    path = os.path.join(store_path, GEO_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, place_ids=place_ids, lats=latlon[:, 0], lons=latlon[:, 1])
+    os.replace(tmp, path)
+    return len(coords)
+
+
+def load_geo_index(store_path: str) -> Optional[GeoGridIndex]:
+    """
+    버전 경로의 좌표 인덱스를 불러옵니다.
+
+    게시된 버전은 여러 프로세스가 함께 읽으므로 여기서 생성하지 않습니다.
+    (빌드 훅 또는 `python -m app.data.maintenance reindex`로 생성)
+
+    Returns:
+        Optional[GeoGridIndex]: 좌표 인덱스 (파일이 없으면 None)
+    """
+    path = os.path.join(store_path, GEO_FILE)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return GeoGridIndex(data["place_ids"], data["lats"], data["lons"])
+
+
+def build_hook(client, path: str) -> None:
+    """벡터 저장소 버전 게시 직전에 좌표 인덱스를 함께 생성합니다. (SnapshotManager 빌드 훅)"""
+    export_geo_index(client, path)
@@ -0,0 +1,487 @@
+"""
+키워드 어휘(n-gram) 역색인 모듈
+
+짧은 메뉴명("짬뽕", "평양냉면") 같은 질의는 벡터 검색보다 문자열 일치가 빠르고 정확합니다.
+이 모듈은 컬렉션별로 색인된 키워드를 한글 문자 2-gram(앞뒤 경계 표시 포함)으로 나눈 역색인을 만들고,
+BM25 점수를 질의 자신의 점수로 나눈 0~1 점수로 검색합니다. (질의와 같은 키워드 = 1.0)
+공백/대소문자는 무시하므로 "평양 냉면"과 "평양냉면"은 같은 키워드로 봅니다.
+
+역색인은 벡터 저장소 버전마다 빌드 훅으로 생성되며, 이전 버전의 역색인을 기준으로
+새로 생긴 키워드만 n-gram으로 나누고 사라진 키워드의 포스팅만 제거합니다. (항목 목록이 같으면 복사)
+
+디렉토리 구조 ({버전 경로}/lexical):
+    meta.json                       컬렉션별 항목/키워드/n-gram 수
+    {collection}.keys.json          키워드 목록 (행 순서)
+    {collection}.key_lengths.npy    (M,) int32 키워드별 n-gram 수
+    {collection}.grams.json         n-gram 목록 (정렬)
+    {collection}.gram_offsets.npy   (G + 1,) int64 n-gram별 포스팅 구간
+    {collection}.posting_keys.npy   (P,) int32 포스팅 키워드 행 번호
+    {collection}.posting_tf.npy     (P,) float32 포스팅 빈도
+    {collection}.key_offsets.npy    (M + 1,) int64 키워드별 항목 구간 (항목은 키워드 순 정렬)
+    {collection}.place_ids.npy      (N,) int64 항목 place_id
+    {collection}.categories.json    장소 카테고리 목록
+    {collection}.entry_categories.npy (N,) int16 항목 장소 카테고리 번호 (-1은 없음)
+
+주요 구성요소:
+    - char_ngrams: 키워드 → 문자 n-gram 목록
+    - build_lexical_index: 어휘 역색인 생성 (이전 버전 기준 증분)
+    - LexicalIndex: 컬렉션 하나의 어휘 역색인 (BM25 검색)
+    - load_lexical_indexes: 어휘 역색인 불러오기 (없으면 빈 dict)
+
+사용법:
+    python -m app.data.lexical_index build [--full]
+    python -m app.data.lexical_index search --category 음식/제품 짬뽕
+"""
+
+import os
+import json
+import time
+import shutil
+import argparse
+import unicodedata
+import numpy as np
+
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id
+
+LEXICAL_DIR = "lexical"
+META_FILE = "meta.json"
+PAGE_SIZE = 1000
+NGRAM = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+FILES = (
+    "keys.json", "key_lengths.npy", "grams.json", "gram_offsets.npy", "posting_keys.npy", "posting_tf.npy",
+    "key_offsets.npy", "place_ids.npy", "categories.json", "entry_categories.npy"
+)
+
+
+def lexical_dir_of(store_path: str) -> str:
+    return os.path.join(store_path, LEXICAL_DIR)
+
+
+def normalize_text(text: str) -> str:
+    """NFC 정규화 후 공백 제거, 소문자 변환"""
+    return "".join(unicodedata.normalize("NFC", str(text or "")).lower().split())
+
+
+def char_ngrams(text: str, n: int = NGRAM) -> List[str]:
+    """
+    키워드를 앞뒤 경계 표시(^, $)를 붙인 문자 n-gram 목록으로 나눕니다. (한 글자 키워드도 색인되도록)
+
+    예: "짬뽕" → ["^짬", "짬뽕", "뽕$"]
+    """
+    text = normalize_text(text)
+    if not text:
+        return []
+    padded = f"^{text}$"
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def _read_entries(collection) -> List[Tuple[int, str, str]]:
+    """컬렉션의 (place_id, keyword, place_category) 항목 목록 (임베딩 없이 조회, place_id를 읽을 수 없는 항목 제외)"""
+    entries = []
+    offset = skipped = 0
+    while True:
+        page = collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas", "documents"])
+        if not page["ids"]:
+            break
+        for doc_id, document, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+            meta = meta or {}
+            place_id = entry_place_id(meta, doc_id)
+            if place_id is None:
+                skipped += 1
+                continue
+            entries.append((
+                place_id,
+                str(meta.get("keyword") or document or ""),
+                str(meta.get("place_category") or "")
+            ))
+        offset += len(page["ids"])
+    if skipped:
+        print(f"⚠️ place_id를 읽을 수 없는 항목 {skipped}개를 어휘 역색인에서 제외했습니다. ({collection.name})")
+    return entries
+
+
+def _tokenize(keys: List[str], gram_row: Dict[str, int], grams: List[str]) -> tuple:
+    """
+    키워드들을 n-gram으로 나눠 (gram 번호, 키워드 번호, 빈도) 포스팅과 키워드별 n-gram 수를 만듭니다.
+    처음 보는 n-gram은 grams/gram_row에 추가합니다.
+    """
+    gram_ids, key_ids, tfs, lengths = [], [], [], []
+    for row, key in enumerate(keys):
+        counts = Counter(char_ngrams(key))
+        lengths.append(sum(counts.values()))
+        for gram, tf in counts.items():
+            if gram not in gram_row:
+                gram_row[gram] = len(grams)
+                grams.append(gram)
+            gram_ids.append(gram_row[gram])
+            key_ids.append(row)
+            tfs.append(tf)
+    return (
+        np.asarray(gram_ids, dtype=np.int64),
+        np.asarray(key_ids, dtype=np.int64),
+        np.asarray(tfs, dtype=np.float32),
+        np.asarray(lengths, dtype=np.int32)
+    )
+
+
+def _build_collection(entries: List[Tuple[int, str, str]], previous: Optional["LexicalIndex"]) -> tuple:
+    """
+    컬렉션 하나의 역색인을 계산합니다. previous가 있으면 남아 있는 키워드의 포스팅을 재사용하고
+    새 키워드만 n-gram으로 나눕니다.
+
+    Returns:
+        tuple: (저장할 배열 dict, 새로 나눈 키워드 수)
+    """
+    entries = sorted(entries, key=lambda e: (e[1], e[0]))
+    keys = sorted({kw for _, kw, _ in entries})
+    key_row = {kw: i for i, kw in enumerate(keys)}
+    entry_keys = np.asarray([key_row[kw] for _, kw, _ in entries], dtype=np.int64)
+    key_offsets = np.searchsorted(entry_keys, np.arange(len(keys) + 1)).astype(np.int64)
+
+    grams: List[str] = []
+    gram_row: Dict[str, int] = {}
+    lengths = np.zeros(len(keys), dtype=np.int32)
+    parts = []
+    new_rows = np.arange(len(keys))
+
+    if previous is not None and len(previous.keys):
+        # 이전 키워드 번호 → 새 키워드 번호 (사라진 키워드는 -1)
+        old_to_new = np.asarray([key_row.get(kw, -1) for kw in previous.keys], dtype=np.int64)
+        grams = list(previous.grams)
+        gram_row = {g: i for i, g in enumerate(grams)}
+        old_gram = np.repeat(np.arange(len(grams)), np.diff(np.asarray(previous.gram_offsets)))
+        old_key = old_to_new[np.asarray(previous.posting_keys, dtype=np.int64)]
+        kept = old_key >= 0
+        parts.append((old_gram[kept], old_key[kept], np.asarray(previous.posting_tf, dtype=np.float32)[kept]))
+        reused = old_to_new >= 0
+        lengths[old_to_new[reused]] = np.asarray(previous.key_lengths)[reused]
+        new_rows = np.setdiff1d(np.arange(len(keys)), old_to_new[reused])
+
+    gram_ids, local_keys, tfs, new_lengths = _tokenize([keys[i] for i in new_rows], gram_row, grams)
+    parts.append((gram_ids, new_rows[local_keys] if len(local_keys) else local_keys, tfs))
+    lengths[new_rows] = new_lengths
+
+    # n-gram 사전 정렬 후 (n-gram, 키워드) 순으로 포스팅 정렬
+    gram_order = np.argsort(np.asarray(grams, dtype=object), kind="stable") if grams else np.zeros(0, dtype=np.int64)
+    remap = np.empty(len(grams), dtype=np.int64)
+    remap[gram_order] = np.arange(len(grams))
+    all_grams = remap[np.concatenate([p[0] for p in parts])] if grams else np.zeros(0, dtype=np.int64)
+    all_keys = np.concatenate([p[1] for p in parts]).astype(np.int64)
+    all_tf = np.concatenate([p[2] for p in parts]).astype(np.float32)
+    order = np.lexsort((all_keys, all_grams))
+    all_grams, all_keys, all_tf = all_grams[order], all_keys[order], all_tf[order]
+
+    # 모든 포스팅이 사라진 n-gram 제거
+    used = np.unique(all_grams)
+    sorted_grams = [grams[i] for i in gram_order]
+    compact = np.full(len(grams), -1, dtype=np.int64)
+    compact[used] = np.arange(len(used))
+    all_grams = compact[all_grams]
+
+    place_categories = [c for _, _, c in entries]
+    categories = sorted({c for c in place_categories if c})
+    code = {c: i for i, c in enumerate(categories)}
+    arrays = {
+        "keys": keys,
+        "key_lengths": lengths,
+        "grams": [sorted_grams[i] for i in used],
+        "gram_offsets": np.searchsorted(all_grams, np.arange(len(used) + 1)).astype(np.int64),
+        "posting_keys": all_keys.astype(np.int32),
+        "posting_tf": all_tf,
+        "key_offsets": key_offsets,
+        "place_ids": np.asarray([pid for pid, _, _ in entries], dtype=np.int64),
+        "categories": categories,
+        "entry_categories": np.asarray([code.get(c, -1) for c in place_categories], dtype=np.int16),
+    }
+    return arrays, len(new_rows)
+
+
+def _save_collection(out_dir: str, name: str, arrays: dict) -> None:
+    base = os.path.join(out_dir, name)
+    for key, value in arrays.items():
+        if isinstance(value, list):
+            with open(f"{base}.{key}.json", "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+        else:
+            np.save(f"{base}.{key}.npy", value)
+
+
+def build_lexical_index(client, out_dir: str, previous_dir: Optional[str] = None) -> dict:
+    """
+    모든 컬렉션의 어휘 역색인을 out_dir에 생성합니다.
+
+    previous_dir(이전 버전의 역색인)가 있으면 항목 목록이 같은 컬렉션은 파일을 복사하고,
+    바뀐 컬렉션은 새 키워드만 n-gram으로 나누어 포스팅을 병합합니다.
+
+    Returns:
+        dict: meta.json 내용
+    """
+    previous = load_lexical_indexes(previous_dir) if previous_dir else {}
+    tmp_dir = f"{out_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    meta = {"ngram": NGRAM, "created_at": time.time(), "collections": {}}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        start = time.perf_counter()
+        entries = _read_entries(collection)
+        old = previous.get(name)
+        if old is not None and set(entries) == old.entry_set():
+            for suffix in FILES:
+                shutil.copyfile(os.path.join(previous_dir, f"{name}.{suffix}"), os.path.join(tmp_dir, f"{name}.{suffix}"))
+            meta["collections"][name] = {
+                "entries": len(old.place_ids), "keys": len(old.keys), "grams": len(old.grams), "tokenized": 0
+            }
+            continue
+
+        arrays, tokenized = _build_collection(entries, old)
+        _save_collection(tmp_dir, name, arrays)
+        meta["collections"][name] = {
+            "entries": len(entries), "keys": len(arrays["keys"]), "grams": len(arrays["grams"]), "tokenized": int(tokenized)
+        }
+        print(
+            f"[INFO] 어휘 색인 갱신: {name} (키워드 {len(arrays['keys'])}개 중 {tokenized}개 신규, "
+            f"{time.perf_counter() - start:.2f}s)"
+        )
+
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return meta
+
+
+class LexicalIndex:
+    """
+    컬렉션 하나의 키워드 어휘 역색인
+
+    Attributes:
+        name (str): 컬렉션 이름
+        keys (List[str]): 키워드 목록
+        key_lengths (np.ndarray): (M,) 키워드별 n-gram 수
+        grams (List[str]): n-gram 목록
+        gram_offsets (np.ndarray): (G + 1,) n-gram별 포스팅 구간
+        posting_keys (np.ndarray): (P,) 포스팅 키워드 번호
+        posting_tf (np.ndarray): (P,) 포스팅 빈도
+        key_offsets (np.ndarray): (M + 1,) 키워드별 항목 구간
+        place_ids (np.ndarray): (N,) 항목 place_id
+        entry_categories (np.ndarray): (N,) 항목 장소 카테고리 번호
+    """
+
+    def __init__(self, directory: str, name: str):
+        base = os.path.join(directory, name)
+        self.name = name
+        with open(f"{base}.keys.json", "r", encoding="utf-8") as f:
+            self.keys: List[str] = json.load(f)
+        with open(f"{base}.grams.json", "r", encoding="utf-8") as f:
+            self.grams: List[str] = json.load(f)
+        with open(f"{base}.categories.json", "r", encoding="utf-8") as f:
+            self.categories: List[str] = json.load(f)
+        self.gram_row = {g: i for i, g in enumerate(self.grams)}
+        self.category_code = {c: i for i, c in enumerate(self.categories)}
+        self.key_lengths = np.load(f"{base}.key_lengths.npy", mmap_mode="r")
+        self.gram_offsets = np.load(f"{base}.gram_offsets.npy", mmap_mode="r")
+        self.posting_keys = np.load(f"{base}.posting_keys.npy", mmap_mode="r")
+        self.posting_tf = np.load(f"{base}.posting_tf.npy", mmap_mode="r")
+        self.key_offsets = np.load(f"{base}.key_offsets.npy", mmap_mode="r")
+        self.place_ids = np.load(f"{base}.place_ids.npy", mmap_mode="r")
+        self.entry_categories = np.load(f"{base}.entry_categories.npy", mmap_mode="r")
+
+        self.avg_length = float(np.mean(self.key_lengths)) if len(self.keys) else 1.0
+        self.exact_rows: Dict[str, List[int]] = {}
+        for row, key in enumerate(self.keys):
+            self.exact_rows.setdefault(normalize_text(key), []).append(row)
+
+    def entry_set(self) -> set:
+        entry_keys = np.repeat(np.arange(len(self.keys)), np.diff(np.asarray(self.key_offsets)))
+        return {
+            (int(pid), self.keys[int(row)], self.categories[int(code)] if code >= 0 else "")
+            for pid, row, code in zip(self.place_ids, entry_keys, self.entry_categories)
+        }
+
+    def _idf(self, df: np.ndarray) -> np.ndarray:
+        n_keys = len(self.keys)
+        return np.log(1.0 + (n_keys - df + 0.5) / (df + 0.5))
+
+    def key_scores(self, keyword: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        질의와 n-gram을 공유하는 키워드들의 정규화 BM25 점수를 계산합니다.
+
+        점수는 질의와 같은 키워드가 받을 BM25 점수로 나눈 값이며 1.0을 넘지 않습니다.
+        색인에 없는 n-gram도 질의 자신의 점수에는 포함되므로, 일부만 일치하는 키워드는 낮은 점수를 받습니다.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (키워드 번호, 0~1 점수)
+        """
+        counts = Counter(char_ngrams(keyword))
+        if not counts or not len(self.keys):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query_length = sum(counts.values())
+        norm = 1.0 - BM25_B + BM25_B * np.asarray(self.key_lengths, dtype=np.float32) / self.avg_length
+        query_norm = 1.0 - BM25_B + BM25_B * query_length / self.avg_length
+
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        ideal = 0.0
+        for gram, qtf in counts.items():
+            row = self.gram_row.get(gram)
+            if row is None:
+                ideal += qtf * float(self._idf(np.float32(0.0))) * (qtf * (BM25_K1 + 1)) / (qtf + BM25_K1 * query_norm)
+                continue
+            start, end = int(self.gram_offsets[row]), int(self.gram_offsets[row + 1])
+            docs = np.asarray(self.posting_keys[start:end], dtype=np.int64)
+            tf = np.asarray(self.posting_tf[start:end], dtype=np.float32)
+            idf = float(self._idf(np.float32(end - start)))
+            scores[docs] += qtf * idf * (tf * (BM25_K1 + 1)) / (tf + BM25_K1 * norm[docs])
+            ideal += qtf * idf * (qtf * (BM25_K1 + 1)) / (qtf + BM25_K1 * query_norm)
+
+        rows = np.flatnonzero(scores > 0)
+        return rows, np.minimum(scores[rows] / ideal, 1.0) if ideal > 0 else np.zeros(len(rows), dtype=np.float32)
+
+    def search(
+        self,
+        keyword: str,
+        n_results: int = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None,
+        min_score: Optional[float] = None
+    ) -> Optional[Tuple[Dict[str, list], bool]]:
+        """
+        질의 키워드와 문자열이 비슷한 항목을 점수 내림차순으로 최대 n_results개 반환합니다.
+
+        질의와 정규화 문자열이 같은 키워드는 1.0점, 나머지는 정규화 BM25 점수(min_score 이상)를 받으며,
+        결과의 distance는 ChromaDB 결과와 같이 1 - 점수로 표시합니다.
+
+        Returns:
+            Optional[Tuple[Dict[str, list], bool]]: (ChromaDB query 결과 형태, 정확히 일치한 항목 포함 여부)
+                (조건에 맞는 항목이 없으면 None)
+        """
+        min_score = float(settings.LEXICAL_MIN_SCORE if min_score is None else min_score)
+        rows, scores = self.key_scores(keyword)
+        exact = self.exact_rows.get(normalize_text(keyword), [])
+        if exact:
+            scores[np.isin(rows, exact)] = 1.0
+        keep = scores >= min_score
+        rows, scores = rows[keep], scores[keep]
+        if not len(rows):
+            return None
+        order = np.argsort(-scores, kind="stable")
+        rows, scores = rows[order], scores[order]
+
+        # 키워드 → 항목 (키워드 순서대로 펼침)
+        starts = np.asarray(self.key_offsets[rows], dtype=np.int64)
+        lengths = np.asarray(self.key_offsets[rows + 1], dtype=np.int64) - starts
+        seg = np.r_[0, np.cumsum(lengths)[:-1]]
+        entries = np.repeat(starts - seg, lengths) + np.arange(int(lengths.sum()))
+        entry_rows = np.repeat(rows, lengths)
+        entry_scores = np.repeat(scores, lengths)
+
+        mask = np.ones(len(entries), dtype=bool)
+        if place_category is not None:
+            code = self.category_code.get(place_category)
+            if code is None:
+                return None
+            mask &= np.asarray(self.entry_categories[entries]) == code
+        if place_ids is not None:
+            mask &= np.isin(self.place_ids[entries], np.fromiter(place_ids, dtype=np.int64))
+        if exclude_ids:
+            mask &= ~np.isin(self.place_ids[entries], np.fromiter(exclude_ids, dtype=np.int64))
+        selected = np.flatnonzero(mask)[:int(n_results)]
+        if not len(selected):
+            return None
+
+        metadatas = [
+            {"place_id": int(self.place_ids[entries[i]]), "keyword": self.keys[int(entry_rows[i])]}
+            for i in selected
+        ]
+        results = {
+            "ids": [[f"{self.name}_{m['place_id']}_{m['keyword']}" for m in metadatas]],
+            "documents": [[m["keyword"] for m in metadatas]],
+            "metadatas": [metadatas],
+            "distances": [[float(1.0 - entry_scores[i]) for i in selected]],
+        }
+        return results, bool(exact) and bool(np.isin(entry_rows[selected], exact).any())
+
+
+def load_lexical_indexes(directory: str) -> Dict[str, LexicalIndex]:
+    """
+    어휘 역색인을 엽니다. (생성되지 않은 버전이면 빈 dict)
+    """
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return {name: LexicalIndex(directory, name) for name in meta["collections"]}
+
+
+def build_hook(manager) -> Callable:
+    """
+    manager가 게시하는 버전의 어휘 역색인을 갱신하는 빌드 훅을 반환합니다. (SnapshotManager 빌드 훅)
+
+    게시 전이므로 manager의 현재 버전이 곧 이전 버전이며, 그 역색인을 기준으로 증분 갱신합니다.
+    """
+    def _hook(client, path: str) -> None:
+        build_lexical_index(client, lexical_dir_of(path), lexical_dir_of(manager.current_path()))
+    return _hook
+
+
+def main(argv=None) -> None:
+    import chromadb
+    from app.data.snapshots import SnapshotManager
+
+    parser = argparse.ArgumentParser(description="키워드 어휘 역색인")
+    parser.add_argument("command", choices=["build", "search"])
+    parser.add_argument("keyword", nargs="?")
+    parser.add_argument("--path", default=settings.VECTOR_STORE_PATH)
+    parser.add_argument("--category", default="음식/제품", help="검색할 키워드 카테고리 (search)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--full", action="store_true", help="기존 역색인을 무시하고 전체 다시 생성")
+    args = parser.parse_args(argv)
+
+    manager = SnapshotManager(args.path)
+    if args.command == "build":
+        # 게시된 버전은 읽기 전용이므로, 현재 버전을 (파생 인덱스 포함) 복사한 새 버전에 만들어 게시
+        with manager.locked():
+            previous = lexical_dir_of(manager.current_path())
+            version, building = manager.begin(keep_derived=True)
+            try:
+                client = chromadb.PersistentClient(path=building)
+                meta = build_lexical_index(client, lexical_dir_of(building), None if args.full else previous)
+            except BaseException:
+                manager.discard(building)
+                raise
+            manager.publish(version, building)
+        print(json.dumps(meta, ensure_ascii=False, indent=2))
+        return
+
+    directory = lexical_dir_of(manager.current_path())
+
+    index = load_lexical_indexes(directory).get(CATEGORY_MAP[args.category])
+    if index is None:
+        raise SystemExit(f"어휘 역색인이 없습니다: {directory}")
+    start = time.perf_counter()
+    found = index.search(args.keyword or "", n_results=args.k)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not found:
+        print(f"결과 없음 ({elapsed:.2f}ms)")
+        return
+    results, exact = found
+    for meta, distance in zip(results["metadatas"][0], results["distances"][0]):
+        print(f"{1.0 - distance:.3f}  {meta['place_id']}  {meta['keyword']}")
+    print(f"정확히 일치: {exact} ({elapsed:.2f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,518 @@
+"""
+벡터 저장소 점검/압축 모듈
+
+이 모듈은 ChromaDB 컬렉션의 상태를 점검하고, 조각난 컬렉션을 새로 빌드하여 교체합니다.
+업로드 재시도, 장소 삭제, 재수집 과정에서 남은 불필요한 항목과 HNSW 그래프 단편화를 정리합니다.
+
+주요 구성요소:
+    - collection_report: 컬렉션별 항목 수, 고아 place_id, 중복 키워드 집계
+    - migrate_place_ids: 이전 형식(문서 id 문자열) place_id를 정수로 다시 기록
+    - backfill_coordinates: 좌표(lat, lon) 메타데이터가 없는 항목을 S3 장소 테이블 location으로 채움
+    - measure_latency: 컬렉션별 검색 지연 시간 측정
+    - compact: 유효 항목만 적정 HNSW 설정으로 새로 빌드하여 새 버전으로 게시
+    - reindex: 파생 인덱스(좌표, 영업시간 등)를 다시 만들어 새 버전으로 게시
+
+사용법:
+    python -m app.data.maintenance report
+    python -m app.data.maintenance compact [--keep-orphans]
+    python -m app.data.maintenance rollback
+    python -m app.data.maintenance partition   (place_category 메타데이터 채우기)
+    python -m app.data.maintenance migrate-ids (문자열 place_id를 정수로 변환)
+    python -m app.data.maintenance coords      (S3 장소 테이블에서 좌표 채우기)
+    python -m app.data.maintenance reindex     (파생 인덱스 다시 생성)
+"""
+
+import sys
+import pysqlite3
+sys.modules["sqlite3"] = pysqlite3
+import sqlite3
+
+import io
+import os
+import time
+import json
+import argparse
+import chromadb
+import numpy as np
+import pandas as pd
+
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.chroma_db import get_hnsw_metadata_by_size
+from app.data.geo_index import parse_location
+from app.data.place_ids import entry_place_id
+from app.data.snapshots import SnapshotManager, add_default_build_hooks, get_snapshot_manager
+from app.data_pipeline.keyword_normalizer import canonical_key
+
+CATALOG_PATH = "app/data/place_id_category_data.csv"
+PAGE_SIZE = 1000
+
+
+def load_catalog_ids(csv_path: str = CATALOG_PATH) -> Optional[set]:
+    """
+    장소 카탈로그 CSV의 place_id 목록을 반환합니다. (파일이 없으면 None)
+    """
+    if not os.path.exists(csv_path):
+        return None
+    return set(pd.read_csv(csv_path)["id"].astype(int))
+
+
+def load_catalog_categories(csv_path: str = CATALOG_PATH) -> dict:
+    """
+    장소 카탈로그 CSV의 {place_id: 장소 카테고리}를 반환합니다. (파일이 없으면 빈 dict)
+    """
+    if not os.path.exists(csv_path):
+        return {}
+    df = pd.read_csv(csv_path)
+    return dict(zip(df["id"].astype(int), df["place_category"].astype(str)))
+
+
+def backfill_place_category(manager: Optional[SnapshotManager] = None) -> dict:
+    """
+    place_category 메타데이터가 없거나 카탈로그와 다른 항목을 갱신하여 새 버전으로 게시합니다.
+    (장소 카테고리 파티션 검색 이전에 색인된 저장소용)
+
+    Returns:
+        dict: 컬렉션 이름별 갱신 항목 수
+    """
+    manager = manager or get_snapshot_manager()
+    catalog = load_catalog_categories()
+    updated = {}
+    with manager.transaction() as client:
+        for name in CATEGORY_MAP.values():
+            try:
+                collection = client.get_collection(name=name)
+            except Exception:
+                continue
+            ids, metadatas = [], []
+            for doc_id, _, metadata, _ in iter_entries(collection, include=("metadatas",)):
+                metadata = dict(metadata or {})
+                place_category = catalog.get(entry_place_id(metadata, doc_id))
+                if place_category and metadata.get("place_category") != place_category:
+                    metadata["place_category"] = place_category
+                    ids.append(doc_id)
+                    metadatas.append(metadata)
+            for i in range(0, len(ids), PAGE_SIZE):
+                collection.update(ids=ids[i:i + PAGE_SIZE], metadatas=metadatas[i:i + PAGE_SIZE])
+            updated[name] = len(ids)
+    return updated
+
+
+def migrate_place_ids(manager: Optional[SnapshotManager] = None) -> dict:
+    """
+    place_id 메타데이터가 정수가 아닌 항목(초기 업로드의 문서 id 문자열)을 정수 장소 id로 다시 기록하여
+    새 버전으로 게시합니다. 장소 id를 읽을 수 없는 항목은 그대로 두고 개수만 집계합니다.
+
+    Returns:
+        dict: 컬렉션 이름별 {migrated, unparsable}
+    """
+    manager = manager or get_snapshot_manager()
+    result = {}
+    with manager.transaction() as client:
+        for name in CATEGORY_MAP.values():
+            try:
+                collection = client.get_collection(name=name)
+            except Exception:
+                continue
+            ids, metadatas = [], []
+            unparsable = 0
+            for doc_id, _, metadata, _ in iter_entries(collection, include=("metadatas",)):
+                metadata = dict(metadata or {})
+                place_id = entry_place_id(metadata, doc_id)
+                if place_id is None:
+                    unparsable += 1
+                    continue
+                if metadata.get("place_id") != place_id:
+                    metadata["place_id"] = place_id
+                    ids.append(doc_id)
+                    metadatas.append(metadata)
+            for i in range(0, len(ids), PAGE_SIZE):
+                collection.update(ids=ids[i:i + PAGE_SIZE], metadatas=metadatas[i:i + PAGE_SIZE])
+            result[name] = {"migrated": len(ids), "unparsable": unparsable}
+    return result
+
+
+def _read_s3_table(s3, key: str) -> Optional[pd.DataFrame]:
+    try:
+        body = s3.get_object(Bucket=settings.S3_METADATA_PATH, Key=key)["Body"].read()
+    except s3.exceptions.NoSuchKey:
+        return None
+    if key.endswith(".parquet"):
+        return pd.read_parquet(io.BytesIO(body))
+    return pd.read_csv(io.BytesIO(body))
+
+
+def _table_locations(table: Optional[pd.DataFrame], place_ids: set) -> Dict[int, Tuple[float, float]]:
+    found = {}
+    if table is None or "id" not in table or "location" not in table:
+        return found
+    for place_id, location in zip(table["id"], table["location"]):
+        coords = parse_location(location)
+        if coords is not None and int(place_id) in place_ids:
+            found[int(place_id)] = coords
+    return found
+
+
+def load_place_locations(place_ids: set, s3=None) -> Dict[int, Tuple[float, float]]:
+    """
+    S3에 내보낸 장소 테이블의 location("SRID=4326;POINT(lon lat)")에서 장소 좌표를 읽습니다.
+
+    장소 단위 CSV(`{place_id}/place_table.csv`)를 먼저 찾고,
+    없는 장소는 Parquet batch(`{S3_EXPORT_PREFIX}/{batch_id}/place_table.parquet`)의 manifest로 찾습니다.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: {place_id: (위도, 경도)} (좌표를 찾은 장소만)
+    """
+    if not place_ids:
+        return {}
+    if s3 is None:
+        from app.services.s3_client_factory import S3ClientFactory
+        s3 = S3ClientFactory.get_instance()
+
+    coords: Dict[int, Tuple[float, float]] = {}
+    with ThreadPoolExecutor(max_workers=int(settings.S3_MAX_POOL_CONNECTIONS)) as executor:
+        tables = executor.map(lambda pid: _read_s3_table(s3, f"{pid}/place_table.csv"), sorted(place_ids))
+        for table in tables:
+            coords.update(_table_locations(table, place_ids))
+
+    missing = set(place_ids) - set(coords)
+    if missing:
+        paginator = s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=settings.S3_METADATA_PATH, Prefix=f"{settings.S3_EXPORT_PREFIX}/"):
+            for obj in page.get("Contents", []):
+                if not missing or not obj["Key"].endswith("/manifest.json"):
+                    continue
+                manifest = json.loads(s3.get_object(Bucket=settings.S3_METADATA_PATH, Key=obj["Key"])["Body"].read())
+                if not missing.intersection(int(pid) for pid in manifest.get("place_ids", [])):
+                    continue
+                table_info = manifest.get("tables", {}).get("place_table")
+                if table_info:
+                    found = _table_locations(_read_s3_table(s3, table_info["key"]), missing)
+                    coords.update(found)
+                    missing -= set(found)
+    return coords
+
+
+def backfill_coordinates(manager: Optional[SnapshotManager] = None, s3=None) -> dict:
+    """
+    좌표(lat, lon) 메타데이터가 없는 항목을 S3 장소 테이블의 location으로 채워 새 버전으로 게시합니다.
+    (반경 검색 이전에 색인된 저장소용, 게시 시 좌표 인덱스도 다시 생성)
+
+    Returns:
+        dict: 컬렉션 이름별 {updated, missing} (missing = S3에서도 좌표를 찾지 못한 항목 수)
+    """
+    manager = manager or get_snapshot_manager()
+    result = {}
+    with manager.transaction() as client:
+        pending = {}
+        for name in CATEGORY_MAP.values():
+            try:
+                collection = client.get_collection(name=name)
+            except Exception:
+                continue
+            entries = []
+            for doc_id, _, metadata, _ in iter_entries(collection, include=("metadatas",)):
+                metadata = dict(metadata or {})
+                place_id = entry_place_id(metadata, doc_id)
+                if place_id is not None and ("lat" not in metadata or "lon" not in metadata):
+                    entries.append((doc_id, place_id, metadata))
+            pending[name] = (collection, entries)
+
+        coords = load_place_locations({pid for _, entries in pending.values() for _, pid, _ in entries}, s3)
+        for name, (collection, entries) in pending.items():
+            ids, metadatas = [], []
+            for doc_id, place_id, metadata in entries:
+                if place_id in coords:
+                    metadata["lat"], metadata["lon"] = float(coords[place_id][0]), float(coords[place_id][1])
+                    ids.append(doc_id)
+                    metadatas.append(metadata)
+            for i in range(0, len(ids), PAGE_SIZE):
+                collection.update(ids=ids[i:i + PAGE_SIZE], metadatas=metadatas[i:i + PAGE_SIZE])
+            result[name] = {"updated": len(ids), "missing": len(entries) - len(ids)}
+    return result
+
+
+def reindex(manager: Optional[SnapshotManager] = None) -> str:
+    """
+    항목은 그대로 두고 빌드 훅으로 파생 인덱스를 다시 만들어 새 버전으로 게시합니다.
+    (파생 인덱스 없이 게시된 버전이나 인덱스 설정을 바꾼 경우)
+
+    Returns:
+        str: 게시한 버전
+    """
+    manager = manager or get_snapshot_manager()
+    with manager.transaction():
+        pass
+    return manager.current()
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def iter_entries(collection, include=("metadatas", "documents", "embeddings")):
+    """
+    컬렉션 항목을 PAGE_SIZE 단위로 읽어 (id, document, metadata, embedding)을 반환합니다.
+    """
+    offset = 0
+    while True:
+        page = collection.get(limit=PAGE_SIZE, offset=offset, include=list(include))
+        ids = page["ids"]
+        if not ids:
+            return
+        documents = page.get("documents") or [None] * len(ids)
+        metadatas = page.get("metadatas") or [None] * len(ids)
+        embeddings = page.get("embeddings") or [None] * len(ids)
+        yield from zip(ids, documents, metadatas, embeddings)
+        offset += len(ids)
+
+
+def _entry_key(doc_id: str, metadata: dict, document: str) -> tuple:
+    """(장소 id, 정규화 키워드) (장소 id를 읽을 수 없으면 None)"""
+    keyword = (metadata or {}).get("keyword") or document or ""
+    return (entry_place_id(metadata, doc_id), canonical_key(keyword))
+
+
+def collection_report(client, catalog_ids: Optional[set] = None) -> dict:
+    """
+    컬렉션별 상태를 집계합니다.
+
+    장소 id를 읽을 수 없는 항목은 고아 항목(unparsable)으로 집계합니다.
+
+    Returns:
+        dict: 컬렉션 이름별 {count, places, orphaned_places, unparsable, duplicate_keywords, hnsw}
+    """
+    report = {}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            report[name] = None
+            continue
+
+        keys = Counter()
+        for doc_id, document, metadata, _ in iter_entries(collection, include=("metadatas", "documents")):
+            keys[_entry_key(doc_id, metadata, document)] += 1
+
+        places = {place_id for place_id, _ in keys if place_id is not None}
+        orphaned = sorted(places - catalog_ids) if catalog_ids is not None else []
+        report[name] = {
+            "count": sum(keys.values()),
+            "places": len(places),
+            "orphaned_places": orphaned,
+            "unparsable": sum(n for (place_id, _), n in keys.items() if place_id is None),
+            "duplicate_keywords": sum(n - 1 for n in keys.values() if n > 1),
+            "hnsw": {k: v for k, v in (collection.metadata or {}).items() if k.startswith("hnsw:")},
+        }
+    return report
+
+
+def measure_latency(client, n_queries: int = 50, n_results: int = 50, seed: int = 0) -> dict:
+    """
+    컬렉션에 저장된 임베딩을 질의로 사용하여 검색 지연 시간을 측정합니다.
+
+    Returns:
+        dict: 컬렉션 이름별 {p50_ms, p95_ms} (빈 컬렉션은 제외)
+    """
+    rng = np.random.default_rng(seed)
+    out = {}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        count = collection.count()
+        if count == 0:
+            continue
+
+        offsets = rng.integers(0, count, size=min(n_queries, count))
+        queries = [
+            collection.get(limit=1, offset=int(o), include=["embeddings"])["embeddings"][0]
+            for o in offsets
+        ]
+        timings = []
+        for vec in queries:
+            start = time.perf_counter()
+            collection.query(query_embeddings=[vec], n_results=min(n_results, count))
+            timings.append((time.perf_counter() - start) * 1000)
+        out[name] = {
+            "p50_ms": float(np.percentile(timings, 50)),
+            "p95_ms": float(np.percentile(timings, 95)),
+        }
+    return out
+
+
+def rebuild(src_client, dst_path: str, catalog_ids: Optional[set] = None, drop_orphans: bool = True) -> dict:
+    """
+    유효한 항목만 dst_path에 새 컬렉션으로 빌드합니다.
+
+    - 같은 (place_id, 키워드) 중복 항목은 하나만 남깁니다.
+    - drop_orphans=True이면 카탈로그에 없는 장소와 장소 id를 읽을 수 없는 항목을 제외합니다.
+    - 이전 형식(문서 id 문자열)의 place_id는 정수로 다시 기록합니다.
+    - 남은 항목 수에 맞는 HNSW 설정으로 컬렉션을 생성합니다.
+
+    Returns:
+        dict: 컬렉션 이름별 {before, after}
+    """
+    dst_client = chromadb.PersistentClient(path=dst_path)
+    stats = {}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = src_client.get_collection(name=name)
+        except Exception:
+            continue
+
+        seen = set()
+        kept = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+        before = 0
+        for doc_id, document, metadata, embedding in iter_entries(collection):
+            before += 1
+            key = _entry_key(doc_id, metadata, document)
+            if key in seen:
+                continue
+            if drop_orphans and (key[0] is None or (catalog_ids is not None and key[0] not in catalog_ids)):
+                continue
+            seen.add(key)
+            if key[0] is not None:
+                metadata = {**(metadata or {}), "place_id": key[0]}
+            kept["ids"].append(doc_id)
+            kept["documents"].append(document)
+            kept["metadatas"].append(metadata)
+            kept["embeddings"].append(embedding)
+
+        target = dst_client.create_collection(
+            name=name,
+            metadata=get_hnsw_metadata_by_size(len(kept["ids"]))
+        )
+        for i in range(0, len(kept["ids"]), PAGE_SIZE):
+            target.add(**{k: v[i:i + PAGE_SIZE] for k, v in kept.items()})
+        stats[name] = {"before": before, "after": len(kept["ids"])}
+    return stats
+
+
+def compact(manager: Optional[SnapshotManager] = None, drop_orphans: bool = True, n_queries: int = 50) -> dict:
+    """
+    현재 버전을 새로 빌드하여 새 버전으로 게시합니다.
+
+    빌드는 작성용 디렉토리에서 수행되고, 게시는 CURRENT 포인터 교체로 이루어지므로
+    검색 중인 서버는 다음 요청부터 새 버전을 사용합니다. 이전 버전은 롤백용으로 유지됩니다.
+
+    Returns:
+        dict: {collections, size_before, size_after, latency_before, latency_after, previous, version}
+    """
+    manager = manager or get_snapshot_manager()
+    catalog_ids = load_catalog_ids()
+
+    with manager.locked():
+        previous = manager.current()
+        path = manager.path_of(previous)
+        src_client = chromadb.PersistentClient(path=path)
+        latency_before = measure_latency(src_client, n_queries=n_queries)
+        size_before = dir_size(path) if previous else dir_size(path) - dir_size(manager.versions_dir)
+
+        version, building = manager.begin(copy_current=False)
+        try:
+            collections = rebuild(src_client, building, catalog_ids, drop_orphans=drop_orphans)
+            dst_client = chromadb.PersistentClient(path=building)
+            latency_after = measure_latency(dst_client, n_queries=n_queries)
+            manager.run_build_hooks(dst_client, building)
+        except BaseException:
+            manager.discard(building)
+            raise
+        size_after = dir_size(building)
+        manager.publish(version, building)
+
+    return {
+        "collections": collections,
+        "size_before": size_before,
+        "size_after": size_after,
+        "latency_before": latency_before,
+        "latency_after": latency_after,
+        "previous": previous,
+        "version": version,
+    }
+
+
+def _print_report(manager: SnapshotManager) -> None:
+    path = manager.current_path()
+    client = chromadb.PersistentClient(path=path)
+    catalog_ids = load_catalog_ids()
+    print(f"벡터 저장소: {path} (버전: {manager.current()}, {dir_size(path) / 1024 / 1024:.1f}MB)")
+    print(f"보관 중인 버전: {manager.versions()}")
+    if catalog_ids is None:
+        print(f"⚠️ 카탈로그 없음 ({CATALOG_PATH}), 고아 place_id 점검 생략")
+
+    for name, info in collection_report(client, catalog_ids).items():
+        if info is None:
+            print(f"- {name}: 컬렉션 없음")
+            continue
+        print(
+            f"- {name}: {info['count']}개 항목, {info['places']}곳, "
+            f"고아 {len(info['orphaned_places'])}곳, place_id 없음 {info['unparsable']}개, "
+            f"중복 키워드 {info['duplicate_keywords']}개, "
+            f"HNSW {info['hnsw']}"
+        )
+        if info["orphaned_places"]:
+            print(f"    고아 place_id: {info['orphaned_places'][:20]}")
+
+    for name, lat in measure_latency(client).items():
+        print(f"  {name} 검색 지연: p50 {lat['p50_ms']:.2f}ms / p95 {lat['p95_ms']:.2f}ms")
+
+
+def _print_compact(result: dict) -> None:
+    for name, c in result["collections"].items():
+        before = result["latency_before"].get(name, {})
+        after = result["latency_after"].get(name, {})
+        print(
+            f"- {name}: {c['before']} → {c['after']}개, "
+            f"p95 {before.get('p95_ms', 0):.2f}ms → {after.get('p95_ms', 0):.2f}ms"
+        )
+    print(
+        f"디스크: {result['size_before'] / 1024 / 1024:.1f}MB → "
+        f"{result['size_after'] / 1024 / 1024:.1f}MB "
+        f"(버전: {result['previous']} → {result['version']})"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="벡터 저장소 점검/압축")
+    parser.add_argument("command", choices=["report", "compact", "rollback", "partition", "migrate-ids", "coords", "reindex"])
+    parser.add_argument("--path", default=settings.VECTOR_STORE_PATH)
+    parser.add_argument("--keep-orphans", action="store_true", help="카탈로그에 없는 장소 항목 유지")
+    parser.add_argument("--queries", type=int, default=50, help="지연 시간 측정 질의 수")
+    args = parser.parse_args(argv)
+
+    # 메타데이터를 바꾸는 명령도 게시 전에 파생 인덱스를 함께 다시 만듦
+    manager = add_default_build_hooks(SnapshotManager(args.path))
+    if args.command == "report":
+        _print_report(manager)
+    elif args.command == "compact":
+        _print_compact(compact(manager, drop_orphans=not args.keep_orphans, n_queries=args.queries))
+    elif args.command == "partition":
+        for name, count in backfill_place_category(manager).items():
+            print(f"- {name}: place_category 갱신 {count}개")
+    elif args.command == "migrate-ids":
+        for name, info in migrate_place_ids(manager).items():
+            print(f"- {name}: place_id 변환 {info['migrated']}개, 읽을 수 없음 {info['unparsable']}개")
+    elif args.command == "coords":
+        for name, info in backfill_coordinates(manager).items():
+            print(f"- {name}: 좌표 갱신 {info['updated']}개, S3에서 찾지 못함 {info['missing']}개")
+    elif args.command == "reindex":
+        print(f"현재 버전: {reindex(manager)}")
+    else:
+        print(f"현재 버전: {manager.rollback()}")
+
+
+if __name__ == "__main__":
+    main()
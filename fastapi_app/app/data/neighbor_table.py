@@ -0,0 +1,467 @@
+"""
+키워드 이웃 테이블 모듈
+
+추출된 질의 키워드가 색인된 키워드와 정확히 같으면, 그 키워드의 상위 K개 이웃은
+인덱스가 바뀌기 전까지 항상 같습니다. 이 모듈은 컬렉션별로 색인된 키워드마다
+상위 K개 (place_id, keyword, distance)를 미리 계산해 두고, 검색 시 O(1)로 돌려줍니다.
+
+이웃은 컬렉션 전체에 대한 정확한 코사인 거리(1 - cos, ChromaDB cosine 공간과 동일)로 계산합니다.
+키워드 벡터는 검색 시와 같은 방식(문자열 하나씩 encode)으로 임베딩하여 저장해 두고 다음 버전에서 재사용합니다.
+버전 게시 시에는 이전 버전의 테이블과 항목 목록(항목 벡터 해시 포함)을 비교하여
+변경이 없는 컬렉션은 그대로 복사하고, 변경된 컬렉션도 영향을 받은 키워드만 다시 계산합니다.
+재업로드로 벡터가 바뀐 항목은 삭제 후 다시 추가된 항목으로 취급합니다.
+    - 새로 생긴 키워드, 벡터가 바뀐 항목의 키워드: 다시 임베딩하고 전체 다시 계산
+    - 이웃 중 삭제(또는 벡터가 변경)된 항목이 있는 키워드: 전체 다시 계산
+    - 나머지 키워드: 기존 이웃 + 추가된 항목만 비교하여 병합
+
+디렉토리 구조 ({버전 경로}/neighbors):
+    meta.json                      K, 컬렉션별 항목/키워드 수
+    {collection}.keys.json         키워드 목록 (행 순서)
+    {collection}.key_vectors.npy   (M, D) float32 정규화된 키워드 벡터 (검색 시 임베딩과 동일)
+    {collection}.entry_digests.npy (N,) uint64 항목 벡터 해시 (재업로드로 벡터가 바뀐 항목 감지)
+    {collection}.place_ids.npy     (N,) int64 항목 place_id
+    {collection}.entry_keys.npy    (N,) int32 항목 키워드 (keys 행 번호)
+    {collection}.categories.json   장소 카테고리 목록
+    {collection}.entry_categories.npy (N,) int16 항목 장소 카테고리 (categories 번호, -1은 없음)
+    {collection}.neighbors.npy     (M, K) int32 이웃 항목 번호 (-1은 빈칸)
+    {collection}.distances.npy     (M, K) float32 이웃 거리
+
+주요 구성요소:
+    - build_neighbor_tables: 이웃 테이블 생성 (이전 버전 기준 증분)
+    - NeighborTable: 컬렉션 하나의 이웃 테이블 (정확 일치 조회)
+    - load_neighbor_tables: 이웃 테이블 불러오기 (없으면 빈 dict)
+    - build_hook: manager가 게시하는 버전의 이웃 테이블 갱신 훅 (SnapshotManager 빌드 훅)
+
+사용법:
+    python -m app.data.neighbor_table build [--full]
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import numpy as np
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id
+
+NEIGHBOR_DIR = "neighbors"
+META_FILE = "meta.json"
+PAGE_SIZE = 1000
+QUERY_CHUNK = 256  # 키워드 이웃을 한 번에 계산/병합할 행 수
+FILES = (
+    "keys.json", "key_vectors.npy", "entry_digests.npy", "place_ids.npy", "entry_keys.npy",
+    "categories.json", "entry_categories.npy", "neighbors.npy", "distances.npy"
+)
+
+
+def neighbor_dir_of(store_path: str) -> str:
+    return os.path.join(store_path, NEIGHBOR_DIR)
+
+
+def query_encoder() -> Callable:
+    """검색 시 질의 키워드를 임베딩하는 함수 (문자열 하나를 벡터 하나로)"""
+    from app.services.embedding_factory import EmbeddingModelFactory
+    return EmbeddingModelFactory.get_instance().encode
+
+
+def _digest(vec) -> int:
+    return int.from_bytes(hashlib.blake2b(np.asarray(vec, dtype=np.float32).tobytes(), digest_size=8).digest(), "little")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(queries: np.ndarray, entries: np.ndarray, k: int) -> tuple:
+    """
+    각 질의 벡터의 상위 k개 항목을 정확히 계산합니다.
+
+    Returns:
+        tuple: ((Q, k) int32 항목 번호, (Q, k) float32 거리), 항목이 k개보다 적으면 -1 / inf로 채움
+    """
+    n_queries, n_entries = len(queries), len(entries)
+    indices = np.full((n_queries, k), -1, dtype=np.int32)
+    distances = np.full((n_queries, k), np.inf, dtype=np.float32)
+    top = min(k, n_entries)
+    if not top:
+        return indices, distances
+
+    for i in range(0, n_queries, QUERY_CHUNK):
+        dist = 1.0 - queries[i:i + QUERY_CHUNK] @ entries.T
+        part = np.argpartition(dist, top - 1, axis=1)[:, :top] if top < n_entries else np.tile(np.arange(n_entries), (len(dist), 1))
+        part_dist = np.take_along_axis(dist, part, axis=1)
+        order = np.argsort(part_dist, axis=1, kind="stable")
+        indices[i:i + len(dist), :top] = np.take_along_axis(part, order, axis=1)
+        distances[i:i + len(dist), :top] = np.take_along_axis(part_dist, order, axis=1)
+    return indices, distances
+
+
+def _read_entries(collection) -> tuple:
+    """
+    Returns:
+        tuple: (place_ids, keywords, place_categories, vectors, 항목 벡터 해시)
+    """
+    place_ids, keywords, place_categories, vectors = [], [], [], []
+    offset = skipped = 0
+    while True:
+        page = collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas", "documents", "embeddings"])
+        if not page["ids"]:
+            break
+        for doc_id, document, meta, vec in zip(page["ids"], page["documents"], page["metadatas"], page["embeddings"]):
+            meta = meta or {}
+            place_id = entry_place_id(meta, doc_id)
+            if place_id is None:
+                skipped += 1
+                continue
+            place_ids.append(place_id)
+            keywords.append(str(meta.get("keyword") or document or ""))
+            place_categories.append(str(meta.get("place_category") or ""))
+            vectors.append(vec)
+        offset += len(page["ids"])
+    if skipped:
+        print(f"⚠️ place_id를 읽을 수 없는 항목 {skipped}개를 이웃 테이블에서 제외했습니다. ({collection.name})")
+    digests = np.fromiter((_digest(vec) for vec in vectors), dtype=np.uint64, count=len(vectors))
+    return place_ids, keywords, place_categories, vectors, digests
+
+
+def _entry_map(place_ids, keywords, digests) -> dict:
+    """(place_id, keyword) → 항목 벡터 해시 (변경 여부 비교용)"""
+    return {(int(pid), kw): int(digest) for pid, kw, digest in zip(place_ids, keywords, digests)}
+
+
+def _key_vectors(keys: List[str], reuse: Dict[str, int], previous: Optional["NeighborTable"], encode) -> np.ndarray:
+    """
+    키워드 벡터를 검색 시와 같이 문자열 하나씩 임베딩합니다. (reuse에 있는 키워드는 이전 테이블의 벡터 재사용)
+    """
+    vectors = [None] * len(keys)
+    for i, kw in enumerate(keys):
+        row = reuse.get(kw)
+        if row is not None:
+            vectors[i] = np.asarray(previous.key_vectors[row], dtype=np.float32)
+        else:
+            vectors[i] = np.asarray(encode(kw), dtype=np.float32)
+    return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def _save_collection(
+    out_dir: str, name: str, keys, key_vectors, digests, place_ids, entry_keys, place_categories, neighbors, distances
+) -> None:
+    base = os.path.join(out_dir, name)
+    categories = sorted({c for c in place_categories if c})
+    code = {c: i for i, c in enumerate(categories)}
+    with open(f"{base}.keys.json", "w", encoding="utf-8") as f:
+        json.dump(list(keys), f, ensure_ascii=False)
+    with open(f"{base}.categories.json", "w", encoding="utf-8") as f:
+        json.dump(categories, f, ensure_ascii=False)
+    np.save(f"{base}.key_vectors.npy", np.asarray(key_vectors, dtype=np.float32))
+    np.save(f"{base}.entry_digests.npy", np.asarray(digests, dtype=np.uint64))
+    np.save(f"{base}.place_ids.npy", np.asarray(place_ids, dtype=np.int64))
+    np.save(f"{base}.entry_keys.npy", np.asarray(entry_keys, dtype=np.int32))
+    np.save(f"{base}.entry_categories.npy", np.asarray([code.get(c, -1) for c in place_categories], dtype=np.int16))
+    np.save(f"{base}.neighbors.npy", np.asarray(neighbors, dtype=np.int32))
+    np.save(f"{base}.distances.npy", np.asarray(distances, dtype=np.float32))
+
+
+def _build_collection(entries: tuple, previous: Optional["NeighborTable"], k: int, encode) -> tuple:
+    """
+    컬렉션 하나의 이웃 테이블을 계산합니다. previous가 있으면 영향을 받은 키워드만 다시 계산합니다.
+
+    Args:
+        entries (tuple): _read_entries 결과
+        previous (NeighborTable): 이전 버전의 테이블 (없으면 전체 계산)
+        k (int): 키워드별 이웃 수
+        encode (Callable): 질의 임베딩 함수 (문자열 하나 → 벡터)
+
+    Returns:
+        tuple: (keys, key_vectors, digests, place_ids, entry_keys, place_categories, neighbors, distances,
+                다시 계산한 키워드 수)
+    """
+    place_ids, keywords, place_categories, vectors, digests = entries
+    if not place_ids:
+        empty = np.zeros((0, k))
+        return [], np.zeros((0, 0)), digests, place_ids, np.zeros(0), place_categories, empty, empty, 0
+    keys = sorted(set(keywords))
+    key_row = {kw: i for i, kw in enumerate(keys)}
+    entry_keys = np.asarray([key_row[kw] for kw in keywords], dtype=np.int32)
+    entries = _normalize(np.asarray(vectors, dtype=np.float32))
+
+    neighbors = np.full((len(keys), k), -1, dtype=np.int32)
+    distances = np.full((len(keys), k), np.inf, dtype=np.float32)
+    dirty = np.ones(len(keys), dtype=bool)
+    reuse = {}
+
+    if previous is not None:
+        # 이전 항목 번호 → 새 항목 번호 (벡터가 바뀐 항목은 삭제된 것으로 보고 -1)
+        position = {(pid, keywords[i]): i for i, pid in enumerate(place_ids)}
+        old_to_new = np.full(len(previous.place_ids) + 1, -1, dtype=np.int64)
+        changed = set()
+        for j in range(len(previous.place_ids)):
+            kw = previous.keys[previous.entry_keys[j]]
+            i = position.get((int(previous.place_ids[j]), kw))
+            if i is None:
+                continue
+            if int(digests[i]) == int(previous.entry_digests[j]):
+                old_to_new[j] = i
+            else:
+                changed.add(kw)
+        added = np.setdiff1d(np.arange(len(place_ids)), old_to_new[old_to_new >= 0])
+
+        # 새 키워드와 항목 벡터가 바뀐 키워드는 다시 임베딩, 나머지는 저장된 키워드 벡터 재사용
+        reuse = {kw: previous.key_row[kw] for kw in keys if kw in previous.key_row and kw not in changed}
+        key_vectors = _key_vectors(keys, reuse, previous, encode)
+
+        old_rows = np.asarray([reuse.get(kw, -1) for kw in keys], dtype=np.int64)
+        known = np.flatnonzero(old_rows >= 0)
+        old_neighbors = np.asarray(previous.neighbors[old_rows[known]], dtype=np.int64)
+        mapped = old_to_new[old_neighbors]  # 빈칸(-1)은 마지막 원소(-1)로 매핑
+        lost = ((old_neighbors >= 0) & (mapped < 0)).any(axis=1)
+        clean = known[~lost]
+        mapped = mapped[~lost]
+
+        for i in range(0, len(clean), QUERY_CHUNK):
+            rows, old = clean[i:i + QUERY_CHUNK], mapped[i:i + QUERY_CHUNK]
+            merged_idx = old.astype(np.int32)
+            merged_dist = np.where(
+                old >= 0, np.asarray(previous.distances[old_rows[rows]], dtype=np.float32), np.inf
+            ).astype(np.float32)
+            if len(added):
+                add_dist = (1.0 - key_vectors[rows] @ entries[added].T).astype(np.float32)
+                merged_idx = np.concatenate([merged_idx, np.tile(added.astype(np.int32), (len(rows), 1))], axis=1)
+                merged_dist = np.concatenate([merged_dist, add_dist], axis=1)
+            order = np.argsort(merged_dist, axis=1, kind="stable")[:, :k]
+            neighbors[rows] = np.take_along_axis(merged_idx, order, axis=1)
+            distances[rows] = np.take_along_axis(merged_dist, order, axis=1)
+        dirty[clean] = False
+    else:
+        key_vectors = _key_vectors(keys, reuse, previous, encode)
+
+    rows = np.flatnonzero(dirty)
+    if len(rows):
+        neighbors[rows], distances[rows] = _top_k(key_vectors[rows], entries, k)
+    neighbors[~np.isfinite(distances)] = -1
+    return keys, key_vectors, digests, place_ids, entry_keys, place_categories, neighbors, distances, len(rows)
+
+
+def build_neighbor_tables(
+    client,
+    out_dir: str,
+    previous_dir: Optional[str] = None,
+    k: Optional[int] = None,
+    encode: Optional[Callable] = None
+) -> dict:
+    """
+    모든 컬렉션의 이웃 테이블을 out_dir에 생성합니다.
+
+    previous_dir(이전 버전의 이웃 테이블)가 있으면 항목 목록과 항목 벡터가 같은 컬렉션은 파일을 복사하고,
+    바뀐 컬렉션은 영향을 받은 키워드만 다시 계산합니다.
+
+    Args:
+        encode (Callable): 키워드 임베딩 함수 (미지정 시 검색에 쓰는 임베딩 모델, 새 키워드가 있을 때만 불러옴)
+
+    Returns:
+        dict: meta.json 내용
+    """
+    k = int(k or settings.NEIGHBOR_TABLE_K)
+    previous = load_neighbor_tables(previous_dir) if previous_dir else {}
+    model = {}
+
+    def _encode(keyword: str):
+        if "encode" not in model:
+            model["encode"] = encode or query_encoder()
+        return model["encode"](keyword)
+
+    tmp_dir = f"{out_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    meta = {"k": k, "created_at": time.time(), "collections": {}}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        start = time.perf_counter()
+        old = previous.get(name)
+        # K가 다르거나 키워드 벡터/항목 해시가 없는 이전 형식 테이블은 기준으로 쓰지 않음
+        if old is not None and (old.k != k or old.key_vectors is None or old.entry_digests is None):
+            old = None
+        entries = _read_entries(collection)
+        if old is not None and _entry_map(entries[0], entries[1], entries[4]) == old.entry_map():
+            for suffix in FILES:
+                shutil.copyfile(os.path.join(previous_dir, f"{name}.{suffix}"), os.path.join(tmp_dir, f"{name}.{suffix}"))
+            meta["collections"][name] = {"entries": len(old.place_ids), "keys": len(old.keys), "recomputed": 0}
+            continue
+
+        keys, key_vectors, digests, place_ids, entry_keys, place_categories, neighbors, distances, recomputed = (
+            _build_collection(entries, old, k, _encode)
+        )
+        _save_collection(
+            tmp_dir, name, keys, key_vectors, digests, place_ids, entry_keys, place_categories, neighbors, distances
+        )
+        meta["collections"][name] = {"entries": len(place_ids), "keys": len(keys), "recomputed": int(recomputed)}
+        print(
+            f"[INFO] 이웃 테이블 갱신: {name} (키워드 {len(keys)}개 중 {recomputed}개 재계산, "
+            f"{time.perf_counter() - start:.2f}s)"
+        )
+
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return meta
+
+
+class NeighborTable:
+    """
+    컬렉션 하나의 키워드 이웃 테이블
+
+    Attributes:
+        name (str): 컬렉션 이름
+        k (int): 키워드별 이웃 수
+        keys (List[str]): 키워드 목록
+        key_row (Dict[str, int]): 키워드 → 행 번호
+        key_vectors (np.ndarray): (M, D) 키워드 벡터 (이전 형식 테이블이면 None)
+        entry_digests (np.ndarray): (N,) 항목 벡터 해시 (이전 형식 테이블이면 None)
+        place_ids (np.ndarray): (N,) 항목 place_id
+        entry_keys (np.ndarray): (N,) 항목 키워드 행 번호
+        categories (List[str]): 장소 카테고리 목록
+        entry_categories (np.ndarray): (N,) 항목 장소 카테고리 번호
+        neighbors (np.ndarray): (M, K) 이웃 항목 번호
+        distances (np.ndarray): (M, K) 이웃 거리
+    """
+
+    def __init__(self, directory: str, name: str, k: int):
+        base = os.path.join(directory, name)
+        self.name = name
+        self.k = int(k)
+        with open(f"{base}.keys.json", "r", encoding="utf-8") as f:
+            self.keys: List[str] = json.load(f)
+        self.key_row = {kw: i for i, kw in enumerate(self.keys)}
+        # 증분 갱신에만 쓰는 파일 (이전 형식 테이블에는 없음)
+        self.key_vectors = self.entry_digests = None
+        if os.path.exists(f"{base}.key_vectors.npy") and os.path.exists(f"{base}.entry_digests.npy"):
+            self.key_vectors = np.load(f"{base}.key_vectors.npy", mmap_mode="r")
+            self.entry_digests = np.load(f"{base}.entry_digests.npy")
+        self.place_ids = np.load(f"{base}.place_ids.npy", mmap_mode="r")
+        self.entry_keys = np.load(f"{base}.entry_keys.npy", mmap_mode="r")
+        with open(f"{base}.categories.json", "r", encoding="utf-8") as f:
+            self.categories: List[str] = json.load(f)
+        self.category_code = {c: i for i, c in enumerate(self.categories)}
+        self.entry_categories = np.load(f"{base}.entry_categories.npy", mmap_mode="r")
+        self.neighbors = np.load(f"{base}.neighbors.npy", mmap_mode="r")
+        self.distances = np.load(f"{base}.distances.npy", mmap_mode="r")
+
+    def entry_map(self) -> dict:
+        """(place_id, keyword) → 항목 벡터 해시"""
+        return _entry_map(self.place_ids, [self.keys[int(row)] for row in self.entry_keys], self.entry_digests)
+
+    def lookup(
+        self,
+        keyword: str,
+        n_results: int = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None
+    ) -> Optional[Dict[str, list]]:
+        """
+        색인된 키워드와 정확히 같은 질의의 상위 n_results개 이웃을 ChromaDB query 결과 형태로 반환합니다.
+
+        조건(장소 카테고리/장소 id)이 있으면 상위 K개 이웃 중 조건에 맞는 항목을 고릅니다.
+        맞는 항목이 n_results개 이상이면 K개 밖의 항목은 모두 더 멀기 때문에 조건 검색 결과와 같고,
+        그렇지 않으면 (행이 컬렉션 전체를 담고 있지 않은 한) 답할 수 없으므로 None을 반환합니다.
+
+        Returns:
+            Optional[Dict[str, list]]: 검색 결과 (색인에 없는 키워드거나 테이블로 답할 수 없으면 None)
+        """
+        row = self.key_row.get(keyword)
+        if row is None or n_results > self.k:
+            return None
+        indices = np.asarray(self.neighbors[row], dtype=np.int64)
+        valid = indices >= 0
+        entries = indices[valid]
+        mask = np.ones(len(entries), dtype=bool)
+        if place_category is not None:
+            code = self.category_code.get(place_category)
+            if code is None:
+                return None
+            mask &= self.entry_categories[entries] == code
+        if place_ids is not None:
+            mask &= np.isin(self.place_ids[entries], np.fromiter(place_ids, dtype=np.int64))
+        if exclude_ids:
+            mask &= ~np.isin(self.place_ids[entries], np.fromiter(exclude_ids, dtype=np.int64))
+
+        selected = np.flatnonzero(mask)[:n_results]
+        if len(selected) < n_results and valid.all():
+            return None
+
+        metadatas = [
+            {"place_id": int(self.place_ids[i]), "keyword": self.keys[int(self.entry_keys[i])]}
+            for i in entries[selected]
+        ]
+        return {
+            "ids": [[f"{self.name}_{m['place_id']}_{m['keyword']}" for m in metadatas]],
+            "documents": [[m["keyword"] for m in metadatas]],
+            "metadatas": [metadatas],
+            "distances": [[float(d) for d in np.asarray(self.distances[row])[valid][selected]]],
+        }
+
+
+def load_neighbor_tables(directory: str) -> Dict[str, NeighborTable]:
+    """
+    이웃 테이블을 엽니다. (생성되지 않은 버전이면 빈 dict)
+    """
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return {name: NeighborTable(directory, name, meta["k"]) for name in meta["collections"]}
+
+
+def build_hook(manager) -> Callable:
+    """
+    manager가 게시하는 버전의 이웃 테이블을 갱신하는 빌드 훅을 반환합니다. (SnapshotManager 빌드 훅)
+
+    게시 전이므로 manager의 현재 버전이 곧 이전 버전이며, 그 테이블을 기준으로 증분 계산합니다.
+    """
+    def _hook(client, path: str) -> None:
+        build_neighbor_tables(client, neighbor_dir_of(path), neighbor_dir_of(manager.current_path()))
+    return _hook
+
+
+def main(argv=None) -> None:
+    import chromadb
+    from app.data.snapshots import SnapshotManager
+
+    parser = argparse.ArgumentParser(description="키워드 이웃 테이블 생성")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--path", default=settings.VECTOR_STORE_PATH)
+    parser.add_argument("--k", type=int, default=settings.NEIGHBOR_TABLE_K)
+    parser.add_argument("--full", action="store_true", help="기존 테이블을 무시하고 전체 다시 계산")
+    args = parser.parse_args(argv)
+
+    # 게시된 버전은 읽기 전용이므로, 현재 버전을 (파생 인덱스 포함) 복사한 새 버전에 만들어 게시
+    manager = SnapshotManager(args.path)
+    with manager.locked():
+        previous = neighbor_dir_of(manager.current_path())
+        version, building = manager.begin(keep_derived=True)
+        try:
+            client = chromadb.PersistentClient(path=building)
+            meta = build_neighbor_tables(client, neighbor_dir_of(building), None if args.full else previous, k=args.k)
+        except BaseException:
+            manager.discard(building)
+            raise
+        manager.publish(version, building)
+    print(json.dumps(meta, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
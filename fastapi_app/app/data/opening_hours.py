@@ -0,0 +1,195 @@
+"""
+장소 영업시간 비트맵 모듈
+
+이 모듈은 크롤러의 영업시간 테이블(day_of_week/open_time/close_time/is_break_time)을
+장소별 주간 비트맵(7일 × 96개 15분 구간, np.packbits로 84바이트)으로 변환하고,
+특정 시각에 영업 중이 아닌 장소를 한 번의 벡터 연산으로 찾는 인덱스를 제공합니다.
+
+비트맵은 수집 시 키워드 메타데이터(hours, 16진 문자열)로 저장되며,
+버전 게시 직전에 버전 경로의 hours.npz로 내보내 검색 쪽에서 바로 불러옵니다.
+영업시간 정보가 없는 장소는 알 수 없으므로 제외하지 않습니다.
+
+주요 구성요소:
+    - compile_hours: 영업시간 테이블 → 주간 비트맵 (브레이크타임 제외)
+    - OpeningHoursIndex: 시각별 영업 여부 조회 인덱스
+    - export_hours_index: ChromaDB 메타데이터 → hours.npz 내보내기
+    - load_hours_index: 버전 경로의 영업시간 인덱스 불러오기 (없으면 None)
+"""
+
+import os
+import re
+import math
+import numpy as np
+
+from datetime import datetime
+from typing import Dict, Optional, Set
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id
+
+HOURS_FILE = "hours.npz"
+PAGE_SIZE = 1000
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * SLOTS_PER_DAY
+PACKED_BYTES = WEEK_SLOTS // 8
+
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def _minutes(value) -> Optional[int]:
+    match = _TIME_RE.search(str(value or ""))
+    if not match:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+
+def _mark(week: np.ndarray, day: int, start_min: int, end_min: int, inner: bool) -> None:
+    """
+    day 요일 start_min ~ end_min(분) 구간의 슬롯을 표시합니다. (자정을 넘기면 다음 날로 이어짐)
+
+    inner가 True면 구간에 완전히 포함되는 슬롯만 표시합니다. (브레이크타임: 영업 중인 슬롯을 지우지 않도록)
+    """
+    if end_min <= start_min:
+        end_min += 24 * 60
+    if inner:
+        first, last = math.ceil(start_min / SLOT_MINUTES), end_min // SLOT_MINUTES
+    else:
+        first, last = start_min // SLOT_MINUTES, math.ceil(end_min / SLOT_MINUTES)
+    if last <= first:
+        return
+    week[(day * SLOTS_PER_DAY + np.arange(first, last)) % WEEK_SLOTS] = True
+
+
+def compile_hours(place_hours_table) -> Optional[np.ndarray]:
+    """
+    영업시간 테이블을 주간 비트맵으로 변환합니다.
+
+    Returns:
+        Optional[np.ndarray]: (84,) uint8 비트맵 (영업 구간을 알 수 없으면 None)
+    """
+    if place_hours_table is None or len(place_hours_table) == 0:
+        return None
+
+    opened = np.zeros(WEEK_SLOTS, dtype=bool)
+    breaks = np.zeros(WEEK_SLOTS, dtype=bool)
+    for row in place_hours_table.itertuples(index=False):
+        if row.day_of_week not in WEEKDAYS:
+            continue
+        start, end = _minutes(row.open_time), _minutes(row.close_time)
+        if start is None or end is None or start == end:
+            continue
+        day = WEEKDAYS.index(row.day_of_week)
+        if bool(row.is_break_time):
+            _mark(breaks, day, start, end, inner=True)
+        else:
+            _mark(opened, day, start, end, inner=False)
+
+    if not opened.any():
+        return None
+    return np.packbits(opened & ~breaks)
+
+
+def encode_hours(bits: Optional[np.ndarray]) -> Optional[str]:
+    return bits.tobytes().hex() if bits is not None else None
+
+
+def decode_hours(value: str) -> np.ndarray:
+    return np.frombuffer(bytes.fromhex(value), dtype=np.uint8)
+
+
+def slot_of(when: datetime) -> int:
+    """시각 → 주간 슬롯 번호 (naive datetime은 PLACE_TIMEZONE 기준으로 간주)"""
+    tz = ZoneInfo(settings.PLACE_TIMEZONE)
+    when = when.replace(tzinfo=tz) if when.tzinfo is None else when.astimezone(tz)
+    return when.weekday() * SLOTS_PER_DAY + (when.hour * 60 + when.minute) // SLOT_MINUTES
+
+
+class OpeningHoursIndex:
+    """
+    장소별 주간 영업시간 비트맵 인덱스
+
+    Attributes:
+        place_ids (np.ndarray): (N,) place_id
+        bits (np.ndarray): (N, 84) uint8 비트맵
+    """
+
+    def __init__(self, place_ids, bits):
+        self.place_ids = np.asarray(place_ids, dtype=np.int64)
+        self.bits = np.asarray(bits, dtype=np.uint8).reshape(-1, PACKED_BYTES)
+
+    def __len__(self) -> int:
+        return int(self.place_ids.shape[0])
+
+    def is_open(self, when: datetime) -> np.ndarray:
+        """(N,) 각 장소의 when 시각 영업 여부"""
+        slot = slot_of(when)
+        return ((self.bits[:, slot >> 3] >> (7 - (slot & 7))) & 1).astype(bool)
+
+    def closed_at(self, when: datetime) -> Set[int]:
+        """
+        when 시각에 영업하지 않는 장소 id 집합을 반환합니다. (영업시간 정보가 있는 장소 중)
+        """
+        return set(self.place_ids[~self.is_open(when)].tolist())
+
+
+def _read_hours(client) -> Dict[int, str]:
+    hours = {}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        offset = 0
+        while True:
+            page = collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas"])
+            if not page["ids"]:
+                break
+            for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                meta = meta or {}
+                place_id = entry_place_id(meta, doc_id)
+                if meta.get("hours") and place_id is not None:
+                    hours[place_id] = meta["hours"]
+            offset += len(page["ids"])
+    return hours
+
+
+def export_hours_index(client, store_path: str) -> int:
+    """
+    키워드 메타데이터의 영업시간 비트맵을 버전 경로의 hours.npz로 내보냅니다.
+
+    Returns:
+        int: 영업시간 정보가 있는 장소 수
+    """
+    hours = _read_hours(client)
+    place_ids = np.fromiter(hours.keys(), dtype=np.int64, count=len(hours))
+    bits = np.asarray([decode_hours(v) for v in hours.values()], dtype=np.uint8).reshape(-1, PACKED_BYTES)
+
+    path = os.path.join(store_path, HOURS_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, place_ids=place_ids, bits=bits)
+    os.replace(tmp, path)
+    return len(hours)
+
+
+def load_hours_index(store_path: str) -> Optional[OpeningHoursIndex]:
+    """
+    버전 경로의 영업시간 인덱스를 불러옵니다. (생성은 빌드 훅 또는 maintenance reindex)
+
+    Returns:
+        Optional[OpeningHoursIndex]: 영업시간 인덱스 (파일이 없으면 None)
+    """
+    path = os.path.join(store_path, HOURS_FILE)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return OpeningHoursIndex(data["place_ids"], data["bits"])
+
+
+def build_hook(client, path: str) -> None:
+    """벡터 저장소 버전 게시 직전에 영업시간 인덱스를 함께 생성합니다. (SnapshotManager 빌드 훅)"""
+    export_hours_index(client, path)
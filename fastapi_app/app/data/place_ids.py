@@ -0,0 +1,60 @@
+"""
+장소 id 파싱 모듈
+
+이 모듈은 벡터 저장소 항목의 place_id 메타데이터를 정수 장소 id로 읽습니다.
+초기 업로드(upload_chromadb)는 place_id에 문서 id("food_product_123_파스타")를 그대로 저장했으므로,
+정수가 아닌 값은 문서 id 형식에서 장소 id를 꺼내고, 그래도 읽을 수 없으면 None을 반환합니다.
+
+파생 인덱스 빌드와 점검 명령은 장소 id를 읽을 수 없는 항목을 건너뛰며,
+이전 형식의 place_id는 `python -m app.data.maintenance migrate-ids`로 정수로 다시 기록합니다.
+
+주요 구성요소:
+    - parse_place_id: place_id 값 또는 문서 id → 정수 장소 id
+    - entry_place_id: 항목 메타데이터(없으면 문서 id) → 정수 장소 id
+"""
+
+import re
+import numbers
+
+from typing import Any, Optional
+
+from app.core.constants import CATEGORY_MAP
+
+# 문서 id 형식: "{컬렉션 이름}_{장소 id}_{키워드}" (컬렉션 이름에도 "_"가 있으므로 이름 목록으로 구분)
+_DOC_ID_PATTERN = re.compile(
+    r"^(?:%s)_(\d+)(?:_|$)" % "|".join(
+        re.escape(name) for name in sorted(CATEGORY_MAP.values(), key=len, reverse=True)
+    )
+)
+
+
+def parse_place_id(value: Any) -> Optional[int]:
+    """
+    place_id 값을 정수로 변환합니다.
+
+    Returns:
+        Optional[int]: 장소 id (정수, 숫자 문자열, 문서 id 형식이 아니면 None)
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        text = value.strip()
+        if text.lstrip("-").isdigit():
+            return int(text)
+        match = _DOC_ID_PATTERN.match(text)
+        return int(match.group(1)) if match else None
+    return None
+
+
+def entry_place_id(metadata: Optional[dict], doc_id: Optional[str] = None) -> Optional[int]:
+    """
+    항목의 장소 id를 반환합니다. (메타데이터 place_id를 읽을 수 없으면 문서 id에서 추출)
+    """
+    place_id = parse_place_id((metadata or {}).get("place_id"))
+    if place_id is None and doc_id is not None:
+        place_id = parse_place_id(doc_id)
+    return place_id
@@ -0,0 +1,519 @@
+"""
+지역 샤드 분할 모듈
+
+이 모듈은 장소를 지역 단위로 묶어 여러 샤드 저장소로 나눕니다.
+각 샤드는 일반 벡터 저장소와 같은 버전 구조(SnapshotManager)와 파생 인덱스(좌표/영업시간/어휘 역색인/이웃 테이블)를 가지므로
+PlaceStore 하나로 그대로 열어 search_places 계약을 제공합니다.
+
+지역은 도로명주소의 앞 REGION_ADDRESS_DEPTH 단어(예: "경기 성남시")이며,
+주소가 없으면 좌표를 SHARD_REGION_DEG 격자로 나눈 칸을 사용합니다.
+한 지역의 장소는 모두 같은 샤드에 두고, 지역은 장소 수가 적은 샤드부터 채워 샤드 크기를 맞춥니다.
+지역을 알 수 없는 장소는 place_id로 샤드를 정합니다.
+
+분할 이후의 수집은 ShardRouter가 벡터 저장소 작성기의 커밋마다 작업을 장소가 속한 샤드에 나눠 반영합니다.
+새 장소는 지역(없으면 place_id)으로 샤드를 정해 샤드 맵에 추가하며, 처음 보는 지역은 장소 수가 가장 적은 샤드에 둡니다.
+
+디렉토리 구조:
+    {SHARD_ROOT}/shard_map.npz      장소/지역별 샤드 번호
+    {SHARD_ROOT}/shard-0            샤드 0 벡터 저장소 (CURRENT, versions/)
+    {SHARD_ROOT}/shard-1 ...
+
+주요 구성요소:
+    - region_of: 도로명주소/좌표 → 지역 이름
+    - ShardMap: 장소 id → 샤드 번호 조회 (장소 조건을 샤드별로 나눔)
+    - shard_transaction: 여러 샤드에 새 버전을 함께 작성/게시 (하나라도 실패하면 모두 버림)
+    - split_store: 현재 버전을 지역 샤드 저장소들로 분할하여 게시
+    - ShardRouter / get_shard_router: 커밋된 쓰기 작업을 소유 샤드에 반영
+
+사용법:
+    python -m app.data.shards split --shards 3
+    python -m app.data.shards show
+"""
+
+import sys
+import pysqlite3
+sys.modules["sqlite3"] = pysqlite3
+import sqlite3
+
+import os
+import math
+import json
+import argparse
+import threading
+import chromadb
+import numpy as np
+
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id, parse_place_id
+
+SHARD_MAP_FILE = "shard_map.npz"
+SHARD_DIR_PREFIX = "shard-"
+REGION_ADDRESS_DEPTH = 2
+PAGE_SIZE = 1000
+
+
+def region_of(coords: Optional[Tuple[float, float]] = None, road_address: Optional[str] = None) -> Optional[str]:
+    """
+    장소의 지역 이름을 반환합니다.
+
+    Args:
+        coords (Tuple[float, float]): (위도, 경도)
+        road_address (str): 도로명주소 (예: "경기 성남시 분당구 판교역로 166")
+
+    Returns:
+        Optional[str]: 지역 이름 (예: "경기 성남시", 주소가 없으면 "grid:3736,12710") (둘 다 없으면 None)
+    """
+    if isinstance(road_address, str):
+        words = road_address.split()
+        if len(words) >= REGION_ADDRESS_DEPTH:
+            return " ".join(words[:REGION_ADDRESS_DEPTH])
+    if coords:
+        deg = float(settings.SHARD_REGION_DEG)
+        return f"grid:{math.floor(coords[0] / deg)},{math.floor(coords[1] / deg)}"
+    return None
+
+
+def shard_dir_of(root: str, shard: int) -> str:
+    return os.path.join(root, f"{SHARD_DIR_PREFIX}{shard}")
+
+
+class ShardMap:
+    """
+    장소 id → 샤드 번호 조회 테이블
+
+    Attributes:
+        n_shards (int): 샤드 수
+        place_ids (np.ndarray): (N,) place_id (오름차순)
+        shards (np.ndarray): (N,) 샤드 번호
+        regions (Dict[str, int]): 지역 이름별 샤드 번호
+    """
+
+    def __init__(self, n_shards: int, place_ids, shards, regions: Optional[Dict[str, int]] = None):
+        order = np.argsort(np.asarray(place_ids, dtype=np.int64), kind="stable")
+        self.n_shards = int(n_shards)
+        self.place_ids = np.asarray(place_ids, dtype=np.int64)[order]
+        self.shards = np.asarray(shards, dtype=np.int32)[order]
+        self.regions = dict(regions or {})
+
+    def __len__(self) -> int:
+        return int(self.place_ids.shape[0])
+
+    @staticmethod
+    def hash_shard(place_id: int, n_shards: int) -> int:
+        """지역을 알 수 없는 장소의 샤드 번호"""
+        return int(place_id) % int(n_shards)
+
+    def shard_of(self, place_id: int) -> Optional[int]:
+        """장소의 샤드 번호 (샤드 맵에 없는 장소면 None)"""
+        if not len(self):
+            return None
+        pos = min(int(np.searchsorted(self.place_ids, place_id)), len(self) - 1)
+        return int(self.shards[pos]) if self.place_ids[pos] == place_id else None
+
+    def places_of(self, shard: int) -> Set[int]:
+        """샤드에 배정된 장소 id 집합"""
+        return set(self.place_ids[self.shards == shard].tolist())
+
+    def loads(self) -> List[int]:
+        """샤드별 장소 수"""
+        return np.bincount(self.shards, minlength=self.n_shards).tolist()
+
+    def extend(self, places: Dict[int, int], regions: Optional[Dict[str, int]] = None) -> "ShardMap":
+        """장소/지역 배정을 추가한 새 ShardMap을 반환합니다."""
+        return ShardMap(
+            self.n_shards,
+            np.concatenate([self.place_ids, np.fromiter(places.keys(), dtype=np.int64, count=len(places))]),
+            np.concatenate([self.shards, np.fromiter(places.values(), dtype=np.int32, count=len(places))]),
+            {**self.regions, **(regions or {})}
+        )
+
+    def partition(self, place_ids: Iterable[int]) -> Dict[int, Set[int]]:
+        """
+        장소 id들을 샤드별로 나눕니다. (분할 이후 추가되어 샤드를 모르는 장소는 모든 샤드에 포함)
+
+        Returns:
+            Dict[int, Set[int]]: 샤드 번호별 장소 id 집합 (해당하는 장소가 없는 샤드는 빠짐)
+        """
+        ids = np.fromiter((int(pid) for pid in place_ids), dtype=np.int64)
+        if not len(ids):
+            return {}
+        if not len(self):
+            return {shard: set(ids.tolist()) for shard in range(self.n_shards)}
+        pos = np.minimum(np.searchsorted(self.place_ids, ids), len(self) - 1)
+        known = self.place_ids[pos] == ids
+        shards = self.shards[pos[known]]
+        known_ids = ids[known]
+        groups = {int(shard): set(known_ids[shards == shard].tolist()) for shard in np.unique(shards)}
+        unknown = ids[~known].tolist()
+        if unknown:
+            for shard in range(self.n_shards):
+                groups.setdefault(shard, set()).update(unknown)
+        return groups
+
+    def save(self, root: str) -> None:
+        path = os.path.join(root, SHARD_MAP_FILE)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                n_shards=np.asarray(self.n_shards),
+                place_ids=self.place_ids,
+                shards=self.shards,
+                region_names=np.asarray(list(self.regions), dtype=str),
+                region_shards=np.asarray(list(self.regions.values()), dtype=np.int32),
+            )
+        os.replace(tmp, path)
+
+
+def load_shard_map(root: str) -> ShardMap:
+    with np.load(os.path.join(root, SHARD_MAP_FILE)) as data:
+        regions = dict(zip(data["region_names"].tolist(), data["region_shards"].tolist()))
+        return ShardMap(int(data["n_shards"]), data["place_ids"], data["shards"], regions)
+
+
+def assign_regions(region_sizes: Dict[str, int], n_shards: int) -> Dict[str, int]:
+    """
+    지역을 장소 수가 많은 순서로 현재 장소 수가 가장 적은 샤드에 배정합니다.
+
+    Returns:
+        Dict[str, int]: 지역 이름별 샤드 번호
+    """
+    loads = [0] * int(n_shards)
+    assigned = {}
+    for region, size in sorted(region_sizes.items(), key=lambda item: (-item[1], item[0])):
+        shard = min(range(len(loads)), key=lambda i: (loads[i], i))
+        assigned[region] = shard
+        loads[shard] += size
+    return assigned
+
+
+def _place_region(metadata: dict) -> Optional[str]:
+    """키워드 메타데이터의 지역 (수집 시 기록한 region, 없으면 좌표로 계산)"""
+    if metadata.get("region"):
+        return str(metadata["region"])
+    if "lat" in metadata and "lon" in metadata:
+        return region_of((float(metadata["lat"]), float(metadata["lon"])))
+    return None
+
+
+def build_shard_map(client, n_shards: int) -> ShardMap:
+    """
+    저장소의 모든 키워드 메타데이터를 읽어 장소별 샤드 번호를 정합니다.
+    """
+    place_regions: Dict[int, Optional[str]] = {}
+    for name in CATEGORY_MAP.values():
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        offset = 0
+        while True:
+            page = collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas"])
+            if not page["ids"]:
+                break
+            for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                meta = meta or {}
+                place_id = entry_place_id(meta, doc_id)
+                if place_id is None:
+                    continue
+                if place_regions.get(place_id) is None:
+                    place_regions[place_id] = _place_region(meta)
+            offset += len(page["ids"])
+
+    regions = assign_regions(
+        Counter(region for region in place_regions.values() if region is not None), n_shards
+    )
+    place_ids = np.fromiter(place_regions.keys(), dtype=np.int64, count=len(place_regions))
+    shards = np.asarray([
+        regions[region] if region is not None else ShardMap.hash_shard(place_id, n_shards)
+        for place_id, region in place_regions.items()
+    ], dtype=np.int32)
+    return ShardMap(n_shards, place_ids, shards, regions)
+
+
+def build_derived(client, path: str) -> None:
+    """
+    샤드 버전 게시 직전에 파생 인덱스를 생성합니다. (샤드 SnapshotManager 빌드 훅)
+
+    샤드는 분할할 때마다 새로 만들어지므로 이전 버전 기준 증분 갱신 없이 전체 생성합니다.
+    """
+    from app.data.geo_index import export_geo_index
+    from app.data.opening_hours import export_hours_index
+    from app.data.lexical_index import build_lexical_index, lexical_dir_of
+    from app.data.neighbor_table import build_neighbor_tables, neighbor_dir_of
+
+    export_geo_index(client, path)
+    export_hours_index(client, path)
+    if settings.LEXICAL_INDEX:
+        build_lexical_index(client, lexical_dir_of(path))
+    if int(settings.NEIGHBOR_TABLE_K) > 0:
+        build_neighbor_tables(client, neighbor_dir_of(path))
+    if settings.COMPACT_INDEX_EXPORT or settings.SHARD_BACKEND == "compact":
+        from app.data.compact_index import build_hook
+        build_hook(client, path)
+
+
+def get_shard_manager(root: str, shard: int):
+    """샤드 저장소의 SnapshotManager (파생 인덱스 빌드 훅 등록)"""
+    from app.data.snapshots import SnapshotManager
+
+    manager = SnapshotManager(root=shard_dir_of(root, shard))
+    manager.add_build_hook(build_derived)
+    return manager
+
+
+@contextmanager
+def shard_transaction(managers: dict, copy_current: bool = True):
+    """
+    여러 샤드에 새 버전을 함께 작성하는 쓰기 트랜잭션
+
+    모든 샤드를 (샤드 번호 순으로) 잠그고 작성용 버전을 만든 뒤, 블록이 정상 종료되면
+    모든 샤드의 빌드 훅을 실행하고 나서야 게시합니다. 어느 샤드에서든 예외가 발생하면
+    작성 중인 모든 샤드 버전을 버리므로, 일부 샤드에만 반영된 상태로 게시되지 않습니다.
+
+    Yields:
+        Dict[int, chromadb.PersistentClient]: 샤드 번호별 작성용 디렉토리 클라이언트
+    """
+    shards = sorted(managers)
+    with ExitStack() as stack:
+        for shard in shards:
+            stack.enter_context(managers[shard].locked())
+        staged = {}
+        try:
+            for shard in shards:
+                version, building = managers[shard].begin(copy_current=copy_current)
+                staged[shard] = (version, building)
+            clients = {shard: chromadb.PersistentClient(path=building) for shard, (_, building) in staged.items()}
+            yield clients
+            for shard, client in clients.items():
+                managers[shard].run_build_hooks(client, staged[shard][1])
+        except BaseException:
+            for shard, (_, building) in staged.items():
+                managers[shard].discard(building)
+            raise
+        for shard, (version, building) in staged.items():
+            managers[shard].publish(version, building)
+
+
+def split_store(src_client, root: str, n_shards: int) -> dict:
+    """
+    저장소를 지역 샤드 저장소들로 분할하여 각 샤드의 새 버전으로 게시합니다.
+
+    원본 컬렉션은 한 번만 읽어 항목을 샤드별로 나누며, 모든 샤드를 한 트랜잭션으로 게시합니다.
+    샤드 맵은 모든 샤드가 게시된 뒤에 교체하므로, 분할 도중에도 이전 샤드 맵과 샤드 버전으로 검색할 수 있습니다.
+
+    Returns:
+        dict: {shards, places, regions, entries: 샤드별 키워드 항목 수}
+    """
+    from app.data.chroma_db import get_hnsw_metadata_by_size
+    from app.data.maintenance import iter_entries
+
+    os.makedirs(root, exist_ok=True)
+    shard_map = build_shard_map(src_client, n_shards)
+    shard_of = dict(zip(shard_map.place_ids.tolist(), shard_map.shards.tolist()))
+    entries: List[Dict[str, int]] = [defaultdict(int) for _ in range(n_shards)]
+
+    managers = {shard: get_shard_manager(root, shard) for shard in range(n_shards)}
+    with shard_transaction(managers, copy_current=False) as clients:
+        for name in CATEGORY_MAP.values():
+            try:
+                collection = src_client.get_collection(name=name)
+            except Exception:
+                continue
+            kept = [{"ids": [], "documents": [], "metadatas": [], "embeddings": []} for _ in range(n_shards)]
+            for doc_id, document, metadata, embedding in iter_entries(collection):
+                place_id = entry_place_id(metadata, doc_id)
+                if place_id is None:
+                    continue
+                target = kept[shard_of.get(place_id, ShardMap.hash_shard(place_id, n_shards))]
+                target["ids"].append(doc_id)
+                target["documents"].append(document)
+                target["metadatas"].append(metadata)
+                target["embeddings"].append(embedding)
+
+            for shard, client in clients.items():
+                rows = kept[shard]
+                target = client.create_collection(name=name, metadata=get_hnsw_metadata_by_size(len(rows["ids"])))
+                for i in range(0, len(rows["ids"]), PAGE_SIZE):
+                    target.add(**{k: v[i:i + PAGE_SIZE] for k, v in rows.items()})
+                entries[shard][name] = len(rows["ids"])
+    for shard in range(n_shards):
+        print(f"[INFO] 샤드 {shard} 게시: {sum(entries[shard].values())}개 항목")
+
+    shard_map.save(root)
+    return {
+        "shards": n_shards,
+        "places": len(shard_map),
+        "regions": len(shard_map.regions),
+        "entries": [dict(e) for e in entries],
+    }
+
+
+class ShardRouter:
+    """
+    벡터 저장소 작성기가 커밋한 쓰기 작업을 장소가 속한 샤드 저장소에 나눠 반영합니다.
+
+    작업이 있는 샤드들을 한 번의 쓰기 트랜잭션(shard_transaction)으로 반영하므로 모든 샤드에 반영되거나 어느 샤드에도 반영되지 않으며,
+    샤드 맵에 없는 새 장소는 샤드를 정해 샤드 맵에 추가합니다. (ShardedPlaceStore가 refresh 시 다시 불러옴)
+
+    Attributes:
+        root (str): 샤드 저장소 경로
+        shard_map (ShardMap): 장소 id → 샤드 번호
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.SHARD_ROOT
+        self._map_mtime = None
+        self._reload()
+
+    def _reload(self) -> None:
+        """샤드 맵 파일이 바뀌었으면(다시 분할한 경우) 다시 불러옵니다."""
+        mtime = os.path.getmtime(os.path.join(self.root, SHARD_MAP_FILE))
+        if mtime != self._map_mtime:
+            self.shard_map = load_shard_map(self.root)
+            self.managers = [get_shard_manager(self.root, shard) for shard in range(self.shard_map.n_shards)]
+            self._map_mtime = mtime
+
+    def _assign(self, place_id: int, metadata: Optional[dict], places: Dict[int, int], regions: Dict[str, int]) -> Optional[int]:
+        """
+        장소의 샤드 번호를 정합니다. (샤드 맵 → 이번에 배정한 장소 → 지역 → place_id 순)
+
+        메타데이터가 없어 지역을 알 수 없는 새 장소는 배정하지 않고 None을 반환합니다.
+        """
+        shard = self.shard_map.shard_of(place_id)
+        if shard is None:
+            shard = places.get(place_id)
+        if shard is not None or metadata is None:
+            return shard
+
+        region = _place_region(metadata)
+        if region is None:
+            shard = ShardMap.hash_shard(place_id, self.shard_map.n_shards)
+        else:
+            shard = self.shard_map.regions.get(region, regions.get(region))
+            if shard is None:
+                loads = self.shard_map.loads()
+                for assigned in places.values():
+                    loads[assigned] += 1
+                shard = min(range(len(loads)), key=lambda i: (loads[i], i))
+                regions[region] = shard
+        places[place_id] = shard
+        return shard
+
+    def route(self, ops: list) -> tuple:
+        """
+        작업들을 샤드별 작업으로 나눕니다.
+
+        삭제할 문서의 장소를 알 수 없으면 모든 샤드에서 삭제합니다. (없는 문서 삭제는 무시됨)
+
+        Returns:
+            tuple: (샤드 번호별 WriteOp 목록, 새로 배정한 {place_id: 샤드}, 새로 배정한 {지역: 샤드})
+        """
+        from app.data.vector_writer import WriteOp
+
+        places: Dict[int, int] = {}
+        regions: Dict[str, int] = {}
+        n_shards = self.shard_map.n_shards
+        routed: List[Dict[str, WriteOp]] = [{} for _ in range(n_shards)]
+
+        def _op(shard: int, collection: str) -> WriteOp:
+            return routed[shard].setdefault(collection, WriteOp(collection))
+
+        for op in ops:
+            for i, doc_id in enumerate(op.ids):
+                metadata = op.metadatas[i] or {}
+                place_id = entry_place_id(metadata, doc_id)
+                shard = self._assign(place_id, metadata, places, regions) if place_id is not None else None
+                if shard is None:
+                    continue
+                target = _op(shard, op.collection)
+                target.ids.append(doc_id)
+                target.documents.append(op.documents[i])
+                target.metadatas.append(metadata)
+                target.embeddings.append(op.embeddings[i])
+            for doc_id, metadata in op.updates.items():
+                place_id = entry_place_id(metadata, doc_id)
+                shard = self._assign(place_id, metadata, places, regions) if place_id is not None else None
+                if shard is not None:
+                    _op(shard, op.collection).updates[doc_id] = metadata
+            for doc_id in op.delete_ids:
+                place_id = parse_place_id(doc_id)
+                shard = self._assign(place_id, None, places, regions) if place_id is not None else None
+                for target in ([shard] if shard is not None else range(n_shards)):
+                    _op(target, op.collection).delete_ids.append(doc_id)
+
+        return {shard: list(by_name.values()) for shard, by_name in enumerate(routed) if by_name}, places, regions
+
+    def apply(self, ops: list) -> Dict[int, int]:
+        """
+        작업들을 소유 샤드에 반영하고, 새 장소 배정을 샤드 맵에 추가합니다.
+
+        Returns:
+            Dict[int, int]: 샤드 번호별 반영한 항목 수
+        """
+        self._reload()
+        routed, places, regions = self.route(ops)
+        if routed:
+            with shard_transaction({shard: self.managers[shard] for shard in routed}) as clients:
+                for shard, shard_ops in routed.items():
+                    for op in shard_ops:
+                        op.apply(clients[shard].get_collection(name=op.collection))
+        applied = {shard: sum(op.size for op in shard_ops) for shard, shard_ops in routed.items()}
+
+        if places:
+            self.shard_map = self.shard_map.extend(places, regions)
+            self.shard_map.save(self.root)
+            self._map_mtime = os.path.getmtime(os.path.join(self.root, SHARD_MAP_FILE))
+        if applied:
+            print(f"[INFO] 샤드 반영: {applied} (새 장소 {len(places)}곳)")
+        return applied
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_shard_router() -> Optional[ShardRouter]:
+    """
+    SHARD_ROUTE_WRITES가 켜져 있고 SHARD_ROOT가 분할되어 있으면 공용 ShardRouter를 반환합니다. (그 외에는 None)
+    """
+    global _router
+    if not settings.SHARD_ROUTE_WRITES or not os.path.exists(os.path.join(settings.SHARD_ROOT, SHARD_MAP_FILE)):
+        return None
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ShardRouter()
+    return _router
+
+
+def main(argv=None) -> None:
+    from app.data.snapshots import get_snapshot_manager
+
+    parser = argparse.ArgumentParser(description="지역 샤드 분할")
+    parser.add_argument("command", choices=["split", "show"])
+    parser.add_argument("--root", default=settings.SHARD_ROOT)
+    parser.add_argument("--shards", type=int, default=int(settings.SHARD_COUNT))
+    args = parser.parse_args(argv)
+
+    if args.command == "split":
+        src_client = chromadb.PersistentClient(path=get_snapshot_manager().current_path())
+        print(json.dumps(split_store(src_client, args.root, args.shards), ensure_ascii=False, indent=2))
+        return
+
+    shard_map = load_shard_map(args.root)
+    places = Counter(shard_map.shards.tolist())
+    regions = defaultdict(list)
+    for region, shard in shard_map.regions.items():
+        regions[shard].append(region)
+    for shard in range(shard_map.n_shards):
+        print(f"shard-{shard}: 장소 {places.get(shard, 0)}개 | 지역 {', '.join(sorted(regions[shard])) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
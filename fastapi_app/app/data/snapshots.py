@@ -0,0 +1,410 @@
+"""
+벡터 저장소 버전(스냅샷) 관리 모듈
+
+이 모듈은 벡터 저장소를 읽기 전용 버전 단위로 관리합니다.
+색인 작업은 현재 버전을 복사한 임시 디렉토리에서 수행하고, 완료되면 새 버전으로 게시합니다.
+검색 쪽은 CURRENT 포인터가 가리키는 버전만 열기 때문에 작성 중인 상태나
+쓰기 작업의 SQLite 잠금과 마주치지 않습니다.
+
+디렉토리 구조:
+    {VECTOR_STORE_PATH}/CURRENT         현재 버전 이름 (예: v3)
+    {VECTOR_STORE_PATH}/versions/v3     게시된 버전 (읽기 전용)
+    {VECTOR_STORE_PATH}/versions/.building-v4  작성 중인 버전
+    {VECTOR_STORE_PATH}/leases/v3.{pid}.{n}    버전을 읽고 있는 핸들의 임대(lease)
+
+CURRENT가 없으면 VECTOR_STORE_PATH 자체를 저장소로 사용합니다. (기존 단일 저장소 호환)
+
+이전 버전 정리(prune)는 읽는 쪽을 고려합니다. 검색 핸들, 배포 압축 등 버전을 여는 쪽은 acquire로 임대를 등록하고
+다 쓰면 release로 해제하며, 임대가 남아 있거나(종료된 프로세스의 임대는 무시) CURRENT에서 내려온 지
+VECTOR_STORE_RETIRE_GRACE초가 지나지 않은 버전은 삭제하지 않습니다.
+(CURRENT를 읽은 직후 임대를 등록하기 전까지의 틈은 유예 시간이 보호)
+
+쓰기 비용: begin()은 현재 버전 전체를 복사(copytree + SQLite backup)하므로 커밋 한 번의 비용은
+저장소 크기에 비례합니다. 쓰기는 항목 단위가 아니라 VectorStoreWriter의 그룹 커밋으로 묶어서 반영해야 하며,
+커밋 간격은 VECTOR_WRITER_MIN_INTERVAL로 제한합니다.
+
+주요 구성요소:
+    - SnapshotManager: 버전 생성/게시/롤백/정리
+    - add_default_build_hooks: 설정에 맞는 파생 인덱스 빌드 훅 등록
+    - get_snapshot_manager: 공용 SnapshotManager 반환
+    - release_client: 더 이상 쓰지 않는 ChromaDB 클라이언트 자원 해제
+"""
+
+import sys
+import pysqlite3
+sys.modules["sqlite3"] = pysqlite3
+import sqlite3
+
+import os
+import re
+import time
+import fcntl
+import shutil
+import itertools
+import threading
+import chromadb
+
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+from chromadb.api.client import SharedSystemClient
+
+from app.core.config import settings
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+LOCK_FILE = ".lock"
+LEASES_DIR = "leases"
+RETIRED_FILE = ".retired"
+BUILDING_PREFIX = ".building-"
+SQLITE_FILE = "chroma.sqlite3"
+# 버전마다 새로 생성하는 파생 디렉토리/파일 (복사하면 이전 버전 내용이 남으므로 제외)
+DERIVED_DIRS = ("compact", "neighbors", "lexical", "geo.npz", "hours.npz")
+
+_VERSION_RE = re.compile(r"^v(\d+)$")
+_lease_seq = itertools.count(1)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def release_client(path: str) -> None:
+    """
+    path에 대해 열려 있는 ChromaDB 시스템을 종료하고 캐시에서 제거합니다.
+
+    ChromaDB는 경로별로 시스템을 프로세스 전역에 캐시하므로,
+    정리된 버전의 파일 핸들과 HNSW 인덱스 메모리를 반환하려면 명시적으로 해제해야 합니다.
+    """
+    system = SharedSystemClient._identifer_to_system.pop(path, None)
+    if system is not None:
+        try:
+            system.stop()
+        except Exception as e:
+            print(f"⚠️ ChromaDB 시스템 종료 실패 ({path}): {e}")
+
+
+def _copy_store(src: str, dst: str, keep_derived: bool = False) -> None:
+    """
+    저장소 디렉토리를 복사합니다. SQLite 파일은 backup API로 일관된 상태를 복사합니다.
+
+    파생 인덱스는 새 버전에서 빌드 훅이 다시 만들므로 기본적으로 제외합니다. (배포본은 keep_derived=True)
+    """
+    ignore = shutil.ignore_patterns(
+        CURRENT_FILE, VERSIONS_DIR, LEASES_DIR, LOCK_FILE, RETIRED_FILE, f"{SQLITE_FILE}*",
+        *(() if keep_derived else DERIVED_DIRS)
+    )
+    shutil.copytree(src, dst, ignore=ignore)
+
+    src_db = os.path.join(src, SQLITE_FILE)
+    if os.path.exists(src_db):
+        source = sqlite3.connect(src_db)
+        target = sqlite3.connect(os.path.join(dst, SQLITE_FILE))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+
+class SnapshotManager:
+    """
+    벡터 저장소 버전 관리자
+
+    Attributes:
+        root (str): 벡터 저장소 최상위 경로
+        keep (int): 보관할 게시 버전 수 (현재 버전 포함, 롤백용 이전 버전 유지)
+        grace (float): CURRENT에서 내려온 버전을 삭제하지 않고 두는 최소 시간 (초)
+    """
+
+    def __init__(self, root: Optional[str] = None, keep: Optional[int] = None, grace: Optional[float] = None):
+        self.root = os.path.normpath(root or settings.VECTOR_STORE_PATH)
+        self.versions_dir = os.path.join(self.root, VERSIONS_DIR)
+        self.leases_dir = os.path.join(self.root, LEASES_DIR)
+        self.keep = max(2, int(keep or settings.VECTOR_STORE_KEEP_VERSIONS))
+        self.grace = float(grace if grace is not None else settings.VECTOR_STORE_RETIRE_GRACE)
+        self._lock = threading.Lock()
+        self._build_hooks: List[Callable] = []
+        os.makedirs(self.versions_dir, exist_ok=True)
+        os.makedirs(self.leases_dir, exist_ok=True)
+
+    def add_build_hook(self, hook: Callable) -> None:
+        """
+        트랜잭션 게시 직전에 hook(client, 작성용 경로)를 호출하도록 등록합니다.
+        (압축 인덱스 등 버전과 함께 배포할 파생 파일 생성용)
+        """
+        self._build_hooks.append(hook)
+
+    def run_build_hooks(self, client, building: str) -> None:
+        for hook in self._build_hooks:
+            hook(client, building)
+
+    # -------- 조회 --------
+    def current(self) -> Optional[str]:
+        """현재 버전 이름을 반환합니다. (버전이 없는 기존 저장소면 None)"""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def path_of(self, version: Optional[str]) -> str:
+        return os.path.join(self.versions_dir, version) if version else self.root
+
+    def current_path(self) -> str:
+        return self.path_of(self.current())
+
+    def versions(self) -> List[str]:
+        """게시된 버전 목록을 오래된 순으로 반환합니다."""
+        found = [name for name in os.listdir(self.versions_dir) if _VERSION_RE.match(name)]
+        return sorted(found, key=lambda v: int(v[1:]))
+
+    def _next_version(self) -> str:
+        numbers = [int(v[1:]) for v in self.versions()]
+        return f"v{max(numbers, default=0) + 1}"
+
+    # -------- 읽기 임대 --------
+    def acquire(self, version: Optional[str]) -> Optional[str]:
+        """
+        버전을 읽는 동안 정리되지 않도록 임대를 등록합니다.
+
+        Returns:
+            Optional[str]: 임대 토큰 (release에 전달, 버전이 없는 기존 저장소면 None)
+
+        Raises:
+            FileNotFoundError: 이미 정리된 버전인 경우
+        """
+        if not version:
+            return None
+        token = os.path.join(self.leases_dir, f"{version}.{os.getpid()}.{next(_lease_seq)}")
+        with open(token, "w"):
+            pass
+        if not os.path.isdir(self.path_of(version)):
+            self.release(token)
+            raise FileNotFoundError(f"정리된 버전입니다: {version}")
+        return token
+
+    def release(self, token: Optional[str]) -> None:
+        """acquire로 등록한 임대를 해제합니다."""
+        if not token:
+            return
+        try:
+            os.remove(token)
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def leased(self, version: Optional[str]):
+        """블록 안에서 version을 임대합니다."""
+        token = self.acquire(version)
+        try:
+            yield self.path_of(version)
+        finally:
+            self.release(token)
+
+    def holders(self, version: str) -> int:
+        """version을 임대 중인 핸들 수 (종료된 프로세스의 임대는 지움)"""
+        count = 0
+        for name in os.listdir(self.leases_dir):
+            parts = name.split(".")
+            if len(parts) != 3 or parts[0] != version:
+                continue
+            if _pid_alive(int(parts[1])):
+                count += 1
+            else:
+                self.release(os.path.join(self.leases_dir, name))
+        return count
+
+    def _retired_at(self, version: str) -> float:
+        """version이 CURRENT에서 내려온 시각 (기록이 없으면 버전 디렉토리 수정 시각)"""
+        path = self.path_of(version)
+        for candidate in (os.path.join(path, RETIRED_FILE), path):
+            try:
+                return os.path.getmtime(candidate)
+            except OSError:
+                continue
+        return 0.0
+
+    # -------- 생성/게시 --------
+    def begin(self, copy_current: bool = True, keep_derived: bool = False) -> Tuple[str, str]:
+        """
+        새 버전 작성을 시작합니다.
+
+        Args:
+            copy_current (bool): 현재 버전 내용을 복사해서 시작할지 여부 (False면 빈 저장소)
+            keep_derived (bool): 파생 인덱스도 복사할지 여부 (저장소 내용은 그대로 두고 파생 인덱스 하나만 다시 만들 때)
+
+        Returns:
+            Tuple[str, str]: (새 버전 이름, 작성용 디렉토리 경로)
+        """
+        version = self._next_version()
+        building = os.path.join(self.versions_dir, f"{BUILDING_PREFIX}{version}")
+        shutil.rmtree(building, ignore_errors=True)
+
+        source = self.current_path()
+        if copy_current and os.path.exists(os.path.join(source, SQLITE_FILE)):
+            _copy_store(source, building, keep_derived=keep_derived)
+        else:
+            os.makedirs(building)
+        return version, building
+
+    def publish(self, version: str, building: str) -> str:
+        """
+        작성이 끝난 디렉토리를 버전으로 게시하고 CURRENT를 교체합니다.
+
+        CURRENT는 임시 파일을 쓴 뒤 os.replace로 교체하므로
+        읽는 쪽은 항상 이전 버전이나 새 버전 중 하나만 보게 됩니다.
+
+        Returns:
+            str: 게시된 버전 경로
+        """
+        release_client(building)
+        path = self.path_of(version)
+        os.rename(building, path)
+        self._set_current(version)
+        self.prune()
+        print(f"[INFO] 벡터 저장소 버전 게시: {version}")
+        return path
+
+    def discard(self, building: str) -> None:
+        release_client(building)
+        shutil.rmtree(building, ignore_errors=True)
+
+    def _set_current(self, version: str) -> None:
+        previous = self.current()
+        tmp = os.path.join(self.root, f".{CURRENT_FILE}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.root, CURRENT_FILE))
+
+        # 정리 유예 시간 계산용으로 CURRENT에서 내려온 시각을 기록
+        try:
+            os.remove(os.path.join(self.path_of(version), RETIRED_FILE))
+        except FileNotFoundError:
+            pass
+        if previous and previous != version and os.path.isdir(self.path_of(previous)):
+            with open(os.path.join(self.path_of(previous), RETIRED_FILE), "w", encoding="utf-8") as f:
+                f.write(str(time.time()))
+
+    def rollback(self) -> str:
+        """
+        CURRENT를 직전 버전으로 되돌립니다.
+
+        Returns:
+            str: 되돌린 버전 이름
+
+        Raises:
+            ValueError: 되돌릴 이전 버전이 없는 경우
+        """
+        with self.locked():
+            current = self.current()
+            versions = self.versions()
+            older = [v for v in versions if current is None or int(v[1:]) < int(current[1:])]
+            if not older:
+                raise ValueError("되돌릴 이전 버전이 없습니다.")
+            self._set_current(older[-1])
+            print(f"[INFO] 벡터 저장소 롤백: {current} → {older[-1]}")
+            return older[-1]
+
+    def prune(self) -> List[str]:
+        """
+        최신 keep개 버전과 현재 버전을 제외한 버전 중, 임대가 없고 유예 시간이 지난 버전을 삭제합니다.
+        (남겨 둔 버전은 다음 게시 때 다시 확인)
+
+        Returns:
+            List[str]: 삭제한 버전 목록
+        """
+        versions = self.versions()
+        keep = set(versions[-self.keep:])
+        current = self.current()
+        if current:
+            keep.add(current)
+
+        removed = []
+        now = time.time()
+        for version in versions:
+            if version in keep:
+                continue
+            if now - self._retired_at(version) < self.grace or self.holders(version):
+                continue
+            path = self.path_of(version)
+            release_client(path)
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(version)
+        return removed
+
+    # -------- 쓰기 트랜잭션 --------
+    @contextmanager
+    def locked(self):
+        """스레드/프로세스 간 쓰기 작업을 직렬화합니다."""
+        with self._lock:
+            with open(os.path.join(self.root, LOCK_FILE), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def transaction(self, copy_current: bool = True):
+        """
+        새 버전을 작성하는 쓰기 트랜잭션
+
+        블록이 정상 종료되면 빌드 훅을 실행한 뒤 새 버전을 게시하고, 예외가 발생하면 작성 중인 디렉토리를 버립니다.
+
+        Yields:
+            chromadb.PersistentClient: 작성용 디렉토리에 연결된 클라이언트
+        """
+        with self.locked():
+            version, building = self.begin(copy_current=copy_current)
+            try:
+                client = chromadb.PersistentClient(path=building)
+                yield client
+                self.run_build_hooks(client, building)
+            except BaseException:
+                self.discard(building)
+                raise
+            self.publish(version, building)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def add_default_build_hooks(manager: SnapshotManager) -> SnapshotManager:
+    """
+    좌표/영업시간 인덱스와 설정에 따라 어휘 역색인, 이웃 테이블, 압축 인덱스 빌드 훅을 등록합니다.
+
+    파생 인덱스는 게시 전에 작성용 경로에서만 만들며, 검색 쪽은 게시된 버전에 있는 파일만 불러옵니다.
+    """
+    from app.data.geo_index import build_hook as geo_build_hook
+    from app.data.opening_hours import build_hook as hours_build_hook
+    manager.add_build_hook(geo_build_hook)
+    manager.add_build_hook(hours_build_hook)
+    if settings.LEXICAL_INDEX:
+        from app.data.lexical_index import build_hook as lexical_build_hook
+        manager.add_build_hook(lexical_build_hook(manager))
+    if int(settings.NEIGHBOR_TABLE_K) > 0:
+        from app.data.neighbor_table import build_hook as neighbor_build_hook
+        manager.add_build_hook(neighbor_build_hook(manager))
+    if settings.COMPACT_INDEX_EXPORT or settings.RETRIEVAL_BACKEND == "compact":
+        from app.data.compact_index import build_hook
+        manager.add_build_hook(build_hook)
+    return manager
+
+
+def get_snapshot_manager() -> SnapshotManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = add_default_build_hooks(SnapshotManager())
+    return _manager
@@ -0,0 +1,316 @@
+"""
+벡터 저장소 단일 작성기 모듈
+
+이 모듈은 벡터 저장소에 대한 모든 쓰기를 전담하는 작성 스레드를 제공합니다.
+업로드 요청들은 추가/삭제 묶음을 작성기에 제출하고, 작성기는 일정 시간(N ms) 또는
+일정 항목 수(M개)마다 모인 묶음을 한 번의 쓰기 트랜잭션(새 버전 게시)으로 반영합니다.
+쓰기는 한 스레드에서만 일어나므로 SQLite 잠금 경합이 생기지 않고,
+여러 업로드를 묶어 반영하므로 버전 복사/게시 비용이 요청 수만큼 늘어나지 않습니다.
+커밋마다 저장소 전체를 복사하므로(SnapshotManager.begin) 커밋 사이에는 최소 간격(min_interval)을 두고
+그동안 들어온 요청을 다음 커밋에 모읍니다.
+지역 샤드(SHARD_ROOT)가 분할되어 있으면 커밋된 작업을 장소가 속한 샤드 저장소에도 반영합니다. (ShardRouter)
+
+주요 구성요소:
+    - WriteOp: 컬렉션 하나에 대한 추가/삭제 작업
+    - VectorStoreWriter: 그룹 커밋 작성 스레드
+    - get_vector_writer: 공용 작성기 반환
+    - shutdown_vector_writer: 남은 작업 반영 후 작성기 종료
+"""
+
+import time
+import queue
+import threading
+
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+from app.data.snapshots import SnapshotManager, get_snapshot_manager
+from app.data.distribution import get_snapshot_publisher
+from monitoring.metrics import pipeline_metrics
+
+_STOP = object()
+
+
+class _RollbackError(Exception):
+    """실패한 요청을 되돌리지 못해 그룹 커밋 전체를 버려야 하는 경우"""
+
+
+class WriteOp:
+    """
+    컬렉션 하나에 대한 쓰기 작업
+
+    delete_ids를 먼저 삭제한 뒤 ids를 upsert합니다.
+    (같은 id가 여러 번 제출되어도 중복 오류 없이 마지막 값이 반영됨)
+
+    Attributes:
+        collection (str): 컬렉션 이름
+        ids (List[str]): 추가할 문서 id
+        documents (List[str]): 추가할 문서
+        metadatas (List[dict]): 추가할 메타데이터
+        embeddings (List[List[float]]): 추가할 임베딩
+        delete_ids (List[str]): 삭제할 문서 id
+        updates (dict): 메타데이터만 갱신할 {id: metadata}
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+        embeddings: Optional[List[List[float]]] = None,
+        delete_ids: Optional[List[str]] = None,
+        updates: Optional[dict] = None
+    ):
+        self.collection = collection
+        self.ids = ids or []
+        self.documents = documents or []
+        self.metadatas = metadatas or []
+        self.embeddings = embeddings or []
+        self.delete_ids = delete_ids or []
+        self.updates = updates or {}
+
+    @property
+    def size(self) -> int:
+        return len(self.ids) + len(self.delete_ids) + len(self.updates)
+
+    @property
+    def touched_ids(self) -> List[str]:
+        """이 작업이 바꾸는 문서 id (중복 제거, 순서 유지)"""
+        return list(dict.fromkeys([*self.delete_ids, *self.updates, *self.ids]))
+
+    def validate(self) -> None:
+        """
+        Raises:
+            ValueError: 추가할 항목의 id/문서/메타데이터/임베딩 수가 맞지 않는 경우
+        """
+        lengths = {len(self.ids), len(self.documents), len(self.metadatas), len(self.embeddings)}
+        if self.ids and len(lengths) != 1:
+            raise ValueError(
+                f"추가 항목 수 불일치 ({self.collection}): ids {len(self.ids)}, documents {len(self.documents)}, "
+                f"metadatas {len(self.metadatas)}, embeddings {len(self.embeddings)}"
+            )
+
+    def apply(self, collection) -> None:
+        """작업을 컬렉션에 반영합니다. (삭제 → 메타데이터 갱신 → upsert)"""
+        if self.delete_ids:
+            collection.delete(ids=self.delete_ids)
+        if self.updates:
+            collection.update(ids=list(self.updates), metadatas=list(self.updates.values()))
+        if self.ids:
+            collection.upsert(
+                ids=self.ids,
+                documents=self.documents,
+                metadatas=self.metadatas,
+                embeddings=self.embeddings
+            )
+
+
+class _Request:
+    def __init__(self, ops: List[WriteOp]):
+        self.ops = ops
+        self.future: Future = Future()
+        self.size = sum(op.size for op in ops)
+
+
+class VectorStoreWriter:
+    """
+    벡터 저장소 그룹 커밋 작성기
+
+    Attributes:
+        flush_interval (float): 첫 요청 이후 묶음을 모으는 최대 시간(초)
+        max_items (int): 한 번에 반영할 최대 항목 수 (도달하면 최소 간격 전이라도 반영)
+        min_interval (float): 이전 커밋 종료 후 다음 커밋까지의 최소 간격(초)
+        on_commit (Callable): 새 버전 게시 후 버전 이름으로 호출되는 콜백 (배포 등)
+        router (Optional[ShardRouter]): 커밋된 작업을 지역 샤드 저장소에도 반영하는 라우터
+    """
+
+    def __init__(
+        self,
+        manager: Optional[SnapshotManager] = None,
+        flush_interval_ms: Optional[float] = None,
+        max_items: Optional[int] = None,
+        on_commit: Optional[Callable[[str], None]] = None,
+        min_interval: Optional[float] = None,
+        router=None
+    ):
+        self.manager = manager or get_snapshot_manager()
+        self.on_commit = on_commit
+        self.router = router
+        self.flush_interval = float(flush_interval_ms or settings.VECTOR_WRITER_FLUSH_MS) / 1000
+        self.max_items = int(max_items or settings.VECTOR_WRITER_MAX_ITEMS)
+        self.min_interval = float(min_interval if min_interval is not None else settings.VECTOR_WRITER_MIN_INTERVAL)
+        self._last_commit = float("-inf")
+        self._inbox: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="vector-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, ops: List[WriteOp]) -> Future:
+        """
+        쓰기 작업 묶음을 제출합니다.
+
+        Returns:
+            Future: 반영이 끝나면 게시된 버전 이름을 결과로 가지는 Future
+        """
+        if self._closed:
+            raise RuntimeError("종료된 작성기에는 작업을 제출할 수 없습니다.")
+        request = _Request([op for op in ops if op.size])
+        if not request.ops:
+            request.future.set_result(self.manager.current())
+            return request.future
+        self._inbox.put(request)
+        return request.future
+
+    def _collect(self) -> tuple:
+        """
+        첫 요청을 기다린 뒤 flush_interval 동안(이전 커밋 후 min_interval이 지나지 않았으면 그때까지)
+        max_items까지 요청을 모읍니다.
+
+        Returns:
+            tuple: (요청 목록, 종료 신호 수신 여부)
+        """
+        first = self._inbox.get()
+        if first is _STOP:
+            return [], True
+
+        batch, total = [first], first.size
+        deadline = max(time.monotonic() + self.flush_interval, self._last_commit + self.min_interval)
+        while total < self.max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._inbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return batch, True
+            batch.append(request)
+            total += request.size
+        return batch, False
+
+    def _apply_request(self, client, request: _Request) -> None:
+        """
+        요청 하나의 작업들을 모두 반영하거나, 하나도 반영하지 않습니다.
+
+        작업을 반영하기 전에 모든 작업을 검사하고(컬렉션 존재, 항목 수), 반영 도중 실패하면
+        이미 반영한 작업이 바꾼 문서를 반영 전 상태로 되돌린 뒤 예외를 발생시킵니다.
+
+        Raises:
+            Exception: 요청 반영 실패 (작성 중인 버전은 요청 전 상태)
+            _RollbackError: 되돌리기까지 실패한 경우 (작성 중인 버전 상태를 알 수 없음)
+        """
+        collections = []
+        for op in request.ops:
+            op.validate()
+            collections.append(client.get_collection(name=op.collection))
+
+        applied = []
+        try:
+            for op, collection in zip(request.ops, collections):
+                touched = op.touched_ids
+                before = collection.get(ids=touched, include=["documents", "metadatas", "embeddings"])
+                applied.append((collection, touched, before))
+                op.apply(collection)
+        except Exception:
+            try:
+                for collection, touched, before in reversed(applied):
+                    collection.delete(ids=touched)
+                    if before["ids"]:
+                        collection.upsert(
+                            ids=before["ids"],
+                            documents=before["documents"],
+                            metadatas=before["metadatas"],
+                            embeddings=before["embeddings"]
+                        )
+            except Exception as e:
+                raise _RollbackError(f"요청 되돌리기 실패: {str(e)}") from e
+            raise
+
+    def _commit(self, batch: List[_Request]) -> None:
+        start = time.perf_counter()
+        failed = {}
+        try:
+            with self.manager.transaction() as client:
+                for request in batch:
+                    try:
+                        self._apply_request(client, request)
+                    except _RollbackError:
+                        # 일부만 반영된 요청이 게시되지 않도록 그룹 커밋 전체를 버림
+                        raise
+                    except Exception as e:
+                        # 요청 단위로 실패 처리하고 나머지 요청은 계속 반영 (실패한 요청은 반영 전 상태로 되돌림)
+                        failed[id(request)] = e
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            print(f"❌ 벡터 저장소 그룹 커밋 실패 ({len(batch)}건): {e}")
+            return
+        finally:
+            pipeline_metrics.vector_write_latency.observe(time.perf_counter() - start)
+            pipeline_metrics.vector_write_batch.observe(sum(r.size for r in batch))
+
+        version = self.manager.current()
+        for request in batch:
+            error = failed.get(id(request))
+            if error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(version)
+        print(f"[INFO] 벡터 저장소 그룹 커밋: {len(batch)}건, {sum(r.size for r in batch)}개 항목 → {version}")
+        committed = [op for request in batch if id(request) not in failed for op in request.ops]
+        if self.router is not None and committed:
+            try:
+                self.router.apply(committed)
+            except Exception as e:
+                # 반영하지 못한 샤드는 `python -m app.data.shards split`으로 다시 맞춤
+                print(f"❌ 샤드 저장소 반영 실패 ({version}): {e}")
+        if self.on_commit:
+            try:
+                self.on_commit(version)
+            except Exception as e:
+                print(f"⚠️ 커밋 후처리 실패 ({version}): {e}")
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if batch:
+                self._commit(batch)
+                self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        """제출된 작업을 모두 반영한 뒤 작성 스레드를 종료합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._inbox.put(_STOP)
+        self._thread.join()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_vector_writer() -> VectorStoreWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from app.data.shards import get_shard_router
+                publisher = get_snapshot_publisher()
+                _writer = VectorStoreWriter(
+                    on_commit=publisher.publish_async if publisher else None,
+                    router=get_shard_router()
+                )
+    return _writer
+
+
+def shutdown_vector_writer() -> None:
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
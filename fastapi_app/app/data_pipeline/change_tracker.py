@@ -0,0 +1,125 @@
+"""
+장소 변경 감지 모듈
+
+이 모듈은 재업로드 시 실제로 바뀐 부분만 처리할 수 있도록
+장소별 입력 섹션(메뉴, 시설, 후기)의 콘텐츠 해시와 마지막으로 색인한 키워드를 저장합니다.
+
+주요 구성요소:
+    - section_hashes: 섹션별 콘텐츠 해시 계산
+    - PlaceStateStore: 장소별 해시/키워드 상태 저장소 (SQLite)
+    - get_state_store: 공용 상태 저장소 반환
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from typing import Optional
+
+from app.core.config import settings
+
+
+def _digest(value) -> str:
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def section_hashes(place_menu_table, place_facilities, place_reviews) -> dict[str, str]:
+    """
+    LLM 키워드 추출 입력이 되는 섹션별 콘텐츠 해시를 계산합니다.
+
+    순서에 의존하지 않도록 정렬 후 해시합니다.
+    """
+    menu = sorted(
+        (str(name), "" if price is None else str(price))
+        for name, price in place_menu_table[["menu_name", "price"]].itertuples(index=False)
+    )
+    reviews = sorted(str(t) for t in place_reviews["text"]) if "text" in place_reviews else []
+
+    return {
+        "menu": _digest(menu),
+        "facilities": _digest(sorted(str(f) for f in place_facilities)),
+        "reviews": _digest(reviews),
+    }
+
+
+class PlaceStateStore:
+    """
+    장소별 마지막 색인 상태 저장소
+
+    섹션 해시, LLM이 생성한 소개글/장소 카테고리, 색인한 키워드를 저장합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS place_state (
+                place_id INTEGER PRIMARY KEY,
+                hashes TEXT NOT NULL,
+                description TEXT,
+                category TEXT,
+                keywords TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, place_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hashes, description, category, keywords FROM place_state WHERE place_id = ?",
+                (int(place_id),)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "hashes": json.loads(row[0]),
+            "description": row[1],
+            "category": row[2],
+            "keywords": json.loads(row[3]),
+        }
+
+    def put(
+        self,
+        place_id: int,
+        hashes: dict,
+        description: Optional[str],
+        category: Optional[str],
+        keywords: dict
+    ) -> None:
+        keywords = {c: [str(k) for k in kws] for c, kws in keywords.items()}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO place_state VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    int(place_id),
+                    json.dumps(hashes),
+                    description,
+                    category,
+                    json.dumps(keywords, ensure_ascii=False),
+                    time.time(),
+                )
+            )
+            self._conn.commit()
+
+
+_state_store = None
+_state_lock = threading.Lock()
+
+
+def get_state_store() -> PlaceStateStore:
+    global _state_store
+    if _state_store is None:
+        with _state_lock:
+            if _state_store is None:
+                _state_store = PlaceStateStore(settings.INGEST_STATE_PATH)
+    return _state_store
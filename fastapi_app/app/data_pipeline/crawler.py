@@ -1,17 +1,21 @@
 import re
 import time
-import requests
 import pandas as pd
 
+from typing import Optional
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 from app.core.config import settings
+from app.data_pipeline.fetcher import (
+    BrowserPool,
+    BrowserSession,
+    HttpFetcher,
+    get_http_session,
+    has_section,
+    parse_section_modes,
+    place_url,
+)
+from app.data_pipeline.geocoder import KakaoGeocoder
 
 def crawl_place_table(place_id: int, soup: BeautifulSoup, KAKAO_API_KEY: str) -> pd.DataFrame:
     """
@@ -49,26 +53,17 @@ def crawl_place_table(place_id: int, soup: BeautifulSoup, KAKAO_API_KEY: str) ->
     address_query = road_address or name
     lon, lat = None, None
     if address_query:
-        address_query = re.sub(r"\(우\)?\d{5}", "", address_query).strip()
-        try:
-            resp = requests.get(
-                "https://dapi.kakao.com/v2/local/search/address.json",
-                headers={"Authorization": f"KakaoAK {KAKAO_API_KEY}"},
-                params={"query": address_query},
-                timeout=5
-            )
-            result = resp.json().get("documents")
-            if result:
-                lon = float(result[0]["x"])
-                lat = float(result[0]["y"])
-        except Exception as e:
-            print(f"[WARNING] 좌표 변환 실패: {address_query} → {e}")
+        coords = KakaoGeocoder(KAKAO_API_KEY).lookup(address_query)
+        if coords:
+            lon, lat = coords
 
     location = f"SRID=4326;POINT({lon} {lat})" if lon and lat else ""
 
     # --------------------- 이미지 ---------------------
     temp_image_path = settings.TEMP_IMAGE_PATH
     s3_image_path = settings.S3_IMAGE_PATH
+    image_url = None
+    image_src = None
     try:
         first_img = soup.select_one("div.board_photo img")
         if first_img and first_img.get("src"):
@@ -76,13 +71,15 @@ def crawl_place_table(place_id: int, soup: BeautifulSoup, KAKAO_API_KEY: str) ->
             if src.startswith("//"):
                 src = "https:" + src
 
-            r = requests.get(src, stream=True)
-            r.raise_for_status()
-            with open(f"{temp_image_path}/{place_id}.jpg", "wb") as f:
-                for chunk in r.iter_content(1024):
-                    f.write(chunk)
-
-            image_url = f"{s3_image_path}/{place_id}.jpg"
+            image_src = src
+            # stream 모드에서는 업로드 단계에서 원본 URL로부터 S3에 바로 전송하고, 전송에 성공하면 image_url을 채움
+            if settings.IMAGE_TRANSFER_MODE != "stream":
+                r = get_http_session().get(src, stream=True, timeout=settings.HTTP_TIMEOUT)
+                r.raise_for_status()
+                with open(f"{temp_image_path}/{place_id}.jpg", "wb") as f:
+                    for chunk in r.iter_content(64 * 1024):
+                        f.write(chunk)
+                image_url = f"{s3_image_path}/{place_id}.jpg"
 
     except Exception as e:
         print(f"[WARN] 이미지 저장 실패: {e}")
@@ -95,6 +92,7 @@ def crawl_place_table(place_id: int, soup: BeautifulSoup, KAKAO_API_KEY: str) ->
         "location": location,
         "description": None,
         "image_url": image_url,
+        "image_src": image_src,  # 내보내기 단계에서 이미지 업로드 후 제거
         "name": name,
         "phone": phone,
         "lot_address": None,
@@ -268,87 +266,69 @@ def crawl_place_reviews(soup: BeautifulSoup) -> pd.DataFrame:
     return df.sort_values(by='score', ascending=False).reset_index(drop=True)
 
 
-def crawling(place_id):
+def crawling(
+    place_id,
+    section_modes: Optional[dict] = None,
+    browser_pool: Optional[BrowserPool] = None,
+    timings: Optional[dict] = None
+):
     """
     전체 데이터 페이지 단위 크롤링
+
+    섹션(main/menu/reviews)별로 HTTP 또는 브라우저 수집 방식을 선택합니다.
+    HTTP로 가져온 페이지에 섹션이 렌더링되어 있지 않으면 브라우저로 대체 수집합니다.
+    HTTP 요청의 일시적 오류(연결 실패, 429/5xx)는 그대로 발생하므로 CrawlScheduler가 재시도합니다.
+
+    Args:
+        place_id (int): 카카오 장소 id
+        section_modes (dict): 섹션별 수집 방식 (미지정 시 CRAWL_SECTION_MODES 설정 사용)
+        browser_pool (BrowserPool): 재사용할 드라이버 풀 (미지정 시 크롤링마다 드라이버 생성)
+        timings (dict): 전달 시 섹션별 {"mode", "seconds"} 측정값을 기록
     """
-    # Selenium 드라이버 설정
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    service = Service("/usr/bin/chromedriver")
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-
-    url = f'https://place.map.kakao.com/{place_id}'
-    driver.get(url)
-    
-    # --------------메인 페이지 크롤링--------------
-    try:
-        # JS 로딩이 완료될 때까지 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "h3.tit_place"))
-        )
-        time.sleep(1)
-    except:
-        print(f"[ERROR] 메인 페이지 로딩 실패: {url}")
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-    place_table = crawl_place_table(place_id, soup, settings.KAKAO_API_KEY)
-    place_hours_table = crawl_place_hours_table(place_id, soup)
-    place_facilities = crawl_place_facilities(soup)
-
-    # --------------메뉴 페이지 크롤링--------------
-    try:
-        info_tab = driver.find_element(By.XPATH, "//a[@href='#menuInfo']")
-        driver.execute_script("arguments[0].click();", info_tab)
-        time.sleep(1)
-    except:
-        print(f"[ERROR] 메뉴 페이지 로딩 실패: {url}")
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    
-    place_menu_table = crawl_place_menu_table(place_id, soup)
-
-    # --------------후기 페이지 크롤링--------------
+    modes = section_modes or parse_section_modes(settings.CRAWL_SECTION_MODES)
+    url = place_url(place_id)
+    http = HttpFetcher()
+    browser = BrowserSession(url, pool=browser_pool)
+    http_soup = None
+
+    def _section_soup(section: str, browser_loader) -> BeautifulSoup:
+        nonlocal http_soup
+        start = time.perf_counter()
+        mode = "browser"
+        try:
+            if modes.get(section) == "http":
+                if http_soup is None:
+                    http_soup = http.fetch(url)
+                if has_section(http_soup, section):
+                    mode = "http"
+                    return http_soup
+                print(f"[INFO] HTTP 수집 결과에 {section} 섹션이 없어 브라우저로 대체합니다: {url}")
+            return browser_loader()
+        finally:
+            if timings is not None:
+                timings[section] = {"mode": mode, "seconds": time.perf_counter() - start}
+
     try:
-        info_tab = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//a[@href='#comment']"))
-        )
-        driver.execute_script("arguments[0].click();", info_tab)
-        time.sleep(1)
-
-        # 무한 스크롤
-        scroll_pause_time = 0.5
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        while True:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(scroll_pause_time)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
-        # 더보기 버튼 모두 클릭 (여러 번 탐색)
-        for _ in range(3):  # 최대 3회 반복
-            try:
-                buttons = driver.find_elements(By.CSS_SELECTOR, "span.btn_more")
-                if not buttons:
-                    break
-                for btn in buttons:
-                    try:
-                        driver.execute_script("arguments[0].click();", btn)
-                        time.sleep(0.1)
-                    except:
-                        continue
-            except Exception as e:
-                print(f"❗ 더보기 클릭 실패: {e}")
-                break
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        # --------------메인 페이지 크롤링--------------
+        soup = _section_soup("main", browser.main_page)
 
-        place_reviews = crawl_place_reviews(soup)
-        
-    except Exception as e:
-        print(f"[ERROR] 후기 페이지 로딩 실패: {url}")
-        place_reviews = pd.DataFrame(columns=["score", "text"])
+        place_table = crawl_place_table(place_id, soup, settings.KAKAO_API_KEY)
+        place_hours_table = crawl_place_hours_table(place_id, soup)
+        place_facilities = crawl_place_facilities(soup)
 
+        # --------------메뉴 페이지 크롤링--------------
+        soup = _section_soup("menu", browser.menu_page)
+
+        place_menu_table = crawl_place_menu_table(place_id, soup)
+
+        # --------------후기 페이지 크롤링--------------
+        try:
+            soup = _section_soup("reviews", browser.review_page)
+            place_reviews = crawl_place_reviews(soup)
+        except Exception as e:
+            print(f"[ERROR] 후기 페이지 로딩 실패: {url}")
+            place_reviews = pd.DataFrame(columns=["score", "text"])
+    finally:
+        browser.close()
 
-    return place_table, place_hours_table, place_facilities, place_menu_table, place_reviews
\ No newline at end of file
+    return place_table, place_hours_table, place_facilities, place_menu_table, place_reviews
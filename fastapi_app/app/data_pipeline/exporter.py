@@ -0,0 +1,304 @@
+"""
+장소 메타데이터 S3 내보내기 모듈
+
+이 모듈은 크롤링한 장소 테이블을 S3에 내보냅니다.
+모든 업로드는 공용 S3 클라이언트의 커넥션 풀을 공유하며,
+장소 하나의 이미지를 먼저 업로드해 image_url을 확정한 뒤 CSV 3종을 동시에 업로드합니다.
+이미지 업로드에 실패하면 image_url을 비우고 나머지 내보내기를 계속합니다.
+
+주요 구성요소:
+    - S3Exporter: 장소 단위 CSV 내보내기 (기본)
+    - ColumnarExporter: 여러 장소를 Parquet 파일 하나로 묶어 내보내기 + manifest
+    - get_exporter: 설정(S3_EXPORT_FORMAT)에 맞는 공용 exporter 반환
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import threading
+import pandas as pd
+
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.data_pipeline.image_transfer import transfer_image
+from app.services.s3_client_factory import S3ClientFactory
+
+TABLES = ("place_table", "place_hours_table", "place_menu_table")
+IMAGE_SOURCE_COLUMN = "image_src"  # 크롤러가 넘기는 원본 이미지 URL (내보내기 전에 제거)
+
+
+class S3Exporter:
+    """
+    장소 단위 S3 내보내기
+
+    `{place_id}/{table}.csv` 형식의 객체로 업로드합니다.
+    """
+
+    def __init__(self, s3_client=None, max_workers: Optional[int] = None):
+        self.s3 = s3_client or S3ClientFactory.get_instance()
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(max_workers or settings.S3_MAX_POOL_CONNECTIONS),
+            thread_name_prefix="s3-export"
+        )
+
+    def _put_csv(self, key: str, table: pd.DataFrame) -> None:
+        self.s3.put_object(
+            Bucket=settings.S3_METADATA_PATH,
+            Key=key,
+            Body=table.to_csv(index=False).encode("utf-8"),
+            ContentType="text/csv"
+        )
+
+    def _upload_image(self, place_id, image_src: Optional[str]) -> None:
+        image_key = f"place/{place_id}.jpg"
+
+        if settings.IMAGE_TRANSFER_MODE == "stream":
+            stats = transfer_image(image_src, settings.S3_IMAGE_PATH, image_key, s3_client=self.s3)
+            print(
+                f"[INFO] 이미지 전송 완료: {place_id} "
+                f"({stats.bytes_downloaded}B → {stats.bytes_uploaded}B, {stats.seconds:.2f}s)"
+            )
+        else:
+            temp_image_path = f"{settings.TEMP_IMAGE_PATH}/{place_id}.jpg"
+            try:
+                self.s3.upload_file(
+                    Filename=temp_image_path,
+                    Bucket=settings.S3_IMAGE_PATH,
+                    Key=image_key,
+                    ExtraArgs={"ContentType": "image/jpeg"}
+                )
+            finally:
+                if os.path.exists(temp_image_path):
+                    os.remove(temp_image_path)
+
+    def _export_image(self, place_table: pd.DataFrame) -> pd.DataFrame:
+        """
+        장소 이미지를 업로드하고, 결과에 맞게 image_url을 채운 장소 테이블을 반환합니다.
+
+        stream 모드는 원본 URL(image_src 열)에서 바로 전송하고, file 모드는 크롤러가 받아 둔 임시 파일을 업로드합니다.
+        다운로드/업로드에 실패하면 image_url을 비우고 경고만 남깁니다. 반환 테이블에는 image_src 열이 없습니다.
+        """
+        place_id = place_table['id'][0]
+        image_src = place_table[IMAGE_SOURCE_COLUMN][0] if IMAGE_SOURCE_COLUMN in place_table else None
+        place_table = place_table.drop(columns=[IMAGE_SOURCE_COLUMN], errors="ignore")
+
+        if settings.IMAGE_TRANSFER_MODE == "stream":
+            pending = bool(image_src)
+        else:
+            # file 모드에서는 크롤러가 다운로드에 성공한 경우에만 image_url이 채워져 있음
+            pending = bool(place_table['image_url'][0])
+
+        image_url = None
+        if pending:
+            try:
+                self._upload_image(place_id, image_src)
+                image_url = f"{settings.S3_IMAGE_PATH}/{place_id}.jpg"
+            except Exception as e:
+                print(f"[WARN] 이미지 업로드 실패, 이미지 없이 내보냅니다 ({place_id}): {e}")
+        place_table['image_url'] = [image_url]
+        return place_table
+
+    def _table_jobs(self, place_id, tables: dict) -> list:
+        return [
+            self.executor.submit(self._put_csv, f"{place_id}/{name}.csv", table)
+            for name, table in tables.items()
+        ]
+
+    def export_place(self, place_table, place_hours_table, place_menu_table) -> None:
+        """
+        장소 하나의 테이블과 이미지를 동시에 업로드합니다.
+
+        이미지 업로드 실패는 image_url을 비우고 넘어갑니다.
+
+        Raises:
+            Exception: 테이블 업로드 중 하나라도 실패한 경우 (나머지 업로드는 완료까지 대기)
+        """
+        place_table = self._export_image(place_table)
+        place_id = place_table['id'][0]
+        tables = dict(zip(TABLES, (place_table, place_hours_table, place_menu_table)))
+
+        futures = self._table_jobs(place_id, tables)
+        errors = [f.exception() for f in futures]
+        errors = [e for e in errors if e is not None]
+        if errors:
+            raise Exception(f"S3 업로드 실패 ({place_id}): {errors[0]}")
+
+    def flush(self) -> None:
+        """장소 단위 내보내기는 버퍼가 없으므로 아무 작업도 하지 않습니다."""
+        return None
+
+    def close(self) -> None:
+        """남은 내보내기를 마무리합니다."""
+        self.flush()
+
+
+class ColumnarExporter(S3Exporter):
+    """
+    Parquet 일괄 내보내기
+
+    장소 테이블을 메모리에 모았다가 batch_size개가 쌓이거나 가장 오래된 장소가 flush_interval초를 넘기면
+    `{S3_EXPORT_PREFIX}/{batch_id}/{table}.parquet`와 manifest.json으로 한 번에 업로드합니다.
+    요청이 끊겨도 버퍼가 남지 않도록 백그라운드 스레드가 주기적으로 오래된 버퍼를 업로드합니다.
+    이미지는 장소 단위로 바로 업로드합니다.
+    """
+
+    def __init__(
+        self,
+        s3_client=None,
+        max_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        super().__init__(s3_client=s3_client, max_workers=max_workers)
+        self.batch_size = int(batch_size or settings.S3_EXPORT_BATCH_SIZE)
+        self.flush_interval = float(
+            flush_interval if flush_interval is not None else settings.S3_EXPORT_FLUSH_INTERVAL
+        )
+        self._lock = threading.Lock()
+        self._buffer: dict[str, list] = {name: [] for name in TABLES}
+        self._place_ids: list = []
+        self._buffered_at: Optional[float] = None  # 버퍼에 남은 가장 오래된 장소가 들어온 시각
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def export_place(self, place_table, place_hours_table, place_menu_table) -> None:
+        place_table = self._export_image(place_table)
+        place_id = place_table['id'][0]
+
+        with self._lock:
+            for name, table in zip(TABLES, (place_table, place_hours_table, place_menu_table)):
+                self._buffer[name].append(table)
+            self._place_ids.append(int(place_id))
+            if self._buffered_at is None:
+                self._buffered_at = time.monotonic()
+            full = len(self._place_ids) >= self.batch_size or self._expired()
+            self._start_flusher()
+
+        if full:
+            self.flush()
+
+    def _expired(self) -> bool:
+        """버퍼의 가장 오래된 장소가 flush_interval을 넘겼는지 확인합니다. (_lock 안에서 호출)"""
+        return (
+            self.flush_interval > 0
+            and self._buffered_at is not None
+            and time.monotonic() - self._buffered_at >= self.flush_interval
+        )
+
+    def _start_flusher(self) -> None:
+        """주기 flush 스레드를 처음 한 번만 시작합니다. (_lock 안에서 호출)"""
+        if self.flush_interval <= 0 or self._flusher is not None or self._stop.is_set():
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="s3-export-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval / 2):
+            with self._lock:
+                expired = self._expired()
+            if not expired:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[WARN] 주기 Parquet flush 실패, 다음 주기에 재시도: {e}")
+
+    def close(self) -> None:
+        """
+        주기 flush 스레드를 멈추고 버퍼에 남은 장소를 업로드합니다.
+        """
+        self._stop.set()
+        try:
+            if self._flusher is not None:
+                self._flusher.join()
+        finally:
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """
+        버퍼에 쌓인 장소들을 Parquet 파일과 manifest로 업로드합니다.
+
+        Returns:
+            Optional[str]: 업로드한 batch 경로 (버퍼가 비어 있으면 None)
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            if not self._place_ids:
+                return None
+            buffer, self._buffer = self._buffer, {name: [] for name in TABLES}
+            place_ids, self._place_ids = self._place_ids, []
+            buffered_at, self._buffered_at = self._buffered_at, None
+
+        batch_id = time.strftime("%Y%m%dT%H%M%S") + f"-{place_ids[0]}"
+        prefix = f"{settings.S3_EXPORT_PREFIX}/{batch_id}"
+        manifest = {
+            "batch_id": batch_id,
+            "created_at": time.time(),
+            "place_ids": place_ids,
+            "tables": {},
+        }
+
+        def _upload(name: str, frames: list) -> None:
+            df = pd.concat([f for f in frames if not f.empty] or frames, ignore_index=True)
+            out = io.BytesIO()
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out, compression="zstd")
+            body = out.getvalue()
+            key = f"{prefix}/{name}.parquet"
+            self.s3.put_object(
+                Bucket=settings.S3_METADATA_PATH,
+                Key=key,
+                Body=body,
+                ContentType="application/vnd.apache.parquet"
+            )
+            manifest["tables"][name] = {
+                "key": key,
+                "rows": len(df),
+                "bytes": len(body),
+                "sha256": hashlib.sha256(body).hexdigest(),
+            }
+
+        futures = [self.executor.submit(_upload, name, frames) for name, frames in buffer.items()]
+        errors = [e for e in (f.exception() for f in futures) if e is not None]
+        if errors:
+            # 실패한 batch는 버퍼로 되돌려 다음 flush에서 다시 업로드
+            with self._lock:
+                for name, frames in buffer.items():
+                    self._buffer[name] = frames + self._buffer[name]
+                self._place_ids = place_ids + self._place_ids
+                self._buffered_at = buffered_at
+            raise Exception(f"Parquet 업로드 실패 ({batch_id}): {errors[0]}")
+
+        # manifest는 모든 테이블 업로드가 끝난 뒤에 올려 완결된 batch만 노출
+        self.s3.put_object(
+            Bucket=settings.S3_METADATA_PATH,
+            Key=f"{prefix}/manifest.json",
+            Body=json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
+            ContentType="application/json"
+        )
+        print(f"[INFO] Parquet batch 업로드 완료: {prefix} ({len(place_ids)}곳)")
+        return prefix
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> S3Exporter:
+    """
+    S3_EXPORT_FORMAT 설정(csv | parquet)에 맞는 공용 exporter를 반환합니다.
+    """
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                if settings.S3_EXPORT_FORMAT == "parquet":
+                    _exporter = ColumnarExporter()
+                else:
+                    _exporter = S3Exporter()
+    return _exporter
@@ -0,0 +1,443 @@
+"""
+크롤링 페이지 수집 모듈
+
+이 모듈은 장소 페이지를 가져오는 두 가지 방식을 제공합니다.
+가벼운 HTTP 요청으로 충분한 섹션은 커넥션 풀 세션으로 가져오고,
+JS 실행이 필요한 섹션(무한 스크롤 후기 등)만 Selenium 브라우저를 사용합니다.
+
+주요 구성요소:
+    - get_http_session: 커넥션 풀이 적용된 공용 requests 세션
+    - HostThrottle: 호스트별 동시 요청 수 제한 및 최소 요청 간격 보장
+    - HttpFetcher: HTTP 기반 페이지 수집기
+    - BrowserPool: 재사용 가능한 Selenium 드라이버 풀
+    - BrowserSession: Selenium 기반 페이지 수집기
+    - parse_section_modes: 섹션별 수집 방식 설정 파싱
+"""
+
+import time
+import queue
+import threading
+import requests
+
+from typing import Optional
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.config import settings
+
+SECTIONS = ("main", "menu", "reviews")
+FETCH_MODES = ("http", "browser")
+
+# 섹션이 정상적으로 렌더링되었는지 판별하는 CSS 선택자
+SECTION_MARKERS = {
+    "main": "h2.tit_location",
+    "menu": "div.info_goods",
+    "reviews": "ul.list_review > li",
+}
+
+# 섹션은 렌더링되었지만 항목이 없는 상태(메뉴/후기가 없는 장소)를 판별하는 섹션 컨테이너, CSS 선택자와 안내 문구
+# (선택자와 문구는 섹션 컨테이너 안에서만 찾음)
+SECTION_CONTAINERS = {
+    "menu": "div.cont_menu",
+    "reviews": "div.cont_review",
+}
+SECTION_EMPTY_MARKERS = {
+    "menu": ("p.desc_empty", "div.empty_info"),
+    "reviews": ("p.desc_empty", "div.empty_info"),
+}
+SECTION_EMPTY_TEXTS = {
+    "menu": ("등록된 메뉴가 없습니다", "메뉴 정보가 없습니다"),
+    "reviews": ("등록된 후기가 없습니다", "후기가 없습니다"),
+}
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    커넥션 풀과 재시도 정책이 적용된 공용 HTTP 세션을 반환합니다.
+
+    Returns:
+        requests.Session: keep-alive 커넥션을 재사용하는 세션
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(
+                    total=2,
+                    backoff_factor=0.3,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET", "HEAD"),
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=settings.HTTP_POOL_SIZE,
+                    pool_maxsize=settings.HTTP_POOL_SIZE,
+                    max_retries=retry,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+class HostThrottle:
+    """
+    호스트별 요청 예절(politeness) 관리자
+
+    같은 호스트로 향하는 요청의 동시 실행 수를 제한하고,
+    연속된 요청 사이에 최소 간격을 둡니다.
+    """
+
+    def __init__(self, max_concurrency: int, min_interval: float):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._next_slot: dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.Semaphore(self.max_concurrency)
+            return self._semaphores[host]
+
+    def _reserve_slot(self, host: str) -> float:
+        """다음 요청 가능 시각을 예약하고, 대기해야 할 시간을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+            return slot - now
+
+    @contextmanager
+    def limit(self, url: str):
+        host = urlparse(url).netloc
+        semaphore = self._semaphore(host)
+        with semaphore:
+            wait = self._reserve_slot(host)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+_throttle = None
+
+
+def get_host_throttle() -> HostThrottle:
+    global _throttle
+    if _throttle is None:
+        with _session_lock:
+            if _throttle is None:
+                _throttle = HostThrottle(
+                    settings.CRAWL_HOST_CONCURRENCY,
+                    settings.CRAWL_HOST_MIN_INTERVAL
+                )
+    return _throttle
+
+
+def parse_section_modes(raw: Optional[str]) -> dict[str, str]:
+    """
+    "main=http,menu=http,reviews=browser" 형식의 설정을 섹션별 수집 방식으로 변환합니다.
+
+    지정하지 않은 섹션은 main/menu는 http, reviews는 browser를 사용합니다.
+    """
+    modes = {"main": "http", "menu": "http", "reviews": "browser"}
+    if not raw:
+        return modes
+
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        section, mode = (s.strip() for s in item.split("=", 1))
+        if section not in SECTIONS or mode not in FETCH_MODES:
+            raise ValueError(f"잘못된 크롤링 섹션 설정: {item}")
+        modes[section] = mode
+    return modes
+
+
+def place_url(place_id: int) -> str:
+    return f"{settings.KAKAO_PLACE_URL.rstrip('/')}/{place_id}"
+
+
+def has_section(soup: Optional[BeautifulSoup], section: str) -> bool:
+    """
+    수집한 페이지에 해당 섹션이 렌더링되어 있는지 확인합니다.
+
+    항목이 있는 섹션뿐 아니라, 항목이 없다는 안내(빈 상태)가 렌더링된 섹션도 수집 완료로 봅니다.
+    메뉴가 없는 장소를 매번 브라우저로 다시 수집하지 않기 위함입니다.
+    """
+    if soup is None:
+        return False
+    if soup.select_one(SECTION_MARKERS[section]) is not None:
+        return True
+    return is_empty_section(soup, section)
+
+
+def is_empty_section(soup: BeautifulSoup, section: str) -> bool:
+    """
+    섹션이 빈 상태(항목 없음 안내)로 렌더링되어 있는지 확인합니다.
+
+    안내 요소와 문구는 섹션 컨테이너 안에서만 찾으므로, 다른 영역(후기 본문 등)의 같은 문구는 무시합니다.
+    """
+    selector = SECTION_CONTAINERS.get(section)
+    container = soup.select_one(selector) if selector else None
+    if container is None:
+        return False
+    if any(container.select_one(marker) is not None for marker in SECTION_EMPTY_MARKERS.get(section, ())):
+        return True
+    texts = SECTION_EMPTY_TEXTS.get(section, ())
+    return container.find(string=lambda s: s is not None and any(text in s for text in texts)) is not None
+
+
+class HttpFetcher:
+    """
+    HTTP 기반 페이지 수집기
+
+    브라우저 없이 서버가 내려주는 HTML을 그대로 파싱합니다.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+        throttle: Optional[HostThrottle] = None
+    ):
+        self.session = session or get_http_session()
+        self.timeout = timeout or settings.HTTP_TIMEOUT
+        self.throttle = throttle or get_host_throttle()
+
+    def fetch(self, url: str) -> Optional[BeautifulSoup]:
+        """
+        페이지를 가져와 파싱합니다.
+
+        연결 오류, 시간 초과, 429/5xx 같은 일시적 오류는 그대로 발생시켜 호출한 쪽(CrawlScheduler)이 재시도하게 하고,
+        그 밖의 HTTP 오류(404 등)는 경고만 남기고 None을 반환해 브라우저 수집으로 대체하게 합니다.
+
+        Raises:
+            requests.RequestException: 일시적 오류
+        """
+        with self.throttle.limit(url):
+            resp = self.session.get(url, timeout=self.timeout)
+        try:
+            resp.raise_for_status()
+        except requests.HTTPError as e:
+            if resp.status_code == 429 or resp.status_code >= 500:
+                raise
+            print(f"[WARN] HTTP 페이지 수집 실패: {url} → {e}")
+            return None
+        return BeautifulSoup(resp.text, "html.parser")
+
+
+def create_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    service = Service("/usr/bin/chromedriver")
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+class BrowserPool:
+    """
+    Selenium 드라이버 풀
+
+    크롬 기동 비용을 줄이기 위해 드라이버를 장소 간에 재사용합니다.
+    드라이버는 필요할 때 최대 size개까지 생성됩니다.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, int(size))
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return create_driver()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # 다른 작업이 드라이버를 반납(또는 폐기)할 때까지 대기
+            try:
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+    def release(self, driver, broken: bool = False) -> None:
+        if broken:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(driver)
+
+    def close(self) -> None:
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+
+
+class BrowserSession:
+    """
+    Selenium 기반 페이지 수집기
+
+    드라이버는 실제로 필요할 때 처음 생성(또는 풀에서 대여)되며,
+    close() 호출 시 종료(또는 풀에 반납)됩니다.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool: Optional[BrowserPool] = None,
+        throttle: Optional[HostThrottle] = None
+    ):
+        self.url = url
+        self.pool = pool
+        self.throttle = throttle or get_host_throttle()
+        self._driver = None
+        self._loaded = False
+        self._broken = False
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.pool.acquire() if self.pool else create_driver()
+        return self._driver
+
+    def close(self) -> None:
+        if self._driver is not None:
+            if self.pool:
+                self.pool.release(self._driver, broken=self._broken)
+            else:
+                try:
+                    self._driver.quit()
+                except Exception:
+                    pass
+            self._driver = None
+            self._loaded = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _ensure_loaded(self) -> None:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        if self._loaded:
+            return
+        try:
+            with self.throttle.limit(self.url):
+                self.driver.get(self.url)
+        except Exception:
+            self._broken = True
+            raise
+        try:
+            # JS 로딩이 완료될 때까지 대기
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "h3.tit_place"))
+            )
+            time.sleep(1)
+        except Exception:
+            print(f"[ERROR] 메인 페이지 로딩 실패: {self.url}")
+        self._loaded = True
+
+    def main_page(self) -> BeautifulSoup:
+        self._ensure_loaded()
+        return BeautifulSoup(self.driver.page_source, 'html.parser')
+
+    def menu_page(self) -> BeautifulSoup:
+        from selenium.webdriver.common.by import By
+
+        self._ensure_loaded()
+        try:
+            info_tab = self.driver.find_element(By.XPATH, "//a[@href='#menuInfo']")
+            self.driver.execute_script("arguments[0].click();", info_tab)
+            time.sleep(1)
+        except Exception:
+            print(f"[ERROR] 메뉴 페이지 로딩 실패: {self.url}")
+        return BeautifulSoup(self.driver.page_source, 'html.parser')
+
+    def review_page(self) -> BeautifulSoup:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        self._ensure_loaded()
+        driver = self.driver
+        info_tab = WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.XPATH, "//a[@href='#comment']"))
+        )
+        driver.execute_script("arguments[0].click();", info_tab)
+        time.sleep(1)
+
+        # 무한 스크롤
+        scroll_pause_time = 0.5
+        last_height = driver.execute_script("return document.body.scrollHeight")
+        while True:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(scroll_pause_time)
+            new_height = driver.execute_script("return document.body.scrollHeight")
+            if new_height == last_height:
+                break
+            last_height = new_height
+        # 더보기 버튼 모두 클릭 (여러 번 탐색)
+        for _ in range(3):  # 최대 3회 반복
+            try:
+                buttons = driver.find_elements(By.CSS_SELECTOR, "span.btn_more")
+                if not buttons:
+                    break
+                for btn in buttons:
+                    try:
+                        driver.execute_script("arguments[0].click();", btn)
+                        time.sleep(0.1)
+                    except Exception:
+                        continue
+            except Exception as e:
+                print(f"❗ 더보기 클릭 실패: {e}")
+                break
+        return BeautifulSoup(driver.page_source, 'html.parser')
@@ -0,0 +1,198 @@
+"""
+주소 좌표 변환 모듈
+
+이 모듈은 카카오 주소 검색 API로 도로명주소를 좌표로 변환하고,
+결과를 로컬 SQLite 파일에 캐싱합니다.
+재크롤링이나 같은 주소를 공유하는 지점은 외부 API를 호출하지 않습니다.
+
+주요 구성요소:
+    - normalize_address: 캐시 키로 사용할 주소 정규화
+    - GeocodeCache: TTL/부정 캐싱을 지원하는 영구 캐시
+    - KakaoGeocoder: 캐시를 거치는 좌표 변환기 (단건/일괄 조회)
+"""
+
+import os
+import re
+import time
+import sqlite3
+import threading
+import unicodedata
+
+from typing import Iterable, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.data_pipeline.fetcher import get_http_session
+from monitoring.metrics import crawl_metrics
+
+KAKAO_ADDRESS_URL = "https://dapi.kakao.com/v2/local/search/address.json"
+
+Coords = Tuple[float, float]
+
+
+def normalize_address(address: str) -> str:
+    """
+    주소 문자열을 캐시 키로 사용할 수 있도록 정규화합니다.
+
+    우편번호 표기 제거, 유니코드 정규화, 공백 정리를 수행합니다.
+    """
+    address = re.sub(r"\(우\)?\d{5}", "", address)
+    address = unicodedata.normalize("NFKC", address)
+    return re.sub(r"\s+", " ", address).strip()
+
+
+class GeocodeCache:
+    """
+    주소 → (lon, lat) 영구 캐시
+
+    좌표를 찾지 못한 주소도 negative_ttl 동안 캐싱하여 반복 조회를 막습니다.
+
+    Attributes:
+        hits (int): 캐시 적중 수
+        misses (int): 캐시 미스 수
+    """
+
+    def __init__(self, path: str, ttl: float, negative_ttl: float):
+        self.path = path
+        self.ttl = float(ttl)
+        self.negative_ttl = float(negative_ttl)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode (
+                address TEXT PRIMARY KEY,
+                lon REAL,
+                lat REAL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, address: str) -> Tuple[bool, Optional[Coords]]:
+        """
+        캐시를 조회합니다.
+
+        Returns:
+            Tuple[bool, Optional[Coords]]: (적중 여부, 좌표). 부정 캐싱된 주소는 (True, None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lon, lat, updated_at FROM geocode WHERE address = ?", (address,)
+            ).fetchone()
+
+            hit = False
+            coords = None
+            if row:
+                lon, lat, updated_at = row
+                ttl = self.ttl if lon is not None else self.negative_ttl
+                if time.time() - updated_at < ttl:
+                    hit = True
+                    coords = (lon, lat) if lon is not None else None
+
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        crawl_metrics.geocode_cache.labels(result="hit" if hit else "miss").inc()
+        return hit, coords
+
+    def put(self, address: str, coords: Optional[Coords]) -> None:
+        lon, lat = coords if coords else (None, None)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode (address, lon, lat, updated_at) VALUES (?, ?, ?, ?)",
+                (address, lon, lat, time.time())
+            )
+            self._conn.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_geocode_cache() -> GeocodeCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GeocodeCache(
+                    settings.GEOCODE_CACHE_PATH,
+                    settings.GEOCODE_CACHE_TTL,
+                    settings.GEOCODE_NEGATIVE_TTL
+                )
+    return _cache
+
+
+class KakaoGeocoder:
+    """
+    캐시를 거치는 카카오 주소 → 좌표 변환기
+
+    외부 API 호출은 keep-alive 커넥션 풀 세션을 재사용합니다.
+    """
+
+    def __init__(self, api_key: str, cache: Optional[GeocodeCache] = None, session=None):
+        self.api_key = api_key
+        self.cache = cache or get_geocode_cache()
+        self.session = session or get_http_session()
+
+    def _request(self, address: str) -> Optional[Coords]:
+        resp = self.session.get(
+            KAKAO_ADDRESS_URL,
+            headers={"Authorization": f"KakaoAK {self.api_key}"},
+            params={"query": address},
+            timeout=settings.HTTP_TIMEOUT
+        )
+        resp.raise_for_status()
+        result = resp.json().get("documents")
+        if not result:
+            return None
+        return float(result[0]["x"]), float(result[0]["y"])
+
+    def lookup(self, address: str) -> Optional[Coords]:
+        """
+        주소를 (lon, lat) 좌표로 변환합니다.
+
+        API 오류는 캐싱하지 않으며, 결과가 없는 주소는 부정 캐싱합니다.
+        """
+        key = normalize_address(address)
+        if not key:
+            return None
+
+        hit, coords = self.cache.get(key)
+        if hit:
+            return coords
+
+        try:
+            coords = self._request(key)
+        except Exception as e:
+            print(f"[WARNING] 좌표 변환 실패: {key} → {e}")
+            return None
+
+        self.cache.put(key, coords)
+        return coords
+
+    def lookup_many(self, addresses: Iterable[str], workers: int = 4) -> dict[str, Optional[Coords]]:
+        """
+        여러 주소를 일괄 변환합니다. 중복 주소는 한 번만 조회합니다.
+
+        Returns:
+            dict[str, Optional[Coords]]: 입력 주소별 좌표
+        """
+        addresses = list(addresses)
+        unique = list(dict.fromkeys(normalize_address(a) for a in addresses if a))
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            resolved = dict(zip(unique, executor.map(self.lookup, unique)))
+
+        return {a: resolved.get(normalize_address(a)) if a else None for a in addresses}
@@ -0,0 +1,109 @@
+"""
+장소 이미지 전송 모듈
+
+이 모듈은 장소 대표 이미지를 임시 파일 없이 원본 URL에서 S3로 바로 전송합니다.
+리사이즈가 설정된 경우에만 메모리에서 이미지를 다시 인코딩합니다.
+
+주요 구성요소:
+    - TransferStats: 전송 바이트 수와 소요 시간
+    - transfer_image: 이미지 스트리밍 업로드 함수
+"""
+
+import io
+import time
+
+from typing import Optional
+from boto3.s3.transfer import TransferConfig
+
+from app.core.config import settings
+from app.data_pipeline.fetcher import get_http_session
+from app.services.s3_client_factory import S3ClientFactory
+from monitoring.metrics import crawl_metrics
+
+# 8MB 이상이면 멀티파트 업로드
+TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024)
+
+
+class TransferStats:
+    """
+    이미지 전송 결과
+
+    Attributes:
+        bytes_downloaded (int): 원본에서 받은 바이트 수
+        bytes_uploaded (int): S3로 올린 바이트 수
+        seconds (float): 다운로드부터 업로드 완료까지 걸린 시간
+    """
+
+    def __init__(self, bytes_downloaded: int = 0, bytes_uploaded: int = 0, seconds: float = 0.0):
+        self.bytes_downloaded = bytes_downloaded
+        self.bytes_uploaded = bytes_uploaded
+        self.seconds = seconds
+
+
+class _CountingReader:
+    """읽은 바이트 수를 세는 파일 객체 래퍼"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.count += len(chunk)
+        return chunk
+
+
+def _resize(data: bytes, max_size: int, quality: int) -> bytes:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGB")
+        image.thumbnail((max_size, max_size))
+        out = io.BytesIO()
+        image.save(out, format="JPEG", quality=quality, optimize=True)
+        return out.getvalue()
+
+
+def transfer_image(
+    src: str,
+    bucket: str,
+    key: str,
+    s3_client=None,
+    max_size: Optional[int] = None
+) -> TransferStats:
+    """
+    원본 이미지를 내려받으면서 S3에 바로 업로드합니다.
+
+    Args:
+        src (str): 원본 이미지 URL
+        bucket (str): 업로드할 버킷
+        key (str): 업로드할 객체 키
+        s3_client: S3 클라이언트 (미지정 시 공용 클라이언트, 로컬 S3 호환 스토리지 주입 가능)
+        max_size (int): 긴 변 기준 최대 픽셀 수 (미지정 시 IMAGE_MAX_SIZE, 0이면 원본 그대로)
+
+    Returns:
+        TransferStats: 전송 바이트 수와 소요 시간
+    """
+    s3 = s3_client or S3ClientFactory.get_instance()
+    max_size = settings.IMAGE_MAX_SIZE if max_size is None else max_size
+    extra_args = {"ContentType": "image/jpeg"}
+    start = time.perf_counter()
+
+    with get_http_session().get(src, stream=True, timeout=settings.HTTP_TIMEOUT) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        reader = _CountingReader(r.raw)
+
+        if max_size:
+            data = _resize(reader.read(), max_size, settings.IMAGE_JPEG_QUALITY)
+            s3.upload_fileobj(io.BytesIO(data), bucket, key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG)
+            uploaded = len(data)
+        else:
+            s3.upload_fileobj(reader, bucket, key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG)
+            uploaded = reader.count
+
+    stats = TransferStats(reader.count, uploaded, time.perf_counter() - start)
+    crawl_metrics.image_bytes.labels(direction="download").inc(stats.bytes_downloaded)
+    crawl_metrics.image_bytes.labels(direction="upload").inc(stats.bytes_uploaded)
+    crawl_metrics.image_transfer_latency.observe(stats.seconds)
+    return stats
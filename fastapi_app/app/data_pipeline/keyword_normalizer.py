@@ -0,0 +1,130 @@
+"""
+키워드 정규화 모듈
+
+이 모듈은 색인 전에 같은 의미의 키워드 변형("한우모둠"/"한우모듬" 등)을 하나로 합칩니다.
+문자열 정규화로 표기 차이를 먼저 묶고, 남은 키워드는 임베딩 유사도로 군집화합니다.
+군집마다 대표 키워드의 벡터 하나만 색인하고 나머지 표기는 메타데이터(variants)로 보관합니다.
+
+주요 구성요소:
+    - normalize_keyword: 표시용 키워드 정리
+    - canonical_key: 표기 차이를 제거한 비교용 키
+    - KeywordGroup: 대표 키워드와 변형 목록
+    - collapse_keywords: 문자열 + 임베딩 유사도 기반 중복 병합
+"""
+
+import re
+import unicodedata
+import numpy as np
+
+from typing import List, Optional
+
+# 같은 의미로 혼용되는 표기 (변형 → 대표)
+VARIANT_SPELLINGS = {
+    "모듬": "모둠",
+    "부채살": "부챗살",
+    "쭈꾸미": "주꾸미",
+    "짜장": "자장",
+    "까페": "카페",
+    "돈까스": "돈가스",
+}
+
+VARIANTS_DELIMITER = "|"
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    유니코드 정규화, 공백 정리, 앞뒤 특수문자 제거를 수행합니다.
+    """
+    keyword = unicodedata.normalize("NFKC", str(keyword))
+    keyword = re.sub(r"\s+", " ", keyword)
+    return keyword.strip(" \t\n.,!~#·-")
+
+
+def canonical_key(keyword: str) -> str:
+    """
+    공백, 대소문자, 혼용 표기 차이를 제거한 비교용 키를 반환합니다.
+    """
+    key = normalize_keyword(keyword).lower().replace(" ", "")
+    for variant, canonical in VARIANT_SPELLINGS.items():
+        key = key.replace(variant, canonical)
+    return key
+
+
+class KeywordGroup:
+    """
+    중복 병합 결과
+
+    Attributes:
+        canonical (str): 색인할 대표 키워드 (처음 등장한 표기)
+        vector (np.ndarray): 대표 키워드 벡터
+        variants (List[str]): 대표 키워드로 병합된 다른 표기들
+    """
+
+    def __init__(self, canonical: str, vector: np.ndarray, variants: Optional[List[str]] = None):
+        self.canonical = canonical
+        self.vector = vector
+        self.variants = variants or []
+
+    @property
+    def variants_str(self) -> str:
+        return VARIANTS_DELIMITER.join(self.variants)
+
+
+def collapse_keywords(
+    keywords: List[str],
+    vectors: np.ndarray,
+    threshold: float
+) -> List[KeywordGroup]:
+    """
+    같은 장소·카테고리의 키워드 목록에서 중복 표기를 병합합니다.
+
+    1. canonical_key가 같은 키워드를 하나로 묶습니다.
+    2. 대표 키워드끼리 코사인 유사도가 threshold 이상이면 먼저 등장한 쪽으로 병합합니다.
+       (threshold >= 1이면 임베딩 병합을 하지 않습니다)
+
+    Args:
+        keywords (List[str]): 키워드 목록 (등장 순서 유지)
+        vectors (np.ndarray): keywords와 같은 순서의 임베딩 (N x D)
+        threshold (float): 병합할 코사인 유사도 임계값
+
+    Returns:
+        List[KeywordGroup]: 대표 키워드 목록
+    """
+    groups: List[KeywordGroup] = []
+    by_key: dict = {}
+    for keyword, vector in zip(keywords, np.asarray(vectors, dtype=np.float32)):
+        display = normalize_keyword(keyword)
+        if not display:
+            continue
+        key = canonical_key(display)
+        if key in by_key:
+            group = by_key[key]
+            if display != group.canonical and display not in group.variants:
+                group.variants.append(display)
+            continue
+        group = KeywordGroup(display, vector)
+        by_key[key] = group
+        groups.append(group)
+
+    if threshold >= 1 or len(groups) < 2:
+        return groups
+
+    matrix = np.stack([g.vector for g in groups])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    normalized = matrix / np.where(norms == 0, 1, norms)
+    similarity = normalized @ normalized.T
+
+    merged: List[KeywordGroup] = []
+    owner = [-1] * len(groups)
+    for i, group in enumerate(groups):
+        match = next((owner[j] for j in range(i) if owner[j] == j and similarity[i, j] >= threshold), -1)
+        if match < 0:
+            owner[i] = i
+            merged.append(group)
+            continue
+        owner[i] = match
+        target = groups[match]
+        for name in [group.canonical] + group.variants:
+            if name != target.canonical and name not in target.variants:
+                target.variants.append(name)
+    return merged
@@ -1,18 +1,223 @@
-from app.data_pipeline.crawler import crawling
-from app.data_pipeline.post_processor import post_processing
+import threading
+
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.data_pipeline.post_processor import post_processing, post_processing_batch
 from app.data_pipeline.uploader import upload_chromadb
 from app.data_pipeline.uploader import upload_s3
+from app.data_pipeline.scheduler import CrawlScheduler
+from app.data_pipeline.exporter import get_exporter
+from app.data_pipeline.change_tracker import get_state_store, section_hashes
+from app.data_pipeline.runner import Stage, StagedPipelineRunner
 from app.services.recommend.embedding import EmbeddingModel
 
+_runner = None
+_runner_lock = threading.Lock()
+
+
 class UploaderPipeline:
     def __init__(
         self,
         embedding_model: EmbeddingModel
     ):
         self.embedding_model = embedding_model
+        self.state_store = get_state_store()
 
     def upload_data(self, place_id: int) -> None:
-        place_table, place_hours_table, place_facilities, place_menu_table, place_reviews = crawling(place_id)
-        place_table, keywords = post_processing(place_table, place_menu_table, place_facilities, place_reviews)
-        upload_chromadb(place_table, keywords, self.embedding_model)
-        upload_s3(place_table, place_hours_table, place_menu_table)
\ No newline at end of file
+        """
+        장소 하나를 크롤링해 색인/내보내기까지 처리합니다.
+
+        크롤링은 일괄 경로와 같이 CrawlScheduler를 거쳐 일시적 오류를 지수 백오프로 재시도합니다.
+        """
+        scheduler = CrawlScheduler(workers=1)
+        try:
+            result = scheduler.crawl(place_id)
+        finally:
+            scheduler.browser_pool.close()
+        if not result.ok:
+            raise result.error
+        place_table, place_hours_table, place_facilities, place_menu_table, place_reviews = result.data
+        ctx = {
+            "place_id": place_id,
+            "place_table": place_table,
+            "place_hours_table": place_hours_table,
+            "place_facilities": place_facilities,
+            "place_menu_table": place_menu_table,
+            "place_reviews": place_reviews,
+        }
+        self._export(self._index(self._post_process(ctx)))
+
+    def build_runner(self, on_done=None, on_error=None) -> StagedPipelineRunner:
+        """
+        크롤링 → 후처리(LLM) → 색인 → 내보내기 단계를 큐로 연결한 실행기를 생성합니다.
+
+        단계별 워커 수는 PIPELINE_*_WORKERS 설정을 따릅니다.
+        """
+        scheduler = CrawlScheduler()
+
+        def _crawl(place_id: int) -> Optional[dict]:
+            result = scheduler.crawl(place_id)
+            if not result.ok:
+                raise result.error
+            place_table, place_hours_table, place_facilities, place_menu_table, place_reviews = result.data
+            return {
+                "place_id": place_id,
+                "place_table": place_table,
+                "place_hours_table": place_hours_table,
+                "place_facilities": place_facilities,
+                "place_menu_table": place_menu_table,
+                "place_reviews": place_reviews,
+            }
+
+        return StagedPipelineRunner(
+            [
+                Stage("crawl", _crawl, settings.PIPELINE_CRAWL_WORKERS),
+                Stage(
+                    "post_process",
+                    self._post_process_batch if settings.LLM_BATCH_SIZE > 1 else self._post_process,
+                    settings.PIPELINE_LLM_WORKERS,
+                    batch_size=settings.LLM_BATCH_SIZE
+                ),
+                Stage("index", self._index, settings.PIPELINE_INDEX_WORKERS),
+                Stage("export", self._export, settings.PIPELINE_EXPORT_WORKERS),
+            ],
+            queue_size=settings.PIPELINE_QUEUE_SIZE,
+            on_done=on_done,
+            on_error=on_error,
+            on_shutdown=scheduler.browser_pool.close
+        )
+
+    def upload_many(self, place_ids: Iterable[int]) -> dict[int, str]:
+        """
+        여러 장소를 단계별 파이프라인으로 처리합니다.
+
+        Returns:
+            dict[int, str]: 장소 id별 처리 결과 ("ok" 또는 오류 메시지)
+        """
+        statuses = {}
+
+        def _on_done(ctx):
+            statuses[ctx["place_id"]] = "ok"
+
+        def _on_error(stage, item, e):
+            place_id = item["place_id"] if isinstance(item, dict) else item
+            print(f"❌ 업로드 실패 ({place_id}, {stage}): {e}")
+            statuses[place_id] = f"{stage}: {e}"
+
+        runner = self.build_runner(on_done=_on_done, on_error=_on_error).start()
+        try:
+            for place_id in place_ids:
+                runner.submit(place_id)
+        finally:
+            runner.shutdown(drain=True)
+            get_exporter().flush()
+        return statuses
+
+    def _reuse_state(self, ctx: dict) -> bool:
+        """
+        입력 섹션 해시를 계산하고, 변경이 없으면 이전 키워드 추출 결과를 ctx에 채웁니다.
+
+        Returns:
+            bool: 이전 결과를 재사용했으면 True (LLM 호출 불필요)
+        """
+        place_id = int(ctx["place_table"]['id'][0])
+        place_table = ctx["place_table"]
+        hashes = section_hashes(ctx["place_menu_table"], ctx["place_facilities"], ctx["place_reviews"])
+        state = self.state_store.get(place_id)
+        ctx.update(hashes=hashes, previous_keywords=state["keywords"] if state else None)
+
+        # 입력 섹션이 그대로면 LLM 키워드 추출을 건너뛰고 이전 결과를 재사용
+        if state and state["hashes"] == hashes and state["keywords"]:
+            print(f"[INFO] 입력 변경 없음, 키워드 추출 생략: {place_id}")
+            place_table.at[0, "description"] = state["description"]
+            place_table.at[0, "category"] = state["category"]
+            ctx["keywords"] = state["keywords"]
+            return True
+        return False
+
+    def _post_process(self, ctx: dict) -> dict:
+        if not self._reuse_state(ctx):
+            place_table, keywords = post_processing(
+                ctx["place_table"], ctx["place_menu_table"], ctx["place_facilities"], ctx["place_reviews"]
+            )
+            ctx.update(place_table=place_table, keywords=keywords)
+        return ctx
+
+    def _post_process_batch(self, ctxs: list) -> list:
+        """
+        변경된 장소들만 모아 한 번의 일괄 LLM 요청으로 키워드를 추출합니다.
+
+        키워드 추출에 실패한 장소는 결과 자리에 예외를 반환하므로, 그 장소만 실패로 처리됩니다.
+        """
+        out = list(ctxs)
+        pending = [i for i, ctx in enumerate(ctxs) if not self._reuse_state(ctx)]
+        if pending:
+            items = [
+                (ctxs[i]["place_table"], ctxs[i]["place_menu_table"], ctxs[i]["place_facilities"], ctxs[i]["place_reviews"])
+                for i in pending
+            ]
+            results, _ = post_processing_batch(items)
+            for i, result in zip(pending, results):
+                if isinstance(result, Exception):
+                    out[i] = result
+                    continue
+                place_table, keywords = result
+                ctxs[i].update(place_table=place_table, keywords=keywords)
+        return out
+
+    def _index(self, ctx: dict) -> dict:
+        upload_chromadb(
+            ctx["place_table"],
+            ctx["keywords"],
+            self.embedding_model,
+            previous_keywords=ctx["previous_keywords"],
+            place_hours_table=ctx["place_hours_table"]
+        )
+        return ctx
+
+    def _export(self, ctx: dict) -> dict:
+        place_table = ctx["place_table"]
+        upload_s3(place_table, ctx["place_hours_table"], ctx["place_menu_table"])
+
+        self.state_store.put(
+            ctx["place_id"],
+            ctx["hashes"],
+            place_table.at[0, "description"],
+            place_table.at[0, "category"],
+            ctx["keywords"]
+        )
+        return ctx
+
+
+def get_pipeline_runner(embedding_model: EmbeddingModel) -> StagedPipelineRunner:
+    """
+    API 서버에서 공유하는 상시 실행 파이프라인을 반환합니다.
+    """
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = UploaderPipeline(embedding_model).build_runner().start()
+    return _runner
+
+
+def current_pipeline_runner() -> Optional[StagedPipelineRunner]:
+    """
+    실행 중인 공유 파이프라인을 반환합니다. (시작되지 않았으면 None, 새로 만들지 않음)
+    """
+    return _runner
+
+
+def shutdown_pipeline_runner() -> None:
+    """
+    공유 파이프라인에 제출된 작업을 모두 처리한 뒤 종료합니다.
+    """
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    try:
+        if runner is not None:
+            runner.shutdown(drain=True)
+    finally:
+        get_exporter().flush()
@@ -1,7 +1,11 @@
 import re
 import json
+import time
 import google.generativeai as genai
 
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
 from google.generativeai import GenerativeModel
 
 from app.core.config import settings
@@ -82,14 +86,78 @@ def parse_output(llm_response: str):
     return description, keywords
 
 
+def _estimate_tokens(text: str) -> int:
+    """한국어 위주 텍스트의 대략적인 토큰 수 (문자 2개당 1토큰)"""
+    return (len(text) + 1) // 2
+
+
+def build_metadata_block(
+    place_table,
+    place_menu_table,
+    place_facilities,
+    place_reviews,
+    token_budget: Optional[int] = None
+) -> str:
+    """
+    프롬프트에 넣을 장소 메타데이터를 간결한 텍스트로 직렬화합니다.
+
+    후기는 별점 높은 순으로, 한 건당 LLM_REVIEW_MAX_CHARS자까지 자른 뒤
+    토큰 예산 안에 들어가는 만큼만 포함합니다.
+    """
+    token_budget = token_budget or settings.LLM_METADATA_TOKEN_BUDGET
+    max_chars = settings.LLM_REVIEW_MAX_CHARS
+
+    name = place_table['name'].iloc[0] if not place_table.empty else ""
+    menu = ", ".join(
+        f"{menu_name}({price})" if price else str(menu_name)
+        for menu_name, price in place_menu_table[['menu_name', 'price']].itertuples(index=False)
+    )
+    facilities = ", ".join(dict.fromkeys(str(f) for f in place_facilities))
+
+    lines = [f"장소명: {name}"]
+    if menu:
+        lines.append(f"메뉴: {menu}")
+    if facilities:
+        lines.append(f"시설: {facilities}")
+    header = "\n".join(lines)
+
+    used = _estimate_tokens(header)
+    reviews = []
+    if not place_reviews.empty and "text" in place_reviews:
+        ordered = place_reviews.sort_values("score", ascending=False) if "score" in place_reviews else place_reviews
+        seen = set()
+        for text in ordered["text"]:
+            text = re.sub(r"\s+", " ", str(text)).strip()[:max_chars]
+            if not text or text in seen:
+                continue
+            line = f"- {text}"
+            cost = _estimate_tokens(line)
+            if used + cost > token_budget:
+                break
+            seen.add(text)
+            reviews.append(line)
+            used += cost
+
+    if reviews:
+        header += "\n후기:\n" + "\n".join(reviews)
+    return header
+
+
+def _apply_result(place_table, place_menu_table, description: str, keywords: dict):
+    if not place_table.empty:
+        place_table.at[0, "description"] = description
+        if "장소 카테고리" in keywords and keywords["장소 카테고리"]:
+            place_table.at[0, "category"] = keywords["장소 카테고리"][0]
+
+    if not place_menu_table.empty:
+        keywords.setdefault("음식/제품", []).extend(place_menu_table['menu_name'].values)
+
+    return place_table, keywords
+
+
 def post_processing(place_table, place_menu_table, place_facilities, place_reviews):
     prompt = get_prompt()
-    metadata_block = {
-        "place_name": place_table['name'].values,
-        "menu": place_menu_table[['menu_name', 'price']].values,
-        "facilities": place_facilities,
-        "reviews": place_reviews['text'].values
-    }
+    metadata_block = build_metadata_block(place_table, place_menu_table, place_facilities, place_reviews)
 
     final_prompt = prompt.format(metadata_block=metadata_block)
 
@@ -99,12 +167,147 @@ def post_processing(place_table, place_menu_table, place_facilities, place_revie
 
     description, keywords = parse_output(response.text)
 
-    if not place_table.empty:
-        place_table.at[0, "description"] = description
-        if "장소 카테고리" in keywords and keywords["장소 카테고리"]:
-            place_table.at[0, "category"] = keywords["장소 카테고리"][0]
+    return _apply_result(place_table, place_menu_table, description, keywords)
 
-    if not place_menu_table.empty:
-        keywords["음식/제품"].extend(place_menu_table['menu_name'].values)
 
-    return place_table, keywords
\ No newline at end of file
+def get_batch_prompt() -> str:
+    """
+    여러 장소를 한 번에 처리하는 프롬프트를 반환합니다.
+
+    장소별 출력은 `### PLACE <id>` 구분자로 시작해야 합니다.
+    """
+    prompt = get_prompt()
+    instructions = prompt[:prompt.index("장소 메타데이터:")]
+    rules = prompt[prompt.index("키워드는 다음"):prompt.index("출력 형식:")]
+    return (
+        instructions.replace("아래에 제시된 장소의", "아래에 제시된 여러 장소 각각의")
+        + "장소 메타데이터 목록 (장소마다 `### PLACE <id>`로 구분):\n"
+        + "    {metadata_blocks}\n\n    "
+        + rules
+        + """출력 형식 (입력된 모든 장소에 대해 아래 형식을 반복하세요):
+    ### PLACE <id>
+    장소 소개글:
+
+    장소 키워드:
+    {{
+    "음식/제품": [],
+    "분위기/공간": [],
+    "서비스/직원": [],
+    "가격/가성비": [],
+    "접근성/편의시설": [],
+    "방문 목적": [],
+    "장소 카테고리": [],
+    "시간": []
+    }}
+    """
+    )
+
+
+def parse_batch_output(llm_response: str, place_ids: list) -> dict:
+    """
+    일괄 응답을 `### PLACE <id>` 구분자 기준으로 나누어 장소별로 파싱합니다.
+
+    Returns:
+        dict: 장소 id별 (소개글, 키워드). 누락되었거나 파싱에 실패한 장소는 포함되지 않음
+    """
+    wanted = {str(pid) for pid in place_ids}
+    parts = re.split(r"#{2,}\s*PLACE\s*(\d+)", llm_response)
+    results = {}
+    # parts = [머리말, id1, 본문1, id2, 본문2, ...]
+    for pid, body in zip(parts[1::2], parts[2::2]):
+        if pid not in wanted or pid in results:
+            continue
+        # 다음 장소 본문과 섞이지 않도록 JSON은 첫 번째 닫는 중괄호 블록까지만 사용
+        body = re.sub(r"(장소 키워드:\s*\{.*?\})[\s\S]*", r"\1", body, flags=re.DOTALL)
+        try:
+            results[pid] = parse_output(body)
+        except Exception as e:
+            print(f"⚠️ 일괄 응답 파싱 실패 ({pid}): {e}")
+    return {int(pid): value for pid, value in results.items()}
+
+
+def _usage_tokens(response, prompt: str) -> int:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        total = getattr(usage, "total_token_count", None)
+        if total:
+            return int(total)
+    return _estimate_tokens(prompt) + _estimate_tokens(getattr(response, "text", "") or "")
+
+
+def post_processing_batch(
+    items: list,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None
+) -> Tuple[list, dict]:
+    """
+    여러 장소의 키워드를 한 프롬프트에 묶어 동시에 추출합니다.
+
+    요청은 동기 generate_content를 스레드 풀에서 동시에 보냅니다.
+    (비동기 클라이언트는 처음 사용한 이벤트 루프에 묶이므로 여러 파이프라인 워커 스레드에서 공유할 수 없음)
+    묶음 요청이 실패하거나 응답에서 누락된 장소는 단건 요청으로 다시 처리하며,
+    단건 요청도 실패한 장소는 결과 자리에 예외를 담아 반환합니다.
+
+    Args:
+        items (list): (place_table, place_menu_table, place_facilities, place_reviews) 목록
+        batch_size (int): 프롬프트 하나에 넣을 장소 수 (미지정 시 LLM_BATCH_SIZE)
+        concurrency (int): 동시에 보낼 LLM 요청 수 (미지정 시 LLM_BATCH_CONCURRENCY)
+
+    Returns:
+        Tuple[list, dict]: 입력 순서대로의 (place_table, keywords) 또는 예외 목록,
+                           장소 id별 {"tokens", "seconds"} 비용 보고
+    """
+    batch_size = int(batch_size or settings.LLM_BATCH_SIZE)
+    concurrency = max(1, int(concurrency or settings.LLM_BATCH_CONCURRENCY))
+    model = get_model(settings.GOOGLE_API_KEY, settings.MODEL_NAME)
+    prompt = get_batch_prompt()
+
+    results: list = [None] * len(items)
+    report: dict = {}
+
+    def _run(indices: list) -> None:
+        chunk = {int(items[i][0]['id'].iloc[0]): i for i in indices}
+        blocks = "\n\n".join(
+            f"### PLACE {pid}\n{build_metadata_block(*items[i])}" for pid, i in chunk.items()
+        )
+        final_prompt = prompt.format(metadata_blocks=blocks)
+
+        start = time.perf_counter()
+        try:
+            response = model.generate_content(final_prompt)
+            parsed = parse_batch_output(response.text, list(chunk))
+            tokens = _usage_tokens(response, final_prompt)
+        except Exception as e:
+            print(f"⚠️ 일괄 키워드 추출 실패, 단건 재요청: {list(chunk)} → {e}")
+            parsed, tokens = {}, 0
+        seconds = time.perf_counter() - start
+
+        for pid, i in chunk.items():
+            report[pid] = {"tokens": tokens / len(chunk), "seconds": seconds / len(chunk)}
+            if pid in parsed:
+                place_table, place_menu_table = items[i][0], items[i][1]
+                results[i] = _apply_result(place_table, place_menu_table, *parsed[pid])
+
+        # 일괄 응답에서 누락된 장소는 단건 요청으로 다시 처리
+        for pid, i in chunk.items():
+            if results[i] is None:
+                print(f"⚠️ 일괄 응답에 장소 누락, 단건 재요청: {pid}")
+                start = time.perf_counter()
+                try:
+                    results[i] = post_processing(*items[i])
+                except Exception as e:
+                    print(f"❌ 단건 키워드 추출 실패: {pid} → {e}")
+                    results[i] = e
+                report[pid]["seconds"] += time.perf_counter() - start
+
+    chunks = [list(range(i, min(i + batch_size, len(items)))) for i in range(0, len(items), batch_size)]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks) or 1)) as executor:
+        list(executor.map(_run, chunks))
+
+    if report:
+        print(
+            f"[INFO] 일괄 키워드 추출: {len(items)}곳, "
+            f"장소당 평균 {sum(r['tokens'] for r in report.values()) / len(report):.0f}토큰, "
+            f"{sum(r['seconds'] for r in report.values()) / len(report):.2f}초"
+        )
+    return results, report
@@ -0,0 +1,259 @@
+"""
+단계별 스트리밍 파이프라인 실행 모듈
+
+이 모듈은 수집 파이프라인의 각 단계(크롤링, 후처리, 색인, 내보내기)를
+크기가 제한된 큐로 연결된 워커 그룹으로 실행합니다.
+다음 단계 큐가 가득 차면 이전 단계가 대기(back-pressure)하므로,
+전체 처리량은 모든 단계의 합이 아닌 가장 느린 단계에 의해 결정됩니다.
+
+주요 구성요소:
+    - Stage: 단계 정의 (이름, 처리 함수, 동시 실행 수)
+    - StagedPipelineRunner: 단계별 워커 실행기
+"""
+
+import time
+import queue
+import threading
+
+from typing import Any, Callable, List, Optional
+
+from monitoring.metrics import pipeline_metrics
+
+_STOP = object()
+
+
+class Stage:
+    """
+    파이프라인 단계 정의
+
+    Attributes:
+        name (str): 단계 이름
+        func (Callable): 입력 항목을 받아 다음 단계로 넘길 항목을 반환하는 함수 (None 반환 시 중단)
+        concurrency (int): 단계 워커 수
+        batch_size (int): 2 이상이면 func가 항목 목록을 받아 같은 길이의 결과 목록을 반환
+                          (일부 항목만 실패하면 그 자리에 예외를 반환)
+        batch_wait (float): 배치를 채우기 위해 기다리는 최대 시간(초)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        concurrency: int = 1,
+        batch_size: int = 1,
+        batch_wait: float = 0.5
+    ):
+        self.name = name
+        self.func = func
+        self.concurrency = max(1, int(concurrency))
+        self.batch_size = max(1, int(batch_size))
+        self.batch_wait = float(batch_wait)
+
+
+class _StageState:
+    def __init__(self, stage: Stage, queue_size: int):
+        self.stage = stage
+        self.inbox: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.threads: List[threading.Thread] = []
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0
+        self.busy_seconds = 0.0
+        self.lock = threading.Lock()
+
+
+class StagedPipelineRunner:
+    """
+    단계별 워커 그룹 실행기
+
+    각 단계는 자신의 입력 큐에서 항목을 꺼내 처리한 뒤 다음 단계 큐에 넣습니다.
+    처리 중 예외가 발생한 항목은 on_error 콜백으로 전달되고 이후 단계로 넘어가지 않습니다.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 16,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+        on_shutdown: Optional[Callable[[], None]] = None
+    ):
+        self._states = [_StageState(stage, queue_size) for stage in stages]
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_shutdown = on_shutdown
+        self._started_at = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> "StagedPipelineRunner":
+        with self._lock:
+            if self._started_at is not None:
+                return self
+            self._started_at = time.monotonic()
+            for idx, state in enumerate(self._states):
+                for n in range(state.stage.concurrency):
+                    t = threading.Thread(
+                        target=self._work,
+                        args=(idx,),
+                        name=f"pipeline-{state.stage.name}-{n}",
+                        daemon=True
+                    )
+                    t.start()
+                    state.threads.append(t)
+        return self
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> None:
+        """
+        첫 단계 큐에 항목을 넣습니다. 큐가 가득 차면 자리가 날 때까지 대기합니다.
+
+        Raises:
+            RuntimeError: 종료 중인 실행기에 제출한 경우
+            queue.Full: timeout 내에 자리가 나지 않은 경우
+        """
+        if self._closed:
+            raise RuntimeError("종료 중인 파이프라인에는 작업을 추가할 수 없습니다.")
+        self.start()
+        self._states[0].inbox.put(item, timeout=timeout)
+        pipeline_metrics.queue_depth.labels(stage=self._states[0].stage.name).set(
+            self._states[0].inbox.qsize()
+        )
+
+    def _next_batch(self, state: _StageState) -> tuple:
+        """
+        입력 큐에서 최대 batch_size개의 항목을 꺼냅니다.
+
+        Returns:
+            tuple: (항목 목록, 종료 신호 수신 여부)
+        """
+        item = state.inbox.get()
+        if item is _STOP:
+            return [], True
+
+        items = [item]
+        deadline = time.monotonic() + state.stage.batch_wait
+        while len(items) < state.stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = state.inbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _work(self, idx: int) -> None:
+        state = self._states[idx]
+        stage = state.stage
+        name = stage.name
+        next_inbox = self._states[idx + 1].inbox if idx + 1 < len(self._states) else None
+
+        stopping = False
+        while not stopping:
+            items, stopping = self._next_batch(state)
+            pipeline_metrics.queue_depth.labels(stage=name).set(state.inbox.qsize())
+            if not items:
+                break
+
+            with state.lock:
+                state.busy += 1
+            start = time.perf_counter()
+            try:
+                if stage.batch_size > 1:
+                    results = list(stage.func(items))
+                else:
+                    results = [stage.func(items[0])]
+            except Exception as e:
+                results = [None] * len(items)
+                with state.lock:
+                    state.failed += len(items)
+                pipeline_metrics.items.labels(stage=name, status="failure").inc(len(items))
+                for item in items:
+                    if self.on_error:
+                        self.on_error(name, item, e)
+                    else:
+                        print(f"❌ 파이프라인 {name} 단계 실패: {e}")
+            else:
+                # 배치 결과 중 예외인 항목만 실패로 처리
+                failures = [(item, r) for item, r in zip(items, results) if isinstance(r, Exception)]
+                if failures:
+                    results = [None if isinstance(r, Exception) else r for r in results]
+                    pipeline_metrics.items.labels(stage=name, status="failure").inc(len(failures))
+                    for item, e in failures:
+                        if self.on_error:
+                            self.on_error(name, item, e)
+                        else:
+                            print(f"❌ 파이프라인 {name} 단계 실패: {e}")
+                with state.lock:
+                    state.processed += len(items) - len(failures)
+                    state.failed += len(failures)
+                pipeline_metrics.items.labels(stage=name, status="success").inc(len(items) - len(failures))
+            finally:
+                elapsed = time.perf_counter() - start
+                with state.lock:
+                    state.busy -= 1
+                    state.busy_seconds += elapsed
+                pipeline_metrics.stage_latency.labels(stage=name).observe(elapsed)
+
+            for result in results:
+                if result is None:
+                    continue
+                if next_inbox is not None:
+                    next_inbox.put(result)  # 다음 단계 큐가 가득 차면 대기 (back-pressure)
+                elif self.on_done:
+                    self.on_done(result)
+
+    def shutdown(self, drain: bool = True) -> None:
+        """
+        파이프라인을 종료합니다.
+
+        drain=True이면 이미 제출된 항목을 모두 처리한 뒤 단계 순서대로 워커를 종료합니다.
+        drain=False이면 대기 중인 항목을 버리고 종료합니다.
+        """
+        self._closed = True
+        if self._started_at is None:
+            return
+
+        for state in self._states:
+            if not drain:
+                try:
+                    while True:
+                        state.inbox.get_nowait()
+                except queue.Empty:
+                    pass
+            # 앞 단계 워커가 모두 끝난 뒤 종료 신호를 보내야 남은 항목이 유실되지 않음
+            for _ in state.threads:
+                state.inbox.put(_STOP)
+            for t in state.threads:
+                t.join()
+
+        if self.on_shutdown:
+            self.on_shutdown()
+
+    def stats(self) -> dict:
+        """
+        단계별 실시간 상태를 반환합니다.
+
+        Returns:
+            dict: 단계 이름별 {workers, busy, queue_depth, processed, failed, throughput, utilization}
+        """
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        out = {}
+        for state in self._states:
+            with state.lock:
+                done = state.processed + state.failed
+                out[state.stage.name] = {
+                    "workers": state.stage.concurrency,
+                    "busy": state.busy,
+                    "queue_depth": state.inbox.qsize(),
+                    "processed": state.processed,
+                    "failed": state.failed,
+                    "throughput": done / uptime if uptime else 0.0,
+                    "utilization": (
+                        state.busy_seconds / (uptime * state.stage.concurrency) if uptime else 0.0
+                    ),
+                }
+        return out
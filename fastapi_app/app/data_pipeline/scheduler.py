@@ -0,0 +1,212 @@
+"""
+크롤링 스케줄러 모듈
+
+이 모듈은 여러 장소를 동시에 크롤링하는 스케줄러를 제공합니다.
+작업 대기열(frontier)은 크기가 제한되어 메모리 사용량이 일정하게 유지되며,
+호스트별 동시 요청 수와 요청 간격은 fetcher의 HostThrottle이 보장합니다.
+
+주요 구성요소:
+    - CrawlResult: 장소 단위 크롤링 결과
+    - CrawlScheduler: 동시 크롤링 스케줄러
+"""
+
+import time
+import queue
+import random
+import threading
+import requests
+
+from typing import Iterable, Iterator, Optional
+from selenium.common.exceptions import WebDriverException
+
+from app.core.config import settings
+from app.data_pipeline.crawler import crawling
+from app.data_pipeline.fetcher import BrowserPool, parse_section_modes
+from monitoring.metrics import crawl_metrics
+
+# 재시도할 일시적 오류 유형
+TRANSIENT_ERRORS = (
+    requests.RequestException,
+    WebDriverException,
+    TimeoutError,
+    ConnectionError,
+)
+
+_STOP = object()
+
+
+class CrawlResult:
+    """
+    장소 단위 크롤링 결과
+
+    Attributes:
+        place_id (int): 장소 id
+        data (tuple): crawling() 반환값 (실패 시 None)
+        timings (dict): 섹션별 {"mode", "seconds"} 측정값과 전체 소요 시간("total")
+        attempts (int): 시도 횟수
+        error (Exception): 최종 실패 원인
+    """
+
+    def __init__(self, place_id: int, data=None, timings=None, attempts: int = 0, error=None):
+        self.place_id = place_id
+        self.data = data
+        self.timings = timings or {}
+        self.attempts = attempts
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class CrawlScheduler:
+    """
+    동시 크롤링 스케줄러
+
+    워커 스레드들이 frontier에서 장소 id를 꺼내 크롤링하며,
+    일시적 오류는 지수 백오프로 재시도합니다.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        frontier_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        section_modes: Optional[dict] = None,
+        browser_pool: Optional[BrowserPool] = None
+    ):
+        self.workers = int(workers or settings.CRAWL_WORKERS)
+        self.frontier_size = int(frontier_size or settings.CRAWL_FRONTIER_SIZE)
+        self.max_retries = int(max_retries if max_retries is not None else settings.CRAWL_MAX_RETRIES)
+        self.backoff = float(backoff if backoff is not None else settings.CRAWL_RETRY_BACKOFF)
+        self.section_modes = section_modes or parse_section_modes(settings.CRAWL_SECTION_MODES)
+        # 호출한 쪽이 넘긴 풀은 호출한 쪽이 닫음
+        self._owns_pool = browser_pool is None
+        self.browser_pool = browser_pool or BrowserPool(settings.CRAWL_BROWSER_POOL_SIZE)
+
+    def crawl(self, place_id: int) -> CrawlResult:
+        """
+        장소 하나를 크롤링합니다. 일시적 오류는 지수 백오프로 재시도하고, 결과를 메트릭에 기록합니다.
+        """
+        result = self._crawl_with_retry(place_id)
+        self._record(result)
+        return result
+
+    def _crawl_with_retry(self, place_id: int) -> CrawlResult:
+        attempt = 0
+        while True:
+            attempt += 1
+            timings = {}
+            start = time.perf_counter()
+            try:
+                data = crawling(
+                    place_id,
+                    section_modes=self.section_modes,
+                    browser_pool=self.browser_pool,
+                    timings=timings
+                )
+                timings["total"] = time.perf_counter() - start
+                return CrawlResult(place_id, data=data, timings=timings, attempts=attempt)
+            except TRANSIENT_ERRORS as e:
+                if attempt > self.max_retries:
+                    return CrawlResult(place_id, timings=timings, attempts=attempt, error=e)
+                delay = self.backoff * (2 ** (attempt - 1)) + random.uniform(0, self.backoff)
+                print(f"⏳ ({attempt}/{self.max_retries}) 크롤링 재시도 대기 {delay:.1f}초: {place_id} → {e}")
+                time.sleep(delay)
+            except Exception as e:
+                return CrawlResult(place_id, timings=timings, attempts=attempt, error=e)
+
+    @staticmethod
+    def _record(result: CrawlResult) -> None:
+        for section, info in result.timings.items():
+            if isinstance(info, dict):
+                crawl_metrics.page_latency.labels(section=section, mode=info["mode"]).observe(info["seconds"])
+        crawl_metrics.place_count.labels(status="success" if result.ok else "failure").inc()
+
+        pages = ", ".join(
+            f"{section}({info['mode']}) {info['seconds']:.2f}s"
+            for section, info in result.timings.items() if isinstance(info, dict)
+        )
+        if result.ok:
+            print(f"[INFO] 크롤링 완료: {result.place_id} | {pages} | 총 {result.timings.get('total', 0):.2f}s")
+        else:
+            print(f"[ERROR] 크롤링 실패: {result.place_id} ({result.attempts}회 시도) → {result.error}")
+
+    def run(self, place_ids: Iterable[int]) -> Iterator[CrawlResult]:
+        """
+        장소 id들을 동시에 크롤링하고, 완료되는 순서대로 결과를 반환합니다.
+
+        호출한 쪽이 중간에 반복을 멈추면(break, close) 남은 장소는 크롤링하지 않고,
+        진행 중인 크롤링이 끝나 드라이버가 반납될 때까지 기다린 뒤 종료합니다.
+        스케줄러가 만든 드라이버 풀은 종료할 때 닫습니다.
+
+        Args:
+            place_ids (Iterable[int]): 크롤링할 장소 id 목록 (제너레이터 가능)
+
+        Yields:
+            CrawlResult: 장소 단위 크롤링 결과
+        """
+        frontier: queue.Queue = queue.Queue(maxsize=self.frontier_size)
+        results: queue.Queue = queue.Queue()
+        stopping = threading.Event()
+
+        def _offer(item, active) -> bool:
+            """frontier에 자리가 날 때까지 기다려 넣습니다. (active()가 거짓이 되면 포기)"""
+            while active():
+                try:
+                    frontier.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _workers_alive() -> bool:
+            return any(t.is_alive() for t in workers)
+
+        def _produce():
+            try:
+                for place_id in place_ids:
+                    # frontier가 가득 차면 대기 (중단되면 남은 장소는 넣지 않음)
+                    if not _offer(place_id, lambda: not stopping.is_set()):
+                        break
+            finally:
+                for _ in range(self.workers):
+                    _offer(_STOP, _workers_alive)
+
+        def _work():
+            try:
+                while True:
+                    place_id = frontier.get()
+                    if place_id is _STOP:
+                        break
+                    if stopping.is_set():
+                        continue
+                    results.put(self.crawl(place_id))
+            finally:
+                results.put(_STOP)
+
+        producer = threading.Thread(target=_produce, daemon=True)
+        workers = [threading.Thread(target=_work, daemon=True) for _ in range(self.workers)]
+        producer.start()
+        for t in workers:
+            t.start()
+
+        try:
+            finished = 0
+            while finished < self.workers:
+                result = results.get()
+                if result is _STOP:
+                    finished += 1
+                    continue
+                yield result
+        finally:
+            stopping.set()
+            # 남은 장소는 워커가 건너뜀. producer가 다음 장소를 기다리는 중이어도 워커가 끝나도록 종료 신호를 추가
+            for _ in range(self.workers):
+                _offer(_STOP, _workers_alive)
+            # 진행 중인 크롤링이 끝나 드라이버가 반납될 때까지 대기
+            for t in workers:
+                t.join()
+            if self._owns_pool:
+                self.browser_pool.close()
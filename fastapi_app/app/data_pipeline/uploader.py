@@ -3,137 +3,170 @@ import pysqlite3
 sys.modules["sqlite3"] = pysqlite3
 import sqlite3
 
-import io
-import time
-import boto3
 import chromadb
 
-from sqlite3 import OperationalError
-from chromadb.errors import IDAlreadyExistsError
-
 from app.core.config import settings
 from app.core.constants import CATEGORY_MAP
-
-
-def upload_chromadb(place_table, keywords, embedding_model):
-    client = chromadb.PersistentClient(path=settings.VECTOR_STORE_PATH)
-
-    for category, keyword_list in keywords.items():
-        if not keyword_list:
+from app.data_pipeline.exporter import get_exporter
+from app.data.snapshots import get_snapshot_manager
+from app.data.geo_index import parse_location
+from app.data.shards import region_of
+from app.data.opening_hours import compile_hours, encode_hours
+from app.data.vector_writer import WriteOp, get_vector_writer
+from app.data_pipeline.keyword_normalizer import KeywordGroup, collapse_keywords, normalize_keyword
+
+
+def keyword_doc_id(collection_name: str, place_id: int, keyword: str) -> str:
+    return f"{collection_name}_{place_id}_{keyword}"
+
+
+def upload_chromadb(place_table, keywords, embedding_model, previous_keywords=None, place_hours_table=None):
+    """
+    장소 키워드를 ChromaDB에 반영합니다.
+
+    키워드 변형은 대표 키워드 하나로 병합한 뒤(keyword_normalizer),
+    기존에 색인된 키워드(현재 게시 버전 조회 + 이전 상태)와 비교하여
+    사라진 키워드는 삭제하고, 새로 생긴 대표 키워드만 추가합니다.
+    이미 색인된 키워드는 저장된 벡터를 재사용하므로 새 키워드만 임베딩합니다.
+
+    실제 쓰기는 단일 작성기(VectorStoreWriter)에 제출되어 다른 업로드와 함께 그룹 커밋됩니다.
+
+    Args:
+        place_table (pd.DataFrame): 장소 테이블
+        keywords (dict): 카테고리별 키워드 목록
+        embedding_model (EmbeddingModel): 임베딩 모델
+        previous_keywords (dict): 이전에 색인한 카테고리별 키워드 목록
+        place_hours_table (pd.DataFrame): 장소 영업시간 테이블 (영업시간 비트맵 메타데이터용)
+
+    Returns:
+        Tuple[int, int]: (추가한 키워드 수, 삭제한 키워드 수)
+    """
+    # 조회는 게시된 읽기 전용 버전에서 수행 (작성기와 잠금 경합 없음)
+    client = chromadb.PersistentClient(path=get_snapshot_manager().current_path())
+    place_id = int(place_table['id'][0])
+    place_category = place_table['category'][0] if 'category' in place_table else None
+    coords = parse_location(place_table['location'][0]) if 'location' in place_table else None
+    road_address = place_table['road_address'][0] if 'road_address' in place_table else None
+    region = region_of(coords, road_address)
+    hours = encode_hours(compile_hours(place_hours_table))
+    previous_keywords = previous_keywords or {}
+    ops = []
+    raw_count, collapsed_count = 0, 0
+
+    for category, collection_name in CATEGORY_MAP.items():
+        keyword_list = list(dict.fromkeys(
+            normalize_keyword(k) for k in keywords.get(category) or [] if normalize_keyword(k)
+        ))
+        candidates = {keyword_doc_id(collection_name, place_id, kw): kw for kw in keyword_list}
+
+        try:
+            collection = client.get_collection(name=collection_name)
+            indexed = set(collection.get(where={"place_id": place_id}, include=[])["ids"])
+            existing = {"ids": [], "embeddings": [], "metadatas": []}
+            if candidates:
+                existing = collection.get(ids=list(candidates), include=["embeddings", "metadatas"])
+                indexed |= set(existing["ids"])
+        except Exception as e:
+            print(f"⚠️ 기존 색인 조회 실패 ({collection_name}): {e}")
             continue
 
-        collection_name = CATEGORY_MAP.get(category)
-        if not collection_name:
+        known_vectors = dict(zip(existing["ids"], existing["embeddings"]))
+        known_metadata = {
+            doc_id: meta or {} for doc_id, meta in zip(existing["ids"], existing["metadatas"])
+        }
+
+        # -------- 임베딩 (이미 색인된 키워드는 저장된 벡터 재사용) --------
+        missing = [kw for doc_id, kw in candidates.items() if doc_id not in known_vectors]
+        try:
+            encoded = dict(zip(missing, embedding_model.encode(missing))) if missing else {}
+        except Exception as e:
+            print(f"❌ 임베딩 실패 ({collection_name}): {e}")
             continue
-
-        collection = client.get_collection(name=collection_name)
-
-        for keyword in keyword_list:
-            try:
-                doc_id = f"{collection_name}_{place_table['id'][0]}_{keyword}"
-                metadata = {
-                    "place_id": doc_id,
-                    "keyword": keyword,
-                    "category": category
-                }
-            except Exception as e:
-                print(f"⚠️ 메타데이터 정제 실패: {e}")
-                continue
-
-            # 중복 방지
-            try:
-                existing = collection.get(ids=[doc_id])
-                if existing["ids"]:
-                    print(f"⚠️ 중복된 ID 감지됨: {doc_id}")
-                    continue
-            except Exception as e:
-                print(f"⚠️ 중복 검사 실패 ({doc_id}): {e}")
-                continue
-
-            # 임베딩 생성
-            try:
-                keyword_vec = embedding_model.encode(keyword).tolist()
-            except Exception as e:
-                print(f"❌ 임베딩 실패 ({keyword}): {e}")
-                continue
-
-            # 데이터 추가 5회 반복
-            for attempt in range(5):
-                try:
-                    collection.add(
-                        ids=[doc_id],
-                        documents=[keyword],
-                        metadatas=[metadata],
-                        embeddings=[keyword_vec]
-                    )
-                    break  # 성공 시 반복 탈출
-                except (OperationalError, IDAlreadyExistsError) as e:
-                    print(f"⏳ ({attempt+1}/5) 잠금 또는 중복 오류 발생: {e}")
-                    time.sleep(0.1)
-                except Exception as e:
-                    print(f"❌ 알 수 없는 오류 발생 ({keyword}): {e}")
-                    break  # 비재시도 오류
-            else:
-                print(f"❌ 최대 재시도 초과, 업로드 실패: {doc_id}")
-
-
-def upload_s3(place_table, place_hours_table, place_menu_table):
-    s3 = boto3.client(
-    's3',
-    aws_access_key_id=settings.S3_ACCESS_KEY,
-    aws_secret_access_key=settings.S3_SECRET_KEY,
-    region_name=settings.S3_DEFAULT_REGION
+        vectors = [
+            known_vectors.get(doc_id) if doc_id in known_vectors else encoded[kw]
+            for doc_id, kw in candidates.items()
+        ]
+
+        # -------- 중복 키워드 병합 --------
+        groups = collapse_keywords(keyword_list, vectors, settings.KEYWORD_DEDUP_THRESHOLD)
+        wanted = {keyword_doc_id(collection_name, place_id, g.canonical): g for g in groups}
+        raw_count += len(keyword_list)
+        collapsed_count += len(groups)
+
+        previous_ids = {
+            keyword_doc_id(collection_name, place_id, str(kw))
+            for kw in previous_keywords.get(category) or []
+        }
+
+        # 사라진 키워드 삭제, 변형 목록/장소 카테고리/좌표/영업시간/지역이 바뀐 키워드 메타데이터 갱신, 새 키워드 추가
+        stale = sorted((indexed | previous_ids) - wanted.keys())
+        metadata = {
+            doc_id: keyword_metadata(place_id, category, group, place_category, coords, hours, region)
+            for doc_id, group in wanted.items()
+        }
+        changed = [
+            doc_id for doc_id in wanted
+            if doc_id in indexed and any(
+                known_metadata.get(doc_id, {}).get(field) != metadata[doc_id].get(field)
+                for field in ("variants", "place_category", "lat", "lon", "hours", "region")
+            )
+        ]
+        new_ids = [doc_id for doc_id in wanted if doc_id not in indexed]
+        ops.append(WriteOp(
+            collection_name,
+            ids=new_ids,
+            documents=[wanted[doc_id].canonical for doc_id in new_ids],
+            metadatas=[metadata[doc_id] for doc_id in new_ids],
+            embeddings=[[float(x) for x in wanted[doc_id].vector] for doc_id in new_ids],
+            delete_ids=stale,
+            updates={doc_id: metadata[doc_id] for doc_id in changed}
+        ))
+
+    version = get_vector_writer().submit(ops).result()
+    added = sum(len(op.ids) for op in ops)
+    deleted = sum(len(op.delete_ids) for op in ops)
+    print(
+        f"[INFO] 키워드 색인 반영: {place_id} (+{added} / -{deleted}, {version}), "
+        f"중복 병합 {raw_count} → {collapsed_count}개"
     )
+    return added, deleted
+
+
+def keyword_metadata(
+    place_id: int,
+    category: str,
+    group: KeywordGroup,
+    place_category=None,
+    coords=None,
+    hours=None,
+    region=None
+) -> dict:
+    metadata = {
+        "place_id": place_id,
+        "keyword": group.canonical,
+        "category": category,
+        "variants": group.variants_str
+    }
+    # 장소 카테고리별 부분 검색(where 필터)에 사용 (ChromaDB 메타데이터는 None 불가)
+    if isinstance(place_category, str) and place_category:
+        metadata["place_category"] = place_category
+    # 반경 검색용 좌표 인덱스(geo_index) 생성에 사용
+    if coords:
+        metadata["lat"], metadata["lon"] = float(coords[0]), float(coords[1])
+    # 영업 중 필터용 주간 비트맵 (opening_hours, 16진 문자열)
+    if hours:
+        metadata["hours"] = hours
+    # 지역 샤드 분할(app.data.shards)에 사용
+    if region:
+        metadata["region"] = region
+    return metadata
 
-    place_id = place_table['id'][0]
-
-    # -------- place_table.csv 업로드 --------
-    # CSV 데이터를 메모리에 쓰기
-    place_table_csv_buffer = io.StringIO()
-    place_table.to_csv(place_table_csv_buffer, index=False, encoding="utf-8-sig")
-    place_table_key = f"{place_id}/place_table.csv"
 
-    # S3에 업로드
-    s3.put_object(
-        Bucket=settings.S3_METADATA_PATH,
-        Key=place_table_key,
-        Body=place_table_csv_buffer.getvalue(),
-        ContentType="text/csv"
-    )
-
-    # -------- place_hours_table.csv 업로드 --------
-    place_hours_table_csv_buffer = io.StringIO()
-    place_hours_table.to_csv(place_hours_table_csv_buffer, index=False, encoding="utf-8-sig")
-    place_hours_table_key = f"{place_id}/place_hours_table.csv"
-
-    s3.put_object(
-        Bucket=settings.S3_METADATA_PATH,
-        Key=place_hours_table_key,
-        Body=place_hours_table_csv_buffer.getvalue(),
-        ContentType="text/csv"
-    )
-
-    # -------- place_menu_table.csv 업로드 --------
-    place_menu_table_csv_buffer = io.StringIO()
-    place_menu_table.to_csv(place_menu_table_csv_buffer, index=False, encoding="utf-8-sig")
-    place_menu_table_key = f"{place_id}/place_menu_table.csv"
-
-    s3.put_object(
-        Bucket=settings.S3_METADATA_PATH,
-        Key=place_menu_table_key,
-        Body=place_menu_table_csv_buffer.getvalue(),
-        ContentType="text/csv"
-    )
+def upload_s3(place_table, place_hours_table, place_menu_table):
+    """
+    장소 테이블과 이미지를 S3에 업로드합니다.
 
-    # -------- 이미지 존재하면 이미지 업로드 --------
-    image_url = place_table['image_url'][0]
-    if image_url:
-        temp_image_path = f"{settings.TEMP_IMAGE_PATH}/{place_id}.jpg"
-        image_key = f"place/{place_id}.jpg"
-
-        s3.upload_file(
-            Filename=temp_image_path,
-            Bucket=settings.S3_IMAGE_PATH,
-            Key=image_key,
-            ExtraArgs={"ContentType": "image/jpeg"}
-        )
\ No newline at end of file
+    S3_EXPORT_FORMAT이 parquet이면 테이블은 여러 장소 단위로 묶여 업로드됩니다.
+    남은 버퍼는 S3_EXPORT_FLUSH_INTERVAL마다 업로드되며, 일괄 작업이 끝나면 get_exporter().flush()를 호출해 바로 올립니다.
+    """
+    get_exporter().export_place(place_table, place_hours_table, place_menu_table)
@@ -1,5 +1,10 @@
+from typing import List
 from pydantic import BaseModel, Field
 
 class UploadRequest(BaseModel):
     place_id: int
-    upload_secret_key: str = Field(..., description="업로드 요청을 위한 인증 키")
\ No newline at end of file
+    upload_secret_key: str = Field(..., description="업로드 요청을 위한 인증 키")
+
+class BatchUploadRequest(BaseModel):
+    place_ids: List[int] = Field(..., min_length=1, description="업로드할 장소 id 목록")
+    upload_secret_key: str = Field(..., description="업로드 요청을 위한 인증 키")
@@ -0,0 +1,41 @@
+"""
+샤드 서버의 데이터 모델 정의
+
+이 모듈은 지역 샤드 서버(app.shard.server)의 요청 데이터 구조를 정의합니다.
+필드는 PlaceStore의 같은 이름 메서드 인자와 같습니다. (장소 id 집합은 목록으로 전달)
+
+주요 구성요소:
+    - ShardSearchRequest: search_places 요청
+    - ShardLexicalRequest: lexical_search 요청
+    - ShardWithinRequest: places_within 요청
+    - ShardClosedRequest: places_closed_at 요청
+"""
+
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional, List
+
+class ShardSearchRequest(BaseModel):
+    category: str
+    keyword_vec: List[float]
+    n_results: Optional[int] = 50
+    place_category: Optional[str] = None
+    place_ids: Optional[List[int]] = None
+    exclude_ids: Optional[List[int]] = None
+    keyword: Optional[str] = None
+
+class ShardLexicalRequest(BaseModel):
+    category: str
+    keyword: Optional[str] = None
+    n_results: int = 50
+    place_category: Optional[str] = None
+    place_ids: Optional[List[int]] = None
+    exclude_ids: Optional[List[int]] = None
+
+class ShardWithinRequest(BaseModel):
+    lat: float
+    lon: float
+    radius_m: float
+
+class ShardClosedRequest(BaseModel):
+    when: datetime
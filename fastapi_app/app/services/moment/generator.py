@@ -10,8 +10,11 @@ LangChain을 사용하여 be 서버 입력을 활용해서 장소 추천 게시
 
 import json
 
+from typing import Optional
 from langchain.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
+from app.core.config import settings
+from app.cache.cache import Cache
 from app.schemas.moment_schema import GenerateRequest, GenerateResponse
 
 class GeneratorService:
@@ -24,19 +27,23 @@ class GeneratorService:
     Attributes:
         llm (ChatGoogleGenerativeAI): LangChain LLM 인스턴스
         chain: 키워드 추출을 위한 LangChain 체인
+        cache (Cache): 생성한 게시글 캐시
     """
     
     def __init__(
         self,
         llm: ChatGoogleGenerativeAI,
+        cache: Optional[Cache] = None,
     ):
         """
         RecommenderService 초기화
         
         Args:
             llm (ChatGoogleGenerativeAI): LangChain LLM 인스턴스
+            cache (Cache): 생성한 게시글 캐시 ("moment" 네임스페이스, None이면 캐시 안 함)
         """
         self.llm = llm
+        self.cache = cache
         self.chain = self._create_chain()
     
     def _create_chain(self):
@@ -87,6 +94,8 @@ class GeneratorService:
     async def generate_moment(self, place_info: GenerateRequest) -> GenerateResponse:
         """
         장소 정보를 활용해서 게시글을 생성합니다.
+
+        같은 장소 정보로 생성한 게시글은 캐시에서 반환합니다.
                 
         Args:
             place_info (GenerateRequest): 장소 정보
@@ -98,21 +107,28 @@ class GeneratorService:
             Exception: 게시글 생성 과정에서 오류가 발생한 경우
         """
         try:
-            response = await self.chain.ainvoke({"place_info": place_info})
-            moment_str = response.content
-            
-            # JSON 문자열에서 게시글 딕셔너리 추출
-            start_idx = moment_str.find("{")
-            end_idx = moment_str.rfind("}") + 1
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("게시글 생성 실패: JSON 형식이 올바르지 않습니다.")
-            
-            moment_json = moment_str[start_idx:end_idx]
-            moment = json.loads(moment_json)
+            if self.cache is None:
+                return await self._generate(place_info)
+            key = Cache.key(settings.MODEL_NAME, place_info.model_dump(mode="json"))
+            return await self.cache.get_or_set(
+                "moment", key, lambda: self._generate(place_info), GenerateResponse
+            )
+        except Exception as e:
+            raise Exception(f"게시글 생성 중 오류 발생: {str(e)}")
 
-            moment["place_id"] = place_info.id
+    async def _generate(self, place_info: GenerateRequest) -> GenerateResponse:
+        response = await self.chain.ainvoke({"place_info": place_info})
+        moment_str = response.content
+        
+        # JSON 문자열에서 게시글 딕셔너리 추출
+        start_idx = moment_str.find("{")
+        end_idx = moment_str.rfind("}") + 1
+        if start_idx == -1 or end_idx == 0:
+            raise ValueError("게시글 생성 실패: JSON 형식이 올바르지 않습니다.")
+        
+        moment_json = moment_str[start_idx:end_idx]
+        moment = json.loads(moment_json)
 
-            return moment
-            
-        except Exception as e:
-            raise Exception(f"게시글 생성 중 오류 발생: {str(e)}")
\ No newline at end of file
+        moment["place_id"] = place_info.id
+
+        return GenerateResponse(**moment)
@@ -1,5 +1,6 @@
 import threading
-from app.services.recommend.retriever import PlaceStore
+from app.core.config import settings
+from app.services.recommend.retriever import PlaceStore, CompactPlaceStore
 
 class PlaceStoreFactory:
     _instance = None
@@ -11,7 +12,16 @@ class PlaceStoreFactory:
             with cls._lock:
                 if cls._instance is None:
                     try:
-                        cls._instance = PlaceStore()
+                        if settings.RETRIEVAL_BACKEND == "compact":
+                            cls._instance = CompactPlaceStore()
+                        elif settings.RETRIEVAL_BACKEND == "sharded":
+                            from app.services.recommend.sharding import ShardedPlaceStore
+                            cls._instance = ShardedPlaceStore()
+                        else:
+                            cls._instance = PlaceStore()
                     except Exception as e:
                         raise RuntimeError(f"PlaceStore 초기화 실패: {str(e)}")
+        else:
+            # 요청 사이에 새로 게시된 벡터 저장소 버전으로 교체
+            cls._instance.refresh()
         return cls._instance
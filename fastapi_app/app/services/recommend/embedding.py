@@ -28,9 +28,15 @@ class EmbeddingModel:
             self.input_names["attention_mask"]: encoded["attention_mask"].astype(np.int64)
         }
 
-    def _postprocess(self, outputs: np.ndarray) -> np.ndarray:
-        # Mean pooling
-        return outputs.mean(axis=1)
+    def _postprocess(self, outputs: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        # Mean pooling (패딩 토큰 제외)
+        # 배치 인코딩은 가장 긴 문장에 맞춰 패딩되므로, 마스크 없이 평균을 내면 같은 문자열도 배치 구성에 따라 벡터가 달라짐
+        if outputs.ndim == 2:
+            return outputs
+        mask = attention_mask[..., np.newaxis].astype(outputs.dtype)
+        summed = (outputs * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        return summed / counts
 
     def get_sentence_embedding_dimension(self) -> int:
         output_shape = self.session.get_outputs()[0].shape
@@ -44,13 +50,13 @@ class EmbeddingModel:
         if isinstance(sentences, str):
             input_feed = self._preprocess(sentences)
             output = self.session.run([self.output_name], input_feed)[0]
-            return self._postprocess(output)[0]  # Return single vector
+            return self._postprocess(output, input_feed[self.input_names["attention_mask"]])[0]  # Return single vector
 
         embeddings = []
         for i in range(0, len(sentences), batch_size):
             batch = sentences[i:i + batch_size]
             input_feed = self._preprocess(batch)
             output = self.session.run([self.output_name], input_feed)[0]
-            pooled = self._postprocess(output)
+            pooled = self._postprocess(output, input_feed[self.input_names["attention_mask"]])
             embeddings.append(pooled)
         return np.vstack(embeddings).tolist()
\ No newline at end of file
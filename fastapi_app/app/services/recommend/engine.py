@@ -2,18 +2,34 @@
 추천 엔진 모듈
 
 이 모듈은 키워드 기반 장소 추천 기능을 제공합니다.
+
+적응형 검색(ADAPTIVE_TOP_K)은 키워드별 검색 결과의 거리만 먼저 받은 뒤,
+다른 키워드들의 최고 점수를 모두 더해도 임계값에 못 미치는 꼬리 결과는 메타데이터 조회와 점수 계산을 생략합니다.
+꼬리 결과가 최고 키워드인 장소는 기존 방식에서도 임계값을 넘지 못하므로 최종 추천 결과는 같습니다.
+
+원문 키워드가 있으면 어휘 역색인(문자 n-gram BM25) 검색을 먼저 합니다.
+어휘 검색이 정확히 일치하거나 최고 점수가 LEXICAL_SKIP_DENSE_SCORE 이상이면 (LEXICAL_SKIP_DENSE)
+그 결과만 사용하고 키워드 임베딩과 벡터 검색을 하지 않습니다. 벡터 검색은 나머지 키워드의 대체 경로입니다.
+벡터 검색을 한 키워드의 장소 점수는 max(벡터 점수, 어휘 점수 * LEXICAL_WEIGHT)이며,
+색인된 키워드와 정확히 같은 키워드는 이웃 테이블이 답하면 ANN 검색을 하지 않습니다.
+
 주요 구성요소:
-    - RecommendationEngine: 추천 엔진 클래스
+    - RecommendationEngine: 추천 엔진 클래스 (키워드 모드 get_recommendations, dense 모드 get_dense_recommendations)
 """
 
 import asyncio
 import numpy as np
+
+from datetime import datetime
 import pandas as pd
 
-from typing import Optional, List, Tuple
+from typing import Callable, Optional, List, Set, Tuple
 from collections import defaultdict
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.place_ids import entry_place_id
 from app.logging.config import get_logger
-from app.services.recommend.retriever import PlaceStore
+from app.services.recommend.retriever import PlaceStore, RankedHits
 from app.schemas.recommend_schema import Recommendation, RecommendResponse
 
 class RecommendationEngine:
@@ -24,7 +40,11 @@ class RecommendationEngine:
     
     Attributes:
         place_store (PlaceStore): 장소 벡터 저장소
+        adaptive_top_k (bool): 임계값을 넘을 수 없는 꼬리 결과 생략 여부
     """
+
+    # 부동소수점 합산 순서 차이로 경계의 결과를 잘못 생략하지 않도록 두는 여유
+    CUTOFF_MARGIN = 1e-6
     
     def __init__(self, place_store: PlaceStore, logger=None):
         """
@@ -34,6 +54,7 @@ class RecommendationEngine:
             place_store (PlaceStore): 장소 벡터 저장소 인스턴스
         """
         self.place_store = place_store
+        self.adaptive_top_k = settings.ADAPTIVE_TOP_K
         if logger is None:
             from app.logging.di import get_logger_dep
             logger = get_logger_dep()
@@ -43,14 +64,26 @@ class RecommendationEngine:
         self,
         categories: Optional[List[str]],
         keyword_vecs: Optional[List[float]],
-        place_category: Optional[str]
+        place_category: Optional[str],
+        location: Optional[Tuple[float, float, float]] = None,
+        open_at: Optional[datetime] = None,
+        keywords: Optional[List[str]] = None,
+        encode: Optional[Callable] = None
     ) -> RecommendResponse:
         """
         키워드 기반 장소 추천
+
+        location이 주어지면 반경 내 장소로, open_at이 주어지면 그 시각에 영업 중인 장소로
+        후보를 먼저 제한한 뒤 점수를 계산합니다.
+        keyword_vecs 대신 encode를 주면 어휘 검색으로 답하지 못한 키워드만 임베딩합니다.
         
         Args:
             keywords (Dict[str, List[str]]): 카테고리별 키워드 목록
             top_n (int): 반환할 추천 장소 수
+            location (Tuple[float, float, float]): (위도, 경도, 반경 m)
+            open_at (datetime): 영업 중이어야 하는 시각
+            keywords (List[str]): keyword_vecs의 원문 키워드 (어휘 검색/이웃 테이블 조회용)
+            encode (Callable): 키워드 목록 → 벡터 목록 임베딩 함수 (keyword_vecs가 None일 때 사용)
             
         Returns:
             RecommendResponse: 추천 결과
@@ -59,8 +92,15 @@ class RecommendationEngine:
             Exception: 추천 생성 중 오류 발생 시
         """
         try:
+            place_ids, exclude_ids = await self._place_filters(location, open_at)
+            if place_ids is not None and not place_ids:
+                return RecommendResponse(recommendations=[], place_category=place_category)
+
             keyword_weight, place_threshold = self._calculate_weight_threshold(categories)
-            place_scores = await self._calculate_place_scores(categories, keyword_vecs, keyword_weight)
+            place_scores = await self._calculate_place_scores(
+                categories, keyword_vecs, keyword_weight, place_category, place_ids, exclude_ids, keywords,
+                place_threshold=place_threshold, encode=encode
+            )
             filtered_df = self._filter_and_sort(place_scores, place_threshold)
 
             recommendations = [
@@ -81,6 +121,97 @@ class RecommendationEngine:
             self.logger.error(f"추천 생성 중 오류 발생: {str(e)}")
             raise Exception(f"추천 생성 중 오류 발생: {str(e)}") 
 
+    async def get_dense_recommendations(
+        self,
+        query_vec: List[float],
+        place_category: Optional[str] = None,
+        location: Optional[Tuple[float, float, float]] = None,
+        open_at: Optional[datetime] = None
+    ) -> RecommendResponse:
+        """
+        질의 문장 임베딩 기반 장소 추천 (dense 모드, 키워드 추출 없음)
+
+        문장 임베딩 하나로 모든 키워드 카테고리 컬렉션을 동시에 검색하고,
+        카테고리 가중치 없이 장소별 카테고리 최고 유사도(DENSE_MIN_SCORE 이상)를 합산하여
+        상위 DENSE_MAX_RESULTS개 장소를 반환합니다. 메타데이터는 DENSE_MIN_SCORE를 넘는 결과만 조회합니다.
+
+        Args:
+            query_vec (List[float]): 질의 문장 임베딩
+            place_category (str): 검색할 장소 카테고리 (예: "카페")
+            location (Tuple[float, float, float]): (위도, 경도, 반경 m)
+            open_at (datetime): 영업 중이어야 하는 시각
+
+        Returns:
+            RecommendResponse: 추천 결과 (키워드 모드와 같은 형식)
+
+        Raises:
+            Exception: 추천 생성 중 오류 발생 시
+        """
+        try:
+            place_ids, exclude_ids = await self._place_filters(location, open_at)
+            if place_ids is not None and not place_ids:
+                return RecommendResponse(recommendations=[], place_category=place_category)
+
+            categories = list(CATEGORY_MAP)
+            hits = await asyncio.gather(*(
+                asyncio.to_thread(
+                    self.place_store.probe_places,
+                    category,
+                    query_vec,
+                    n_results=int(settings.DENSE_TOP_K),
+                    place_category=place_category,
+                    place_ids=place_ids,
+                    exclude_ids=exclude_ids
+                )
+                for category in categories
+            ), return_exceptions=True)
+
+            max_distance = 1.0 - float(settings.DENSE_MIN_SCORE)
+            place_scores = defaultdict(lambda: {"total_score": 0.0, "keywords": set()})
+            for category, ranked in zip(categories, hits):
+                if isinstance(ranked, Exception):
+                    self.logger.error("카테고리 %s 처리 중 오류: %s", category, ranked)
+                    continue
+                if ranked is None:
+                    continue
+                count = int(np.count_nonzero(ranked.distances <= max_distance))
+                results = await asyncio.to_thread(ranked.fetch, count) if count else None
+                if results:
+                    # 카테고리 가중치 없음 (keyword_weight = 1)
+                    self._best_place_scores(results, category, place_scores, 1.0, place_ids, exclude_ids)
+
+            filtered_df = self._filter_and_sort(place_scores, 0.0).head(int(settings.DENSE_MAX_RESULTS))
+            return RecommendResponse(
+                recommendations=[
+                    Recommendation(id=row.place_id, similarity_score=row.total_score, keyword=row.keywords)
+                    for _, row in filtered_df.iterrows()
+                ],
+                place_category=place_category,
+            )
+
+        except Exception as e:
+            self.logger.error(f"dense 추천 생성 중 오류 발생: {str(e)}")
+            raise Exception(f"추천 생성 중 오류 발생: {str(e)}")
+
+    async def _place_filters(
+        self,
+        location: Optional[Tuple[float, float, float]],
+        open_at: Optional[datetime]
+    ) -> Tuple[Optional[Set[int]], Optional[Set[int]]]:
+        """
+        위치/영업시간 조건을 검색 대상 장소(place_ids)와 제외 장소(exclude_ids)로 변환
+        """
+        place_ids, exclude_ids = None, None
+        if location is not None:
+            place_ids = await asyncio.to_thread(self.place_store.places_within, *location)
+        if open_at is not None:
+            closed = await asyncio.to_thread(self.place_store.places_closed_at, open_at)
+            if place_ids is not None:
+                place_ids = place_ids - closed
+            else:
+                exclude_ids = closed
+        return place_ids, exclude_ids
+
     @staticmethod
     def _calculate_weight_threshold(categories: List[str]) -> Tuple[float, float]:
         """
@@ -99,54 +230,263 @@ class RecommendationEngine:
         self,
         categories: List[str],
         keyword_vecs: List[float],
-        keyword_weight: float
+        keyword_weight: float,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keywords: Optional[List[str]] = None,
+        place_threshold: Optional[float] = None,
+        encode: Optional[Callable] = None
     ) -> dict[int, dict[str, object]]:
         """
         장소 별 가장 유사한 키워드들의 유사도 누적
+
+        장소 카테고리가 지정되면 해당 카테고리 장소의 키워드만 검색하고,
+        place_ids가 지정되면 해당 장소의 키워드만, exclude_ids가 지정되면 해당 장소를 제외하고 검색합니다.
+        적응형 검색이 켜져 있고 place_threshold가 주어지면 임계값을 넘을 수 있는 결과만 누적합니다.
+        어휘 검색으로 답한 키워드는 벡터 검색을 하지 않습니다. (keyword_vecs가 None이면 나머지 키워드만 encode로 임베딩)
         """
         place_scores = defaultdict(lambda: {"total_score": 0.0, "keywords": set()})
+        keywords = keywords or [None] * len(categories)
+
+        lexical = await asyncio.gather(*(
+            self._lexical(category, keyword, place_category, place_ids, exclude_ids)
+            for category, keyword in zip(categories, keywords)
+        ))
+        dense = [not self._lexical_confident(found) for found in lexical]
+        lexical = [found[0] if found is not None else None for found in lexical]
+        keyword_vecs = await self._keyword_vecs(keywords, keyword_vecs, dense, encode)
 
-        for category, keyword_vec in zip(categories, keyword_vecs):
+        if self.adaptive_top_k and place_threshold is not None:
+            hits = await asyncio.gather(*(
+                self._probe(category, keyword_vec, keyword, place_category, place_ids, exclude_ids)
+                for category, keyword_vec, keyword in zip(categories, keyword_vecs, keywords)
+            ))
+            floors = [
+                float(self._lexical_scores(found, category, keyword_weight).max()) if found else 0.0
+                for category, found in zip(categories, lexical)
+            ]
+            counts = self._cutoff_counts(categories, hits, keyword_weight, place_threshold, floors)
+            for category, ranked, count, found in zip(categories, hits, counts, lexical):
+                try:
+                    results = await asyncio.to_thread(ranked.fetch, count) if ranked is not None and count else None
+                    if results or found:
+                        self._best_place_scores(
+                            results, category, place_scores, keyword_weight, place_ids, exclude_ids, lexical=found
+                        )
+                except Exception as e:  # pragma: no cover
+                    self.logger.error("카테고리 %s 처리 중 오류: %s", category, e, exc_info=True)
+            return place_scores
+
+        for category, keyword_vec, keyword, found in zip(categories, keyword_vecs, keywords, lexical):
             try:
-                results = await asyncio.to_thread(self.place_store.search_places, category, keyword_vec)
-                if not results:
+                results = await asyncio.to_thread(
+                    self.place_store.search_places,
+                    category,
+                    keyword_vec,
+                    place_category=place_category,
+                    place_ids=place_ids,
+                    exclude_ids=exclude_ids,
+                    keyword=keyword
+                ) if keyword_vec is not None else None
+                if not results and not found:
                     continue
 
-                self._best_place_scores(results, category, place_scores, keyword_weight)
+                self._best_place_scores(
+                    results, category, place_scores, keyword_weight, place_ids, exclude_ids, lexical=found
+                )
 
             except Exception as e:  # pragma: no cover
                 self.logger.error("카테고리 %s 처리 중 오류: %s", category, e, exc_info=True)
 
         return place_scores
 
+    @staticmethod
+    def _lexical_confident(found: Optional[tuple]) -> bool:
+        """어휘 검색 결과만으로 답할지 여부 (정확히 일치하거나 최고 점수가 LEXICAL_SKIP_DENSE_SCORE 이상)"""
+        if not settings.LEXICAL_SKIP_DENSE or found is None:
+            return False
+        results, exact = found
+        if exact:
+            return True
+        distances = results["distances"][0]
+        return bool(distances) and 1.0 - min(distances) >= float(settings.LEXICAL_SKIP_DENSE_SCORE)
+
+    async def _keyword_vecs(
+        self,
+        keywords: List[Optional[str]],
+        keyword_vecs: Optional[List[List[float]]],
+        dense: List[bool],
+        encode: Optional[Callable]
+    ) -> List[Optional[List[float]]]:
+        """
+        벡터 검색할 키워드의 벡터 목록 (어휘 검색으로 답한 키워드는 None)
+
+        keyword_vecs가 없으면 벡터 검색할 키워드만 encode로 한 번에 임베딩합니다.
+        """
+        if keyword_vecs is not None:
+            return [vec if use else None for vec, use in zip(keyword_vecs, dense)]
+        vecs = [None] * len(keywords)
+        rows = [i for i, use in enumerate(dense) if use]
+        if rows:
+            if encode is None:
+                raise ValueError("keyword_vecs나 encode 중 하나는 필요합니다.")
+            encoded = await asyncio.to_thread(encode, [keywords[i] for i in rows])
+            for i, vec in zip(rows, encoded):
+                vecs[i] = vec
+        return vecs
+
+    async def _lexical(
+        self,
+        category: str,
+        keyword: Optional[str],
+        place_category: Optional[str],
+        place_ids: Optional[Set[int]],
+        exclude_ids: Optional[Set[int]]
+    ) -> Optional[tuple]:
+        """키워드 하나의 어휘 역색인 검색 결과와 정확히 일치 여부 (원문 키워드가 없거나 오류 시 None)"""
+        if not keyword:
+            return None
+        try:
+            return await asyncio.to_thread(
+                self.place_store.lexical_search,
+                category,
+                keyword,
+                place_category=place_category,
+                place_ids=place_ids,
+                exclude_ids=exclude_ids
+            )
+        except Exception as e:  # pragma: no cover
+            self.logger.error("카테고리 %s 어휘 검색 중 오류: %s", category, e, exc_info=True)
+            return None
+
+    async def _probe(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        keyword: Optional[str],
+        place_category: Optional[str],
+        place_ids: Optional[Set[int]],
+        exclude_ids: Optional[Set[int]]
+    ) -> Optional[RankedHits]:
+        """키워드 하나의 검색 결과 거리를 조회합니다. (벡터 검색을 생략한 키워드거나 오류 시 None)"""
+        if keyword_vec is None:
+            return None
+        try:
+            return await asyncio.to_thread(
+                self.place_store.probe_places,
+                category,
+                keyword_vec,
+                place_category=place_category,
+                place_ids=place_ids,
+                exclude_ids=exclude_ids,
+                keyword=keyword
+            )
+        except Exception as e:  # pragma: no cover
+            self.logger.error("카테고리 %s 처리 중 오류: %s", category, e, exc_info=True)
+            return None
+
+    def _cutoff_counts(
+        self,
+        categories: List[str],
+        hits: List[Optional[RankedHits]],
+        keyword_weight: float,
+        place_threshold: float,
+        floors: Optional[List[float]] = None
+    ) -> List[int]:
+        """
+        키워드별로 앞에서부터 몇 개의 결과가 임계값을 넘는 장소에 쓰일 수 있는지 계산
+
+        장소 총점은 키워드별 최고 점수의 합이고, 결과에 없는 키워드는 0점이므로
+        키워드 i에서 점수 s인 결과가 최고인 장소의 총점은 s + Σ(j≠i) max(키워드 j 최고 점수, 0) 이하입니다.
+        이 값이 임계값보다 작은 결과는 버려도 통과하는 장소와 그 키워드가 바뀌지 않습니다.
+        키워드별 최고 점수에는 floors(어휘 검색 최고 점수)도 포함하며,
+        최고 점수의 합조차 임계값에 못 미치면 어떤 장소도 통과할 수 없으므로 모두 0을 반환합니다.
+        하한(bound)이 0 이하인 키워드는 잘라내지 않고 결과를 모두 사용합니다.
+        (다른 키워드 점수만으로 임계값을 넘는 장소는 이 키워드의 0점 이하 결과로도 키워드 목록이 바뀌므로)
+        """
+        floors = floors or [0.0] * len(categories)
+        scores = [
+            self._convert_distance_to_score(ranked.distances, category, keyword_weight)
+            if ranked is not None and len(ranked) else None
+            for category, ranked in zip(categories, hits)
+        ]
+        tops = [
+            max(float(s.max()) if s is not None else 0.0, floor, 0.0)
+            for s, floor in zip(scores, floors)
+        ]
+        total = sum(tops)
+        if total < place_threshold - self.CUTOFF_MARGIN:
+            return [0] * len(scores)
+
+        counts = []
+        for s, top in zip(scores, tops):
+            if s is None:
+                counts.append(0)
+                continue
+            bound = place_threshold - (total - top) - self.CUTOFF_MARGIN
+            if bound <= 0:
+                counts.append(len(s))
+                continue
+            reachable = np.flatnonzero(s >= bound)
+            counts.append(int(reachable[-1]) + 1 if len(reachable) else 0)
+        return counts
+
     def _best_place_scores(
         self,
-        results: dict,
+        results: Optional[dict],
         category: str,
         place_scores: dict[int, dict[str, object]],
-        keyword_weight: float
+        keyword_weight: float,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        lexical: Optional[dict] = None
     ):
         """
         검색된 유사 키워드에서 장소 중복을 제거하여 한 장소 별 가장 유사한 키워드만 필터링
+
+        lexical(어휘 검색 결과)이 주어지면 어휘 점수 * LEXICAL_WEIGHT도 같은 장소의 후보 점수로 보고 최고 점수를 고릅니다.
+        place_ids 밖의 장소와 exclude_ids의 장소는 제외합니다. (장소가 많아 검색 필터를 생략한 경우)
         """
-        metas = results["metadatas"][0]
-        scores = self._convert_distance_to_score(np.array(results["distances"][0]), category, keyword_weight)
+        sources = []
+        if results:
+            distances = np.array(results["distances"][0])
+            sources.append((
+                self._ids(results), results["metadatas"][0],
+                self._convert_distance_to_score(distances, category, keyword_weight)
+            ))
+        if lexical:
+            sources.append((self._ids(lexical), lexical["metadatas"][0], self._lexical_scores(lexical, category, keyword_weight)))
 
         best_scores = {}
-        for meta, score in zip(metas, scores):
-            pid = meta.get("place_id")
-            kw = meta.get("keyword")
-            if pid is None:
-                continue
-            # 한 장소-한 키워드 최고 점수만 유지
-            if pid not in best_scores or best_scores[pid]["score"] < score:
-                best_scores[pid] = {"score": score, "keyword": kw}
+        for ids, metas, scores in sources:
+            for doc_id, meta, score in zip(ids, metas, scores):
+                pid = entry_place_id(meta, doc_id)
+                kw = (meta or {}).get("keyword")
+                if pid is None or (place_ids is not None and pid not in place_ids):
+                    continue
+                if exclude_ids and pid in exclude_ids:
+                    continue
+                # 한 장소-한 키워드 최고 점수만 유지
+                if pid not in best_scores or best_scores[pid]["score"] < score:
+                    best_scores[pid] = {"score": score, "keyword": kw}
 
         # 점수 누적
         for pid, info in best_scores.items():
             place_scores[pid]["total_score"] += info["score"]
             place_scores[pid]["keywords"].add(info["keyword"])
 
+    @staticmethod
+    def _ids(results: dict) -> list:
+        """검색 결과의 문서 id 목록 (place_id를 읽을 수 없는 이전 형식 항목용, 없으면 None)"""
+        ids = results.get("ids")
+        return ids[0] if ids else [None] * len(results["metadatas"][0])
+
+    def _lexical_scores(self, lexical: dict, category: str, keyword_weight: float) -> np.ndarray:
+        """어휘 검색 결과의 점수 (LEXICAL_WEIGHT와 카테고리 가중치 포함)"""
+        distances = np.array(lexical["distances"][0])
+        return self._convert_distance_to_score(distances, category, keyword_weight) * float(settings.LEXICAL_WEIGHT)
+
     @staticmethod
     def _convert_distance_to_score(distances: np.ndarray, category: str, keyword_weight: float) -> np.ndarray:
         """
@@ -173,5 +513,7 @@ class RecommendationEngine:
             }
             for pid, data in place_scores.items()
         )
+        if df.empty:  # 누적된 장소가 없으면 열도 없음
+            df = pd.DataFrame(columns=["place_id", "total_score", "keywords"])
 
         return df[df["total_score"] >= place_threshold].sort_values("total_score", ascending=False)
\ No newline at end of file
@@ -1,11 +1,15 @@
 import json
 
+from typing import Optional
 from langchain.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
+from app.core.config import settings
+from app.cache.cache import Cache
 
 class KeywordExtractor:
-    def __init__(self, llm: ChatGoogleGenerativeAI):
+    def __init__(self, llm: ChatGoogleGenerativeAI, cache: Optional[Cache] = None):
         self.llm = llm
+        self.cache = cache  # 같은 입력의 추출 결과 재사용 ("extract" 네임스페이스)
         self.chain = self._create_chain()
 
     def _create_chain(self):
@@ -56,9 +60,18 @@ class KeywordExtractor:
         
         return prompt | self.llm
 
-    async def extract(self, user_input: str) -> dict:
+    async def extract(self, user_input: str) -> tuple:
+        key = Cache.key(settings.MODEL_NAME, user_input.strip())
+        if self.cache is not None:
+            cached = await self.cache.get("extract", key)
+            if cached is not None:
+                return tuple(cached)
+
         response = await self.chain.ainvoke({"user_input": user_input})
-        return self._parse_response(response.content)
+        result = self._parse_response(response.content)
+        if self.cache is not None:
+            await self.cache.set("extract", key, list(result))
+        return result
 
     def _parse_response(self, raw: str) -> dict:
         start, end = raw.find("{"), raw.rfind("}") + 1
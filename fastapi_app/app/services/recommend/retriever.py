@@ -3,7 +3,17 @@
 
 이 모듈은 ChromaDB를 사용하여 장소 정보를 벡터 형태로 저장하고 검색하는 기능을 제공합니다.
 주요 구성요소:
-    - PlaceStore: 장소 벡터 저장소 클래스
+    - PlaceStore: 장소 벡터 저장소 클래스 (게시된 버전으로 무잠금 교체)
+    - CompactPlaceStore: 메모리 매핑 압축 인덱스 기반 저장소 (RETRIEVAL_BACKEND=compact)
+
+각 버전 핸들은 장소 좌표 격자 인덱스(GeoGridIndex)와 영업시간 비트맵 인덱스(OpeningHoursIndex)를
+함께 열어 반경 내 장소 조회와 특정 시각에 영업하지 않는 장소 조회를 제공합니다.
+질의 키워드가 색인된 키워드와 정확히 같으면 버전의 키워드 이웃 테이블(NeighborTable)에서
+벡터 검색 없이 결과를 돌려줍니다. 키워드 문자 n-gram 역색인(LexicalIndex)으로
+문자열이 비슷한 키워드를 찾는 lexical_search도 제공합니다.
+
+probe_places는 거리만 먼저 조회한 RankedHits를 반환하며, 추천 엔진은 임계값을 넘을 수 있는
+앞부분의 메타데이터만 가져옵니다. (ADAPTIVE_TOP_K)
 """
 
 import sys
@@ -12,74 +22,378 @@ sys.modules["sqlite3"] = pysqlite3
 import sqlite3
 
 import os
+import time
 import logging
+
+from datetime import datetime
+import threading
 import chromadb
 import numpy as np
 
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Set, Callable
 from fastapi import Depends
 
 from app.core.config import settings
-from app.core.constants import CATEGORY_MAP
+from app.core.constants import CATEGORY_MAP, PLACE_CATEGORIES
+from app.data.snapshots import get_snapshot_manager, release_client
+from app.data.compact_index import compact_dir_of, load_compact_index
+from app.data.geo_index import GeoGridIndex, load_geo_index
+from app.data.opening_hours import OpeningHoursIndex, load_hours_index
+from app.data.neighbor_table import NeighborTable, load_neighbor_tables, neighbor_dir_of
+from app.data.lexical_index import LexicalIndex, load_lexical_indexes, lexical_dir_of
+
+class _Snapshot:
+    """
+    한 버전의 벡터 저장소에 연결된 읽기용 핸들
+
+    Attributes:
+        version (Optional[str]): 버전 이름 (버전이 없는 기존 저장소면 None)
+        path (str): 저장소 경로
+        client (chromadb.PersistentClient): ChromaDB 클라이언트
+        collections (Dict[str, Any]): 컬렉션 이름별 컬렉션
+        geo (Optional[GeoGridIndex]): 장소 좌표 인덱스 (없거나 로드 실패 시 None)
+        hours (Optional[OpeningHoursIndex]): 장소 영업시간 인덱스 (없거나 로드 실패 시 None)
+        neighbors (Dict[str, NeighborTable]): 컬렉션 이름별 키워드 이웃 테이블 (없으면 빈 dict)
+        lexical (Dict[str, LexicalIndex]): 컬렉션 이름별 키워드 어휘 역색인 (없으면 빈 dict)
+        lease (Optional[str]): 버전 임대 토큰 (핸들을 해제할 때 반납)
+    """
+
+    def __init__(
+        self,
+        version: Optional[str],
+        path: str,
+        client,
+        collections: Dict[str, Any],
+        geo: Optional[GeoGridIndex] = None,
+        hours: Optional[OpeningHoursIndex] = None,
+        neighbors: Optional[Dict[str, NeighborTable]] = None,
+        lexical: Optional[Dict[str, LexicalIndex]] = None
+    ):
+        self.version = version
+        self.path = path
+        self.client = client
+        self.collections = collections
+        self.geo = geo
+        self.hours = hours
+        self.neighbors = neighbors or {}
+        self.lexical = lexical or {}
+        self.sizes: Dict[str, int] = {}
+        self.lease: Optional[str] = None
+
+
+class RankedHits:
+    """
+    거리 오름차순으로 정렬된 검색 결과 후보
+
+    거리만 먼저 들고 있고, 메타데이터(place_id, keyword)는 fetch로 앞에서부터 필요한 개수만 가져옵니다.
+
+    Attributes:
+        distances (np.ndarray): (k,) 거리 (오름차순)
+    """
+
+    def __init__(self, distances, fetch: Callable[[int], Dict[str, Any]]):
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self._fetch = fetch
+
+    def __len__(self) -> int:
+        return int(self.distances.shape[0])
+
+    @classmethod
+    def of(cls, results: Dict[str, Any]) -> "RankedHits":
+        """메타데이터까지 조회된 검색 결과를 감쌉니다."""
+        return cls(
+            results["distances"][0],
+            lambda count: {key: [results[key][0][:count]] for key in ("ids", "documents", "metadatas", "distances")}
+        )
+
+    def fetch(self, count: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        앞에서부터 count개 결과를 ChromaDB query 결과 형태로 반환합니다. (count가 None이면 전체)
+        """
+        count = len(self) if count is None else min(int(count), len(self))
+        if count <= 0:
+            return None
+        return self._fetch(count)
+
 
 class PlaceStore:
     """
     장소 벡터 저장소 클래스
     
     이 클래스는 ChromaDB를 사용하여 장소 정보를 벡터 형태로 저장하고 검색합니다.
+    현재 버전(스냅샷) 핸들 하나를 참조하며, 새 버전이 게시되면 요청 사이에
+    참조를 통째로 교체합니다. 검색 경로는 잠금 없이 교체 시점의 참조 하나만 사용합니다.
     
     Attributes:
-        client (chromadb.PersistentClient): ChromaDB 클라이언트
+        snapshots (SnapshotManager): 벡터 저장소 버전 관리자
         category_map (Dict[str, str]): 카테고리 매핑
     """
     
-    def __init__(self, logger=None):  # None으로 지정하는 이유는 추후 의존성 주입의 유연성을 위함 (예: 테스트 환경에서는 로거를 직접 전달할 수 있음)
-        """PlaceStore 초기화"""
+    def __init__(self, logger=None, snapshots=None):  # None으로 지정하는 이유는 추후 의존성 주입의 유연성을 위함 (예: 테스트 환경에서는 로거를 직접 전달할 수 있음)
+        """PlaceStore 초기화 (snapshots를 주면 해당 저장소를 엶, 예: 지역 샤드)"""
         if logger is None:
             from app.logging.di import get_logger_dep
             logger = get_logger_dep()
         self.logger = logger
-        db_path = settings.VECTOR_STORE_PATH
+        self.snapshots = snapshots or get_snapshot_manager()
+        self.category_map = CATEGORY_MAP
 
         # if not os.path.exists(db_path) or not os.listdir(db_path):
         #     from app.data.chroma_db import make_chroma_db
         #     make_chroma_db()
 
-        # ChromaDB 클라이언트 초기화
-        self.client = chromadb.PersistentClient(path=db_path)
-        self.category_map = CATEGORY_MAP
+        # 현재 버전 연결
+        version = self.snapshots.current()
+        self._active = self._open_leased(version)
+        self._retired: Optional[_Snapshot] = None
+        self._checked_at = time.monotonic()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def client(self):
+        return self._active.client
+
+    @property
+    def collections(self) -> Dict[str, Any]:
+        return self._active.collections
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._active.version
+
+    def _open_leased(self, version: Optional[str]) -> _Snapshot:
+        """버전을 임대한 뒤 엽니다. (핸들을 해제할 때 _release로 임대 반납)"""
+        lease = self.snapshots.acquire(version)
+        try:
+            snapshot = self._open(version)
+        except BaseException:
+            self.snapshots.release(lease)
+            raise
+        snapshot.lease = lease
+        return snapshot
+
+    def _release(self, snapshot: _Snapshot) -> None:
+        release_client(snapshot.path)
+        self.snapshots.release(snapshot.lease)
+
+    def _open(self, version: Optional[str]) -> _Snapshot:
+        path = self.snapshots.path_of(version)
+        client = chromadb.PersistentClient(path=path)
+        return _Snapshot(
+            version, path, client, self._init_collections(client), *self._open_place_indexes(path)
+        )
+
+    def _open_place_indexes(self, path: str) -> tuple:
+        """
+        버전의 좌표/영업시간 인덱스를 엽니다. 없거나 실패하면 해당 조건 없이 검색하도록 None을 반환합니다.
+
+        파생 인덱스는 게시 시 빌드 훅이 생성한 경우에만 사용하며, 게시된 버전 경로에는 쓰지 않습니다.
+        (이웃 테이블과 어휘 역색인이 없으면 벡터 검색만 사용)
+
+        Returns:
+            tuple: (GeoGridIndex 또는 None, OpeningHoursIndex 또는 None, 컬렉션별 NeighborTable, 컬렉션별 LexicalIndex)
+        """
+        indexes = []
+        for name, load in (("좌표", load_geo_index), ("영업시간", load_hours_index)):
+            try:
+                index = load(path)
+            except Exception as e:
+                self.logger.error(f"{name} 인덱스 로드 실패 ({path}): {str(e)}")
+                index = None
+            else:
+                if index is None:
+                    self.logger.warning(f"{name} 인덱스 없음 ({path}), maintenance reindex로 생성할 수 있습니다.")
+            indexes.append(index)
+        for name, load, directory in (
+            ("이웃 테이블", load_neighbor_tables, neighbor_dir_of(path)),
+            ("어휘 역색인", load_lexical_indexes, lexical_dir_of(path)),
+        ):
+            try:
+                indexes.append(load(directory))
+            except Exception as e:
+                self.logger.error(f"{name} 로드 실패 ({path}): {str(e)}")
+                indexes.append({})
+        return tuple(indexes)
+
+    def _lookup_neighbors(
+        self,
+        collection_name: str,
+        keyword: Optional[str],
+        n_results: int,
+        place_category: Optional[str],
+        place_ids: Optional[Set[int]],
+        exclude_ids: Optional[Set[int]]
+    ) -> Optional[Dict[str, Any]]:
+        """색인된 키워드와 정확히 같은 질의를 이웃 테이블에서 조회합니다. (답할 수 없으면 None)"""
+        table = self._active.neighbors.get(collection_name)
+        if table is None or not keyword:
+            return None
+        results = table.lookup(keyword.strip(), n_results, place_category, place_ids, exclude_ids)
+        if not results or not results["metadatas"][0]:
+            return None
+        return results
+
+    def lexical_search(
+        self,
+        category: str,
+        keyword: Optional[str],
+        n_results: int = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None
+    ) -> Optional[tuple]:
+        """
+        키워드와 문자열이 비슷한 항목을 어휘 역색인에서 검색합니다. (장소 카테고리/장소 id 조건은 search_places와 같음)
+
+        Returns:
+            Optional[tuple]: (ChromaDB query 결과 형태, 정확히 일치한 키워드 포함 여부)
+                (역색인이 없거나 결과가 없으면 None)
+        """
+        index = self._active.lexical.get(self.category_map.get(category))
+        if index is None or not keyword:
+            return None
+        if place_ids is not None and not place_ids:
+            return None
+        found = None
+        if place_category in index.category_code:
+            found = index.search(keyword, n_results, place_category, place_ids, exclude_ids)
+        # 벡터 검색과 같이 장소 카테고리 조건으로 결과가 없으면 조건 없이 다시 검색
+        return found or index.search(keyword, n_results, None, place_ids, exclude_ids)
+
+    def places_within(self, lat: float, lon: float, radius_m: float) -> Optional[Set[int]]:
+        """
+        (lat, lon)에서 radius_m 이내인 장소 id 집합을 반환합니다.
+
+        Returns:
+            Optional[Set[int]]: 장소 id 집합 (좌표 인덱스가 없거나 비어 있으면 None = 제한 없음)
+        """
+        geo = self._active.geo
+        if geo is None:
+            self.logger.warning("좌표 인덱스가 없어 위치 조건을 적용하지 않습니다.")
+            return None
+        found = geo.within(lat, lon, radius_m)
+        if found is None:
+            self.logger.warning("좌표가 있는 장소가 없어 위치 조건을 적용하지 않습니다. (maintenance coords로 좌표 채우기)")
+        return found
+
+    def places_closed_at(self, when: datetime) -> Set[int]:
+        """
+        when 시각에 영업하지 않는 장소 id 집합을 반환합니다. (영업시간 정보가 없는 장소는 포함하지 않음)
+        """
+        hours = self._active.hours
+        if hours is None:
+            self.logger.warning("영업시간 인덱스가 없어 영업 중 조건을 적용하지 않습니다.")
+            return set()
+        return hours.closed_at(when)
 
-        # 컬렉션 초기화
-        self.collections = {}
-        self._init_collections()
+    @staticmethod
+    def _where(
+        place_category: Optional[str],
+        place_ids: Optional[Set[int]],
+        exclude_ids: Optional[Set[int]] = None
+    ) -> Optional[dict]:
+        clauses = []
+        if place_category in PLACE_CATEGORIES:
+            clauses.append({"place_category": place_category})
+        # 장소가 너무 많으면 필터 대신 추천 엔진에서 결과를 거름
+        if place_ids is not None and len(place_ids) <= settings.PLACE_FILTER_MAX_IDS:
+            clauses.append({"place_id": {"$in": sorted(int(pid) for pid in place_ids)}})
+        if exclude_ids and len(exclude_ids) <= settings.PLACE_FILTER_MAX_IDS:
+            clauses.append({"place_id": {"$nin": sorted(int(pid) for pid in exclude_ids)}})
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
     
-    def _init_collections(self):
+    def _init_collections(self, client) -> Dict[str, Any]:
         """
         ChromaDB 컬렉션 초기화
         
-        각 카테고리별로 컬렉션을 생성하고, 없는 경우 새로 생성합니다.
+        각 카테고리별로 기존 컬렉션을 조회합니다.
         """
+        collections = {}
         for category in self.category_map.values():
             try:
                 # 기존 컬렉션 확인
-                collection = self.client.get_collection(name=category)
-                self.collections[category] = collection
+                collections[category] = client.get_collection(name=category)
             except Exception as e:
                 raise Exception(f"컬렉션 초기화 실패: {str(e)}")
+        return collections
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        새 버전이 게시되었으면 해당 버전으로 교체합니다.
+
+        CURRENT 확인은 VECTOR_STORE_REFRESH_INTERVAL 초에 한 번만 수행하며,
+        다른 스레드가 교체 중이면 기다리지 않고 현재 버전을 계속 사용합니다.
+        교체 전 버전은 처리 중인 요청을 위해 한 세대 더 유지한 뒤 해제합니다.
+        열려 있는 버전은 임대 중이므로 그동안 다른 쓰기 작업의 정리(prune)에서 삭제되지 않습니다.
+
+        Returns:
+            bool: 버전을 교체했으면 True
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < settings.VECTOR_STORE_REFRESH_INTERVAL:
+            return False
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = now
+            version = self.snapshots.current()
+            if version == self._active.version:
+                return False
+            try:
+                snapshot = self._open_leased(version)
+            except Exception as e:
+                self.logger.error(f"벡터 저장소 버전 교체 실패 ({version}): {str(e)}")
+                return False
+
+            retired, self._active = self._active, snapshot
+            if self._retired is not None:
+                if self._retired.path not in (retired.path, snapshot.path):
+                    self._release(self._retired)
+                else:
+                    self.snapshots.release(self._retired.lease)
+            self._retired = retired
+            self.logger.info(f"벡터 저장소 버전 교체: {retired.version} → {snapshot.version}")
+            return True
+        finally:
+            self._refresh_lock.release()
     
+    def _collection_size(self, collection) -> int:
+        """컬렉션 항목 수 (버전 핸들마다 한 번만 조회)"""
+        sizes = self._active.sizes
+        if collection.name not in sizes:
+            sizes[collection.name] = collection.count()
+        return sizes[collection.name]
+
     def search_places(
         self,
         category: str,
         keyword_vec: List[float],
-        n_results: Optional[int] = 50
+        n_results: Optional[int] = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keyword: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         키워드와 유사한 장소 검색
+
+        keyword가 색인된 키워드와 정확히 같으면 이웃 테이블에서 바로 반환합니다.
+
+        place_category가 주어지면 해당 장소 카테고리 파티션(메타데이터 필터)에서만 검색하고,
+        파티션 정보가 없는 저장소라 결과가 비면 카테고리 조건 없이 다시 검색합니다.
+        place_ids가 주어지면 해당 장소의 키워드만 검색하고 (위치 조건),
+        exclude_ids가 주어지면 해당 장소의 키워드는 제외합니다. (영업 중 조건)
         
         Args:
             category (str): 검색할 카테고리
             keyword_vec (List[float]): 검색 키워드 벡터
             n_results (int): 반환할 결과 수
+            place_category (str): 검색할 장소 카테고리 (예: "카페")
+            place_ids (Set[int]): 검색 대상 장소 id (None이면 제한 없음)
+            exclude_ids (Set[int]): 검색에서 제외할 장소 id
+            keyword (str): keyword_vec의 원문 키워드 (이웃 테이블 조회용)
             
         Returns:
             Dict[str, Any]: 검색 결과
@@ -88,23 +402,198 @@ class PlaceStore:
             ValueError: 유효하지 않은 카테고리인 경우
             Exception: 검색 중 오류 발생 시
         """            
+        hits = self._probe(
+            category, keyword_vec, n_results, place_category, place_ids, exclude_ids, keyword,
+            include=["documents", "metadatas", "distances"]
+        )
+        return hits.fetch() if hits is not None else None
+
+    def probe_places(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        n_results: Optional[int] = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keyword: Optional[str] = None
+    ) -> Optional[RankedHits]:
+        """
+        search_places와 같은 검색을 거리만 조회하여 수행합니다.
+
+        ChromaDB는 include에 거리만 있으면 메타데이터(SQLite)를 읽지 않으므로,
+        메타데이터는 RankedHits.fetch로 필요한 개수만큼 id로 가져옵니다.
+
+        Returns:
+            Optional[RankedHits]: 검색 결과 후보 (결과가 없으면 None)
+        """
+        return self._probe(
+            category, keyword_vec, n_results, place_category, place_ids, exclude_ids, keyword,
+            include=["distances"]
+        )
+
+    def _probe(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        n_results: Optional[int],
+        place_category: Optional[str],
+        place_ids: Optional[Set[int]],
+        exclude_ids: Optional[Set[int]],
+        keyword: Optional[str],
+        include: List[str]
+    ) -> Optional[RankedHits]:
         try:
-            collection = self.collections.get(self.category_map[category])
+            collection = self._active.collections.get(self.category_map[category])
             if collection is None:
                 raise ValueError(f"컬렉션 미존재: {category}")
     
-            results = collection.query(
-                query_embeddings=[keyword_vec],
-                n_results=n_results,
-                include=["documents", "metadatas", "distances"]
+            if place_ids is not None and not place_ids:
+                return None
+
+            results = self._lookup_neighbors(
+                collection.name,
+                keyword,
+                n_results,
+                place_category if place_category in PLACE_CATEGORIES else None,
+                place_ids,
+                exclude_ids
             )
+            if results:
+                return RankedHits.of(results)
+
+            # 컬렉션 항목 수보다 많이 요청하지 않음
+            n_results = min(n_results, self._collection_size(collection))
+            if n_results <= 0:
+                return None
+            if place_category in PLACE_CATEGORIES:
+                results = collection.query(
+                    query_embeddings=[keyword_vec],
+                    n_results=n_results,
+                    where=self._where(place_category, place_ids, exclude_ids),
+                    include=include
+                )
+            if not results or not results.get('ids') or not results['ids'][0]:
+                results = collection.query(
+                    query_embeddings=[keyword_vec],
+                    n_results=n_results,
+                    where=self._where(None, place_ids, exclude_ids),
+                    include=include
+                )
             
             # 결과 검증
-            if not results or not results.get('metadatas') or not results['metadatas'][0]:
+            if not results or not results.get('ids') or not results['ids'][0]:
+                self.logger.warning("검색 결과가 없습니다.")
+                return None
+
+            if "metadatas" in include:
+                return RankedHits.of(results)
+            ids, distances = results["ids"][0], results["distances"][0]
+            return RankedHits(distances, lambda count: self._fetch_by_ids(collection, ids, distances, count))
+        except Exception as e:
+            self.logger.error(f"장소 검색 중 오류 발생: {str(e)}")
+            raise Exception(f"장소 검색 중 오류 발생: {str(e)}")
+
+    @staticmethod
+    def _fetch_by_ids(collection, ids: List[str], distances: List[float], count: int) -> Dict[str, Any]:
+        """거리 순 id 앞 count개의 메타데이터를 조회해 ChromaDB query 결과 형태로 반환합니다."""
+        ids = ids[:count]
+        page = collection.get(ids=ids, include=["documents", "metadatas"])
+        position = {item_id: i for i, item_id in enumerate(page["ids"])}
+        order = [position[item_id] for item_id in ids if item_id in position]
+        return {
+            "ids": [[page["ids"][i] for i in order]],
+            "documents": [[page["documents"][i] for i in order]],
+            "metadatas": [[page["metadatas"][i] for i in order]],
+            "distances": [[d for item_id, d in zip(ids, distances) if item_id in position]],
+        }
+
+
+class CompactPlaceStore(PlaceStore):
+    """
+    메모리 매핑 압축 인덱스 기반 장소 저장소
+
+    PlaceStore와 같은 버전 교체 방식을 사용하되, 각 버전의 압축 인덱스(compact/)를
+    np.memmap으로 열어 프로세스 내에서 코사인 검색을 수행합니다.
+    결과는 ChromaDB query 결과와 같은 형태로 반환되므로 추천 엔진은 그대로 사용할 수 있습니다.
+    압축 인덱스는 게시 시 빌드 훅이 생성하며, 없는 버전은 열지 않습니다. (교체 시 이전 버전 유지)
+    """
+
+    def _open(self, version: Optional[str]) -> _Snapshot:
+        path = self.snapshots.path_of(version)
+        try:
+            collections = load_compact_index(compact_dir_of(path))
+        except FileNotFoundError:
+            raise Exception(
+                f"압축 인덱스 없음 ({path}), maintenance reindex 또는 compact_index export로 생성하세요."
+            )
+        missing = [c for c in self.category_map.values() if c not in collections]
+        if missing:
+            raise Exception(f"컬렉션 초기화 실패: 압축 인덱스에 {missing} 없음")
+        return _Snapshot(version, path, None, collections, *self._open_place_indexes(path))
+
+    def search_places(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        n_results: Optional[int] = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keyword: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        hits = self.probe_places(
+            category, keyword_vec, n_results, place_category, place_ids, exclude_ids, keyword
+        )
+        return hits.fetch() if hits is not None else None
+
+    def probe_places(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        n_results: Optional[int] = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keyword: Optional[str] = None
+    ) -> Optional[RankedHits]:
+        try:
+            collection = self._active.collections.get(self.category_map[category])
+            if collection is None:
+                raise ValueError(f"컬렉션 미존재: {category}")
+            if place_ids is not None and not place_ids:
+                return None
+
+            results = self._lookup_neighbors(
+                collection.name,
+                keyword,
+                n_results,
+                place_category if place_category in collection.partitions else None,
+                place_ids,
+                exclude_ids
+            )
+            if results:
+                return RankedHits.of(results)
+
+            ranked = None
+            if place_category in collection.partitions:
+                ranked = collection.rank(
+                    keyword_vec,
+                    n_results=n_results,
+                    place_category=place_category,
+                    place_ids=place_ids,
+                    exclude_ids=exclude_ids
+                )
+            if ranked is None or not len(ranked[0]):
+                ranked = collection.rank(
+                    keyword_vec, n_results=n_results, place_ids=place_ids, exclude_ids=exclude_ids
+                )
+            if ranked is None or not len(ranked[0]):
                 self.logger.warning("검색 결과가 없습니다.")
                 return None
-                
-            return results
+
+            rows, sims = ranked
+            return RankedHits(1.0 - sims, lambda count: collection.to_results(rows[:count], sims[:count]))
         except Exception as e:
             self.logger.error(f"장소 검색 중 오류 발생: {str(e)}")
-            raise Exception(f"장소 검색 중 오류 발생: {str(e)}")
\ No newline at end of file
+            raise Exception(f"장소 검색 중 오류 발생: {str(e)}")
@@ -4,6 +4,10 @@
 이 모듈은 추천 서비스의 핵심 비즈니스 로직을 구현합니다.
 LangChain을 사용하여 사용자 입력을 처리하고 추천을 생성합니다.
 
+dense 모드는 LLM 키워드 추출 없이 입력 문장 전체를 한 번 임베딩하여 추천합니다.
+키워드 모드에서 키워드 추출이 KEYWORD_EXTRACT_TIMEOUT을 넘기거나 실패하면 dense 모드로 대체합니다.
+추천 결과는 같은 입력/조건/벡터 저장소 버전이면 캐시(app.cache)에서 반환합니다.
+
 주요 구성요소:
     - RecommenderService: 추천 서비스 클래스
 """
@@ -12,7 +16,12 @@ import json
 import time
 import asyncio
 
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.constants import PLACE_CATEGORIES
+from app.cache.cache import Cache
+from app.data.opening_hours import slot_of
 from langchain.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from app.services.recommend.retriever import PlaceStore
@@ -34,6 +43,7 @@ class RecommenderService:
         keyword_extractor (KeywordExtractor): 키워드 추출
         recommendation_engine (RecommendationEngine): 추천 엔진
         metrics (RecommendMetrics): Prometheus 메트릭 객체
+        cache (Cache): 추천 결과 캐시
     """
     
     def __init__(
@@ -42,7 +52,8 @@ class RecommenderService:
         embedding_model: EmbeddingModel,
         recommendation_engine: RecommendationEngine,
         metrics=None,
-        logger=None
+        logger=None,
+        cache: Optional[Cache] = None
     ):
         """
         RecommenderService 초기화
@@ -51,25 +62,39 @@ class RecommenderService:
             llm (ChatGoogleGenerativeAI): LangChain LLM 인스턴스
             place_store (PlaceStore): 장소 벡터 저장소 인스턴스
             metrics (RecommendMetrics): Prometheus 메트릭 객체
+            cache (Cache): 추천 결과 캐시 ("recommend" 네임스페이스, None이면 캐시 안 함)
         """
         self.keyword_extractor = keyword_extractor
         self.embedding_model = embedding_model
         self.recommendation_engine = recommendation_engine
+        self.cache = cache
         self.metrics = metrics  # DI로 주입받은 메트릭 객체 저장
         if logger is None:
             logger = get_logger_dep()
         self.logger = logger
     
-    async def get_recommendation(self, user_input: str) -> RecommendResponse:
+    async def get_recommendation(
+        self,
+        user_input: str,
+        location: Optional[Tuple[float, float, float]] = None,
+        open_at: Optional[datetime] = None,
+        mode: str = "keyword"
+    ) -> RecommendResponse:
         """
         사용자 입력에서 키워드를 추출하고 추천 결과를 생성합니다.
         
         이 메서드는 다음 단계로 동작합니다:
-        1. LangChain을 사용하여 사용자 입력에서 키워드 추출
+        1. LangChain을 사용하여 사용자 입력에서 키워드 추출 (dense 모드면 생략)
         2. 추출된 키워드를 기반으로 장소 추천
         
+        키워드 추출이 시간 초과되거나 실패하면 dense 모드로 대체합니다.
+        같은 요청의 추천 결과는 캐시에서 반환합니다. (dense 대체 결과는 캐시하지 않음)
+        
         Args:
             user_input (str): 사용자의 입력 텍스트
+            location (Tuple[float, float, float]): (위도, 경도, 반경 m) 위치 조건
+            open_at (datetime): 영업 중이어야 하는 시각
+            mode (str): "keyword" (LLM 키워드 추출) 또는 "dense" (문장 임베딩)
             
         Returns:
             RecommendResponse: 추천 결과
@@ -81,24 +106,100 @@ class RecommenderService:
         if self.metrics:
             self.metrics.request_count.inc()  # 추천 API 호출 시 카운터 증가
         try:
-            # 1. 키워드 추출
-            self.logger.info(f"추천 요청 : user_input = {user_input}")
-            parsed, categories, keywords, place_category = await self.keyword_extractor.extract(user_input)
+            self.logger.info(f"추천 요청 : user_input = {user_input}, mode = {mode}")
+            cache_key = self._cache_key(user_input, location, open_at, mode)
+            if self.cache is not None:
+                cached = await self.cache.get("recommend", cache_key, RecommendResponse)
+                if cached is not None:
+                    return cached
+
+            response, fallback = await self._recommend(user_input, location, open_at, mode)
+            # dense 대체 결과는 캐시하지 않음 (키워드 추출이 복구되면 바로 키워드 모드 결과 사용)
+            if self.cache is not None and not fallback:
+                await self.cache.set("recommend", cache_key, response)
+            return response
 
-            # 추출 키워드가 없을 시 장소 카테고리만 반환
-            if categories == None and keywords == None:
-                return RecommendResponse(recommendations=[], place_category=place_category)
-            # 추출 키워드가 있을 시 추천 시작
-            else:
-                # 2. 키워드 임베딩
-                keywords_vec = await asyncio.to_thread(self.embedding_model.encode, keywords)
-                # 3. 장소 추천 시작
-                self.logger.info(f"추천 시작 : 키워드={parsed}")
-                return await self.recommendation_engine.get_recommendations(categories, keywords_vec, place_category)
-                
         except Exception as e:
             raise Exception(f"추천 생성 중 오류 발생: {str(e)}")
         finally:
             if self.metrics:
                 # 추천 API 처리 시간 기록 (Histogram)
                 self.metrics.request_latency.observe(time.time() - start)
+
+    async def _recommend(
+        self,
+        user_input: str,
+        location: Optional[Tuple[float, float, float]],
+        open_at: Optional[datetime],
+        mode: str
+    ) -> Tuple[RecommendResponse, bool]:
+        """
+        추천 결과와 dense 모드 대체 여부를 반환합니다.
+        """
+        if mode == "dense":
+            return await self._dense_recommendation(user_input, location, open_at), False
+        # 1. 키워드 추출
+        try:
+            parsed, categories, keywords, place_category = await self._extract(user_input)
+        except Exception as e:
+            reason = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+            self.logger.warning(f"키워드 추출 실패 ({reason}), dense 모드로 대체: {e!r}")
+            if self.metrics:
+                self.metrics.fallback_count.labels(reason=reason).inc()
+            return await self._dense_recommendation(user_input, location, open_at), True
+
+        # 추출 키워드가 없을 시 장소 카테고리만 반환
+        if categories == None and keywords == None:
+            return RecommendResponse(recommendations=[], place_category=place_category), False
+        # 추출 키워드가 있을 시 추천 시작
+        else:
+            # 2. 장소 추천 시작 (어휘 검색으로 답하지 못한 키워드만 엔진이 임베딩)
+            self.logger.info(f"추천 시작 : 키워드={parsed}")
+            response = await self.recommendation_engine.get_recommendations(
+                categories, None, place_category, location=location, open_at=open_at, keywords=keywords,
+                encode=self.embedding_model.encode
+            )
+            return response, False
+
+    def _cache_key(
+        self,
+        user_input: str,
+        location: Optional[Tuple[float, float, float]],
+        open_at: Optional[datetime],
+        mode: str
+    ) -> str:
+        """
+        추천 결과 캐시 키
+
+        벡터 저장소 버전을 포함하여 새 버전이 게시되면 이전 결과를 쓰지 않으며,
+        영업 시각은 영업시간 비트맵과 같은 15분 구간으로 묶습니다. (open_now 요청도 같은 구간이면 재사용)
+        """
+        version = getattr(self.recommendation_engine.place_store, "version", None)
+        slot = slot_of(open_at) if open_at is not None else None
+        return Cache.key(version, mode, user_input.strip(), location, slot)
+
+    async def _extract(self, user_input: str):
+        """키워드 추출 (KEYWORD_EXTRACT_TIMEOUT초가 지나면 asyncio.TimeoutError)"""
+        timeout = float(settings.KEYWORD_EXTRACT_TIMEOUT)
+        extract = self.keyword_extractor.extract(user_input)
+        if timeout > 0:
+            return await asyncio.wait_for(extract, timeout)
+        return await extract
+
+    async def _dense_recommendation(
+        self,
+        user_input: str,
+        location: Optional[Tuple[float, float, float]],
+        open_at: Optional[datetime]
+    ) -> RecommendResponse:
+        """
+        입력 문장 전체를 한 번 임베딩하여 추천합니다. (LLM 호출 없음)
+
+        장소 카테고리는 입력 문장에 포함된 첫 번째 장소 카테고리 이름으로 정합니다. (없으면 전체)
+        """
+        place_category = next((category for category in PLACE_CATEGORIES if category in user_input), None)
+        query_vec = await asyncio.to_thread(self.embedding_model.encode, user_input)
+        self.logger.info(f"dense 추천 시작 : 장소 카테고리={place_category}")
+        return await self.recommendation_engine.get_dense_recommendations(
+            query_vec, place_category, location=location, open_at=open_at
+        )
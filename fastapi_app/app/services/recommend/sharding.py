@@ -0,0 +1,409 @@
+"""
+지역 샤드 분산 검색 모듈
+
+이 모듈은 지역 샤드(app.data.shards)로 나뉜 장소 저장소를 PlaceStore와 같은 인터페이스로 제공합니다.
+검색은 관련 샤드들에 동시에 보내고(scatter), 기한(SHARD_TIMEOUT) 안에 응답한 샤드의 상위 결과를
+거리 순으로 병합합니다(gather). 기한을 넘기거나 실패한 샤드는 결과 없이 병합하고 경고를 남기며,
+모든 샤드가 응답하지 못한 경우에만 오류를 발생시킵니다.
+단, 영업시간 조건(places_closed_at)은 응답하지 않은 샤드의 장소를 모두 제외하여 확인하지 않은 장소가 결과에 섞이지 않게 합니다.
+기한을 넘긴 호출은 취소할 수 없어 계속 실행되므로, 샤드별로 끝나지 않은 호출이 SHARD_MAX_PENDING개 이상이면
+그 샤드에는 새 호출을 보내지 않고 결과 없이 병합합니다. (느린 샤드가 스레드 풀을 모두 차지하지 않도록)
+
+version은 샤드 버전들을 이은 값이므로, 어느 샤드든 새 버전이 게시되면 추천 캐시 키가 바뀝니다.
+
+위치/영업시간 조건(place_ids, exclude_ids)은 샤드 맵으로 샤드별로 나누어 보내므로,
+반경 검색이면 반경 안의 장소가 있는 샤드에만 질의합니다.
+
+샤드는 SHARD_URLS가 비어 있으면 SHARD_ROOT의 샤드 저장소를 프로세스 내에서 열고(LocalShard),
+주소가 있으면 샤드 서버(app.shard.server)에 HTTP로 질의합니다(HttpShard).
+
+주요 구성요소:
+    - LocalShard: 프로세스 내 샤드
+    - HttpShard: 샤드 서버 클라이언트
+    - ShardedPlaceStore: 샤드 분산 검색 저장소 (RETRIEVAL_BACKEND=sharded)
+"""
+
+import os
+import json
+import threading
+import requests
+import numpy as np
+
+from requests.adapters import HTTPAdapter
+
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Dict, List, Any, Set
+
+from app.core.config import settings
+from app.core.constants import CATEGORY_MAP
+from app.data.shards import SHARD_MAP_FILE, ShardMap, load_shard_map, shard_dir_of
+from app.data.snapshots import SnapshotManager
+from app.services.recommend.retriever import PlaceStore, CompactPlaceStore, RankedHits
+
+RESULT_KEYS = ("ids", "documents", "metadatas", "distances")
+
+
+def to_jsonable(value):
+    """샤드 요청/응답을 JSON으로 보낼 수 있는 형태로 변환합니다. (집합 → 정렬된 목록, numpy → 기본 타입)"""
+    if isinstance(value, dict):
+        return {key: to_jsonable(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(int(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class LocalShard:
+    """
+    프로세스 내 샤드 (샤드 저장소를 PlaceStore로 직접 엶)
+
+    Attributes:
+        shard (int): 샤드 번호
+        store (PlaceStore): 샤드 저장소
+    """
+
+    def __init__(self, root: str, shard: int, logger=None):
+        self.shard = shard
+        store_cls = CompactPlaceStore if settings.SHARD_BACKEND == "compact" else PlaceStore
+        self.store = store_cls(logger=logger, snapshots=SnapshotManager(root=shard_dir_of(root, shard)))
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.store.version
+
+    def search_places(self, **kwargs) -> Optional[Dict[str, Any]]:
+        return self.store.search_places(**kwargs)
+
+    def lexical_search(self, **kwargs) -> Optional[tuple]:
+        return self.store.lexical_search(**kwargs)
+
+    def places_within(self, lat: float, lon: float, radius_m: float) -> Optional[Set[int]]:
+        return self.store.places_within(lat, lon, radius_m)
+
+    def places_closed_at(self, when: datetime) -> Set[int]:
+        return self.store.places_closed_at(when)
+
+    def refresh(self) -> bool:
+        return self.store.refresh()
+
+
+class HttpShard:
+    """
+    샤드 서버(app.shard.server) 클라이언트
+
+    Attributes:
+        url (str): 샤드 서버 주소 (예: http://127.0.0.1:8101)
+        timeout (float): 요청 기한 (초)
+    """
+
+    def __init__(self, url: str, timeout: Optional[float] = None):
+        self.url = url.rstrip("/")
+        self.timeout = float(timeout if timeout is not None else settings.SHARD_TIMEOUT)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(CATEGORY_MAP) * 4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._version: Optional[str] = None
+
+    def _post(self, path: str, payload: dict) -> dict:
+        response = self.session.post(
+            f"{self.url}{path}",
+            data=json.dumps(to_jsonable(payload), ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        body = response.json()
+        if "version" in body:
+            self._version = body["version"]
+        return body
+
+    @property
+    def version(self) -> Optional[str]:
+        """샤드 서버가 마지막 응답에 담아 보낸 버전 (응답 전이면 None)"""
+        return self._version
+
+    def search_places(self, **kwargs) -> Optional[Dict[str, Any]]:
+        return self._post("/search", kwargs)["results"]
+
+    def lexical_search(self, **kwargs) -> Optional[tuple]:
+        found = self._post("/lexical", kwargs)
+        return (found["results"], found["exact"]) if found["results"] else None
+
+    def places_within(self, lat: float, lon: float, radius_m: float) -> Optional[Set[int]]:
+        place_ids = self._post("/within", {"lat": lat, "lon": lon, "radius_m": radius_m})["place_ids"]
+        return set(place_ids) if place_ids is not None else None
+
+    def places_closed_at(self, when: datetime) -> Set[int]:
+        return set(self._post("/closed", {"when": when})["place_ids"])
+
+    def refresh(self) -> bool:
+        # 샤드 서버가 요청마다 스스로 새 버전으로 교체
+        return False
+
+
+class ShardedPlaceStore:
+    """
+    지역 샤드 분산 검색 저장소
+
+    PlaceStore와 같은 검색 메서드를 제공하므로 추천 엔진은 그대로 사용할 수 있습니다.
+
+    Attributes:
+        shard_map (ShardMap): 장소 id → 샤드 번호
+        shards (List[LocalShard | HttpShard]): 샤드 번호 순 샤드 목록
+        timeout (float): 샤드 응답 기한 (초)
+    """
+
+    def __init__(self, logger=None, shards: Optional[list] = None, shard_map: Optional[ShardMap] = None):
+        if logger is None:
+            from app.logging.di import get_logger_dep
+            logger = get_logger_dep()
+        self.logger = logger
+        self.category_map = CATEGORY_MAP
+        self.timeout = float(settings.SHARD_TIMEOUT)
+        self.max_pending = int(settings.SHARD_MAX_PENDING)
+        self._map_path = None if shard_map is not None else os.path.join(settings.SHARD_ROOT, SHARD_MAP_FILE)
+        self._map_mtime = os.path.getmtime(self._map_path) if self._map_path else None
+        self.shard_map = shard_map or load_shard_map(settings.SHARD_ROOT)
+        self.shards = shards if shards is not None else self._connect()
+        if len(self.shards) != self.shard_map.n_shards:
+            raise Exception(f"샤드 수 불일치: 샤드 맵 {self.shard_map.n_shards}개, 연결 {len(self.shards)}개")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(8, len(self.shards) * len(CATEGORY_MAP)), thread_name_prefix="shard"
+        )
+        self._pending = [0] * len(self.shards)
+        self._pending_lock = threading.Lock()
+
+    def _connect(self) -> list:
+        urls = [url.strip() for url in str(settings.SHARD_URLS or "").split(",") if url.strip()]
+        if urls:
+            return [HttpShard(url, self.timeout) for url in urls]
+        return [LocalShard(settings.SHARD_ROOT, shard, self.logger) for shard in range(self.shard_map.n_shards)]
+
+    @property
+    def version(self) -> str:
+        """샤드 버전들을 샤드 번호 순으로 이은 값 (예: "v3+v5+v2", 추천 캐시 키용)"""
+        return "+".join(str(shard.version) for shard in self.shards)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        프로세스 내 샤드를 각각 새로 게시된 버전으로 교체합니다.
+        샤드 맵이 바뀌었으면(수집으로 장소가 추가된 경우) 다시 불러옵니다.
+        """
+        if self._map_path is not None:
+            try:
+                mtime = os.path.getmtime(self._map_path)
+                if mtime != self._map_mtime:
+                    shard_map = load_shard_map(os.path.dirname(self._map_path))
+                    if shard_map.n_shards == len(self.shards):
+                        self.shard_map, self._map_mtime = shard_map, mtime
+                    else:
+                        self.logger.error(f"샤드 수가 바뀐 샤드 맵은 재시작해야 적용됩니다: {shard_map.n_shards}개")
+            except Exception as e:
+                self.logger.error(f"샤드 맵 다시 불러오기 실패: {str(e)}")
+        return any([shard.refresh() for shard in self.shards])
+
+    def _submit(self, shard: int, method: str, kwargs: dict):
+        """
+        샤드 호출을 제출합니다. 샤드에 끝나지 않은 호출이 max_pending개 이상이면 제출하지 않고 None을 반환합니다.
+        """
+        with self._pending_lock:
+            if self._pending[shard] >= self.max_pending:
+                return None
+            self._pending[shard] += 1
+
+        def _done(_):
+            with self._pending_lock:
+                self._pending[shard] -= 1
+
+        future = self._executor.submit(getattr(self.shards[shard], method), **kwargs)
+        future.add_done_callback(_done)
+        return future
+
+    def _scatter(self, method: str, calls: Dict[int, dict]) -> List[Any]:
+        """
+        샤드별 인자로 method를 동시에 호출하고, 기한 안에 성공한 샤드의 결과만 반환합니다.
+
+        Raises:
+            Exception: 질의한 샤드가 모두 응답하지 못한 경우
+        """
+        return list(self._scatter_by_shard(method, calls).values())
+
+    def _scatter_by_shard(self, method: str, calls: Dict[int, dict]) -> Dict[int, Any]:
+        """
+        _scatter와 같지만 기한 안에 성공한 샤드 번호별 결과를 반환합니다. (응답하지 않은 샤드는 빠짐)
+
+        Raises:
+            Exception: 질의한 샤드가 모두 응답하지 못한 경우
+        """
+        if not calls:
+            return {}
+        futures = {}
+        for shard, kwargs in calls.items():
+            future = self._submit(shard, method, kwargs)
+            if future is None:
+                self.logger.warning(
+                    f"샤드 {shard}에 끝나지 않은 호출이 {self.max_pending}개 이상이라 건너뜀 ({method}), 결과 없이 병합"
+                )
+                continue
+            futures[future] = shard
+        if not futures:
+            raise Exception(f"장소 검색 중 오류 발생: 모든 샤드 과부하 ({method})")
+
+        done, pending = wait(futures, timeout=self.timeout)
+        for future in pending:
+            # 이미 실행 중인 호출은 취소되지 않으며, 끝날 때까지 샤드의 끝나지 않은 호출 수에 포함됨
+            future.cancel()
+            self.logger.warning(f"샤드 {futures[future]} 응답 기한 초과 ({method}, {self.timeout}s), 결과 없이 병합")
+
+        answers = {}
+        for future in done:
+            try:
+                answers[futures[future]] = future.result()
+            except Exception as e:
+                self.logger.error(f"샤드 {futures[future]} 검색 실패 ({method}): {str(e)}")
+        if not answers:
+            raise Exception(f"장소 검색 중 오류 발생: 모든 샤드 응답 실패 ({method})")
+        return answers
+
+    def _calls(self, place_ids: Optional[Set[int]], exclude_ids: Optional[Set[int]], **kwargs) -> Dict[int, dict]:
+        """
+        장소 조건을 샤드별로 나눈 호출 인자 (검색 대상 장소가 없는 샤드는 제외)
+
+        샤드의 모든 장소가 제외되면(영업시간을 확인하지 못한 샤드 등) 그 샤드에는 질의하지 않습니다.
+        """
+        places = self.shard_map.partition(place_ids) if place_ids is not None else None
+        excluded = self.shard_map.partition(exclude_ids) if exclude_ids else {}
+        targets = sorted(places) if places is not None else range(len(self.shards))
+        if excluded:
+            loads = self.shard_map.loads()
+            targets = [shard for shard in targets if len(excluded.get(shard, ())) < loads[shard] or not loads[shard]]
+        return {
+            shard: dict(
+                kwargs,
+                place_ids=places[shard] if places is not None else None,
+                exclude_ids=excluded.get(shard)
+            )
+            for shard in targets
+        }
+
+    @staticmethod
+    def _merge(answers: List[Optional[Dict[str, Any]]], n_results: Optional[int]) -> Optional[Dict[str, Any]]:
+        """샤드별 상위 결과를 거리 순으로 병합해 상위 n_results개를 ChromaDB query 결과 형태로 반환합니다."""
+        rows = [
+            row
+            for results in answers if results and results["ids"] and results["ids"][0]
+            for row in zip(*(results[key][0] for key in RESULT_KEYS))
+        ]
+        if not rows:
+            return None
+        rows.sort(key=lambda row: (row[3], row[0]))
+        if n_results is not None:
+            rows = rows[:n_results]
+        return {key: [[row[i] for row in rows]] for i, key in enumerate(RESULT_KEYS)}
+
+    def search_places(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        n_results: Optional[int] = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keyword: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        관련 샤드들에서 키워드와 유사한 장소를 동시에 검색해 병합합니다. (인자는 PlaceStore.search_places와 같음)
+        """
+        if place_ids is not None and not place_ids:
+            return None
+        calls = self._calls(
+            place_ids,
+            exclude_ids,
+            category=category,
+            keyword_vec=keyword_vec,
+            n_results=n_results,
+            place_category=place_category,
+            keyword=keyword
+        )
+        return self._merge(self._scatter("search_places", calls), n_results)
+
+    def probe_places(
+        self,
+        category: str,
+        keyword_vec: List[float],
+        n_results: Optional[int] = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None,
+        keyword: Optional[str] = None
+    ) -> Optional[RankedHits]:
+        """
+        search_places 결과를 RankedHits로 감쌉니다.
+
+        샤드 왕복을 한 번으로 줄이기 위해 각 샤드에서 메타데이터까지 조회해 옵니다.
+        """
+        results = self.search_places(
+            category, keyword_vec, n_results, place_category, place_ids, exclude_ids, keyword
+        )
+        return RankedHits.of(results) if results else None
+
+    def lexical_search(
+        self,
+        category: str,
+        keyword: Optional[str],
+        n_results: int = 50,
+        place_category: Optional[str] = None,
+        place_ids: Optional[Set[int]] = None,
+        exclude_ids: Optional[Set[int]] = None
+    ) -> Optional[tuple]:
+        """
+        관련 샤드들의 어휘 역색인 검색 결과를 점수 순으로 병합합니다.
+
+        Returns:
+            Optional[tuple]: (ChromaDB query 결과 형태, 한 샤드라도 정확히 일치했는지 여부) (결과가 없으면 None)
+        """
+        if not keyword or (place_ids is not None and not place_ids):
+            return None
+        calls = self._calls(
+            place_ids, exclude_ids, category=category, keyword=keyword, n_results=n_results, place_category=place_category
+        )
+        found = [answer for answer in self._scatter("lexical_search", calls) if answer]
+        results = self._merge([results for results, _ in found], n_results)
+        if results is None:
+            return None
+        return results, any(exact for _, exact in found)
+
+    def places_within(self, lat: float, lon: float, radius_m: float) -> Optional[Set[int]]:
+        """
+        모든 샤드의 반경 내 장소를 합칩니다. (좌표 인덱스가 없는 샤드가 있으면 None = 제한 없음)
+        """
+        calls = {shard: {"lat": lat, "lon": lon, "radius_m": radius_m} for shard in range(len(self.shards))}
+        answers = self._scatter("places_within", calls)
+        if any(place_ids is None for place_ids in answers):
+            return None
+        return set().union(*answers)
+
+    def places_closed_at(self, when: datetime) -> Set[int]:
+        """
+        모든 샤드에서 when 시각에 영업하지 않는 장소를 합칩니다.
+
+        기한 안에 응답하지 않은 샤드는 영업 여부를 알 수 없으므로 그 샤드의 장소를 모두 영업하지 않는 장소로 보고
+        (검색에서 제외), 영업 조건을 확인하지 않은 결과가 섞이지 않도록 합니다.
+        """
+        calls = {shard: {"when": when} for shard in range(len(self.shards))}
+        answers = self._scatter_by_shard("places_closed_at", calls)
+        closed = set().union(*answers.values())
+        for shard in calls:
+            if shard not in answers:
+                self.logger.warning(f"샤드 {shard} 영업시간 확인 실패, 해당 샤드 장소를 결과에서 제외")
+                closed |= self.shard_map.places_of(shard)
+        return closed
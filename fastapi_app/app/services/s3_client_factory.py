@@ -0,0 +1,41 @@
+import threading
+
+from app.core.config import settings
+
+class S3ClientFactory:
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _create_instance(cls):
+        import boto3
+        from botocore.config import Config
+
+        return boto3.client(
+            's3',
+            aws_access_key_id=settings.S3_ACCESS_KEY,
+            aws_secret_access_key=settings.S3_SECRET_KEY,
+            region_name=settings.S3_DEFAULT_REGION,
+            # 로컬 S3 호환 스토리지(MinIO 등)로 테스트할 때 엔드포인트 지정
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            config=Config(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": 5, "mode": "adaptive"}
+            )
+        )
+
+    @classmethod
+    def get_instance(cls):
+        """
+        boto3 S3 클라이언트의 싱글톤 인스턴스를 반환합니다.
+
+        boto3 클라이언트는 스레드 안전하므로 모든 업로드가 커넥션 풀을 공유합니다.
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    try:
+                        cls._instance = cls._create_instance()
+                    except Exception as e:
+                        raise RuntimeError(f"S3 클라이언트 초기화 실패: {str(e)}")
+        return cls._instance
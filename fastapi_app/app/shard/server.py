@@ -0,0 +1,132 @@
+"""
+지역 샤드 서버
+
+이 모듈은 지역 샤드 저장소 하나를 HTTP로 제공하는 FastAPI 앱입니다.
+추천 API(RETRIEVAL_BACKEND=sharded, SHARD_URLS 지정)의 ShardedPlaceStore가 각 샤드 서버에 동시에 질의합니다.
+요청마다 샤드 저장소를 새로 게시된 버전으로 교체하고(VECTOR_STORE_REFRESH_INTERVAL 간격),
+응답에 샤드 버전을 담아 추천 API가 캐시 키에 사용하도록 합니다.
+
+주요 구성요소:
+    - create_app: 샤드 번호의 저장소를 여는 샤드 서버 앱 생성
+    - serve_all: 모든 샤드 서버를 localhost의 연속된 포트로 실행
+
+사용법:
+    python -m app.data.shards split --shards 3
+    python -m app.shard.server --shard 0 --port 8101
+    python -m app.shard.server --all --base-port 8101
+    SHARD_URLS=http://127.0.0.1:8101,http://127.0.0.1:8102,http://127.0.0.1:8103 RETRIEVAL_BACKEND=sharded uvicorn main:app
+"""
+
+import sys
+import argparse
+import subprocess
+
+from typing import Optional
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.data.shards import load_shard_map
+from app.schemas.shard_schema import ShardSearchRequest, ShardLexicalRequest, ShardWithinRequest, ShardClosedRequest
+from app.services.recommend.sharding import LocalShard, to_jsonable
+
+
+def _place_filters(request) -> dict:
+    return {
+        "place_ids": set(request.place_ids) if request.place_ids is not None else None,
+        "exclude_ids": set(request.exclude_ids) if request.exclude_ids else None,
+    }
+
+
+def create_app(shard: int, root: Optional[str] = None) -> FastAPI:
+    """
+    샤드 서버 앱을 생성합니다.
+
+    Args:
+        shard (int): 샤드 번호
+        root (str): 샤드 저장소 경로 (기본값 SHARD_ROOT)
+    """
+    store = LocalShard(root or settings.SHARD_ROOT, shard)
+    app = FastAPI(title=f"장소 샤드 {shard}", docs_url=None, redoc_url=None)
+
+    # 검색은 블로킹 호출이므로 동기 함수로 두어 스레드 풀에서 처리
+    @app.post("/search")
+    def search(request: ShardSearchRequest) -> dict:
+        store.refresh()
+        results = store.search_places(
+            **request.model_dump(exclude={"place_ids", "exclude_ids"}), **_place_filters(request)
+        )
+        return {"results": to_jsonable(results), "version": store.version}
+
+    @app.post("/lexical")
+    def lexical(request: ShardLexicalRequest) -> dict:
+        store.refresh()
+        found = store.lexical_search(
+            **request.model_dump(exclude={"place_ids", "exclude_ids"}), **_place_filters(request)
+        )
+        results, exact = found if found else (None, False)
+        return {"results": to_jsonable(results), "exact": exact, "version": store.version}
+
+    @app.post("/within")
+    def within(request: ShardWithinRequest) -> dict:
+        return {
+            "place_ids": to_jsonable(store.places_within(request.lat, request.lon, request.radius_m)),
+            "version": store.version
+        }
+
+    @app.post("/closed")
+    def closed(request: ShardClosedRequest) -> dict:
+        return {"place_ids": to_jsonable(store.places_closed_at(request.when)), "version": store.version}
+
+    @app.get("/health")
+    def health() -> dict:
+        return {"shard": shard, "version": store.version}
+
+    return app
+
+
+def serve_all(root: str, host: str, base_port: int) -> None:
+    """
+    샤드 맵의 모든 샤드 서버를 하위 프로세스로 실행하고, 종료(Ctrl+C)될 때까지 기다립니다.
+    """
+    n_shards = load_shard_map(root).n_shards
+    urls = [f"http://{host}:{base_port + shard}" for shard in range(n_shards)]
+    processes = [
+        subprocess.Popen([
+            sys.executable, "-m", "app.shard.server",
+            "--shard", str(shard), "--root", root, "--host", host, "--port", str(base_port + shard)
+        ])
+        for shard in range(n_shards)
+    ]
+    print(f"[INFO] 샤드 서버 {n_shards}개 실행: SHARD_URLS={','.join(urls)}")
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="지역 샤드 서버")
+    parser.add_argument("--shard", type=int, help="실행할 샤드 번호")
+    parser.add_argument("--all", action="store_true", help="모든 샤드를 --base-port부터 연속된 포트로 실행")
+    parser.add_argument("--root", default=settings.SHARD_ROOT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--base-port", type=int, default=8101)
+    args = parser.parse_args(argv)
+
+    if args.all:
+        serve_all(args.root, args.host, args.base_port)
+        return
+    if args.shard is None:
+        parser.error("--shard 또는 --all을 지정해야 합니다.")
+    uvicorn.run(create_app(args.shard, args.root), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -56,6 +56,35 @@ async def log_requests(request: Request, call_next):
             content={"detail": f"서버 내부 오류: {str(e)}"}
         )
 
+@app.on_event("startup")
+def start_snapshot_subscriber():
+    # API 레플리카: 수집 노드가 배포한 벡터 저장소 버전을 백그라운드에서 받아 적용
+    from app.data.distribution import start_snapshot_subscriber as _start
+    try:
+        _start()
+    except Exception as e:
+        get_logger_dep().error(f"벡터 저장소 배포 구독 시작 실패: {str(e)}")
+
+@app.on_event("shutdown")
+def flush_exporter():
+    # 일괄 업로드 파이프라인에 남은 작업 처리 후, 벡터 저장소에 남은 쓰기 반영,
+    # Parquet 내보내기 모드에서 버퍼에 남은 장소 테이블 업로드
+    from app.data_pipeline.exporter import get_exporter
+    from app.data_pipeline.pipeline import shutdown_pipeline_runner
+    from app.data.vector_writer import shutdown_vector_writer
+    from app.data.distribution import stop_snapshot_subscriber
+    # 한 단계가 실패해도 나머지 단계는 계속 진행
+    for name, step in (
+        ("벡터 저장소 배포 구독 종료", stop_snapshot_subscriber),
+        ("업로드 파이프라인 종료", shutdown_pipeline_runner),
+        ("벡터 저장소 작성기 종료", shutdown_vector_writer),
+        ("S3 내보내기 flush", lambda: get_exporter().close()),
+    ):
+        try:
+            step()
+        except Exception as e:
+            get_logger_dep().error(f"{name} 실패: {str(e)}")
+
 @app.get("/")
 async def root():
     return {"message": "추천 서비스 API가 실행 중입니다."}
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # 추천 API 관련 메트릭을 관리하는 클래스
 class RecommendMetrics:
@@ -11,6 +11,69 @@ class RecommendMetrics:
         self.request_latency = Histogram(
             'recommend_request_latency_seconds', '추천 API 요청 처리 시간'
         )
+        # 키워드 추출(LLM) 시간 초과/실패로 dense 모드로 대체한 추천 요청 수
+        self.fallback_count = Counter(
+            'recommend_dense_fallback_total', 'dense 모드로 대체한 추천 요청 수', ['reason']
+        )
+
+# 크롤링 관련 메트릭을 관리하는 클래스
+class CrawlMetrics:
+    def __init__(self):
+        # 섹션(main/menu/reviews) 및 수집 방식(http/browser)별 페이지 수집 시간
+        self.page_latency = Histogram(
+            'crawl_page_latency_seconds', '크롤링 페이지 수집 시간', ['section', 'mode']
+        )
+        # 크롤링 완료 장소 수 (성공/실패)
+        self.place_count = Counter(
+            'crawl_places_total', '크롤링 장소 수', ['status']
+        )
+        # 주소 좌표 변환 캐시 조회 수 (hit/miss)
+        self.geocode_cache = Counter(
+            'geocode_cache_requests_total', '좌표 변환 캐시 조회 수', ['result']
+        )
+        # 장소 이미지 전송 바이트 수 (download/upload) 및 전송 시간
+        self.image_bytes = Counter(
+            'image_transfer_bytes_total', '이미지 전송 바이트 수', ['direction']
+        )
+        self.image_transfer_latency = Histogram(
+            'image_transfer_latency_seconds', '이미지 전송 시간'
+        )
+
+# 단계별 수집 파이프라인 메트릭을 관리하는 클래스
+class PipelineMetrics:
+    def __init__(self):
+        # 단계별 입력 큐 대기 항목 수
+        self.queue_depth = Gauge(
+            'pipeline_queue_depth', '파이프라인 단계별 큐 대기 수', ['stage']
+        )
+        # 단계별 처리 항목 수 (성공/실패)
+        self.items = Counter(
+            'pipeline_items_total', '파이프라인 단계별 처리 수', ['stage', 'status']
+        )
+        # 단계별 항목 처리 시간
+        self.stage_latency = Histogram(
+            'pipeline_stage_latency_seconds', '파이프라인 단계별 처리 시간', ['stage']
+        )
+        # 벡터 저장소 그룹 커밋 1회당 반영 항목 수
+        self.vector_write_batch = Histogram(
+            'vector_write_batch_items', '벡터 저장소 그룹 커밋 항목 수',
+            buckets=(1, 10, 50, 100, 500, 1000, 5000)
+        )
+        # 벡터 저장소 그룹 커밋 소요 시간 (버전 복사 + 반영 + 게시)
+        self.vector_write_latency = Histogram(
+            'vector_write_latency_seconds', '벡터 저장소 그룹 커밋 시간'
+        )
+
+# 계층형 캐시 메트릭을 관리하는 클래스
+class CacheMetrics:
+    def __init__(self):
+        # 네임스페이스별 캐시 조회 수 (적중한 계층 memory/redis 또는 miss)
+        self.requests = Counter(
+            'cache_requests_total', '캐시 조회 수', ['namespace', 'result']
+        )
 
 # RecommendMetrics의 싱글턴 인스턴스 생성 (프로젝트 전체에서 공유)
-metrics = RecommendMetrics()  # 싱글턴 인스턴스 
\ No newline at end of file
+metrics = RecommendMetrics()  # 싱글턴 인스턴스 
+crawl_metrics = CrawlMetrics()  # 크롤링 메트릭 싱글턴 인스턴스
+pipeline_metrics = PipelineMetrics()  # 파이프라인 메트릭 싱글턴 인스턴스
+cache_metrics = CacheMetrics()  # 캐시 메트릭 싱글턴 인스턴스
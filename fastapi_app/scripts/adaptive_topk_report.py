@@ -0,0 +1,260 @@
+"""
+적응형 검색(ADAPTIVE_TOP_K) 결과 동일성 리포트 스크립트
+
+같은 질의 집합을 기존 방식(키워드별 상위 50개 전체 조회)과 적응형 방식으로 재생하여
+최종 추천 결과(장소 id, 점수, 키워드)가 모두 같은지 확인하고,
+메타데이터를 조회한 검색 결과 수와 평균 지연 시간을 비교합니다.
+
+질의는 서비스와 같이 원문 키워드와 함께 재생하므로 어휘 역색인과 이웃 테이블 경로를 거칩니다.
+두 인덱스가 없는 저장소에서는 실행하지 않으며, --build-indexes로 현재 버전에 인덱스를 만든 새 버전을 게시할 수 있습니다.
+
+질의 파일은 한 줄에 하나씩 다음 형식의 JSON을 둡니다. (키워드는 임베딩 모델로 변환)
+    {"categories": ["음식/제품", "분위기"], "keywords": ["파스타", "조용한"], "place_category": "음식점"}
+
+질의 파일이 없으면 저장소에 색인된 키워드를 무작위로 골라 같은 방식으로 질의를 만듭니다.
+--noise를 주면 저장된 키워드 벡터에 잡음을 더하고 원문 키워드 없이 벡터 검색 경로만 재생합니다.
+
+사용 예:
+    cd fastapi_app
+    python -m scripts.adaptive_topk_report --sample 300 --build-indexes
+    python -m scripts.adaptive_topk_report --queries replay.jsonl --output report.json
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+import numpy as np
+
+
+class _FetchCounter:
+    """장소 저장소를 감싸 메타데이터까지 조회한 검색 결과 수를 셉니다."""
+
+    def __init__(self, store):
+        self.store = store
+        self.fetched = 0
+
+    def places_within(self, *args, **kwargs):
+        return self.store.places_within(*args, **kwargs)
+
+    def places_closed_at(self, *args, **kwargs):
+        return self.store.places_closed_at(*args, **kwargs)
+
+    def lexical_search(self, *args, **kwargs):
+        return self.store.lexical_search(*args, **kwargs)
+
+    def _count(self, results):
+        if results:
+            self.fetched += len(results["ids"][0])
+        return results
+
+    def search_places(self, *args, **kwargs):
+        return self._count(self.store.search_places(*args, **kwargs))
+
+    def probe_places(self, *args, **kwargs):
+        from app.services.recommend.retriever import RankedHits
+
+        hits = self.store.probe_places(*args, **kwargs)
+        if hits is None:
+            return None
+        return RankedHits(hits.distances, lambda count: self._count(hits.fetch(count)))
+
+
+def load_queries(path: str) -> list:
+    from app.services.embedding_factory import EmbeddingModelFactory
+
+    model = EmbeddingModelFactory.get_instance()
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            query = json.loads(line)
+            query["keyword_vecs"] = [list(map(float, v)) for v in model.encode(query["keywords"])]
+            queries.append(query)
+    return queries
+
+
+def sample_queries(n_queries: int, noise: float, seed: int) -> list:
+    import chromadb
+    from app.core.constants import CATEGORY_MAP, PLACE_CATEGORIES
+    from app.data.snapshots import get_snapshot_manager
+
+    model = None
+    if not noise:
+        from app.services.embedding_factory import EmbeddingModelFactory
+        model = EmbeddingModelFactory.get_instance()
+
+    rng = np.random.default_rng(seed)
+    pick = random.Random(seed)
+    client = chromadb.PersistentClient(path=get_snapshot_manager().current_path())
+    collections = {category: client.get_collection(name=name) for category, name in CATEGORY_MAP.items()}
+    sizes = {category: collection.count() for category, collection in collections.items()}
+    categories = [category for category, size in sizes.items() if size]
+
+    queries = []
+    for _ in range(n_queries):
+        terms = pick.sample(categories, k=min(len(categories), pick.randint(1, 4)))
+        keyword_vecs, keywords = [], []
+        for category in terms:
+            page = collections[category].get(
+                limit=1, offset=pick.randrange(sizes[category]), include=["embeddings", "documents", "metadatas"]
+            )
+            keyword = str((page["metadatas"][0] or {}).get("keyword") or page["documents"][0])
+            if model is not None:
+                # 실제 질의와 같이 원문 키워드를 검색 시 방식으로 임베딩
+                keyword_vecs.append(list(map(float, model.encode(keyword))))
+            else:
+                vec = np.asarray(page["embeddings"][0], dtype=np.float64)
+                vec = vec + rng.normal(scale=noise, size=vec.shape)
+                keyword_vecs.append((vec / (np.linalg.norm(vec) or 1.0)).tolist())
+            keywords.append(keyword)
+        queries.append({
+            "categories": terms,
+            # 잡음을 더한 벡터는 원문 키워드와 맞지 않으므로 벡터 검색 경로만 재생
+            "keywords": keywords if model is not None else None,
+            "keyword_vecs": keyword_vecs,
+            "place_category": pick.choice([None, *PLACE_CATEGORIES]),
+        })
+    return queries
+
+
+def require_indexes(build: bool) -> dict:
+    """
+    현재 버전에 어휘 역색인과 이웃 테이블이 있는지 확인합니다. (build면 없을 때 새 버전으로 생성)
+
+    Returns:
+        dict: 컬렉션별 이웃 테이블 (질의 키워드의 이웃 테이블 적중률 계산용)
+    """
+    from app.data import lexical_index, neighbor_table
+    from app.data.snapshots import get_snapshot_manager
+
+    def _loaded():
+        path = get_snapshot_manager().current_path()
+        return (
+            lexical_index.load_lexical_indexes(lexical_index.lexical_dir_of(path)),
+            neighbor_table.load_neighbor_tables(neighbor_table.neighbor_dir_of(path)),
+        )
+
+    lexical, neighbors = _loaded()
+    if build and not lexical:
+        lexical_index.main(["build"])
+    if build and not neighbors:
+        neighbor_table.main(["build"])
+    if build:
+        lexical, neighbors = _loaded()
+    missing = [name for name, index in (("어휘 역색인", lexical), ("이웃 테이블", neighbors)) if not index]
+    if missing:
+        raise SystemExit(f"현재 버전에 {', '.join(missing)}이(가) 없습니다. --build-indexes로 생성한 뒤 다시 실행하세요.")
+    return neighbors
+
+
+def _summary(response) -> list:
+    return [(r.id, r.similarity_score, tuple(sorted(r.keyword))) for r in response.recommendations]
+
+
+async def _replay(engine, counter, query: dict, adaptive: bool) -> tuple:
+    engine.adaptive_top_k = adaptive
+    fetched = counter.fetched
+    start = time.perf_counter()
+    # 서비스와 같이 원문 키워드를 넘겨 어휘 역색인/이웃 테이블 경로를 거침
+    response = await engine.get_recommendations(
+        query["categories"], query["keyword_vecs"], query.get("place_category"), keywords=query.get("keywords")
+    )
+    return _summary(response), time.perf_counter() - start, counter.fetched - fetched
+
+
+async def run_report(queries: list, neighbors: dict) -> dict:
+    from app.core.constants import CATEGORY_MAP
+    from app.services.place_store_factory import PlaceStoreFactory
+    from app.services.recommend.engine import RecommendationEngine
+
+    counter = _FetchCounter(PlaceStoreFactory.get_instance())
+    engine = RecommendationEngine(place_store=counter)
+
+    mismatches, fetched, latency = [], {"baseline": 0, "adaptive": 0}, {"baseline": [], "adaptive": []}
+    for i, query in enumerate(queries):
+        baseline, base_time, base_fetched = await _replay(engine, counter, query, adaptive=False)
+        adaptive, adaptive_time, adaptive_fetched = await _replay(engine, counter, query, adaptive=True)
+        fetched["baseline"] += base_fetched
+        fetched["adaptive"] += adaptive_fetched
+        latency["baseline"].append(base_time)
+        latency["adaptive"].append(adaptive_time)
+        if baseline != adaptive:
+            mismatches.append({
+                "index": i,
+                "categories": query["categories"],
+                "keywords": query.get("keywords"),
+                "baseline": baseline[:5],
+                "adaptive": adaptive[:5],
+            })
+
+    # 이웃 테이블에 있는 (색인된 키워드와 정확히 같은) 질의 키워드 비율
+    terms = [
+        (CATEGORY_MAP.get(category), keyword)
+        for query in queries
+        for category, keyword in zip(query["categories"], query.get("keywords") or [])
+    ]
+    indexed = sum(
+        1 for name, keyword in terms
+        if name in neighbors and keyword and keyword.strip() in neighbors[name].key_row
+    )
+
+    return {
+        "queries": len(queries),
+        "identical": len(queries) - len(mismatches),
+        "keyword_terms": len(terms),
+        "neighbor_hits": indexed,
+        "mismatches": mismatches,
+        "fetched": fetched,
+        "fetched_ratio": fetched["adaptive"] / fetched["baseline"] if fetched["baseline"] else 1.0,
+        "latency_ms": {
+            mode: {
+                "mean": statistics.mean(values) * 1000 if values else 0.0,
+                "p95": sorted(values)[max(int(len(values) * 0.95) - 1, 0)] * 1000 if values else 0.0,
+            }
+            for mode, values in latency.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="적응형 검색 결과 동일성 리포트")
+    parser.add_argument("--queries", help="재생할 질의 JSONL 파일 (없으면 저장소에서 무작위 생성)")
+    parser.add_argument("--sample", type=int, default=200, help="무작위 생성할 질의 수")
+    parser.add_argument("--noise", type=float, default=0.0, help="0보다 크면 저장된 벡터에 잡음을 더해 벡터 검색 경로만 재생")
+    parser.add_argument("--build-indexes", action="store_true", help="어휘 역색인/이웃 테이블이 없으면 새 버전으로 생성")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="리포트를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    neighbors = require_indexes(args.build_indexes)
+    if args.queries:
+        queries = load_queries(args.queries)
+    else:
+        queries = sample_queries(args.sample, args.noise, args.seed)
+
+    report = asyncio.run(run_report(queries, neighbors))
+    print(
+        f"질의 {report['queries']}개 | 결과 동일 {report['identical']}개 | "
+        f"이웃 테이블 키워드 {report['neighbor_hits']}/{report['keyword_terms']}개 | "
+        f"메타데이터 조회 {report['fetched']['baseline']} → {report['fetched']['adaptive']}건 "
+        f"({report['fetched_ratio'] * 100:.1f}%)"
+    )
+    for mode, stat in report["latency_ms"].items():
+        print(f"[{mode:>8}] 평균 {stat['mean']:.2f}ms | p95 {stat['p95']:.2f}ms")
+    for mismatch in report["mismatches"][:10]:
+        print(f"❌ 결과 불일치 #{mismatch['index']}: {mismatch['categories']} {mismatch['keywords']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    if report["mismatches"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
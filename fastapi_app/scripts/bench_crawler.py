@@ -0,0 +1,113 @@
+"""
+크롤러 수집 방식 벤치마크 스크립트
+
+로컬에 저장한 장소 페이지(fixture)를 HTTP 서버로 띄우고,
+섹션별 수집 방식(http / browser)에 따른 크롤링 소요 시간을 비교합니다.
+
+fixture 디렉토리에는 `{place_id}.html` 형식의 파일을 둡니다.
+`--capture` 옵션을 주면 실제 카카오 장소 페이지를 브라우저로 렌더링해서 fixture로 저장합니다.
+
+사용 예:
+    cd fastapi_app
+    python -m scripts.bench_crawler --fixtures tests/fixtures/places --capture 26338954 8137235
+    python -m scripts.bench_crawler --fixtures tests/fixtures/places --repeat 3
+"""
+
+import os
+import time
+import argparse
+import threading
+import statistics
+
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """`/{place_id}` 요청을 `{place_id}.html` 파일로 응답하는 핸들러"""
+
+    def translate_path(self, path):
+        path = path.split("?", 1)[0].split("#", 1)[0].strip("/")
+        return os.path.join(self.directory, f"{path}.html")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory: str) -> ThreadingHTTPServer:
+    handler = partial(_FixtureHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def capture_fixtures(directory: str, place_ids: list[int]) -> None:
+    from app.data_pipeline.fetcher import BrowserSession
+
+    os.makedirs(directory, exist_ok=True)
+    for place_id in place_ids:
+        with BrowserSession(f"https://place.map.kakao.com/{place_id}") as browser:
+            browser.main_page()
+            html = browser.driver.page_source
+        with open(os.path.join(directory, f"{place_id}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"fixture 저장: {place_id}")
+
+
+def run_benchmark(directory: str, repeat: int) -> None:
+    place_ids = sorted(
+        int(name[:-5]) for name in os.listdir(directory)
+        if name.endswith(".html") and name[:-5].isdigit()
+    )
+    if not place_ids:
+        raise SystemExit(f"fixture가 없습니다: {directory}")
+
+    server = serve_fixtures(directory)
+    os.environ["KAKAO_PLACE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    from app.core.config import settings
+    settings.KAKAO_PLACE_URL = os.environ["KAKAO_PLACE_URL"]
+
+    from app.data_pipeline import crawler
+    from app.data_pipeline.fetcher import parse_section_modes
+
+    # 벤치마크에서는 외부 API(좌표 변환, 이미지 저장) 호출을 제외하고 파싱 비용만 측정합니다.
+    crawler.crawl_place_table = lambda place_id, soup, _key: crawler.pd.DataFrame([{"id": place_id}])
+
+    scenarios = {
+        "http": parse_section_modes("main=http,menu=http,reviews=http"),
+        "browser": parse_section_modes("main=browser,menu=browser,reviews=browser"),
+    }
+
+    try:
+        for name, modes in scenarios.items():
+            durations = []
+            for _ in range(repeat):
+                for place_id in place_ids:
+                    start = time.perf_counter()
+                    crawler.crawling(place_id, section_modes=modes)
+                    durations.append(time.perf_counter() - start)
+            print(
+                f"[{name:>7}] 장소 {len(place_ids)}개 x {repeat}회 | "
+                f"평균 {statistics.mean(durations):.3f}초 | "
+                f"p95 {sorted(durations)[int(len(durations) * 0.95) - 1]:.3f}초 | "
+                f"분당 {60 / statistics.mean(durations):.1f}곳"
+            )
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 수집 방식 벤치마크")
+    parser.add_argument("--fixtures", required=True, help="fixture HTML 디렉토리")
+    parser.add_argument("--capture", nargs="*", type=int, help="fixture로 저장할 장소 id 목록")
+    parser.add_argument("--repeat", type=int, default=3, help="장소별 반복 횟수")
+    args = parser.parse_args()
+
+    if args.capture:
+        capture_fixtures(args.fixtures, args.capture)
+    run_benchmark(args.fixtures, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
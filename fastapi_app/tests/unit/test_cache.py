@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import types
+from datetime import datetime
+
+import pytest
+
+from app.cache import backends
+from app.cache.backends import MemoryCache
+from app.cache.cache import Cache
+from app.cache.redis import RedisCache
+
+LOGGER = logging.getLogger("test_cache")
+
+
+class _Clock:
+    """MemoryCache의 time.monotonic 대신 쓰는 시계 (advance로만 흐름)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class _DownRedis:
+    """모든 명령이 연결 오류로 실패하는 redis.asyncio 클라이언트"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, px=None):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def delete(self, key):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(backends, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _cache(*tiers):
+    return Cache(list(tiers), ttls={"recommend": 300.0}, prefix="test", logger=LOGGER)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    memory = MemoryCache(max_items=2)
+
+    async def scenario():
+        await memory.set("a", b"1", 60)
+        await memory.set("b", b"2", 60)
+        assert await memory.get("a") == b"1"  # a를 최근 사용으로 옮김
+        await memory.set("c", b"3", 60)
+        return [await memory.get(key) for key in ("a", "b", "c")]
+
+    assert _run(scenario()) == [b"1", None, b"3"]
+    assert len(memory) == 2
+
+
+def test_memory_cache_expires_items(clock):
+    memory = MemoryCache(max_items=8, max_ttl=30)
+
+    async def scenario():
+        await memory.set("short", b"1", 10)
+        await memory.set("capped", b"2", 3600)  # max_ttl(30초)로 줄어듦
+        await memory.set("none", b"3", 0)
+        clock.advance(9.9)
+        first = [await memory.get(key) for key in ("short", "capped", "none")]
+        clock.advance(0.1)
+        second = [await memory.get(key) for key in ("short", "capped")]
+        clock.advance(20)
+        third = await memory.get("capped")
+        return first, second, third
+
+    first, second, third = _run(scenario())
+    assert first == [b"1", b"2", None]
+    assert second == [None, b"2"]
+    assert third is None
+    assert len(memory) == 0
+
+
+def test_lower_tier_hit_fills_upper_tier():
+    upper, lower = MemoryCache(), MemoryCache()
+    cache = _cache(upper, lower)
+
+    async def scenario():
+        await lower.set("test:recommend:k", b'{"v": 1}', 60)
+        return await cache.get("recommend", "k"), await upper.get("test:recommend:k")
+
+    assert _run(scenario()) == ({"v": 1}, b'{"v": 1}')
+
+
+def test_redis_down_falls_back_to_memory_tier():
+    redis = _DownRedis()
+    cache = _cache(MemoryCache(), RedisCache(client=redis, retry_interval=60))
+
+    async def scenario():
+        await cache.set("recommend", "k", {"v": 1})
+        hit = await cache.get("recommend", "k")
+        miss = await cache.get("recommend", "other")
+        return hit, miss
+
+    hit, miss = _run(scenario())
+    assert hit == {"v": 1}
+    assert miss is None
+    # 첫 실패 후 retry_interval 동안은 Redis에 명령을 보내지 않음
+    assert redis.calls == 1
+    assert not cache.tiers[1].available
+
+
+def test_get_or_set_survives_redis_outage():
+    redis = _DownRedis()
+    cache = _cache(RedisCache(client=redis, retry_interval=0))
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        return {"v": len(calls)}
+
+    async def scenario():
+        return [await cache.get_or_set("recommend", "k", factory) for _ in range(2)]
+
+    # 캐시할 곳이 없으므로 매번 factory 결과를 그대로 반환
+    assert _run(scenario()) == [{"v": 1}, {"v": 2}]
+
+
+def test_recommend_cache_key_includes_store_version_and_time_slot():
+    pytest.importorskip("langchain")
+    pytest.importorskip("langchain_google_genai")
+    from app.services.recommend.service import RecommenderService
+
+    def key(version, user_input="조용한 카페", open_at=None, location=None, mode="keyword"):
+        service = types.SimpleNamespace(
+            recommendation_engine=types.SimpleNamespace(place_store=types.SimpleNamespace(version=version))
+        )
+        return RecommenderService._cache_key(service, user_input, location, open_at, mode)
+
+    noon = datetime(2026, 10, 19, 12, 0)
+    assert key("v1", open_at=noon) == key("v1", " 조용한 카페 ", open_at=noon)
+    assert key("v1", open_at=noon) != key("v2", open_at=noon)
+    # 같은 15분 구간이면 같은 키, 다음 구간이면 다른 키
+    assert key("v1", open_at=noon) == key("v1", open_at=datetime(2026, 10, 19, 12, 14))
+    assert key("v1", open_at=noon) != key("v1", open_at=datetime(2026, 10, 19, 12, 15))
+    assert key("v1", open_at=noon) != key("v1")
+    assert key("v1") != key("v1", mode="dense")
+    assert key("v1") != key("v1", location=(37.5, 127.0, 1000.0))
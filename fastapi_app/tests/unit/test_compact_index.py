@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from app.data.compact_index import CompactCollection, export_compact_index, quantize_int8
+
+N_PLACES = 300
+KEYWORDS_PER_PLACE = 5
+DIM = 48
+K = 10
+
+
+class _Collection:
+    """ChromaDB 컬렉션의 get(limit, offset, include)만 흉내 내는 컬렉션"""
+
+    def __init__(self, name, vectors):
+        self.name = name
+        self.ids = [f"{name}_{i // KEYWORDS_PER_PLACE}_kw{i}" for i in range(len(vectors))]
+        self.metadatas = [
+            {"place_id": i // KEYWORDS_PER_PLACE, "keyword": f"kw{i}", "place_category": "카페"}
+            for i in range(len(vectors))
+        ]
+        self.vectors = vectors
+
+    def get(self, limit=None, offset=0, include=()):
+        end = len(self.ids) if limit is None else offset + limit
+        return {
+            "ids": self.ids[offset:end],
+            "documents": [m["keyword"] for m in self.metadatas[offset:end]],
+            "metadatas": self.metadatas[offset:end],
+            "embeddings": self.vectors[offset:end].tolist(),
+        }
+
+
+class _Client:
+    def __init__(self, collections):
+        self.collections = {c.name: c for c in collections}
+
+    def get_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(name)
+        return self.collections[name]
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    # 장소마다 중심 주변에 키워드가 모이는 임베딩 분포를 흉내 냄
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(N_PLACES, DIM))
+    noise = rng.normal(scale=0.35, size=(N_PLACES * KEYWORDS_PER_PLACE, DIM))
+    return (np.repeat(centers, KEYWORDS_PER_PLACE, axis=0) + noise).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def queries(vectors):
+    rng = np.random.default_rng(11)
+    picked = vectors[rng.choice(len(vectors), size=50, replace=False)]
+    return picked + rng.normal(scale=0.2, size=picked.shape).astype(np.float32)
+
+
+def _exact_top_k(vectors, query, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    sims = normed @ (query / np.linalg.norm(query))
+    return set(np.argsort(-sims)[:k].tolist())
+
+
+def _exported(tmp_path, vectors, dtype, rerank=0):
+    directory = str(tmp_path / f"{dtype}-{rerank}")
+    meta = export_compact_index(_Client([_Collection("food_product", vectors)]), directory, dtype=dtype, rerank=rerank)
+    assert meta["dtypes"]["food_product"] == dtype
+    return CompactCollection(directory, "food_product", dtype, rerank=rerank, two_stage=False)
+
+
+def _recall(collection, vectors, queries):
+    hits = 0
+    for query in queries:
+        rows, _ = collection.rank(query, K)
+        # 내보내기는 (장소 카테고리, place_id) 순으로 정렬하지만, 여기서는 원래 순서와 같음
+        hits += len(_exact_top_k(vectors, query, K).intersection(rows.tolist()))
+    return hits / (K * len(queries))
+
+
+def test_int8_round_trip_error_is_within_half_a_step():
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(200, DIM)).astype(np.float32)
+
+    codes, scale, offset = quantize_int8(matrix)
+    restored = offset + scale * codes.astype(np.float32)
+
+    assert codes.dtype == np.uint8
+    assert np.all(np.abs(restored - matrix) <= scale / 2 + 1e-6)
+
+
+def test_int8_constant_dimension_does_not_divide_by_zero():
+    matrix = np.ones((4, 3), dtype=np.float32)
+
+    codes, scale, offset = quantize_int8(matrix)
+
+    np.testing.assert_allclose(offset + scale * codes, matrix)
+
+
+@pytest.mark.parametrize("dtype, min_recall", [("float32", 1.0), ("float16", 0.98), ("int8", 0.9)])
+def test_quantized_search_agrees_with_exact_cosine(tmp_path, vectors, queries, dtype, min_recall):
+    collection = _exported(tmp_path, vectors, dtype)
+
+    assert _recall(collection, vectors, queries) >= min_recall
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_rerank_restores_exact_order(tmp_path, vectors, queries, dtype):
+    collection = _exported(tmp_path, vectors, dtype, rerank=4)
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    for query in queries:
+        rows, sims = collection.rank(query, K)
+        exact = normed @ (query / np.linalg.norm(query))
+        assert rows[0] == int(np.argmax(exact))
+        np.testing.assert_allclose(sims, exact[rows], rtol=1e-5, atol=1e-6)
+
+
+def test_quantized_vectors_are_smaller(tmp_path, vectors):
+    sizes = {dtype: _exported(tmp_path, vectors, dtype).nbytes for dtype in ("float32", "float16", "int8")}
+
+    assert sizes["float16"] * 2 == sizes["float32"]
+    assert sizes["int8"] * 4 == sizes["float32"]
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+pytest.importorskip("pysqlite3")
+pytest.importorskip("chromadb")
+
+from app.data.distribution import (
+    ARCHIVE_NAME,
+    LATEST_KEY,
+    MANIFEST_NAME,
+    LocalSnapshotStore,
+    SnapshotPublisher,
+    SnapshotSubscriber,
+)
+from app.data.snapshots import SnapshotManager
+
+
+@pytest.fixture
+def source(tmp_path):
+    """항목 두 개가 든 food_product 컬렉션을 게시한 수집 노드 저장소"""
+    manager = SnapshotManager(root=str(tmp_path / "source"), grace=0)
+    with manager.transaction(copy_current=False) as client:
+        collection = client.get_or_create_collection(name="food_product")
+        collection.add(
+            ids=["1_맛있음", "2_고소함"],
+            documents=["맛있음", "고소함"],
+            embeddings=[[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]],
+            metadatas=[{"place_id": 1}, {"place_id": 2}],
+        )
+    return manager
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalSnapshotStore(str(tmp_path / "remote"))
+
+
+@pytest.fixture
+def replica(tmp_path):
+    return SnapshotManager(root=str(tmp_path / "replica"), grace=0)
+
+
+def _published(source, store) -> str:
+    snapshot_id = SnapshotPublisher(store=store, manager=source).publish()
+    assert snapshot_id is not None
+    return snapshot_id
+
+
+def test_round_trip_through_local_store(source, store, replica):
+    snapshot_id = _published(source, store)
+    manifest = json.loads(store.get_bytes(f"{snapshot_id}/{MANIFEST_NAME}"))
+    assert manifest["source_version"] == source.current()
+    assert manifest["collections"]["food_product"] == 2
+
+    subscriber = SnapshotSubscriber(store=store, manager=replica)
+    assert subscriber.poll() == snapshot_id
+    assert subscriber.applied == snapshot_id
+    assert replica.current() is not None
+
+    import chromadb
+    client = chromadb.PersistentClient(path=replica.current_path())
+    assert client.get_collection(name="food_product").count() == 2
+
+    # 이미 적용한 배포는 다시 받지 않음
+    assert subscriber.poll() is None
+
+
+def test_checksum_mismatch_is_not_published(source, store, replica, tmp_path):
+    snapshot_id = _published(source, store)
+    corrupted = tmp_path / "corrupted.tar.gz"
+    corrupted.write_bytes(b"not an archive")
+    store.put_file(f"{snapshot_id}/{ARCHIVE_NAME}", str(corrupted))
+
+    subscriber = SnapshotSubscriber(store=store, manager=replica)
+    with pytest.raises(ValueError, match="체크섬"):
+        subscriber.poll()
+    assert replica.current() is None
+    assert subscriber.applied is None
+
+
+def test_collection_count_mismatch_is_not_published(source, store, replica):
+    snapshot_id = _published(source, store)
+    key = f"{snapshot_id}/{MANIFEST_NAME}"
+    manifest = json.loads(store.get_bytes(key))
+    manifest["collections"]["food_product"] = 3
+    store.put_bytes(key, json.dumps(manifest).encode("utf-8"))
+
+    subscriber = SnapshotSubscriber(store=store, manager=replica)
+    with pytest.raises(ValueError, match="항목 수"):
+        subscriber.poll()
+    assert replica.current() is None
+    assert replica.versions() == []
+    assert store.get_bytes(LATEST_KEY).decode("utf-8") == snapshot_id
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("transformers")
+
+from app.services.recommend.embedding import EmbeddingModel
+
+
+class _Tokenizer:
+    """문자 하나를 토큰 하나로 보는 토크나이저 (가장 긴 문장에 맞춰 0으로 패딩)"""
+
+    def __call__(self, sentences, return_tensors="np", padding=True, truncation=True, max_length=64):
+        width = max(len(s) for s in sentences)
+        ids = np.zeros((len(sentences), width), dtype=np.int64)
+        mask = np.zeros((len(sentences), width), dtype=np.int64)
+        for i, s in enumerate(sentences):
+            ids[i, :len(s)] = [ord(c) % 97 + 1 for c in s]
+            mask[i, :len(s)] = 1
+        return {"input_ids": ids, "attention_mask": mask}
+
+
+class _Session:
+    """토큰 id를 고정된 임베딩 표에서 찾아 (batch, seq, dim) 출력을 내는 세션 (패딩 위치도 값이 있음)"""
+
+    def __init__(self, dim: int = 8):
+        self.table = np.random.default_rng(0).normal(size=(128, dim)).astype(np.float32)
+
+    def run(self, output_names, input_feed):
+        return [self.table[input_feed["input_ids"]]]
+
+
+def _model() -> EmbeddingModel:
+    model = EmbeddingModel.__new__(EmbeddingModel)
+    model.tokenizer = _Tokenizer()
+    model.session = _Session()
+    model.input_names = {"input_ids": "input_ids", "attention_mask": "attention_mask"}
+    model.output_name = "last_hidden_state"
+    model.max_length = 64
+    return model
+
+
+def test_batch_encode_matches_single_encode():
+    # make_chroma_db/upload_chromadb는 키워드를 묶어 인코딩하고, 검색은 키워드 하나씩 인코딩함
+    model = _model()
+    keywords = ["조용한", "분위기 좋은 카페", "넓음"]
+
+    batched = model.encode(keywords)
+    for keyword, vec in zip(keywords, batched):
+        np.testing.assert_allclose(vec, model.encode(keyword), rtol=1e-5, atol=1e-6)
+
+
+def test_postprocess_ignores_padding_positions():
+    model = _model()
+    outputs = np.arange(2 * 3 * 2, dtype=np.float32).reshape(2, 3, 2)
+    mask = np.array([[1, 0, 0], [1, 1, 1]])
+
+    pooled = model._postprocess(outputs, mask)
+
+    np.testing.assert_allclose(pooled[0], outputs[0, 0])
+    np.testing.assert_allclose(pooled[1], outputs[1].mean(axis=0))
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.data.opening_hours import (
+    PACKED_BYTES,
+    OpeningHoursIndex,
+    compile_hours,
+    decode_hours,
+    encode_hours,
+)
+
+# 2026-10-19는 월요일
+MONDAY = 19
+
+
+def _table(*rows):
+    return pd.DataFrame(
+        [
+            {"day_of_week": day, "open_time": open_time, "close_time": close_time, "is_break_time": is_break}
+            for day, open_time, close_time, is_break in rows
+        ]
+    )
+
+
+def _is_open(bits, day_offset, hour, minute):
+    index = OpeningHoursIndex([1], bits)
+    return bool(index.is_open(datetime(2026, 10, MONDAY + day_offset, hour, minute))[0])
+
+
+def test_overnight_hours_continue_into_next_day():
+    bits = compile_hours(_table(("금", "18:00", "02:00", False)))
+
+    assert _is_open(bits, 4, 23, 30)
+    assert _is_open(bits, 5, 0, 0)
+    assert _is_open(bits, 5, 1, 45)
+    assert not _is_open(bits, 5, 2, 0)
+    assert not _is_open(bits, 4, 17, 45)
+
+
+def test_sunday_overnight_wraps_to_monday():
+    bits = compile_hours(_table(("일", "22:00", "03:00", False)))
+
+    assert _is_open(bits, 6, 23, 0)
+    assert _is_open(bits, 0, 2, 45)
+    assert not _is_open(bits, 0, 3, 0)
+
+
+def test_break_time_is_subtracted():
+    bits = compile_hours(_table(("월", "10:00", "22:00", False), ("월", "15:00", "17:00", True)))
+
+    assert _is_open(bits, 0, 14, 45)
+    assert not _is_open(bits, 0, 15, 0)
+    assert not _is_open(bits, 0, 16, 45)
+    assert _is_open(bits, 0, 17, 0)
+
+
+def test_partial_break_slots_stay_open():
+    # 브레이크타임은 완전히 포함되는 슬롯만 지움 (15:00~15:15, 16:45~17:00 슬롯은 영업 중)
+    bits = compile_hours(_table(("월", "10:00", "22:00", False), ("월", "15:10", "16:50", True)))
+
+    assert _is_open(bits, 0, 15, 0)
+    assert not _is_open(bits, 0, 15, 15)
+    assert not _is_open(bits, 0, 16, 30)
+    assert _is_open(bits, 0, 16, 45)
+
+
+def test_partial_open_slots_round_outward():
+    # 영업 구간은 걸치는 슬롯까지 포함 (09:10 개점 → 09:00 슬롯, 21:50 마감 → 21:45 슬롯)
+    bits = compile_hours(_table(("화", "09:10", "21:50", False)))
+
+    assert not _is_open(bits, 1, 8, 45)
+    assert _is_open(bits, 1, 9, 0)
+    assert _is_open(bits, 1, 21, 45)
+    assert not _is_open(bits, 1, 22, 0)
+
+
+def test_unknown_hours_compile_to_none():
+    assert compile_hours(None) is None
+    assert compile_hours(_table(("공휴일", "10:00", "22:00", False))) is None
+    assert compile_hours(_table(("월", "휴무", "", False))) is None
+
+
+def test_encoded_hours_round_trip_and_closed_at():
+    open_bits = compile_hours(_table(("월", "10:00", "22:00", False)))
+    closed_bits = compile_hours(_table(("화", "10:00", "22:00", False)))
+    assert len(encode_hours(open_bits)) == PACKED_BYTES * 2
+    np.testing.assert_array_equal(decode_hours(encode_hours(open_bits)), open_bits)
+
+    index = OpeningHoursIndex([1, 2], np.stack([open_bits, closed_bits]))
+
+    assert index.closed_at(datetime(2026, 10, MONDAY, 12, 0)) == {2}